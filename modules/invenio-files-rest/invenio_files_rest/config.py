@@ -113,6 +113,45 @@ FILES_REST_MULTIPART_CHUNKSIZE_MAX = 5 * 1024 * 1024 * 1024  # 5 GiB
 FILES_REST_MULTIPART_EXPIRES = timedelta(days=4)
 """Time delta after which a multipart upload is considered expired."""
 
+FILES_REST_CHECKSUM_VERIFICATION_CHUNK_SIZE = 64 * 1024 * 1024  # 64 MiB
+"""Read buffer size used by the scheduled fixity checks."""
+
+FILES_REST_CHECKSUM_VERIFICATION_CONCURRENCY = 4
+"""Number of parallel tasks a scheduled batch of fixity checks is split in."""
+
+FILES_REST_CHECKSUM_VERIFICATION_MAX_BYTES_PER_SECOND = None
+"""Global read budget in bytes per second for the scheduled fixity checks.
+
+The budget is shared equally by the parallel tasks of a batch. ``None`` means
+unlimited.
+"""
+
+FILES_REST_CHECKSUM_VERIFICATION_WINDOWS = []
+"""Hours of the day during which scheduled fixity checks may run.
+
+A list of ``(start_hour, end_hour)`` tuples in server local time, e.g.
+``[(22, 6)]`` for nightly checks only. An empty list allows any time.
+"""
+
+FILES_REST_TEXT_EXTRACTION_URL = None
+"""URL of a text extraction server used to index non-text files.
+
+The file content is streamed to the URL with a ``PUT`` request and the plain
+text response is used, e.g. ``'http://tika:9998/tika'`` for Apache Tika
+server. ``None`` disables the extraction.
+"""
+
+FILES_REST_TEXT_EXTRACTION_TIMEOUT = (3, 30)
+"""Connect and read timeouts in seconds of a text extraction request.
+
+When the request fails or times out, the file is indexed as if no extraction
+server was configured.
+"""
+
+FILES_REST_TEXT_EXTRACTION_RETRY_AFTER = 300
+"""Seconds during which the extraction server is not called after a
+failure."""
+
 FILES_REST_TASK_WAIT_INTERVAL = 2
 """Interval in seconds between sending a whitespace to not close connection."""
 
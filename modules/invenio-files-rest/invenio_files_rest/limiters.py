@@ -6,10 +6,13 @@
 # Invenio is free software; you can redistribute it and/or modify it
 # under the terms of the MIT License; see LICENSE file for more details.
 
-"""File size limiting functionality for Invenio-Files-REST."""
+"""File size and bandwidth limiting functionality for Invenio-Files-REST."""
 
 from __future__ import absolute_import, print_function
 
+import time
+from datetime import datetime
+
 
 def file_size_limiters(bucket):
     """Get default file size limiters.
@@ -71,3 +74,67 @@ class FileSizeLimit(object):
         elif isinstance(other, FileSizeLimit):
             return self.limit == other.limit
         raise self.not_implemented_error
+
+
+class BandwidthLimit(object):
+    """Bytes-per-second budget shared by the reads of a single worker.
+
+    Call :meth:`consume` after each chunk has been read; the limiter sleeps
+    long enough for the average throughput since creation to stay below the
+    configured budget. A falsy ``bytes_per_second`` disables throttling.
+    """
+
+    def __init__(self, bytes_per_second, clock=time.monotonic,
+                 sleep=time.sleep):
+        """Instantiate a new bandwidth limit.
+
+        :param bytes_per_second: Maximum average read rate.
+        :param clock: Monotonic clock function. (Default: ``time.monotonic``)
+        :param sleep: Sleep function. (Default: ``time.sleep``)
+        """
+        self.bytes_per_second = bytes_per_second
+        self.clock = clock
+        self.sleep = sleep
+        self.started = clock()
+        self.consumed = 0
+
+    @property
+    def elapsed(self):
+        """Seconds elapsed since the limiter was created."""
+        return self.clock() - self.started
+
+    @property
+    def throughput(self):
+        """Average bytes per second consumed so far."""
+        elapsed = self.elapsed
+        return self.consumed / elapsed if elapsed > 0 else 0.0
+
+    def consume(self, size):
+        """Account ``size`` bytes and wait if the budget is exceeded."""
+        self.consumed += size
+        if not self.bytes_per_second:
+            return
+        delay = self.consumed / float(self.bytes_per_second) - self.elapsed
+        if delay > 0:
+            self.sleep(delay)
+
+
+def in_time_windows(windows, now=None):
+    """Check if ``now`` falls inside one of the given hour windows.
+
+    :param windows: List of ``(start_hour, end_hour)`` tuples. A window where
+        ``start_hour > end_hour`` wraps around midnight, e.g. ``(22, 6)``.
+        An empty list means that any time is allowed.
+    :param now: The datetime to check. (Default: ``datetime.now()``)
+    :returns: ``True`` if ``now`` is inside a window.
+    """
+    if not windows:
+        return True
+    hour = (now or datetime.now()).hour
+    for start, end in windows:
+        if start <= end:
+            if start <= hour < end:
+                return True
+        elif hour >= start or hour < end:
+            return True
+    return False
@@ -987,6 +987,15 @@ class FileInstance(db.Model, Timestamp):
         """
         return self.storage(**kwargs).read_file(fjson)
 
+    def read_text(self, fjson, size_limit, **kwargs):
+        """Read at most ``size_limit`` bytes of text of the file.
+
+        :param fjson: Dictionary of file metadata.
+        :param size_limit: Maximum size in bytes of the text.
+        :return: The text or ``None``.
+        """
+        return self.storage(**kwargs).read_text(fjson, size_limit)
+
 
 class ObjectVersion(db.Model, Timestamp):
     """Model for storing versions of objects.
@@ -128,7 +128,7 @@ class FileStorage(object):
         fp = self.open(mode='rb')
         try:
             value = self._compute_checksum(
-                fp, size=self._size, chunk_size=None,
+                fp, size=self._size, chunk_size=chunk_size,
                 progress_callback=progress_callback)
         except StorageError:
             raise
@@ -13,8 +13,10 @@ from __future__ import absolute_import, print_function
 import base64
 import hashlib
 import shutil
+import time
 
 import cchardet as chardet
+import requests
 from flask import current_app
 from fs.opener import opener
 from fs.path import basename, dirname
@@ -22,6 +24,9 @@ from fs.path import basename, dirname
 from ..helpers import make_path
 from .base import FileStorage, StorageError
 
+_text_extraction_retry_at = [0]
+"""Time until which the text extraction server is not called again."""
+
 
 class PyFSFileStorage(FileStorage):
     """File system storage using PyFilesystem for access the file.
@@ -193,6 +198,68 @@ class PyFSFileStorage(FileStorage):
 
         return strb
 
+    def read_text(self, fjson, size_limit):
+        """Read the text of a file for indexing without loading it whole.
+
+        Text files are decoded from their first ``size_limit`` bytes. Other
+        files are streamed to ``FILES_REST_TEXT_EXTRACTION_URL`` when it is
+        configured, and at most ``size_limit`` bytes of the extracted text
+        are kept. If the extraction fails, the server is not called again
+        for ``FILES_REST_TEXT_EXTRACTION_RETRY_AFTER`` seconds.
+
+        :param fjson: File metadata including the ``mimetype``.
+        :param size_limit: Maximum size in bytes of the returned text.
+        :returns: The text, or ``None`` if the file type can not be read as
+            text or the extraction failed.
+        """
+        if fjson is None or len(fjson) == 0:
+            return None
+
+        mime = fjson.get('mimetype', '')
+        url = current_app.config.get('FILES_REST_TEXT_EXTRACTION_URL')
+        if 'text' not in mime and (
+                not url or time.time() < _text_extraction_retry_at[0]):
+            return None
+
+        try:
+            fp = self.open(mode='rb')
+        except Exception as e:
+            raise StorageError('Could not send file: {}'.format(e))
+
+        try:
+            if 'text' in mime:
+                s = fp.read(size_limit)
+            else:
+                res = requests.put(
+                    url, data=fp, stream=True,
+                    headers={'Accept': 'text/plain', 'Content-Type': mime},
+                    timeout=current_app.config.get(
+                        'FILES_REST_TEXT_EXTRACTION_TIMEOUT'))
+                try:
+                    res.raise_for_status()
+                    chunks, read = [], 0
+                    for chunk in res.iter_content(64 * 1024):
+                        chunks.append(chunk)
+                        read += len(chunk)
+                        if read >= size_limit:
+                            break
+                    s = b''.join(chunks)[:size_limit]
+                finally:
+                    res.close()
+        except requests.RequestException as e:
+            current_app.logger.warning('Could not extract text: {}'.format(e))
+            _text_extraction_retry_at[0] = time.time() + current_app.config.get(
+                'FILES_REST_TEXT_EXTRACTION_RETRY_AFTER', 0)
+            return None
+        finally:
+            fp.close()
+
+        ecd = chardet.detect(s).get('encoding') or 'utf-8'
+        try:
+            return s.decode(ecd, errors='ignore')
+        except LookupError:
+            return s.decode('utf-8', errors='ignore')
+
 
 def pyfs_storage_factory(fileinstance=None, default_location=None,
                          default_storage_class=None,
@@ -27,6 +27,7 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from weko_admin.models import AdminSettings
 
 from .api import send_alert_mail
+from .limiters import BandwidthLimit, in_time_windows
 from .models import FileInstance, Location, MultipartObject, ObjectVersion
 from .storage.pyfs import remove_dir_with_file
 from .utils import obj_or_import_string
@@ -62,6 +63,93 @@ def verify_checksum(file_id, pessimistic=False, chunk_size=None, throws=True,
     db.session.commit()
 
 
+@shared_task(ignore_result=True)
+def verify_checksums(file_ids, chunk_size=None, max_bytes_per_second=None,
+                     windows=None, checksum_kwargs=None):
+    """Verify checksums of a batch of file instances.
+
+    Files are read one after the other under a shared
+    :class:`BandwidthLimit`. Like the pessimistic :func:`verify_checksum`,
+    each file is marked as unchecked right before it is read, and its result
+    is committed right after, so an interrupted batch keeps the results
+    obtained so far. Files left when the allowed time window closes are
+    skipped and keep their previous result, so they are scheduled again
+    with the next batch.
+
+    :param file_ids: List of file IDs.
+    :param chunk_size: Read buffer size. (Default:
+        ``FILES_REST_CHECKSUM_VERIFICATION_CHUNK_SIZE``)
+    :param max_bytes_per_second: Read budget of this task. ``None`` means
+        unlimited.
+    :param windows: Allowed hour windows, see
+        :func:`invenio_files_rest.limiters.in_time_windows`.
+    :param dict checksum_kwargs: Passed to ``FileInstance.verify_checksum``.
+    :returns: Dictionary with the verification metrics.
+    """
+    chunk_size = chunk_size or current_app.config.get(
+        'FILES_REST_CHECKSUM_VERIFICATION_CHUNK_SIZE')
+    ids = [uuid.UUID(str(file_id)) for file_id in file_ids]
+    limit = BandwidthLimit(max_bytes_per_second)
+    metrics = dict(files=0, bytes=0, failed=0, mismatch=0, skipped=0)
+
+    for file_id in ids:
+        if not in_time_windows(windows):
+            metrics['skipped'] += 1
+            continue
+        f = FileInstance.query.get(file_id)
+        if f is None:
+            continue
+        # Anything might happen while the file is read, so it is unchecked
+        # until proven otherwise.
+        f.clear_last_check()
+        db.session.commit()
+        read = [0]
+
+        def progress_callback(size, total):
+            limit.consume(total - read[0])
+            read[0] = total
+
+        result = f.verify_checksum(
+            progress_callback=progress_callback, chunk_size=chunk_size,
+            throws=False, checksum_kwargs=checksum_kwargs)
+        db.session.commit()
+        if not read[0] and result is not None:
+            # Storage did not report progress, account the whole file.
+            read[0] = f.size or 0
+            limit.consume(read[0])
+        metrics['files'] += 1
+        metrics['bytes'] += read[0]
+        if result is None:
+            metrics['failed'] += 1
+        elif result is False:
+            metrics['mismatch'] += 1
+
+    metrics['seconds'] = limit.elapsed
+    metrics['throughput'] = limit.throughput
+    logger.info(
+        u'Checksum verification: {files} files, {bytes} bytes in '
+        '{seconds:.1f}s ({throughput:.0f} B/s), {failed} failed, '
+        '{mismatch} mismatched, {skipped} skipped.'.format(**metrics))
+    return metrics
+
+
+def checksum_verification_coverage(frequency, files_query=None):
+    """Return the ratio of files checked during the last ``frequency``.
+
+    :param frequency: A ``datetime.timedelta``.
+    :param files_query: The FileInstance query of files that should be
+        checked. (Default: all files)
+    :returns: A float between ``0`` and ``1``.
+    """
+    files = files_query or default_checksum_verification_files_query()
+    total = files.count()
+    if not total:
+        return 1.0
+    checked = files.filter(
+        FileInstance.last_check_at >= datetime.utcnow() - frequency).count()
+    return checked / float(total)
+
+
 def default_checksum_verification_files_query():
     """Return a query of valid FileInstances for checksum verficiation."""
     return FileInstance.query
@@ -71,7 +159,8 @@ def default_checksum_verification_files_query():
 def schedule_checksum_verification(frequency=None, batch_interval=None,
                                    max_count=None, max_size=None,
                                    files_query=None,
-                                   checksum_kwargs=None):
+                                   checksum_kwargs=None, concurrency=None,
+                                   max_bytes_per_second=None, windows=None):
     """Schedule a batch of files for checksum verification.
 
     The purpose of this task is to be periodically called through `celerybeat`,
@@ -97,8 +186,26 @@ def schedule_checksum_verification(frequency=None, batch_interval=None,
     :param str files_query: Import path for a function returning a
         FileInstance query for files that should be checked.
     :param dict checksum_kwargs: Passed to ``FileInstance.verify_checksum``.
+    :param int concurrency: Number of parallel :func:`verify_checksums`
+        tasks the batch is split in. (Default:
+        ``FILES_REST_CHECKSUM_VERIFICATION_CONCURRENCY``)
+    :param int max_bytes_per_second: Global read budget shared by the
+        parallel tasks. (Default:
+        ``FILES_REST_CHECKSUM_VERIFICATION_MAX_BYTES_PER_SECOND``)
+    :param list windows: Hour windows during which checks may run. (Default:
+        ``FILES_REST_CHECKSUM_VERIFICATION_WINDOWS``)
     """
     assert max_count is not None or max_size is not None
+    config = current_app.config
+    if windows is None:
+        windows = config.get('FILES_REST_CHECKSUM_VERIFICATION_WINDOWS')
+    if not in_time_windows(windows):
+        return
+    concurrency = concurrency or config.get(
+        'FILES_REST_CHECKSUM_VERIFICATION_CONCURRENCY', 1)
+    if max_bytes_per_second is None:
+        max_bytes_per_second = config.get(
+            'FILES_REST_CHECKSUM_VERIFICATION_MAX_BYTES_PER_SECOND')
     frequency = timedelta(**frequency) if frequency else timedelta(days=30)
     if batch_interval:
         batch_interval = timedelta(**batch_interval)
@@ -113,9 +220,11 @@ def schedule_checksum_verification(frequency=None, batch_interval=None,
     total_batches = int(
         frequency.total_seconds() / batch_interval.total_seconds())
 
-    files = obj_or_import_string(
-        files_query, default=default_checksum_verification_files_query)()
-    files = files.order_by(
+    files_query = obj_or_import_string(
+        files_query, default=default_checksum_verification_files_query)
+    logger.info(u'Checksum verification coverage over {0}: {1:.2%}'.format(
+        frequency, checksum_verification_coverage(frequency, files_query())))
+    files = files_query().order_by(
         sa.func.coalesce(FileInstance.last_check_at, date.min))
 
     if max_count is not None:
@@ -151,11 +260,17 @@ def schedule_checksum_verification(frequency=None, batch_interval=None,
         total_size += f.size
         if max_size and max_size <= total_size:
             break
+    if not scheduled_file_ids:
+        return
+    concurrency = min(concurrency, len(scheduled_file_ids))
+    task_budget = (int(max_bytes_per_second / concurrency)
+                   if max_bytes_per_second else None)
     group(
-        verify_checksum.s(
-            file_id, pessimistic=True, throws=False,
+        verify_checksums.s(
+            scheduled_file_ids[i::concurrency],
+            max_bytes_per_second=task_budget, windows=windows,
             checksum_kwargs=(checksum_kwargs or {}))
-        for file_id in scheduled_file_ids
+        for i in range(concurrency)
     ).apply_async()
 
 
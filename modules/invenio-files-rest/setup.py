@@ -58,6 +58,7 @@ install_requires = [
     'Flask>=0.11.1',
     'fs>=0.5.4,<2.0',
     'invenio-rest[cors]>=1.1.0',
+    'requests>=2.18.0',
     'simplejson>=3.0.0',
     'SQLAlchemy-Utils>=0.31.0',
     'WTForms>=2.0',
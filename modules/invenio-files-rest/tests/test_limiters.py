@@ -10,9 +10,12 @@
 
 from __future__ import absolute_import, print_function
 
+from datetime import datetime
+
 import pytest
 
-from invenio_files_rest.limiters import FileSizeLimit
+from invenio_files_rest.limiters import BandwidthLimit, FileSizeLimit, \
+    in_time_windows
 
 
 def test_file_size_limit_comparisons():
@@ -33,3 +36,35 @@ def test_file_size_limit_comparisons():
         bigger < 90.25
     with pytest.raises(NotImplementedError):
         bigger == 90.25
+
+
+def test_bandwidth_limit():
+    """Test BandwidthLimit throttling."""
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limit = BandwidthLimit(100, clock=lambda: now[0], sleep=sleep)
+    limit.consume(50)
+    assert sleeps == [0.5]
+    now[0] += 2
+    limit.consume(50)
+    assert sleeps == [0.5]
+    assert limit.consumed == 100
+
+    unlimited = BandwidthLimit(None, clock=lambda: now[0], sleep=sleep)
+    unlimited.consume(10 ** 9)
+    assert sleeps == [0.5]
+
+
+def test_in_time_windows():
+    """Test hour windows."""
+    assert in_time_windows([])
+    assert in_time_windows([(1, 5)], now=datetime(2020, 1, 1, 3))
+    assert not in_time_windows([(1, 5)], now=datetime(2020, 1, 1, 5))
+    assert in_time_windows([(22, 6)], now=datetime(2020, 1, 1, 23))
+    assert in_time_windows([(22, 6)], now=datetime(2020, 1, 1, 2))
+    assert not in_time_windows([(22, 6)], now=datetime(2020, 1, 1, 12))
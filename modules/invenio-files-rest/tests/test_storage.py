@@ -16,6 +16,7 @@ import os
 from os.path import dirname, exists, getsize, join
 
 import pytest
+import requests
 from fs.errors import DirectoryNotEmptyError, ResourceNotFoundError
 from mock import patch
 from six import BytesIO
@@ -329,6 +330,42 @@ def test_pyfs_copy(pyfs, dummy_location):
     assert fp.read() == b'otherdata'
 
 
+def test_pyfs_read_text(app, pyfs):
+    """Test reading the text of a file for indexing."""
+    pyfs.save(BytesIO(b'somedata' * 10))
+
+    assert pyfs.read_text({}, 10) is None
+    assert pyfs.read_text({'mimetype': 'text/plain'}, 10) == 'somedataso'
+    assert pyfs.read_text({'mimetype': 'application/pdf'}, 10) is None
+
+    app.config['FILES_REST_TEXT_EXTRACTION_URL'] = 'http://localhost/tika'
+    retry_at = [0]
+    with patch('invenio_files_rest.storage.pyfs.requests.put') as put, \
+            patch('invenio_files_rest.storage.pyfs._text_extraction_retry_at',
+                  retry_at):
+        put.return_value.iter_content.return_value = [b'extracted', b'text']
+        assert pyfs.read_text({'mimetype': 'application/pdf'}, 12) == \
+            'extractedtex'
+        assert put.call_args[0][0] == 'http://localhost/tika'
+        assert put.call_args[1]['stream'] is True
+
+        # the server is unavailable: fall back and stop calling it
+        put.return_value.raise_for_status.side_effect = \
+            requests.RequestException()
+        assert pyfs.read_text({'mimetype': 'application/pdf'}, 12) is None
+        put.reset_mock()
+        assert pyfs.read_text({'mimetype': 'application/pdf'}, 12) is None
+        assert not put.called
+        assert pyfs.read_text({'mimetype': 'text/plain'}, 10) == \
+            'somedataso'
+
+        # the retry period is over
+        retry_at[0] = 0
+        put.return_value.raise_for_status.side_effect = None
+        assert pyfs.read_text({'mimetype': 'application/pdf'}, 12) == \
+            'extractedtex'
+
+
 def test_non_unicode_filename(app, pyfs):
     """Test sending the non-unicode filename in the header."""
     data = b'HelloWorld'
@@ -20,7 +20,7 @@ from six import BytesIO
 
 from invenio_files_rest.models import Bucket, FileInstance, ObjectVersion
 from invenio_files_rest.tasks import migrate_file, remove_file_data, \
-    schedule_checksum_verification, verify_checksum
+    schedule_checksum_verification, verify_checksum, verify_checksums
 
 
 def test_verify_checksum(app, db, dummy_location):
@@ -107,6 +107,71 @@ def test_schedule_checksum_verification(app, db, dummy_location):
     assert checked_files() == 21
 
 
+def test_verify_checksums(app, db, dummy_location):
+    """Test batched checksum verification."""
+    b1 = Bucket.create()
+    objects = [ObjectVersion.create(b1, str(i), stream=BytesIO(b'tests'))
+               for i in range(3)]
+    db.session.commit()
+    objects[0].file.uri = 'invalid'
+    db.session.commit()
+    file_ids = [str(o.file_id) for o in objects]
+
+    metrics = verify_checksums(file_ids, max_bytes_per_second=10 ** 6)
+    assert metrics['files'] == 3
+    assert metrics['failed'] == 1
+    assert metrics['bytes'] == 10
+
+    assert FileInstance.query.get(objects[0].file_id).last_check is None
+    for o in objects[1:]:
+        f = FileInstance.query.get(o.file_id)
+        assert f.last_check is True
+        assert f.last_check_at
+
+    # skipped files keep their previous result
+    last_check_at = FileInstance.query.get(objects[1].file_id).last_check_at
+    with patch('invenio_files_rest.tasks.in_time_windows',
+               return_value=False):
+        metrics = verify_checksums(file_ids[1:])
+    assert metrics['skipped'] == 2
+    f = FileInstance.query.get(objects[1].file_id)
+    assert f.last_check is True
+    assert f.last_check_at == last_check_at
+
+    # results of the files verified before an interruption are kept
+    verified = []
+
+    def fake_verify(self, **kwargs):
+        verified.append(self.id)
+        if len(verified) > 1:
+            raise Exception('worker lost')
+        self.last_check = True
+        return True
+
+    with patch('invenio_files_rest.models.FileInstance.verify_checksum',
+               autospec=True, side_effect=fake_verify):
+        with pytest.raises(Exception):
+            verify_checksums(file_ids[1:])
+    db.session.rollback()
+    first, second = verified
+    assert FileInstance.query.get(first).last_check is True
+    assert FileInstance.query.get(second).last_check is None
+
+
+def test_schedule_checksum_verification_windows(app, db, dummy_location):
+    """Test that scheduling outside the allowed windows does nothing."""
+    b1 = Bucket.create()
+    ObjectVersion.create(b1, 'a', stream=BytesIO(b'tests'))
+    db.session.commit()
+
+    with patch('invenio_files_rest.tasks.in_time_windows',
+               return_value=False):
+        schedule_checksum_verification.s(
+            frequency={'minutes': 20}, batch_interval={'minutes': 1}
+        ).apply(kwargs={'max_count': 0})
+    assert FileInstance.query.one().last_check_at is None
+
+
 def test_migrate_file(app, db, dummy_location, extra_location, bucket,
                       objects):
     """Test file migration."""
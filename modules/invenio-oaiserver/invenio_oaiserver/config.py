@@ -214,3 +214,16 @@ OAISERVER_MESSAGE_NO_RECORDS_MATCH = "The combination of the values of the " \
 
 OAISERVER_ES_MAX_CLAUSE_COUNT = 1024
 """The number of clauses a Lucene BooleanQuery can have."""
+
+OAISERVER_METADATA_CACHE_KEY = \
+    'oaiserver:metadata:{record_id}:{revision}:{prefix}:{mapping}:{root}'
+"""Cache key of the serialized metadata of a record revision."""
+
+OAISERVER_METADATA_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+"""Lifetime in seconds of the serialized metadata cache, 0 disables it."""
+
+OAISERVER_METADATA_CACHE_WARM_DELAY = 30
+"""Seconds to wait after a record update before warming its metadata."""
+
+OAISERVER_METADATA_CACHE_WARM_PREFIXES = None
+"""Metadata prefixes warmed after publish, all formats if None."""
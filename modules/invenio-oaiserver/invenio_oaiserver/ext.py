@@ -53,6 +53,12 @@ class _AppState(object):
                                                      weak=False)
         records_signals.before_record_update.connect(self.update_function,
                                                      weak=False)
+        if self.app.config['OAISERVER_METADATA_CACHE_TIMEOUT']:
+            from .receivers import warm_record_metadata_cache
+            records_signals.after_record_insert.connect(
+                warm_record_metadata_cache)
+            records_signals.after_record_update.connect(
+                warm_record_metadata_cache)
         if self.app.config['OAISERVER_REGISTER_SET_SIGNALS']:
             self.register_signals_oaiset()
 
@@ -73,6 +79,11 @@ class _AppState(object):
                 self.update_function)
             records_signals.before_record_update.disconnect(
                 self.update_function)
+        from .receivers import warm_record_metadata_cache
+        records_signals.after_record_insert.disconnect(
+            warm_record_metadata_cache)
+        records_signals.after_record_update.disconnect(
+            warm_record_metadata_cache)
         self.unregister_signals_oaiset()
 
     def unregister_signals_oaiset(self):
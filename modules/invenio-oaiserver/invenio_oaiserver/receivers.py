@@ -12,8 +12,11 @@ from __future__ import absolute_import, print_function
 
 from time import sleep
 
+from flask import current_app
+from invenio_cache import current_cache
+
 from .percolator import _delete_percolator, _new_percolator, get_record_sets
-from .tasks import update_affected_records
+from .tasks import update_affected_records, warm_metadata_cache
 
 
 class OAIServerUpdater(object):
@@ -33,6 +36,29 @@ class OAIServerUpdater(object):
                 })
 
 
+def warm_record_metadata_cache(sender, record, **kwargs):
+    """Warm the serialized metadata cache after a record is published.
+
+    Updates arriving while a warm-up is pending are covered by it, since
+    the task serializes the latest revision of the record.
+
+    :param record: The record data.
+    """
+    if not record.get('_oai', {}).get('id') or \
+            record.get('_deposit', {}).get('status') != 'published':
+        return
+    delay = current_app.config['OAISERVER_METADATA_CACHE_WARM_DELAY']
+    try:
+        if current_cache.add('oaiserver:metadata:warm:{}'.format(record.id),
+                             True, timeout=delay):
+            warm_metadata_cache.apply_async(args=(str(record.id), ),
+                                            countdown=delay)
+    except Exception as ex:
+        # a missed warm-up only means the first harvest serializes it
+        current_app.logger.warning(
+            'Cannot warm metadata of {}: {}'.format(record.id, ex))
+
+
 def after_insert_oai_set(mapper, connection, target):
     """Update records on OAISet insertion."""
     _new_percolator(spec=target.spec, search_pattern=target.search_pattern)
@@ -35,8 +35,9 @@ from .provider import OAIIDProvider
 from .query import get_records
 from .resumption_token import serialize
 from .utils import HARVEST_PRIVATE, OUTPUT_HARVEST, PRIVATE_INDEX, \
-    datetime_to_datestamp, get_index_state, handle_license_free, \
-    is_output_harvest, serializer
+    datetime_to_datestamp, get_cached_metadata, get_index_state, \
+    get_metadata_cache_key, handle_license_free, is_output_harvest, \
+    serializer, set_cached_metadata
 
 NS_OAIPMH = 'http://www.openarchives.org/OAI/2.0/'
 NS_OAIPMH_XSD = 'http://www.openarchives.org/OAI/2.0/OAI-PMH.xsd'
@@ -451,18 +452,41 @@ def getrecord(**kwargs):
     e_metadata = SubElement(e_record,
                             etree.QName(NS_OAIPMH, 'metadata'))
 
-    etree_record = pickle.loads(pickle.dumps(record, -1))
+    root = get_record_metadata(pid_object, record,
+                               kwargs['metadataPrefix'], record_dumper)
+
+    e_metadata.append(root)
+    return e_tree
 
+
+def get_record_metadata(pid, record, metadata_prefix, record_dumper=None):
+    """Serialize the metadata of a record for the metadataPrefix.
+
+    The serialized metadata is cached per record revision, so harvesting
+    the same record again does not convert it again.
+
+    :param pid: The OAI :class:`invenio_pidstore.models.PersistentIdentifier`.
+    :param record: The :class:`weko_deposit.api.WekoRecord` instance.
+    :param metadata_prefix: metadataPrefix of the request.
+    :param record_dumper: Serializer of the metadataPrefix.
+    :returns: A LXML Element instance.
+    """
+    cache_key = get_metadata_cache_key(record, metadata_prefix)
+    root = get_cached_metadata(cache_key)
+    if root is not None:
+        return root
+
+    if record_dumper is None:
+        record_dumper = serializer(metadata_prefix)
+    etree_record = pickle.loads(pickle.dumps(record, -1))
     if not etree_record.get('system_identifier_doi', None):
         etree_record['system_identifier_doi'] = get_identifier(record)
 
     # Merge licensetype and licensefree
     etree_record = handle_license_free(etree_record)
-
-    root = record_dumper(pid_object, {'_source': etree_record})
-
-    e_metadata.append(root)
-    return e_tree
+    root = record_dumper(pid, {'_source': etree_record})
+    set_cached_metadata(cache_key, root)
+    return root
 
 
 def listidentifiers(**kwargs):
@@ -644,15 +668,8 @@ def listrecords(**kwargs):
                 )
                 e_metadata = SubElement(e_record, etree.QName(NS_OAIPMH,
                                                               'metadata'))
-                etree_record = pickle.loads(pickle.dumps(record, -1))
-                if not etree_record.get('system_identifier_doi', None):
-                    etree_record['system_identifier_doi'] = get_identifier(
-                        record)
-
-                # Merge licensetype and licensefree
-                etree_record = handle_license_free(etree_record)
-                e_metadata.append(record_dumper(
-                    pid, {'_source': etree_record}))
+                e_metadata.append(get_record_metadata(
+                    pid, record, kwargs['metadataPrefix'], record_dumper))
 
         except PIDDoesNotExistError:
             current_app.logger.error(
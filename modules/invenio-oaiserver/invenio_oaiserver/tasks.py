@@ -72,3 +72,41 @@ def update_affected_records(spec=None, search_pattern=None):
         update_records_sets.s(list(filter(None, chunk)))
         for chunk in zip_longest(*[iter(record_ids)] * chunk_size)
     )()
+
+
+@shared_task(ignore_result=True)
+def warm_metadata_cache(record_uuid, metadata_prefixes=None):
+    """Serialize the OAI-PMH metadata of a record into the cache.
+
+    The metadata is serialized in a request for ``THEME_SITEURL``, so the
+    cache keys match the requests of harvesters to the site.
+
+    :param record_uuid: The record UUID.
+    :param metadata_prefixes: The metadataPrefixes to serialize, all of the
+        configured formats if None.
+    """
+    from weko_deposit.api import WekoRecord
+    from weko_schema_ui.schema import get_oai_metadata_formats
+
+    from .provider import OAIIDProvider
+    from .response import get_record_metadata, set_identifier
+
+    record = WekoRecord.get_record(record_uuid)
+    oai_id = record.get('_oai', {}).get('id')
+    if not oai_id:
+        return
+    pid_object = OAIIDProvider.get(pid_value=oai_id).pid
+    set_identifier(record, record)
+
+    metadata_prefixes = metadata_prefixes or current_app.config[
+        'OAISERVER_METADATA_CACHE_WARM_PREFIXES'] or \
+        list(get_oai_metadata_formats(current_app))
+    with current_app.test_request_context(
+            base_url=current_app.config.get('THEME_SITEURL')):
+        for metadata_prefix in metadata_prefixes:
+            try:
+                get_record_metadata(pid_object, record, metadata_prefix)
+            except Exception as ex:
+                current_app.logger.warning(
+                    'Cannot warm {} metadata of {}: {}'.format(
+                        metadata_prefix, record_uuid, ex))
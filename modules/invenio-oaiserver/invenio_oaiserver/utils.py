@@ -10,15 +10,19 @@
 
 from __future__ import absolute_import, print_function
 
+import hashlib
+import zlib
 from datetime import datetime
 from functools import partial
 
-from flask import current_app
+from flask import current_app, request
+from invenio_cache import current_cache
 from lxml import etree
 from lxml.builder import E
 from lxml.etree import Element
 from weko_index_tree.api import Indexes
-from weko_schema_ui.schema import get_oai_metadata_formats
+from weko_schema_ui.schema import get_oai_metadata_formats, \
+    get_schema_plan_revision
 from werkzeug.utils import import_string
 
 try:
@@ -210,6 +214,63 @@ def handle_license_free(record_metadata):
     return record_metadata
 
 
+def get_metadata_cache_key(record, metadata_prefix):
+    """Get the cache key of the serialized metadata of a record.
+
+    The key changes with the record revision, the schema and item type
+    mapping revision and the site root used for the identifier URLs.
+
+    :param record: The :class:`weko_deposit.api.WekoRecord` instance.
+    :param metadata_prefix: metadataPrefix of the request.
+    :returns: The cache key.
+    """
+    schema_name = metadata_prefix if metadata_prefix.endswith('_mapping') \
+        else metadata_prefix + '_mapping'
+    mapping_revision = get_schema_plan_revision(
+        schema_name, record.get('item_type_id'))
+    return current_app.config['OAISERVER_METADATA_CACHE_KEY'].format(
+        record_id=record.id,
+        revision=record.revision_id,
+        prefix=metadata_prefix,
+        mapping='-'.join(str(v) for v in mapping_revision),
+        root=hashlib.md5(request.url_root.encode('utf-8')).hexdigest())
+
+
+def get_cached_metadata(cache_key):
+    """Get the serialized metadata from the cache.
+
+    :param cache_key: Key made by :func:`get_metadata_cache_key`.
+    :returns: A LXML Element instance or None.
+    """
+    if not current_app.config['OAISERVER_METADATA_CACHE_TIMEOUT']:
+        return None
+    try:
+        data = current_cache.get(cache_key)
+        if data:
+            return etree.fromstring(zlib.decompress(data))
+    except Exception as ex:
+        current_app.logger.warning(
+            'Cannot read cached metadata {}: {}'.format(cache_key, ex))
+    return None
+
+
+def set_cached_metadata(cache_key, root):
+    """Store the serialized metadata compressed in the cache.
+
+    :param cache_key: Key made by :func:`get_metadata_cache_key`.
+    :param root: A LXML Element instance.
+    """
+    timeout = current_app.config['OAISERVER_METADATA_CACHE_TIMEOUT']
+    if not timeout:
+        return
+    try:
+        current_cache.set(cache_key, zlib.compress(etree.tostring(root)),
+                          timeout=timeout)
+    except Exception as ex:
+        current_app.logger.warning(
+            'Cannot cache metadata {}: {}'.format(cache_key, ex))
+
+
 def get_index_state():
     index_state = {}
     ids = Indexes.get_all_indexes()
@@ -5,7 +5,8 @@ from invenio_oaiserver.receivers import (
     OAIServerUpdater,
     after_update_oai_set,
     after_delete_oai_set,
-    after_insert_oai_set
+    after_insert_oai_set,
+    warm_record_metadata_cache
 )
 # .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_receivers.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
 
@@ -74,4 +75,38 @@ def test_after_delete_oai_set(app,db,mocker):
             return "test_spec"
     mocker.patch("invenio_oaiserver.receivers._delete_percolator")
     mocker.patch("invenio_oaiserver.receivers.update_affected_records.delay")
-    after_delete_oai_set(None,None,Target())
\ No newline at end of file
+    after_delete_oai_set(None,None,Target())
+
+# def warm_record_metadata_cache(sender, record, **kwargs):
+# .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_receivers.py::test_warm_record_metadata_cache -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
+def test_warm_record_metadata_cache(app, mocker):
+    class MockRecord(dict):
+        id = "3f1b7e3e-0000-0000-0000-000000000001"
+    mock_cache = mocker.patch("invenio_oaiserver.receivers.current_cache")
+    mock_cache.add.return_value = True
+    mock_task = mocker.patch(
+        "invenio_oaiserver.receivers.warm_metadata_cache.apply_async")
+
+    # not published
+    warm_record_metadata_cache(None, MockRecord(
+        _oai={"id": "oai:test:1"}, _deposit={"status": "draft"}))
+    warm_record_metadata_cache(None, MockRecord(
+        _deposit={"status": "published"}))
+    mock_task.assert_not_called()
+
+    record = MockRecord(_oai={"id": "oai:test:1"},
+                        _deposit={"status": "published"})
+    warm_record_metadata_cache(None, record)
+    mock_task.assert_called_once_with(
+        args=("3f1b7e3e-0000-0000-0000-000000000001", ), countdown=30)
+
+    # already pending
+    mock_task.reset_mock()
+    mock_cache.add.return_value = False
+    warm_record_metadata_cache(None, record)
+    mock_task.assert_not_called()
+
+    # cache error
+    mock_cache.add.side_effect = Exception("cache error")
+    warm_record_metadata_cache(None, record)
+    mock_task.assert_not_called()
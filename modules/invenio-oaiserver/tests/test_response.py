@@ -10,7 +10,7 @@
 import pytest
 import uuid
 from datetime import timedelta, datetime
-from mock import patch
+from mock import patch, MagicMock
 from flask import current_app
 from flask_babelex import Babel
 from werkzeug.utils import cached_property
@@ -51,7 +51,8 @@ from invenio_oaiserver.response import (
     create_files_url,
     get_identifier,
     header,
-    identify
+    identify,
+    get_record_metadata
 )
 
 
@@ -2119,3 +2120,32 @@ def test_issue34851_listidentifiers(es_app, records, item_type, mock_execute,db,
             res=listidentifiers(**kwargs)
             assert res.xpath("/x:OAI-PMH/x:ListIdentifiers/x:header[1]/x:datestamp/text()",namespaces=NAMESPACES) == [records[1][2].updated.replace(microsecond=0).isoformat()+"Z"]
             assert res.xpath("/x:OAI-PMH/x:ListIdentifiers/x:header[2]/x:datestamp/text()",namespaces=NAMESPACES) == [records[2][2].updated.replace(microsecond=0).isoformat()+"Z"]
+
+
+# def get_record_metadata(pid, record, metadata_prefix, record_dumper=None):
+# .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_response.py::test_get_record_metadata -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
+def test_get_record_metadata(app, mocker):
+    root = etree.Element("root")
+    record = {"system_identifier_doi": {"attribute_name": "Identifier"}}
+    record_dumper = MagicMock(return_value=root)
+    mocker.patch("invenio_oaiserver.response.get_metadata_cache_key",
+                 return_value="key")
+    mock_get = mocker.patch("invenio_oaiserver.response.get_cached_metadata",
+                            return_value=None)
+    mock_set = mocker.patch("invenio_oaiserver.response.set_cached_metadata")
+
+    # cache miss
+    assert get_record_metadata("pid", record, "jpcoar_1.0",
+                               record_dumper) is root
+    record_dumper.assert_called_once_with("pid", {"_source": record})
+    mock_set.assert_called_once_with("key", root)
+
+    # cache hit
+    cached = etree.Element("cached")
+    mock_get.return_value = cached
+    record_dumper.reset_mock()
+    mock_set.reset_mock()
+    assert get_record_metadata("pid", record, "jpcoar_1.0",
+                               record_dumper) is cached
+    record_dumper.assert_not_called()
+    mock_set.assert_not_called()
@@ -4,7 +4,7 @@ from flask import current_app
 from invenio_records.models import RecordMetadata
 from invenio_oaiserver.models import OAISet
 
-from invenio_oaiserver.tasks import _records_commit,update_records_sets, update_affected_records
+from invenio_oaiserver.tasks import _records_commit,update_records_sets, update_affected_records, warm_metadata_cache
 # .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_tasks.py -vv -s --cov-branch --cov-report=term --cov-report=html --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
 
 
@@ -57,4 +57,61 @@ def test_update_affected_records(app,db,without_oaiset_signals,mocker):
     
     db.session.add(oai)
     db.session.commit()
-    update_affected_records.delay(oai.spec,oai.search_pattern)
\ No newline at end of file
+    update_affected_records.delay(oai.spec,oai.search_pattern)
+
+# def warm_metadata_cache(record_uuid, metadata_prefixes=None):
+# .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_tasks.py::test_warm_metadata_cache -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
+def test_warm_metadata_cache(app, mocker):
+    record = {"_oai": {"id": "oai:test:1"}}
+    mocker.patch("weko_deposit.api.WekoRecord.get_record", return_value=record)
+    mock_pid = mocker.patch("invenio_oaiserver.provider.OAIIDProvider.get")
+    mocker.patch("invenio_oaiserver.response.set_identifier")
+    mock_metadata = mocker.patch(
+        "invenio_oaiserver.response.get_record_metadata",
+        side_effect=[None, Exception("serialize error")])
+
+    warm_metadata_cache("uuid", ["jpcoar_1.0", "ddi"])
+    assert mock_metadata.call_count == 2
+    mock_metadata.assert_any_call(
+        mock_pid.return_value.pid, record, "jpcoar_1.0")
+
+    # all configured formats
+    mock_metadata.reset_mock(side_effect=True)
+    warm_metadata_cache("uuid")
+    mock_metadata.assert_called_once_with(
+        mock_pid.return_value.pid, record, "jpcoar_1.0")
+
+    # not an OAI record
+    mock_metadata.reset_mock()
+    record.pop("_oai")
+    warm_metadata_cache("uuid")
+    mock_metadata.assert_not_called()
+
+
+# .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_tasks.py::test_warm_metadata_cache_key -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
+def test_warm_metadata_cache_key(app, mocker):
+    from invenio_oaiserver.utils import get_metadata_cache_key
+
+    class MockRecord(dict):
+        id = "3f1b7e3e-0000-0000-0000-000000000001"
+        revision_id = 2
+    record = MockRecord({"_oai": {"id": "oai:test:1"}, "item_type_id": "15"})
+    app.config["THEME_SITEURL"] = "https://weko3.example.org"
+    mocker.patch("weko_deposit.api.WekoRecord.get_record", return_value=record)
+    mocker.patch("invenio_oaiserver.provider.OAIIDProvider.get")
+    mocker.patch("invenio_oaiserver.response.set_identifier")
+    mocker.patch("invenio_oaiserver.utils.get_schema_plan_revision",
+                 return_value=(1, 4, 10, 3))
+    warmed_keys = []
+    mocker.patch(
+        "invenio_oaiserver.response.get_record_metadata",
+        side_effect=lambda pid, record, prefix: warmed_keys.append(
+            get_metadata_cache_key(record, prefix)))
+
+    warm_metadata_cache("uuid", ["jpcoar_1.0"])
+
+    # a harvester request to the site
+    with app.test_request_context(
+            "/oai?verb=GetRecord&metadataPrefix=jpcoar_1.0",
+            base_url="https://weko3.example.org"):
+        assert warmed_keys == [get_metadata_cache_key(record, "jpcoar_1.0")]
@@ -15,7 +15,10 @@ from invenio_oaiserver.utils import (
     eprints_description,
     handle_license_free,
     get_index_state,
-    is_output_harvest
+    is_output_harvest,
+    get_metadata_cache_key,
+    get_cached_metadata,
+    set_cached_metadata
 )
 
 from tests.helpers import create_record2
@@ -191,4 +194,71 @@ def test_is_output_harvest(app):
     }
     path_list = ["1","2","1000"]
     result = is_output_harvest(path_list,index_state)
-    assert result == 3
\ No newline at end of file
+    assert result == 3
+
+# def get_metadata_cache_key(record, metadata_prefix):
+# .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_utils.py::test_get_metadata_cache_key -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
+def test_get_metadata_cache_key(app, mocker):
+    class MockRecord(dict):
+        id = "3f1b7e3e-0000-0000-0000-000000000001"
+        revision_id = 2
+    record = MockRecord(item_type_id="15")
+    mock_revision = mocker.patch(
+        "invenio_oaiserver.utils.get_schema_plan_revision",
+        return_value=(1, 4, 10, 3))
+    with app.test_request_context():
+        key = get_metadata_cache_key(record, "jpcoar_1.0")
+        mock_revision.assert_called_once_with("jpcoar_1.0_mapping", "15")
+        assert key.startswith(
+            "oaiserver:metadata:3f1b7e3e-0000-0000-0000-000000000001:2:"
+            "jpcoar_1.0:1-4-10-3:")
+
+        # a new record revision or mapping revision is a new key
+        record.revision_id = 3
+        assert get_metadata_cache_key(record, "jpcoar_1.0") != key
+        record.revision_id = 2
+        mock_revision.return_value = (1, 4, 11, 3)
+        assert get_metadata_cache_key(record, "jpcoar_1.0") != key
+
+        mock_revision.reset_mock()
+        get_metadata_cache_key(record, "ddi_mapping")
+        mock_revision.assert_called_once_with("ddi_mapping", "15")
+
+    with app.test_request_context(base_url="http://other.example.org/"):
+        mock_revision.return_value = (1, 4, 10, 3)
+        assert get_metadata_cache_key(record, "jpcoar_1.0") != key
+
+
+# def get_cached_metadata(cache_key):
+# def set_cached_metadata(cache_key, root):
+# .tox/c1/bin/pytest --cov=invenio_oaiserver tests/test_utils.py::test_cached_metadata -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-oaiserver/.tox/c1/tmp
+def test_cached_metadata(app, mocker):
+    store = {}
+
+    class MockCache:
+        def get(self, key):
+            return store.get(key)
+
+        def set(self, key, value, timeout=None):
+            store[key] = value
+    mocker.patch("invenio_oaiserver.utils.current_cache", MockCache())
+    root = etree.fromstring(
+        '<jpcoar:jpcoar xmlns:jpcoar="https://github.com/JPCOAR/schema/'
+        'blob/master/1.0/"><jpcoar:title>title</jpcoar:title>'
+        '</jpcoar:jpcoar>')
+
+    assert get_cached_metadata("key") is None
+    set_cached_metadata("key", root)
+    assert store["key"] != etree.tostring(root)
+    assert etree.tostring(get_cached_metadata("key")) == etree.tostring(root)
+
+    # disabled
+    current_app.config.update(OAISERVER_METADATA_CACHE_TIMEOUT=0)
+    set_cached_metadata("key2", root)
+    assert "key2" not in store
+    assert get_cached_metadata("key") is None
+    current_app.config.update(OAISERVER_METADATA_CACHE_TIMEOUT=60)
+
+    # broken cache
+    store["key"] = b"broken"
+    assert get_cached_metadata("key") is None
@@ -81,6 +81,20 @@ class PreviewFile(object):
             filename=self.file.key,
             allow_aggs=self.allow_aggs)
 
+    @property
+    def tree_uri(self):
+        """Get the URI serving one directory level of an archive.
+
+        ..  note::
+
+            The URI generation assumes that the view
+            ``invenio_records_ui.<pid_type>_preview_zip_tree`` exists.
+        """
+        return url_for(
+            '.{0}_preview_zip_tree'.format(self.pid.pid_type),
+            pid_value=self.pid.pid_value,
+            filename=self.file.key)
+
     def is_local(self):
         """Check if file is local."""
         return True
@@ -97,6 +97,13 @@ fullscreen_js = Bundle(
 )
 """JavaScript bundle for ZIP file previewer."""
 
+zip_tree_js = Bundle(
+    "js/zip/tree.js",
+    filters='uglifyjs',
+    output='gen/zip_tree.%(version)s.js',
+)
+"""JavaScript bundle loading ZIP directory levels on demand."""
+
 prism_js = Bundle(
     NpmBundle(
         npm={
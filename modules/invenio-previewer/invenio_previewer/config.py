@@ -40,7 +40,16 @@ PREVIEWER_MAX_IMAGE_SIZE_BYTES = 0.5 * 1024 * 1024
 """Maximum file size in bytes for image files."""
 
 PREVIEWER_ZIP_MAX_FILES = 1000
-"""Max number of files showed in the ZIP previewer."""
+"""Max number of files showed per directory level in the ZIP previewer."""
+
+PREVIEWER_ZIP_INDEX_MAX_FILES = 1000000
+"""Max number of ZIP entries kept in the cached directory index."""
+
+PREVIEWER_ZIP_INDEX_CACHE_TIMEOUT = 24 * 60 * 60
+"""Timeout in seconds of the cached ZIP directory index."""
+
+PREVIEWER_ZIP_INDEX_CACHE_CHUNK_SIZE = 1000
+"""Number of directory levels of the ZIP index written to the cache at once."""
 
 PREVIEWER_PREFERENCE = [
     'iiif_image',
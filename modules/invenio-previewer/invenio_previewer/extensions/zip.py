@@ -26,11 +26,14 @@
 
 from __future__ import absolute_import, print_function
 
+import hashlib
+import heapq
 import os
 import zipfile
 
 import cchardet as chardet
 from flask import current_app, render_template
+from invenio_cache import current_cache
 from six import binary_type
 
 from .._compat import text_type
@@ -83,6 +86,156 @@ def make_tree(file):
     return tree, False, None
 
 
+def _index_key(file, path=None):
+    """Get the cache key of the ZIP index of a file.
+
+    :param file: The :class:`invenio_previewer.api.PreviewFile` instance.
+    :param path: Directory path inside the archive, or ``None`` for the key
+        holding the index status.
+    """
+    key = 'previewer_zip_index::{0}'.format(file.file.file_id)
+    if path is None:
+        return key
+    return '{0}::{1}'.format(
+        key, hashlib.md5(path.encode('utf-8')).hexdigest())
+
+
+def make_index(file):
+    """Create a flat directory index of a ZIP archive.
+
+    Only the central directory is read. Every directory level is stored as
+    a sorted list of ``[name, type, size]`` entries keyed by its path, so a
+    single level can be served without building the nested tree. Only the
+    first ``PREVIEWER_ZIP_MAX_FILES + 1`` entries of a level can be shown,
+    so larger levels are pruned while the archive is read.
+
+    :param file: The :class:`invenio_previewer.api.PreviewFile` instance.
+    :returns: A tuple ``(levels, limit_reached, error)``.
+    """
+    max_files_count = current_app.config.get(
+        'PREVIEWER_ZIP_INDEX_MAX_FILES', 1000000)
+    level_size = current_app.config.get('PREVIEWER_ZIP_MAX_FILES', 1000) + 1
+    levels = {'': {}}
+
+    def add(parent, name, type_, size):
+        entries = levels.setdefault(parent, {})
+        if name not in entries or type_ == 'folder':
+            entries[name] = [name, type_, size]
+            if len(entries) > 2 * level_size:
+                levels[parent] = {
+                    entry[0]: entry
+                    for entry in heapq.nsmallest(level_size, entries.values())
+                }
+
+    limit_reached, error = False, None
+    try:
+        with file.open() as fp:
+            zf = zipfile.ZipFile(fp)
+            # Detect filenames encoding.
+            sample = ' '.join(zf.namelist()[:level_size - 1])
+            if not isinstance(sample, binary_type):
+                sample = sample.encode('utf-16be')
+            encoding = chardet.detect(sample).get('encoding') or 'utf-8'
+            for i, info in enumerate(zf.infolist()):
+                if i >= max_files_count:
+                    limit_reached = True
+                    break
+                name = info.filename
+                if not isinstance(name, text_type):
+                    name = name.decode(encoding)
+                comps = [c for c in name.split('/') if c]
+                for depth in range(len(comps)):
+                    parent = '/'.join(comps[:depth])
+                    is_leaf = depth == len(comps) - 1 and \
+                        not name.endswith('/')
+                    add(parent, comps[depth],
+                        'item' if is_leaf else 'folder',
+                        info.file_size if is_leaf else 0)
+    except (zipfile.LargeZipFile):
+        error = 'Zipfile is too large to be previewed.'
+    except Exception as e:
+        current_app.logger.warning(str(e), exc_info=True)
+        error = 'Zipfile is not previewable.'
+
+    return {path: heapq.nsmallest(level_size, entries.values())
+            for path, entries in levels.items()}, limit_reached, error
+
+
+def _cache_index(file):
+    """Build the index of a ZIP archive and store it in the cache.
+
+    The levels are written in chunks of
+    ``PREVIEWER_ZIP_INDEX_CACHE_CHUNK_SIZE`` keys, then the status key.
+
+    :param file: The :class:`invenio_previewer.api.PreviewFile` instance.
+    :returns: A tuple ``(levels, status)``.
+    """
+    levels, limit_reached, error = make_index(file)
+    timeout = current_app.config.get('PREVIEWER_ZIP_INDEX_CACHE_TIMEOUT', 0)
+    chunk_size = current_app.config.get(
+        'PREVIEWER_ZIP_INDEX_CACHE_CHUNK_SIZE', 1000)
+    chunk = {}
+    for path, entries in levels.items():
+        chunk[_index_key(file, path)] = entries
+        if len(chunk) >= chunk_size:
+            current_cache.set_many(chunk, timeout=timeout)
+            chunk = {}
+    if chunk:
+        current_cache.set_many(chunk, timeout=timeout)
+    status = dict(limit_reached=limit_reached, error=error)
+    current_cache.set(_index_key(file), status, timeout=timeout)
+    return levels, status
+
+
+def _get_cached_level(file, path):
+    """Get one directory level from the cached index.
+
+    :param file: The :class:`invenio_previewer.api.PreviewFile` instance.
+    :param path: Normalized directory path inside the archive.
+    :returns: The entries of the level, an empty list if the archive has no
+        such directory, or ``None`` if the level was evicted from the cache.
+    """
+    entries = current_cache.get(_index_key(file, path))
+    if entries is not None or not path:
+        return entries
+    parent, _, name = path.rpartition('/')
+    siblings = _get_cached_level(file, parent)
+    if siblings is None or [name, 'folder', 0] in siblings:
+        return None
+    return []
+
+
+def get_tree_level(file, path=''):
+    """Get one directory level of a ZIP archive.
+
+    The index of the archive is built on first access and cached per file
+    instance, so subsequent requests only load the requested level. The
+    index is built again if the requested level was evicted from the cache.
+
+    :param file: The :class:`invenio_previewer.api.PreviewFile` instance.
+    :param path: Directory path inside the archive. (Default: root)
+    :returns: A tuple ``(children, limit_reached, error)`` where children is
+        a list of dictionaries with ``name``, ``path``, ``type`` and ``size``.
+    """
+    path = path.strip('/')
+    status = current_cache.get(_index_key(file))
+    entries = None
+    if status is not None:
+        entries = _get_cached_level(file, path)
+    if entries is None:
+        levels, status = _cache_index(file)
+        entries = levels.get(path) or []
+
+    max_files_count = current_app.config.get('PREVIEWER_ZIP_MAX_FILES', 1000)
+    limit_reached = status['limit_reached'] or len(entries) > max_files_count
+    children = [
+        dict(name=name, path='/'.join(filter(None, [path, name])),
+             type=type_, size=size)
+        for name, type_, size in entries[:max_files_count]
+    ]
+    return children, limit_reached, status['error']
+
+
 def children_to_list(node):
     """Organize children structure."""
     if node['type'] == 'item' and len(node['children']) == 0:
@@ -102,14 +255,15 @@ def can_preview(file):
 
 def preview(file):
     """Return appropriate template and pass the file and an embed flag."""
-    tree, limit_reached, error = make_tree(file)
-    list = children_to_list(tree)['children']
+    tree, limit_reached, error = get_tree_level(file)
     return render_template(
         "invenio_previewer/zip.html",
         file=file,
-        tree=list,
+        tree=tree,
+        tree_url=file.tree_uri,
         limit_reached=limit_reached,
         error=error,
-        js_bundles=current_previewer.js_bundles + ['previewer_fullscreen_js'],
+        js_bundles=current_previewer.js_bundles + [
+            'previewer_fullscreen_js', 'previewer_zip_tree_js'],
         css_bundles=current_previewer.css_bundles,
     )
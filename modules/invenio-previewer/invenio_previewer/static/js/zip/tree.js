@@ -0,0 +1,95 @@
+/*!
+ * -*- coding: utf-8 -*-
+ *
+ * This file is part of WEKO3.
+ * Copyright (C) 2017 National Institute of Informatics.
+ *
+ * WEKO3 is free software; you can redistribute it
+ * and/or modify it under the terms of the GNU General Public License as
+ * published by the Free Software Foundation; either version 2 of the
+ * License, or (at your option) any later version.
+ *
+ * WEKO3 is distributed in the hope that it will be
+ * useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with WEKO3; if not, write to the
+ * Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+ * MA 02111-1307, USA.
+ */
+
+// Load the children of a ZIP folder on first click, then toggle them.
+(function () {
+  var root = document.querySelector('ul.tree[data-tree-url]');
+  if (!root || !root.getAttribute('data-tree-url')) {
+    return;
+  }
+  var treeUrl = root.getAttribute('data-tree-url');
+
+  function formatSize(size) {
+    var units = ['Bytes', 'kB', 'MB', 'GB', 'TB'];
+    var i = 0;
+    while (size >= 1000 && i < units.length - 1) {
+      size = size / 1000;
+      i++;
+    }
+    return (i ? size.toFixed(1) : size) + ' ' + units[i];
+  }
+
+  function renderLevel(children) {
+    var ul = document.createElement('ul');
+    ul.className = 'list-unstyled';
+    children.forEach(function (child) {
+      var li = document.createElement('li');
+      var icon = document.createElement('i');
+      if (child.type === 'folder') {
+        icon.className = 'fa fa-folder';
+        var a = document.createElement('a');
+        a.className = 'zip-tree-folder';
+        a.href = '#';
+        a.setAttribute('data-path', child.path);
+        a.textContent = ' ' + child.name;
+        li.appendChild(icon);
+        li.appendChild(a);
+      } else {
+        var name = document.createElement('span');
+        var size = document.createElement('span');
+        icon.className = 'fa fa-file-o';
+        name.appendChild(icon);
+        name.appendChild(document.createTextNode(' ' + child.name));
+        size.className = 'pull-right';
+        size.textContent = formatSize(child.size);
+        li.appendChild(name);
+        li.appendChild(size);
+      }
+      ul.appendChild(li);
+    });
+    return ul;
+  }
+
+  root.addEventListener('click', function (event) {
+    var link = event.target;
+    if (!link.classList || !link.classList.contains('zip-tree-folder')) {
+      return;
+    }
+    event.preventDefault();
+    var li = link.parentNode;
+    var loaded = li.querySelector('ul');
+    if (loaded) {
+      loaded.style.display = loaded.style.display === 'none' ? '' : 'none';
+      return;
+    }
+    var url = treeUrl + (treeUrl.indexOf('?') < 0 ? '?' : '&') +
+      'path=' + encodeURIComponent(link.getAttribute('data-path'));
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', url);
+    xhr.onload = function () {
+      if (xhr.status === 200) {
+        li.appendChild(renderLevel(JSON.parse(xhr.responseText).children));
+      }
+    };
+    xhr.send();
+  });
+}());
@@ -26,11 +26,12 @@
 
 from __future__ import absolute_import, print_function
 
-from flask import Blueprint, abort, current_app, request
+from flask import Blueprint, abort, current_app, jsonify, request
 from invenio_db import db
 
 from .api import PreviewFile
 from .extensions import default
+from .extensions import zip as zip_previewer
 from .proxies import current_previewer
 
 blueprint = Blueprint(
@@ -89,6 +90,40 @@ def preview(pid, record, template=None, **kwargs):
     return default.preview(fileobj)
 
 
+def zip_tree(pid, record, template=None, **kwargs):
+    """Return one directory level of a previewed ZIP file as JSON.
+
+    The directory is given by the ``path`` query argument. Plug this method
+    into your ``RECORDS_UI_ENDPOINTS`` configuration next to :func:`preview`:
+
+    .. code-block:: python
+
+        RECORDS_UI_ENDPOINTS = dict(
+            recid_preview_zip_tree=dict(
+                # ...
+                route='/records/<pid_value>/preview_zip_tree/'
+                      '<path:filename>',
+                view_imp='invenio_previewer.views.zip_tree',
+                record_class='invenio_records_files.api:Record',
+            )
+        )
+    """
+    fileobj = current_previewer.record_file_factory(
+        pid, record, request.view_args.get(
+            'filename', request.args.get('filename', type=str))
+    )
+    if not fileobj:
+        abort(404)
+    fileobj = PreviewFile(pid, record, fileobj)
+    if not zip_previewer.can_preview(fileobj):
+        abort(404)
+
+    children, limit_reached, error = zip_previewer.get_tree_level(
+        fileobj, request.args.get('path', '', type=str))
+    return jsonify(children=children, limit_reached=limit_reached,
+                   error=error)
+
+
 @blueprint.app_template_test('previewable')
 def is_previewable(extension):
     """Test if a file can be previewed checking its extension."""
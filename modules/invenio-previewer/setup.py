@@ -69,6 +69,7 @@ install_requires = [
     'Flask-BabelEx>=0.9.3',
     'mistune>=0.7.2',
     'cchardet>=1.0.0',
+    'invenio-cache>=1.0.0',
     'invenio-assets>=1.0.0b4',
     'invenio-pidstore>=1.0.0b1',
     'invenio-records-ui>=1.0.0a8',
@@ -112,6 +113,8 @@ setup(
             'previewer_pdfjs_js = invenio_previewer.bundles:pdfjs_js',
             'previewer_fullscreen_js '
             '= invenio_previewer.bundles:fullscreen_js',
+            'previewer_zip_tree_js '
+            '= invenio_previewer.bundles:zip_tree_js',
             'previewer_prism_js '
             '= invenio_previewer.bundles:prism_js',
             'previewer_prism_css '
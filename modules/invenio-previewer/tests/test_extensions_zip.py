@@ -2,7 +2,8 @@ import pytest
 import json
 from mock import patch, MagicMock
 
-from invenio_previewer.extensions.zip import make_tree, children_to_list
+from invenio_previewer.extensions.zip import make_tree, children_to_list, \
+    make_index, get_tree_level
 
 
 # def make_tree(file): 
@@ -37,4 +38,90 @@ def test_children_to_list(app):
         "children": []
     }
     
-    assert children_to_list(node=node).get("children") == None
\ No newline at end of file
+    assert children_to_list(node=node).get("children") == None
+
+# def make_index(file):
+def test_make_index(app):
+    def infolist():
+        infos = []
+        for name, size in [("a/", 0), ("a/b.txt", 5), ("a/c/d.txt", 7),
+                           ("e.txt", 3)]:
+            info = MagicMock()
+            info.filename = name
+            info.file_size = size
+            infos.append(info)
+        return infos
+
+    data1 = MagicMock()
+    data1.namelist = lambda: ["a/", "a/b.txt", "a/c/d.txt", "e.txt"]
+    data1.infolist = infolist
+
+    with patch('invenio_previewer.extensions.zip.zipfile.ZipFile', return_value=data1):
+        levels, limit_reached, error = make_index(MagicMock())
+    assert not limit_reached
+    assert error is None
+    assert levels[""] == [["a", "folder", 0], ["e.txt", "item", 3]]
+    assert levels["a"] == [["b.txt", "item", 5], ["c", "folder", 0]]
+    assert levels["a/c"] == [["d.txt", "item", 7]]
+
+    app.config['PREVIEWER_ZIP_INDEX_MAX_FILES'] = 2
+    with patch('invenio_previewer.extensions.zip.zipfile.ZipFile', return_value=data1):
+        levels, limit_reached, error = make_index(MagicMock())
+    assert limit_reached
+    assert "a/c" not in levels
+
+    # levels are pruned to the entries that can be shown
+    app.config['PREVIEWER_ZIP_INDEX_MAX_FILES'] = 1000000
+    app.config['PREVIEWER_ZIP_MAX_FILES'] = 1
+    with patch('invenio_previewer.extensions.zip.zipfile.ZipFile', return_value=data1):
+        levels, limit_reached, error = make_index(MagicMock())
+    assert not limit_reached
+    assert levels[""] == [["a", "folder", 0], ["e.txt", "item", 3]]
+    assert levels["a/c"] == [["d.txt", "item", 7]]
+
+
+# def get_tree_level(file, path=''):
+def test_get_tree_level(app):
+    file = MagicMock()
+    file.file.file_id = "1234"
+    levels = {"": [["a", "folder", 0]], "a": [["b.txt", "item", 5]]}
+    cache = {}
+
+    with patch('invenio_previewer.extensions.zip.current_cache') as current_cache:
+        current_cache.get.side_effect = cache.get
+        current_cache.set.side_effect = lambda k, v, **kw: cache.update({k: v})
+        current_cache.set_many.side_effect = lambda m, **kw: cache.update(m)
+        with patch('invenio_previewer.extensions.zip.make_index',
+                   return_value=(levels, False, None)) as make_index:
+            children, limit_reached, error = get_tree_level(file)
+            assert children == [
+                {"name": "a", "path": "a", "type": "folder", "size": 0}]
+            children, limit_reached, error = get_tree_level(file, "a/")
+            assert children == [
+                {"name": "b.txt", "path": "a/b.txt", "type": "item", "size": 5}]
+            assert make_index.call_count == 1
+
+            # unknown directories are served from the cached index
+            children, limit_reached, error = get_tree_level(file, "a/x")
+            assert children == []
+            assert make_index.call_count == 1
+
+            # the index is built again when a level was evicted
+            cache.pop([k for k in cache if k.startswith(
+                "previewer_zip_index::1234::")][-1])
+            children, limit_reached, error = get_tree_level(file, "a")
+            assert children == [
+                {"name": "b.txt", "path": "a/b.txt", "type": "item", "size": 5}]
+            assert make_index.call_count == 2
+
+            # levels are written in chunks
+            app.config['PREVIEWER_ZIP_INDEX_CACHE_CHUNK_SIZE'] = 1
+            cache.clear()
+            current_cache.set_many.reset_mock()
+            get_tree_level(file)
+            assert current_cache.set_many.call_count == 2
+
+        app.config['PREVIEWER_ZIP_MAX_FILES'] = 0
+        children, limit_reached, error = get_tree_level(file, "a")
+        assert children == []
+        assert limit_reached
@@ -407,5 +407,9 @@ RECORDS_REST_DEFAULT_MAPPING_DICT = \
     dict(RECORDS_REST_DEFAULT_MAPPING_KEY, **RECORDS_REST_DEFAULT_MAPPING_LANG)
 """Dictionary mapping key and language default."""
 
-RECORDS_REST_DEFAULT_TTL_VALUE = 3600
-"""Default number of seconds for ttl value"""
\ No newline at end of file
+RECORDS_REST_CURSOR_TIEBREAKER = 'control_number'
+"""Unique field ending the sort of search results.
+
+Cursors in the prev/next links of pages beyond ``max_result_window`` hold
+the sort values of a hit, so the sort must give every hit its own position.
+"""
\ No newline at end of file
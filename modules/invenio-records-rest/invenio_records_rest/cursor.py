@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Invenio.
+# Copyright (C) 2016-2018 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Implement functions for managing search_after cursors."""
+
+import hashlib
+import json
+
+from flask import current_app, request
+from itsdangerous import BadData, URLSafeSerializer
+
+PAGINATION_ARGS = ('page', 'page_no', 'size', 'list_view_num', 'cursor')
+"""Request arguments selecting a page of the search results."""
+
+
+def _get_serializer():
+    """Return cursor serializer."""
+    return URLSafeSerializer(
+        current_app.config['SECRET_KEY'],
+        salt='invenio-records-rest-cursor',
+    )
+
+
+def _get_query_digest():
+    """Return a digest of the arguments selecting the search results."""
+    args = sorted(
+        (k, v) for k, v in request.args.items(multi=True)
+        if k not in PAGINATION_ARGS)
+    return hashlib.sha1(json.dumps(args).encode('utf-8')).hexdigest()
+
+
+def get_sort(search):
+    """Return the sort of a search ending with the tiebreaker.
+
+    :param search: Search object.
+    :returns: List of ``{field: {'order': order, ...}}``.
+    """
+    tiebreaker = current_app.config['RECORDS_REST_CURSOR_TIEBREAKER']
+    sort = []
+    for s in search.to_dict().get('sort') or ['_score']:
+        if isinstance(s, dict):
+            field, options = list(s.items())[0]
+            if not isinstance(options, dict):
+                options = {'order': options}
+        elif s.startswith('-'):
+            field, options = s[1:], {'order': 'desc'}
+        else:
+            field, options = s, {}
+        options = dict(options)
+        options.setdefault('order', 'desc' if field == '_score' else 'asc')
+        sort.append({field: options})
+    if all(tiebreaker not in s for s in sort):
+        sort.append({tiebreaker: {'order': list(sort[0].values())[0]['order']}})
+    return sort
+
+
+def reverse_sort(sort):
+    """Return a sort returned by get_sort in the reverse order."""
+    return [
+        {field: dict(options,
+                     order='asc' if options['order'] == 'desc' else 'desc')}
+        for s in sort for field, options in s.items()
+    ]
+
+
+def serialize(page, size, search_after, reverse=False):
+    """Return a cursor to a page of the search results.
+
+    :param page: Page number the cursor points to.
+    :param size: Number of hits per page.
+    :param search_after: Sort values of the hit just before the page, or
+        just after it when ``reverse`` is set.
+    :param reverse: Whether the page is before the hit.
+    """
+    return _get_serializer().dumps(dict(
+        page=page, size=size, search_after=search_after, reverse=reverse,
+        query=_get_query_digest()))
+
+
+def deserialize(cursor, size):
+    """Return the content of a cursor.
+
+    :param cursor: Cursor created by serialize.
+    :param size: Number of hits per page.
+    :returns: The content of the cursor or None if the cursor is not valid
+        for the current search arguments.
+    """
+    if not cursor:
+        return None
+    try:
+        data = _get_serializer().loads(cursor)
+    except BadData:
+        return None
+    if data.get('size') != size or data.get('query') != _get_query_digest():
+        return None
+    return data
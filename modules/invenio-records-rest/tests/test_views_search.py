@@ -263,3 +263,51 @@ def test_dynamic_aggregation(app, indexed_records, search_url):
                           key=lambda x: x['doc_count'])
         assert sorted(data['aggregations']['test']['buckets'],
                       key=lambda x: x['doc_count']) == expected
+
+
+@pytest.mark.parametrize('app', [dict(
+    endpoint=dict(max_result_window=2),
+)], indirect=['app'])
+def test_cursor_pagination(app, indexed_records, search_url):
+    """Test prev/next cursors beyond max_result_window."""
+    def get_years(res):
+        return [hit['metadata']['year'] for hit in get_json(res)['hits']['hits']]
+
+    with app.test_client() as client:
+        res = client.get(search_url, query_string=dict(size=1, page=1, sort='year'))
+        years = get_years(res)
+        urls = [get_json(res)['links']['self']]
+        while 'next' in get_json(res)['links']:
+            urls.append(get_json(res)['links']['next'])
+            res = client.get(to_relative_url(urls[-1]))
+            assert get_json(res)['links']['self'] == urls[-1]
+            years += get_years(res)
+        assert years == [1985, 2015, 2042, 4242]
+
+        # Pages within max_result_window are linked by page number
+        assert 'cursor' not in parse_url(urls[1])['qs']
+        assert parse_url(urls[2])['qs']['page'] == ['3']
+        assert 'cursor' in parse_url(urls[2])['qs']
+
+        # Go back with the prev links
+        years = []
+        while 'prev' in get_json(res)['links']:
+            res = client.get(to_relative_url(get_json(res)['links']['prev']))
+            years += get_years(res)
+        assert years == [2042, 2015, 1985]
+
+        # Page number beyond max_result_window
+        res = client.get(search_url, query_string=dict(size=1, page=4, sort='year'))
+        assert get_years(res) == [4242]
+        res = client.get(search_url, query_string=dict(size=1, page=5, sort='year'))
+        assert get_years(res) == []
+        assert 'next' not in get_json(res)['links']
+
+        # Invalid cursors fall back to the page number
+        qs = parse_url(urls[2])['qs']
+        res = client.get(search_url, query_string=dict(
+            size=1, page=3, sort='year', cursor=qs['cursor'][0] + 'x'))
+        assert get_years(res) == [2042]
+        res = client.get(search_url, query_string=dict(
+            size=1, page=3, sort='-year', cursor=qs['cursor'][0]))
+        assert get_years(res) == [2015]
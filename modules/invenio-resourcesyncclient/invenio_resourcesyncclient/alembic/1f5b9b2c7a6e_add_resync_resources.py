@@ -0,0 +1,43 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2016-2018 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""add resync resources"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '1f5b9b2c7a6e'
+down_revision = 'd758395731f2'
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table('resync_resources',
+    sa.Column('created', sa.DateTime(), nullable=False),
+    sa.Column('updated', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resync_indexes_id', sa.Integer(), nullable=False),
+    sa.Column('resource_key', sa.String(length=2048), nullable=False),
+    sa.Column('resource', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.ForeignKeyConstraint(['resync_indexes_id'], ['resync_indexes.id'], name=op.f('fk_resync_resources_resync_indexes_id_resync_indexes'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_resync_resources')),
+    sa.UniqueConstraint('resync_indexes_id', 'resource_key', name=op.f('uq_resync_resources_resync_indexes_id'))
+    )
+    op.create_index('idx_resync_resources_status', 'resync_resources',
+                    ['resync_indexes_id', 'status'], unique=False)
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index('idx_resync_resources_status', table_name='resync_resources')
+    op.drop_table('resync_resources')
@@ -48,6 +48,18 @@ INVENIO_RESYNC_LOGS_STATUS = {
     'failed': 'Failed'
 }
 
+INVENIO_RESYNC_RESOURCES_STATUS = {
+    'pending': 'pending',
+    'done': 'done'
+}
+"""Value of resync_resources_status."""
+
+INVENIO_RESYNC_IMPORT_WORKERS = 4
+"""Number of workers fetching records while importing."""
+
+INVENIO_RESYNC_IMPORT_PREFETCH = 16
+"""Number of records fetched ahead of the record being imported."""
+
 INVENIO_RESYNC_SAVE_PATH = '/tmp/resync/'
 
 INVENIO_RESYNC_MODE = True
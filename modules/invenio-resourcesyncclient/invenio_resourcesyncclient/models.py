@@ -180,6 +180,51 @@ class ResyncLogs(db.Model, Timestamp):
     """Relation to the Resync Identifier."""
 
 
+class ResyncResources(db.Model, Timestamp):
+    """Resources waiting to be imported by a resource sync."""
+
+    __tablename__ = "resync_resources"
+
+    __table_args__ = (
+        db.UniqueConstraint('resync_indexes_id', 'resource_key'),
+        db.Index('idx_resync_resources_status',
+                 'resync_indexes_id', 'status'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    resync_indexes_id = db.Column(
+        db.Integer,
+        db.ForeignKey(ResyncIndexes.id,
+                      ondelete='CASCADE'),
+        nullable=False
+    )
+    """Resync Identifier."""
+
+    resource_key = db.Column(db.String(2048), nullable=False)
+    """Record id or uri of the resource."""
+
+    resource = db.Column(
+        db.JSON().with_variant(
+            postgresql.JSONB(none_as_null=True),
+            'postgresql',
+        ).with_variant(
+            JSONType(),
+            'sqlite',
+        ).with_variant(
+            JSONType(),
+            'mysql',
+        ),
+        default=lambda: dict(),
+        nullable=True
+    )
+    """Resource as listed by the resource list or change list."""
+
+    status = db.Column(db.String(10), nullable=False, default='pending')
+    """Import status of the resource."""
+
+
 __all__ = ('ResyncIndexes',
-           'ResyncLogs'
+           'ResyncLogs',
+           'ResyncResources'
            )
@@ -19,11 +19,12 @@
 # MA 02111-1307, USA.
 
 """WEKO3 module docstring."""
-import json
-import os
 import signal
 import ssl
+import threading
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -36,19 +37,46 @@ from invenio_db import db
 from invenio_oaiharvester.harvester import DCMapper, DDIMapper, JPCOARMapper
 from invenio_oaiharvester.tasks import event_counter
 from lxml import etree
+from requests.adapters import HTTPAdapter
 
 from .api import ResyncHandler
-from .config import INVENIO_RESYNC_INDEXES_MODE, \
+from .config import INVENIO_RESYNC_IMPORT_PREFETCH, \
+    INVENIO_RESYNC_IMPORT_WORKERS, INVENIO_RESYNC_INDEXES_MODE, \
     INVENIO_RESYNC_INDEXES_STATUS, INVENIO_RESYNC_LOGS_STATUS, \
     INVENIO_RESYNC_MODE, INVENIO_RESYNC_SAVE_PATH
 from .models import ResyncIndexes, ResyncLogs
-from .utils import get_list_records, process_item, process_sync
+from .utils import get_pending_resources, mark_resource_done, \
+    process_item, process_sync
 
 ssl._create_default_https_context = ssl._create_unverified_context
 
 
 logger = get_task_logger(__name__)
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Get the keep-alive session shared by the fetching workers."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # Avoid SSLError - dh key too small
+            requests.packages.urllib3.disable_warnings()
+            requests.packages.urllib3.util.ssl_.DEFAULT_CIPHERS += \
+                ':HIGH:!DH:!aNULL'
+            adapter = HTTPAdapter(
+                pool_maxsize=current_app.config.get(
+                    'INVENIO_RESYNC_IMPORT_WORKERS',
+                    INVENIO_RESYNC_IMPORT_WORKERS))
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.verify = False
+            _session = session
+    return _session
+
 
 def is_running_task(id):
     """Check harvest running."""
@@ -76,7 +104,6 @@ def run_sync_import(id):
     start_time = datetime.now()
     resync = db.session.query(ResyncIndexes).filter_by(id=id).first()
     counter = init_counter()
-    resync_index = ResyncHandler.get_resync(id)
     resync_log = prepare_log(
         resync,
         id,
@@ -93,48 +120,38 @@ def run_sync_import(id):
             pause = True
 
         signal.signal(signal.SIGTERM, sigterm_handler)
-        base = get_list_records(resync.id)
         while True:
             current_app.logger.info('[{0}] [{1}]'.format(
                 0, 'Processing records'))
-            # for record_id in records:
             try:
                 hostname = urlparse(resync.base_url)
-                records = get_list_records(resync.id)
+                resources = [(rc.id, rc.resource)
+                             for rc in get_pending_resources(resync.id)]
                 current_app.logger.debug(
-                    "len(records):{0}".format(len(records)))
-                successful = []
-                try:
-                    for i in records:
-                        current_app.logger.debug('{0} {1} {2}: {3}'.format(
-                            __file__, 'run_sync_import()', 'resource', i))
-                        if INVENIO_RESYNC_MODE:
-                            record = get_record_from_file(i)
-                        else:
-                            record = get_record(
-                                url='{}://{}/oai'.format(
-                                    hostname.scheme,
-                                    hostname.netloc
-                                ),
-                                record_id=i,
-                                metadata_prefix='jpcoar_1.0',
-                            )
-
+                    "len(records):{0}".format(len(resources)))
+                fetched = fetch_records(
+                    resources,
+                    url='{}://{}/oai'.format(
+                        hostname.scheme,
+                        hostname.netloc
+                    ),
+                    is_paused=lambda: pause
+                )
+                for resource_id, future in fetched:
+                    current_app.logger.debug('{0} {1} {2}: {3}'.format(
+                        __file__, 'run_sync_import()', 'resource',
+                        resource_id))
+                    try:
+                        record = future.result()
                         if len(record) == 1:
                             process_item(record[0], resync, counter)
-                            successful.append(i)
-
-                    for item in successful:
-                        records.remove(item)
-
-                    resync_index.update({
-                        'result': json.dumps(records)
-                    })
-
-                except Exception as ex:
-                    current_app.logger.exception(
-                        'Error occurred while importing item')
-                    continue
+                            mark_resource_done(resource_id)
+                        db.session.commit()
+                    except Exception:
+                        current_app.logger.exception(
+                            'Error occurred while importing item')
+                        db.session.rollback()
+                        event_counter('error_items', counter)
 
             except Exception as ex:
                 current_app.logger.error(traceback.format_exc())
@@ -205,9 +222,6 @@ def get_record(
         metadata_prefix=None,
         encoding='utf-8'):
     """Get records by record_id."""
-    # Avoid SSLError - dh key too small
-    requests.packages.urllib3.disable_warnings()
-    requests.packages.urllib3.util.ssl_.DEFAULT_CIPHERS += 'HIGH:!DH:!aNULL'
     payload = {
         'verb': 'GetRecord',
         'metadataPrefix': metadata_prefix,
@@ -222,7 +236,7 @@ def get_record(
     current_app.logger.debug('{0} {1} {2}: {3}'.format(
         __file__, 'get_record()', 'payload_str', payload_str))
 
-    response = requests.get(url, params=payload_str, verify=False)
+    response = get_session().get(url, params=payload_str)
     et = etree.XML(response.text.encode(encoding))
     current_app.logger.debug('{0} {1} {2}: {3}'.format(
         __file__, 'get_record()', 'et', response.text.encode(encoding)))
@@ -233,6 +247,48 @@ def get_record(
     return records
 
 
+def fetch_records(resources, url, is_paused=None):
+    """Fetch records in a bounded worker pool ahead of their import.
+
+    :param resources: List of ``(key, resource)`` to fetch.
+    :param url: OAI-PMH endpoint of the source repository.
+    :param is_paused: Callable telling to stop fetching new records.
+    :returns: Generator of ``(key, future)`` in the order of
+        ``resources``. The future gives the fetched records.
+    """
+    app = current_app._get_current_object()
+
+    def fetch(resource):
+        with app.app_context():
+            if INVENIO_RESYNC_MODE:
+                return get_record_from_file(resource)
+            return get_record(
+                url=url,
+                record_id=resource,
+                metadata_prefix='jpcoar_1.0',
+            )
+
+    if not INVENIO_RESYNC_MODE:
+        get_session()
+    prefetch = current_app.config.get(
+        'INVENIO_RESYNC_IMPORT_PREFETCH', INVENIO_RESYNC_IMPORT_PREFETCH)
+    resources = iter(resources)
+    with ThreadPoolExecutor(max_workers=current_app.config.get(
+            'INVENIO_RESYNC_IMPORT_WORKERS',
+            INVENIO_RESYNC_IMPORT_WORKERS)) as executor:
+        queue = deque()
+        while True:
+            while len(queue) < prefetch \
+                    and not (is_paused and is_paused()):
+                item = next(resources, None)
+                if item is None:
+                    break
+                queue.append((item[0], executor.submit(fetch, item[1])))
+            if not queue:
+                break
+            yield queue.popleft()
+
+
 @shared_task()
 def resync_sync(id):
     """Run resource sync."""
@@ -45,7 +45,9 @@ from weko_deposit.api import WekoDeposit
 from weko_records_ui.utils import soft_delete
 
 from .config import INVENIO_RESYNC_ENABLE_ITEM_VERSIONING, \
-    INVENIO_RESYNC_INDEXES_MODE, INVENIO_RESYNC_MODE
+    INVENIO_RESYNC_INDEXES_MODE, INVENIO_RESYNC_MODE, \
+    INVENIO_RESYNC_RESOURCES_STATUS
+from .models import ResyncIndexes, ResyncResources
 
 ssl._create_default_https_context = ssl._create_unverified_context
 
@@ -217,15 +219,81 @@ def set_query_parameter(url, param_name, param_value):
 
 def get_list_records(resync_id):
     """Get list records in local dir. Only get updated."""
+    return [rc.resource for rc in get_pending_resources(resync_id)]
+
+
+def _get_resource_key(resource):
+    if isinstance(resource, dict):
+        return resource.get('uri') or json.dumps(resource, sort_keys=True)
+    return str(resource)
+
+
+def add_pending_resources(resync_id, resources):
+    """Queue resources to be imported.
+
+    A resource already queued is set back to pending with its new listing.
+
+    :param resync_id: Resync Identifier.
+    :param resources: Record ids or resources of the resource list.
+    """
+    resources = {_get_resource_key(rc): rc for rc in resources}
+    if not resources:
+        return
+    keys = list(resources)
+    rows = {}
+    for i in range(0, len(keys), 1000):
+        rows.update({
+            row.resource_key: row for row in ResyncResources.query.filter(
+                ResyncResources.resync_indexes_id == resync_id,
+                ResyncResources.resource_key.in_(keys[i:i + 1000]))
+        })
+    with db.session.begin_nested():
+        for key, rc in resources.items():
+            row = rows.get(key)
+            if row:
+                row.resource = rc
+                row.status = INVENIO_RESYNC_RESOURCES_STATUS['pending']
+            else:
+                db.session.add(ResyncResources(
+                    resync_indexes_id=resync_id,
+                    resource_key=key,
+                    resource=rc,
+                    status=INVENIO_RESYNC_RESOURCES_STATUS['pending']))
+    db.session.commit()
+
+
+def get_pending_resources(resync_id):
+    """Get the resources waiting to be imported.
+
+    Resources saved in the result of the resync by an older version are
+    moved to the queue first.
+
+    :param resync_id: Resync Identifier.
+    :returns: List of :class:`ResyncResources` in listing order.
+    """
     from .api import ResyncHandler
     resync_index = ResyncHandler.get_resync(resync_id)
-    records = []
-    if not resync_index.result:
-        return records
-    records = json.loads(resync_index.result)
-    # current_app.logger.debug('{0} {1} {2}: {3}'.format(
-    #     __file__, 'get_list_records()', 'records', records))
-    return records
+    if resync_index.result:
+        records = resync_index.result
+        if isinstance(records, str):
+            records = json.loads(records)
+        ResyncIndexes.query.filter_by(id=resync_id).update(
+            {'result': None}, synchronize_session=False)
+        add_pending_resources(resync_id, records)
+    return ResyncResources.query.filter_by(
+        resync_indexes_id=resync_id,
+        status=INVENIO_RESYNC_RESOURCES_STATUS['pending']
+    ).order_by(ResyncResources.id).all()
+
+
+def mark_resource_done(resource_id):
+    """Mark a queued resource as imported.
+
+    :param resource_id: Identifier of the :class:`ResyncResources`.
+    """
+    ResyncResources.query.filter_by(id=resource_id).update(
+        {'status': INVENIO_RESYNC_RESOURCES_STATUS['done']},
+        synchronize_session=False)
 
 
 def process_item(record, resync, counter):
@@ -383,12 +451,7 @@ def process_sync(resync_id, counter):
                                        dryrun=False,
                                        from_date=from_date,
                                        to_date=to_date)
-            tmp = get_list_records(resync_id)
-            tmp.extend(counter.get('list'))
-            new_result = list(map(json.loads, set(map(json.dumps, tmp))))
-            resync_index.update({
-                'result': json.dumps(new_result)
-            })
+            add_pending_resources(resync_id, counter.get('list'))
             return jsonify(success=True)
         elif mode == current_app.config.get(
             'INVENIO_RESYNC_INDEXES_MODE',
@@ -407,12 +470,7 @@ def process_sync(resync_id, counter):
                                        counter=counter,
                                        dryrun=True)
             audit_result = sync_audit(_map, counter)
-            new_result = list(set(
-                get_list_records(resync_id) + counter.get('list')
-            ))
-            resync_index.update({
-                'result': json.dumps(new_result)
-            })
+            add_pending_resources(resync_id, counter.get('list'))
             return jsonify(audit_result)
         elif mode == current_app.config.get(
             'INVENIO_RESYNC_INDEXES_MODE',
@@ -430,11 +488,7 @@ def process_sync(resync_id, counter):
             while _map[0] != uri_host and not result:
                 result = sync_incremental(_map, counter,
                                           base_url, from_date, to_date)
-            new_result = list(
-                set(get_list_records(resync_id) + counter.get('list')))
-            resync_index.update({
-                'result': json.dumps(new_result)
-            })
+            add_pending_resources(resync_id, counter.get('list'))
             return jsonify({'result': result})
     except Exception as e:
         current_app.logger.error(traceback.format_exc())
@@ -1,7 +1,11 @@
 import pytest
+import requests
 from mock import patch, MagicMock
 
+from invenio_resourcesyncclient.models import ResyncResources
 from invenio_resourcesyncclient.tasks import (
+    fetch_records,
+    get_session,
     is_running_task,
     run_sync_import,
     get_record_from_file,
@@ -48,6 +52,28 @@ def test_run_sync_import(app, test_resync):
     res[0].pop('execution_time')
     assert res == ({'task_state': 'SUCCESS', 'task_name': 'import', 'task_type': 'import', 'repository_name': 'weko', 'task_id': None},)
 
+# .tox/c1/bin/pytest --cov=invenio_resourcesyncclient tests/test_tasks.py::test_run_sync_import_resume -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-resourcesyncclient/.tox/c1/tmp
+def test_run_sync_import_resume(app, db, test_resync):
+    with patch('invenio_resourcesyncclient.tasks.get_record_from_file', return_value=[MagicMock()]) as mock_get, \
+            patch('invenio_resourcesyncclient.tasks.process_item') as mock_process:
+        run_sync_import(30)
+        assert mock_get.call_count == 1
+        assert mock_process.call_count == 1
+        assert ResyncResources.query.filter_by(resync_indexes_id=30).one().status == 'done'
+
+        # imported resources are not fetched again
+        run_sync_import(30)
+        assert mock_get.call_count == 1
+
+    # a failed resource stays pending
+    with patch('invenio_resourcesyncclient.tasks.get_record_from_file', side_effect=Exception('error')), \
+            patch('invenio_resourcesyncclient.tasks.process_item') as mock_process:
+        res = run_sync_import(10)
+        assert res[0]['task_state'] == 'SUCCESS'
+        assert mock_process.call_count == 0
+        assert [rc.status for rc in ResyncResources.query.filter_by(resync_indexes_id=10)] == ['pending', 'pending']
+
+
 #def get_record_from_file(rc):
 
 
@@ -62,6 +88,35 @@ def test_get_record(app):
     assert res == []
 
 
+#def get_session():
+# .tox/c1/bin/pytest --cov=invenio_resourcesyncclient tests/test_tasks.py::test_get_session -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-resourcesyncclient/.tox/c1/tmp
+def test_get_session(app):
+    session = get_session()
+    ciphers = requests.packages.urllib3.util.ssl_.DEFAULT_CIPHERS
+    assert get_session() is session
+    assert requests.packages.urllib3.util.ssl_.DEFAULT_CIPHERS == ciphers
+    assert session.verify is False
+
+
+#def fetch_records(resources, url, is_paused=None):
+# .tox/c1/bin/pytest --cov=invenio_resourcesyncclient tests/test_tasks.py::test_fetch_records -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-resourcesyncclient/.tox/c1/tmp
+def test_fetch_records(app):
+    app.config['INVENIO_RESYNC_IMPORT_WORKERS'] = 2
+    app.config['INVENIO_RESYNC_IMPORT_PREFETCH'] = 2
+    resources = [(i, {'uri': str(i)}) for i in range(5)]
+    with patch('invenio_resourcesyncclient.tasks.get_record_from_file', side_effect=lambda rc: [rc['uri']]):
+        res = [(key, future.result()) for key, future in fetch_records(resources, 'http://test/oai')]
+        assert res == [(i, [str(i)]) for i in range(5)]
+
+        # stop fetching when paused
+        paused = []
+        res = []
+        for key, future in fetch_records(resources, 'http://test/oai', is_paused=lambda: paused):
+            res.append(key)
+            paused.append(True)
+        assert res == [0, 1]
+
+
 #def resync_sync(id):
 #        def sigterm_handler(*args):
 # .tox/c1/bin/pytest --cov=invenio_resourcesyncclient tests/test_tasks.py::test_resync_sync -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-resourcesyncclient/.tox/c1/tmp
@@ -5,8 +5,11 @@ from lxml import etree
 from urllib.error import URLError
 from resync.client_utils import ClientFatalError
 
-from invenio_resourcesyncclient.models import ResyncIndexes
+from invenio_resourcesyncclient.models import ResyncIndexes, ResyncResources
 from invenio_resourcesyncclient.utils import (
+    add_pending_resources,
+    get_pending_resources,
+    mark_resource_done,
     read_capability,
     sync_baseline,
     sync_audit,
@@ -94,6 +97,45 @@ def test_set_query_parameter(app):
 
 
 #def get_list_records(resync_id):
+# .tox/c1/bin/pytest --cov=invenio_resourcesyncclient tests/test_utils.py::test_get_list_records -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-resourcesyncclient/.tox/c1/tmp
+def test_get_list_records(app, db, test_resync):
+    assert get_list_records(20) == []
+
+    # move the resources of the result to the queue
+    res = get_list_records(30)
+    assert res == [{"uri": "tests/data/test_records.json", "timestamp": 1664550000, "ln": [{"rel": "file", "href": "tests/data/test_records.json"}]}]
+    assert ResyncIndexes.query.filter_by(id=30).first().result is None
+    assert get_list_records(30) == res
+
+    assert get_list_records(10) == [1, 2]
+
+
+#def add_pending_resources(resync_id, resources):
+# .tox/c1/bin/pytest --cov=invenio_resourcesyncclient tests/test_utils.py::test_add_pending_resources -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/invenio-resourcesyncclient/.tox/c1/tmp
+def test_add_pending_resources(app, db, test_resync):
+    add_pending_resources(20, [])
+    assert ResyncResources.query.filter_by(resync_indexes_id=20).count() == 0
+
+    add_pending_resources(20, [{"uri": "a", "timestamp": 1}, {"uri": "b", "timestamp": 1}, 3, 3])
+    rows = get_pending_resources(20)
+    assert [row.resource_key for row in rows] == ["a", "b", "3"]
+
+    mark_resource_done(rows[0].id)
+    db.session.commit()
+    assert [row.resource_key for row in get_pending_resources(20)] == ["b", "3"]
+
+    # a listed resource is imported again
+    add_pending_resources(20, [{"uri": "a", "timestamp": 2}])
+    rows = get_pending_resources(20)
+    assert [row.resource_key for row in rows] == ["a", "b", "3"]
+    assert rows[0].resource == {"uri": "a", "timestamp": 2}
+    assert ResyncResources.query.filter_by(resync_indexes_id=20).count() == 3
+
+
+#def get_pending_resources(resync_id):
+
+
+#def mark_resource_done(resource_id):
 
 
 #def process_item(record, resync, counter):
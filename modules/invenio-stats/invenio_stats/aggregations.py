@@ -261,6 +261,7 @@ class StatAggregator(object):
         self.event_index = '{0}-events-stats-{1}'.format(
             self.search_index_prefix, self.event)
         self.indices = set()
+        self.touched = set()
         self.bookmark_api = BookmarkAPI(self.client, self.name,
                                         self.aggregation_interval)
 
@@ -356,6 +357,14 @@ class StatAggregator(object):
                             aggregation_data
                         )
 
+                # Remember the summaries invalidated by this aggregation.
+                month = interval_date.strftime('%Y-%m')
+                for kind, field in (('record', 'record_id'),
+                                    ('file', 'root_file_id')):
+                    if aggregation_data.get(field):
+                        self.touched.add(
+                            (kind, str(aggregation_data[field]), month))
+
                 index_name = '{0}-stats-{1}'.\
                              format(self.search_index_prefix, self.event)
                 logger.debug("index_name: {}".format(index_name))
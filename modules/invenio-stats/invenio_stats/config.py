@@ -189,6 +189,13 @@ WEKO_STATS_UNKNOWN_LABEL = 'UNKNOWN'
 STATS_EVENT_STRING = 'events'
 """Stats event string."""
 
+STATS_SUMMARY_CACHE_TIMEOUT = 24 * 60 * 60
+"""Timeout in seconds of the cached record view and file download summaries.
+
+The summaries are also cleared by ``aggregate_events`` whenever a new
+aggregation touches the record or file.
+"""
+
 STATS_AGGREGATION_INDEXES = [
     'celery-task',
     'file-download',
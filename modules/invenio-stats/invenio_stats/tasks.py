@@ -15,6 +15,7 @@ from celery.utils.log import get_task_logger
 from dateutil.parser import parse as dateutil_parse
 
 from .proxies import current_stats
+from .utils import clear_stats_summary_cache
 
 
 @shared_task
@@ -44,4 +45,5 @@ def aggregate_events(aggregations, start_date=None, end_date=None,
         aggregator = aggr_cfg.aggregator_class(
             name=aggr_cfg.name, **aggr_cfg.aggregator_config)
         results.append(aggregator.run(start_date, end_date, update_bookmark, manual))
+        clear_stats_summary_cache(aggregator.touched)
     return results
@@ -16,6 +16,7 @@ import os
 import re
 from base64 import b64encode
 from datetime import datetime, timedelta
+from functools import lru_cache
 from math import ceil
 from typing import Generator, NoReturn, Union
 
@@ -53,6 +54,49 @@ def get_anonymization_salt(ts):
     return salt
 
 
+def get_stats_summary_cache_key(kind, object_id, query_date=None):
+    """Get the cache key of a record view or file download summary.
+
+    :param kind: ``'record'`` or ``'file'``.
+    :param object_id: Record UUID or root file ID.
+    :param query_date: Month as ``YYYY-MM``, or ``None`` for the totals.
+    """
+    return 'stats:summary:{0}:{1}:{2}'.format(
+        kind, object_id, query_date or 'total')
+
+
+def clear_stats_summary_cache(touched):
+    """Clear the summaries touched by an aggregation.
+
+    :param touched: Iterable of ``(kind, object_id, month)`` tuples.
+    """
+    keys = set()
+    for kind, object_id, month in touched:
+        keys.add(get_stats_summary_cache_key(kind, object_id))
+        keys.add(get_stats_summary_cache_key(kind, object_id, month))
+    if keys:
+        current_cache.delete_many(*keys)
+
+
+@lru_cache(maxsize=4)
+def _period_list(year, month, provide_year):
+    period = []
+    start = datetime(year, month, 15)
+    end = datetime(year - provide_year, 1, 1)
+    while end < start:
+        period.append(start.strftime('%Y-%m'))
+        start -= timedelta(days=16)
+        start = datetime(start.year, start.month, 15)
+    return tuple(period)
+
+
+def get_period_list():
+    """Get the months selectable in the stats views, newest first."""
+    now = datetime.now()
+    return list(_period_list(
+        now.year, now.month, int(getattr(config, 'PROVIDE_PERIOD_YEAR'))))
+
+
 def get_geoip(ip):
     """Lookup country for IP address."""
     match = geolite2.reader().get(ip)
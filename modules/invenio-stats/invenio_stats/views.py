@@ -10,12 +10,12 @@
 import uuid
 
 import calendar
-from datetime import datetime, timedelta
 from functools import wraps
 
 from elasticsearch.exceptions import NotFoundError
 from flask import Blueprint, abort, current_app, jsonify, request
 from invenio_pidrelations.contrib.versioning import PIDVersioning
+from invenio_cache import current_cache
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_rest.views import ContentNegotiatedMethodView
 from invenio_db import db
@@ -25,7 +25,8 @@ from .errors import InvalidRequestInputError, UnknownQueryError
 from .proxies import current_stats
 from .utils import QueryCommonReportsHelper, QueryFileReportsHelper, \
     QueryItemRegReportHelper, QueryRecordViewPerIndexReportHelper, \
-    QueryRecordViewReportHelper, QuerySearchReportHelper, current_user
+    QueryRecordViewReportHelper, QuerySearchReportHelper, current_user, \
+    get_period_list, get_stats_summary_cache_key
 
 blueprint = Blueprint(
     'invenio_stats',
@@ -114,66 +115,57 @@ class QueryRecordViewCount(WekoQuery):
 
     def _get_data(self, record_id, query_date=None, get_period=False):
         """Get data."""
-        
+        key = get_stats_summary_cache_key('record', record_id, query_date)
+        result = current_cache.get(key)
+        if result is None:
+            try:
+                result = self._query_data(record_id, query_date)
+                current_cache.set(
+                    key, result, timeout=current_app.config.get(
+                        'STATS_SUMMARY_CACHE_TIMEOUT'))
+            except Exception as e:
+                current_app.logger.debug(e)
+                result = dict(total=0, country={}, period=[])
+        result = dict(result)
+        if get_period:
+            result['period'] = get_period_list()
+        return result
+
+    def _query_data(self, record_id, query_date=None):
+        """Query the record view summary from Elasticsearch."""
         result = {}
-        period = []
         country = {}
         unknown_view = 0
 
-        try:
-            if not query_date:
-                params = {'record_id': record_id,
-                          'interval': 'month'}
-            else:
-                year = int(query_date[0: 4])
-                month = int(query_date[5: 7])
-                _, lastday = calendar.monthrange(year, month)
-                params = {'record_id': record_id,
-                          'interval': 'month',
-                          'start_date': query_date + '-01',
-                          'end_date': query_date + '-' + str(lastday).zfill(2)
-                          + 'T23:59:59'}
-            query_period_cfg = current_stats.queries[
-                'bucket-record-view-histogram']
-            query_period = query_period_cfg.query_class(
-                **query_period_cfg.query_config)
-
-            # total
-            query_total_cfg = current_stats.queries['bucket-record-view-total']
-            query_total = query_total_cfg.query_class(
-                **query_total_cfg.query_config)
-            res_total = query_total.run(**params)
-            
-            result['total'] = res_total['count']
-            for d in res_total['buckets']:
-                country[d['key']] = d['count']
-                unknown_view += d['count']
-            result['country'] = country
-            # period
-            if get_period:
-                provide_year = int(getattr(config, 'PROVIDE_PERIOD_YEAR'))
-                sYear = datetime.now().year
-                sMonth = datetime.now().month
-                eYear = sYear - provide_year
-                start = datetime(sYear, sMonth, 15)
-                end = datetime(eYear, 1, 1)
-                while end < start:
-                    period.append(start.strftime('%Y-%m'))
-                    start -= timedelta(days=16)
-                    start = datetime(start.year, start.month, 15)
-                result['period'] = period
-
-            unknown_view = result['total'] - unknown_view
-            if unknown_view:
-                country[str(getattr(config, 'WEKO_STATS_UNKNOWN_LABEL'))] = \
-                    unknown_view
-                result['country'] = country
-        except Exception as e:
-            current_app.logger.debug(e)
-            result['total'] = 0
-            result['country'] = country
-            result['period'] = period
-
+        if not query_date:
+            params = {'record_id': record_id,
+                      'interval': 'month'}
+        else:
+            year = int(query_date[0: 4])
+            month = int(query_date[5: 7])
+            _, lastday = calendar.monthrange(year, month)
+            params = {'record_id': record_id,
+                      'interval': 'month',
+                      'start_date': query_date + '-01',
+                      'end_date': query_date + '-' + str(lastday).zfill(2)
+                      + 'T23:59:59'}
+
+        # total
+        query_total_cfg = current_stats.queries['bucket-record-view-total']
+        query_total = query_total_cfg.query_class(
+            **query_total_cfg.query_config)
+        res_total = query_total.run(**params)
+
+        result['total'] = res_total['count']
+        for d in res_total['buckets']:
+            country[d['key']] = d['count']
+            unknown_view += d['count']
+        result['country'] = country
+
+        unknown_view = result['total'] - unknown_view
+        if unknown_view:
+            country[str(getattr(config, 'WEKO_STATS_UNKNOWN_LABEL'))] = \
+                unknown_view
         return result
 
     def get_data(self, record_id, query_date=None, get_period=False):
@@ -265,12 +257,6 @@ class QueryFileStatsCount(WekoQuery):
                  get_period=False, root_file_id=None):
         """Get data."""
         from invenio_files_rest.models import ObjectVersion
-        result = {}
-        period = []
-        country_list = []
-        mapping = {}
-        unknown_download = 0
-        unknown_preview = 0
 
         # get root_file_id for general file download/preview event
         if not root_file_id:
@@ -282,96 +268,109 @@ class QueryFileStatsCount(WekoQuery):
             file_id_key = '{}_{}'.format(bucket_id, file_key)
             root_file_id = str(uuid.uuid3(uuid.NAMESPACE_URL, file_id_key))
 
-        params = {'bucket_id': bucket_id,
-                  'file_key': file_key,
-                  'interval': 'month',
-                  'root_file_id': root_file_id}
+        key = get_stats_summary_cache_key('file', root_file_id, query_date)
+        result = current_cache.get(key) if root_file_id else None
+        if result is None:
+            params = {'bucket_id': bucket_id,
+                      'file_key': file_key,
+                      'interval': 'month',
+                      'root_file_id': root_file_id}
 
-        if query_date:
-            year = int(query_date[0: 4])
-            month = int(query_date[5: 7])
-            _, lastday = calendar.monthrange(year, month)
-            params.update({
-                'start_date': query_date + '-01',
-                'end_date': query_date + '-' + str(lastday).zfill(2)
-                + 'T23:59:59'
-            })
+            if query_date:
+                year = int(query_date[0: 4])
+                month = int(query_date[5: 7])
+                _, lastday = calendar.monthrange(year, month)
+                params.update({
+                    'start_date': query_date + '-01',
+                    'end_date': query_date + '-' + str(lastday).zfill(2)
+                    + 'T23:59:59'
+                })
 
-        try:
-            try:
-                # file download
-                query_download_total_cfg = current_stats.queries[
-                    'bucket-file-download-total']
-                query_download_total = query_download_total_cfg.query_class(
-                    **query_download_total_cfg.query_config)
-                res_download_total = query_download_total.run(**params)
-            except Exception as e:
-                res_download_total = {'value': 0, 'buckets': []}
             try:
-                # file preview
-                query_preview_total_cfg = current_stats.queries[
-                    'bucket-file-preview-total']
-                query_preview_total = query_preview_total_cfg.query_class(
-                    **query_preview_total_cfg.query_config)
-                res_preview_total = query_preview_total.run(**params)
+                result, complete = self._query_data(params)
+                # a summary of failed queries is not kept in the cache
+                if root_file_id and complete:
+                    current_cache.set(
+                        key, result, timeout=current_app.config.get(
+                            'STATS_SUMMARY_CACHE_TIMEOUT'))
             except Exception as e:
-                res_preview_total = {'value': 0, 'buckets': []}
-            # total
-            result['download_total'] = res_download_total['value']
-            result['preview_total'] = res_preview_total['value']
-            # country
-            for d in res_download_total['buckets']:
+                current_app.logger.debug(e)
+                result = dict(download_total=0, preview_total=0,
+                              country_list=[], period=[])
+        result = dict(result)
+        if get_period:
+            result['period'] = get_period_list()
+        return result
+
+    def _query_data(self, params):
+        """Query the file download/preview summary from Elasticsearch.
+
+        :returns: The summary, and whether all queries succeeded.
+        """
+        result = {}
+        country_list = []
+        mapping = {}
+        unknown_download = 0
+        unknown_preview = 0
+        complete = True
+
+        try:
+            # file download
+            query_download_total_cfg = current_stats.queries[
+                'bucket-file-download-total']
+            query_download_total = query_download_total_cfg.query_class(
+                **query_download_total_cfg.query_config)
+            res_download_total = query_download_total.run(**params)
+        except Exception as e:
+            current_app.logger.debug(e)
+            complete = False
+            res_download_total = {'value': 0, 'buckets': []}
+        try:
+            # file preview
+            query_preview_total_cfg = current_stats.queries[
+                'bucket-file-preview-total']
+            query_preview_total = query_preview_total_cfg.query_class(
+                **query_preview_total_cfg.query_config)
+            res_preview_total = query_preview_total.run(**params)
+        except Exception as e:
+            current_app.logger.debug(e)
+            complete = False
+            res_preview_total = {'value': 0, 'buckets': []}
+        # total
+        result['download_total'] = res_download_total['value']
+        result['preview_total'] = res_preview_total['value']
+        # country
+        for d in res_download_total['buckets']:
+            data = {}
+            data['country'] = d['key']
+            data['download_counts'] = d['value']
+            data['preview_counts'] = 0
+            unknown_download += d['value']
+            country_list.append(data)
+            mapping[d['key']] = len(country_list) - 1
+        for d in res_preview_total['buckets']:
+            if d['key'] in mapping:
+                country_list[mapping[d['key']]
+                             ]['preview_counts'] = d['value']
+            else:
                 data = {}
                 data['country'] = d['key']
-                data['download_counts'] = d['value']
-                data['preview_counts'] = 0
-                unknown_download += d['value']
+                data['download_counts'] = 0
+                data['preview_counts'] = d['value']
                 country_list.append(data)
-                mapping[d['key']] = len(country_list) - 1
-            for d in res_preview_total['buckets']:
-                if d['key'] in mapping:
-                    country_list[mapping[d['key']]
-                                 ]['preview_counts'] = d['value']
-                else:
-                    data = {}
-                    data['country'] = d['key']
-                    data['download_counts'] = 0
-                    data['preview_counts'] = d['value']
-                    country_list.append(data)
-                unknown_preview += d['value']
-            result['country_list'] = country_list
-            # period
-            if get_period:
-                provide_year = int(getattr(config, 'PROVIDE_PERIOD_YEAR'))
-                sYear = datetime.now().year
-                sMonth = datetime.now().month
-                eYear = sYear - provide_year
-                start = datetime(sYear, sMonth, 15)
-                end = datetime(eYear, 1, 1)
-                while end < start:
-                    period.append(start.strftime('%Y-%m'))
-                    start -= timedelta(days=16)
-                    start = datetime(start.year, start.month, 15)
-                result['period'] = period
-
-            unknown_download = result['download_total'] - unknown_download
-            unknown_preview = result['preview_total'] - unknown_preview
-            if unknown_download or unknown_preview:
-                data = dict(
-                    country=str(getattr(config, 'WEKO_STATS_UNKNOWN_LABEL')),
-                    download_counts=unknown_download,
-                    preview_counts=unknown_preview
-                )
-                country_list.append(data)
-                result['country_list'] = country_list
-        except Exception as e:
-            current_app.logger.debug(e)
-            result['download_total'] = 0
-            result['preview_total'] = 0
-            result['country_list'] = country_list
-            result['period'] = period
-
-        return result
+            unknown_preview += d['value']
+        result['country_list'] = country_list
+
+        unknown_download = result['download_total'] - unknown_download
+        unknown_preview = result['preview_total'] - unknown_preview
+        if unknown_download or unknown_preview:
+            data = dict(
+                country=str(getattr(config, 'WEKO_STATS_UNKNOWN_LABEL')),
+                download_counts=unknown_download,
+                preview_counts=unknown_preview
+            )
+            country_list.append(data)
+        return result, complete
 
     def get(self, **kwargs):
         """Get total file download/preview count."""
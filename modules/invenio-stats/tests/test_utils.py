@@ -21,6 +21,9 @@ from invenio_stats.errors import UnknownQueryError
 from invenio_stats.utils import (
     get_anonymization_salt,
     get_geoip,
+    get_stats_summary_cache_key,
+    clear_stats_summary_cache,
+    get_period_list,
     get_user,
     obj_or_import_string,
     load_or_import_from_config,
@@ -47,6 +50,30 @@ from invenio_stats.utils import (
 def test_get_anonymization_salt(app):
     assert get_anonymization_salt(datetime.datetime(2022, 1, 1))
 
+# def get_stats_summary_cache_key(kind, object_id, query_date=None):
+# def clear_stats_summary_cache(touched):
+def test_stats_summary_cache(app):
+    key = get_stats_summary_cache_key('record', 'abc')
+    month_key = get_stats_summary_cache_key('record', 'abc', '2022-09')
+    assert key == 'stats:summary:record:abc:total'
+    assert month_key == 'stats:summary:record:abc:2022-09'
+    with patch('invenio_stats.utils.current_cache') as cache:
+        clear_stats_summary_cache(set())
+        cache.delete_many.assert_not_called()
+        clear_stats_summary_cache({('record', 'abc', '2022-09')})
+        assert sorted(cache.delete_many.call_args[0]) == sorted([key, month_key])
+
+
+# def get_period_list():
+def test_get_period_list(app):
+    period = get_period_list()
+    now = datetime.datetime.now()
+    assert period[0] == now.strftime('%Y-%m')
+    assert period[-1] == '{}-01'.format(now.year - 5)
+    period.pop()
+    assert get_period_list() != period
+
+
 # def get_geoip(ip):
 # .tox/c1/bin/pytest --cov=invenio_stats tests/test_utils.py::test_get_geoip -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/invenio-stats/.tox/c1/tmp
 def test_get_geoip():
@@ -12,7 +12,8 @@ import uuid
 import pytest
 
 from invenio_accounts.testutils import login_user_via_session
-from invenio_stats.views import QueryFileStatsCount, dbsession_clean
+from invenio_stats.views import QueryFileStatsCount, QueryRecordViewCount, \
+    dbsession_clean
 from flask import url_for
 from mock import patch
 
@@ -174,6 +175,25 @@ def test_query_record_view_count_error(client, db, records):
     assert res.status_code==200
 
 
+# .tox/c1/bin/pytest --cov=invenio_stats tests/test_views.py::test_query_record_view_count_cache -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/invenio-stats/.tox/c1/tmp
+def test_query_record_view_count_cache(app, db):
+    _uuid = str(uuid.uuid4())
+    _res_data = {"count": 5, "buckets": [{"key": "country1", "count": 3}]}
+    cache = {}
+    with patch("invenio_stats.views.current_cache") as current_cache:
+        current_cache.get.side_effect = cache.get
+        current_cache.set.side_effect = lambda k, v, **kw: cache.update({k: v})
+        with patch("invenio_stats.queries.ESTermsQuery.run", return_value=_res_data) as run:
+            res = QueryRecordViewCount()._get_data(_uuid, get_period=True)
+            assert res["total"] == 5
+            assert res["country"] == {"country1": 3, "UNKNOWN": 2}
+            assert res["period"]
+            res = QueryRecordViewCount()._get_data(_uuid)
+            assert res["total"] == 5
+            assert "period" not in res
+            assert run.call_count == 1
+
+
 # class QueryFileStatsCount(WekoQuery):
 # .tox/c1/bin/pytest --cov=invenio_stats tests/test_views.py::test_query_file_stats_count -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/invenio-stats/.tox/c1/tmp
 def test_query_file_stats_count(client, db):
@@ -222,6 +242,22 @@ def test_query_file_stats_count(client, db):
             url_for('invenio_stats.get_file_stats_count', bucket_id=_uuid, file_key='test.pdf'))
         assert res.status_code==200
 
+    # Elasticsearch is unavailable
+    root_file_id = str(uuid.uuid4())
+    with patch("invenio_stats.queries.ESWekoFileStatsQuery.run", side_effect=Exception("error")), \
+            patch("invenio_stats.views.current_cache") as mock_cache:
+        mock_cache.get.return_value = None
+        res = QueryFileStatsCount().get_data(_uuid, 'test.pdf', root_file_id=root_file_id)
+        assert res['download_total'] == 0
+        assert res['preview_total'] == 0
+        mock_cache.set.assert_not_called()
+
+        # the summary is cached once the queries succeed
+        with patch("invenio_stats.queries.ESWekoFileStatsQuery.run", return_value={"value": 20, "buckets": []}):
+            res = QueryFileStatsCount().get_data(_uuid, 'test.pdf', root_file_id=root_file_id)
+            assert res['download_total'] == 20
+            assert mock_cache.set.call_count == 1
+
     # post
     _data1 = {'date': 'total'}
     _data2 = {'date': '2022-09'}
@@ -0,0 +1,114 @@
+import pytest
+from mock import patch, MagicMock
+
+from weko_admin import cache
+from weko_admin.cache import (
+    bump_settings_generation,
+    get_cached_setting,
+    get_settings_generation,
+)
+from weko_admin.models import AdminSettings, SearchManagement
+
+
+class MockRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b'0')) + 1).encode()
+
+
+@pytest.fixture()
+def settings_cache(app):
+    app.config['WEKO_ADMIN_SETTINGS_CACHE_ENABLED'] = True
+    cache._cache.clear()
+    store = MagicMock(redis=MockRedis())
+    with patch('weko_admin.cache._get_store', return_value=store):
+        yield store.redis
+    cache._cache.clear()
+
+
+# def get_settings_generation():
+# .tox/c1/bin/pytest --cov=weko_admin tests/test_cache.py::test_get_settings_generation -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-admin/.tox/c1/tmp
+def test_get_settings_generation(app, settings_cache):
+    with app.test_request_context():
+        assert get_settings_generation() == b'0'
+        settings_cache.data['weko_admin_settings_generation'] = b'1'
+        # read once per request
+        assert get_settings_generation() == b'0'
+    with app.test_request_context():
+        assert get_settings_generation() == b'1'
+
+    with patch('weko_admin.cache._get_store', side_effect=Exception('error')):
+        with app.test_request_context():
+            assert get_settings_generation() is None
+
+
+# def bump_settings_generation():
+# def get_cached_setting(key, loader):
+# .tox/c1/bin/pytest --cov=weko_admin tests/test_cache.py::test_get_cached_setting -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-admin/.tox/c1/tmp
+def test_get_cached_setting(app, settings_cache):
+    loader = MagicMock(return_value={'a': [1]})
+    with app.test_request_context():
+        value = get_cached_setting('key', loader)
+        assert value == {'a': [1]}
+        value['a'].append(2)
+        assert get_cached_setting('key', loader) == {'a': [1]}
+        assert loader.call_count == 1
+
+        bump_settings_generation()
+        assert settings_cache.data['weko_admin_settings_generation'] == b'1'
+        assert get_cached_setting('key', loader) == {'a': [1]}
+        assert loader.call_count == 2
+
+    # least recently used values are dropped
+    app.config['WEKO_ADMIN_SETTINGS_CACHE_SIZE'] = 2
+    with app.test_request_context():
+        for key in ('key1', 'key2', 'key1', 'key3'):
+            get_cached_setting(key, loader)
+        assert list(cache._cache) == ['key1', 'key3']
+
+    # disabled
+    app.config['WEKO_ADMIN_SETTINGS_CACHE_ENABLED'] = False
+    with app.test_request_context():
+        get_cached_setting('key1', loader)
+        get_cached_setting('key1', loader)
+    assert loader.call_count == 7
+
+
+# def get_cached_row(key, loader):
+# def watch_settings_model(model):
+# .tox/c1/bin/pytest --cov=weko_admin tests/test_cache.py::test_get_cached_row -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-admin/.tox/c1/tmp
+def test_get_cached_row(app, db, settings_cache):
+    with app.test_request_context():
+        assert AdminSettings.get('test_settings') is None
+    AdminSettings.update('test_settings', {'key': 'value'})
+    assert settings_cache.data['weko_admin_settings_generation'] == b'1'
+
+    with app.test_request_context():
+        assert AdminSettings.get('test_settings', False) == {'key': 'value'}
+        with patch.object(AdminSettings, 'query') as mock_query:
+            assert AdminSettings.get('test_settings').key == 'value'
+            assert mock_query.filter_by.call_count == 0
+
+    # rows written with the session invalidate the cache
+    with app.test_request_context():
+        setting = AdminSettings.query.filter_by(name='test_settings').one()
+        setting.settings = {'key': 'new'}
+        db.session.commit()
+    with app.test_request_context():
+        assert AdminSettings.get('test_settings', False) == {'key': 'new'}
+
+    # bulk deletes too
+    with app.test_request_context():
+        SearchManagement.create({'dlt_dis_num_selected': 10})
+        row = SearchManagement.get()
+        assert row.default_dis_num == 10
+        assert row not in db.session
+        SearchManagement.query.delete()
+        db.session.commit()
+    with app.test_request_context():
+        assert SearchManagement.get() is None
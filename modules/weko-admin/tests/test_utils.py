@@ -38,6 +38,7 @@ from weko_admin.utils import (
     is_exists_key_in_redis,
     is_exists_key_or_empty_in_redis,
     get_redis_cache,
+    get_redis_caches,
     StatisticMail,
     get_system_default_language,
     str_to_bool,
@@ -560,6 +561,21 @@ def test_get_redis_cache(redis_connect,mocker):
         result = get_redis_cache("test_key")
         assert result == None
 
+
+# def get_redis_caches(*cache_keys):
+# .tox/c1/bin/pytest --cov=weko_admin tests/test_utils.py::test_get_redis_caches -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-admin/.tox/c1/tmp
+def test_get_redis_caches(redis_connect,mocker):
+    mocker.patch("weko_admin.utils.RedisConnection.connection",return_value=redis_connect)
+    redis_connect.delete("test_key2")
+    redis_connect.put("test_key1",bytes("test_value","utf-8"))
+    result = get_redis_caches("test_key1", "test_key2")
+    assert result == ["test_value", None]
+
+    # raise Exception
+    with patch("weko_admin.utils.RedisConnection.connection", side_effect=Exception("test_error")):
+        result = get_redis_caches("test_key1", "test_key2")
+        assert result == [None, None]
+
 # def get_system_default_language():
 # .tox/c1/bin/pytest --cov=weko_admin tests/test_utils.py::test_get_system_default_language -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-admin/.tox/c1/tmp
 def test_get_system_default_language(language_setting):
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+"""Process-local cache of settings rows.
+
+Cached values are tagged with a generation counter kept in Redis. Any
+commit writing to a watched settings model increments the counter, so
+every process reloads its settings on the next request.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, class_mapper, object_session
+from weko_redis.redis import RedisConnection
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_watched_models = set()
+
+
+def _get_store():
+    redis_connection = RedisConnection()
+    return redis_connection.connection(
+        db=current_app.config['CACHE_REDIS_DB'], kv=True)
+
+
+def get_settings_generation():
+    """Get the generation of the settings.
+
+    The generation is read from Redis once per request.
+
+    :return: Generation, or None if it cannot be read.
+    """
+    if has_request_context() and 'weko_admin_settings_generation' in g:
+        return g.weko_admin_settings_generation
+    try:
+        generation = _get_store().redis.get(
+            current_app.config['WEKO_ADMIN_SETTINGS_GENERATION_KEY']) or b'0'
+    except Exception as e:
+        current_app.logger.error(
+            'Could not get settings generation: {}'.format(e))
+        generation = None
+    if has_request_context():
+        g.weko_admin_settings_generation = generation
+    return generation
+
+
+def bump_settings_generation():
+    """Invalidate the cached settings of every process."""
+    with _cache_lock:
+        _cache.clear()
+    if has_request_context():
+        g.pop('weko_admin_settings_generation', None)
+    try:
+        _get_store().redis.incr(
+            current_app.config['WEKO_ADMIN_SETTINGS_GENERATION_KEY'])
+    except Exception as e:
+        current_app.logger.error(
+            'Could not bump settings generation: {}'.format(e))
+
+
+def get_cached_setting(key, loader):
+    """Get a settings value from the process cache.
+
+    :param key: Cache key of the value.
+    :param loader: Function loading the value from the database.
+    :return: A copy of the value.
+    """
+    if not current_app.config.get('WEKO_ADMIN_SETTINGS_CACHE_ENABLED'):
+        return loader()
+    generation = get_settings_generation()
+    if generation is None:
+        return loader()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and entry[0] == generation:
+            _cache.move_to_end(key)
+            return copy.deepcopy(entry[1])
+    value = loader()
+    with _cache_lock:
+        _cache[key] = (generation, copy.deepcopy(value))
+        _cache.move_to_end(key)
+        while len(_cache) > current_app.config[
+                'WEKO_ADMIN_SETTINGS_CACHE_SIZE']:
+            _cache.popitem(last=False)
+    return value
+
+
+def get_cached_row(key, loader):
+    """Get a settings row from the process cache.
+
+    :param key: Cache key of the row.
+    :param loader: Function loading the row from the database.
+    :return: A transient copy of the row, or None.
+    """
+    if not current_app.config.get('WEKO_ADMIN_SETTINGS_CACHE_ENABLED'):
+        return loader()
+
+    def load_values():
+        row = loader()
+        if row is None:
+            return None
+        return type(row), {
+            attr.key: getattr(row, attr.key)
+            for attr in class_mapper(type(row)).column_attrs}
+
+    values = get_cached_setting(key, load_values)
+    if values is None:
+        return None
+    model, values = values
+    row = class_mapper(model).class_manager.new_instance()
+    for name, value in values.items():
+        setattr(row, name, value)
+    return row
+
+
+def watch_settings_model(model):
+    """Bump the settings generation when a model is written.
+
+    :param model: Model class of settings rows.
+    """
+    _watched_models.add(model)
+
+    def mark_changed(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info['weko_admin_settings_changed'] = True
+
+    for name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, name, mark_changed)
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _mark_bulk_changed(context):
+    mapper = getattr(context, 'mapper', None)
+    if mapper is not None and mapper.class_ in _watched_models:
+        context.session.info['weko_admin_settings_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_on_commit(session):
+    if session.info.pop('weko_admin_settings_changed', False) \
+            and has_app_context():
+        bump_settings_generation()
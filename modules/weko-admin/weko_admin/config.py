@@ -133,6 +133,15 @@ WEKO_ADMIN_REPORT_DELIVERY_SCHED = {
 WEKO_ADMIN_CACHE_PREFIX = 'admin_cache_{name}_{user_id}'
 """Redis cache."""
 
+WEKO_ADMIN_SETTINGS_CACHE_ENABLED = True
+"""Cache settings rows in each process. Disabled when testing."""
+
+WEKO_ADMIN_SETTINGS_CACHE_SIZE = 256
+"""Maximum number of settings values cached in each process."""
+
+WEKO_ADMIN_SETTINGS_GENERATION_KEY = 'weko_admin_settings_generation'
+"""Redis key of the generation of the cached settings."""
+
 WEKO_ADMIN_OUTPUT_FORMAT = 'tsv'
 """Output file format."""
 
@@ -148,6 +148,10 @@ class WekoAdmin(object):
         # (GOOGLE_TRACKING_ID_USER and ADDTHIS_USER_ID) with the DB values.
         self.overwrite_the_memory_config(app)
 
+        app.config.setdefault(
+            'WEKO_ADMIN_SETTINGS_CACHE_ENABLED',
+            config.WEKO_ADMIN_SETTINGS_CACHE_ENABLED and not app.testing)
+
         for k in dir(config):
             if k.startswith('WEKO_ADMIN_') and k not in excludes:
                 app.config.setdefault(k, getattr(config, k))
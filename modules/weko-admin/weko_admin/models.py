@@ -33,6 +33,8 @@ from sqlalchemy.sql.expression import desc
 from sqlalchemy_utils import Timestamp
 from sqlalchemy_utils.types import JSONType
 
+from .cache import get_cached_row, watch_settings_model
+
 
 class SessionLifetime(db.Model):
     """Session Lifetime model.
@@ -232,10 +234,9 @@ class SearchManagement(db.Model):
     @classmethod
     def get(cls):
         """Get setting."""
-        _id = db.session.query(func.max(SearchManagement.id)).first()[0]
-        if _id is None:
-            return None
-        return cls.query.filter_by(id=_id).one_or_none()
+        return get_cached_row(
+            'search_management',
+            lambda: cls.query.order_by(cls.id.desc()).first())
 
     @classmethod
     def update(cls, id, data):
@@ -1197,7 +1198,9 @@ class AdminSettings(db.Model):
     def get(cls, name, dict_to_object=True):
         """Get settings by name."""
         try:
-            admin_setting_object = cls.query.filter_by(name=name).first()
+            admin_setting_object = get_cached_row(
+                'admin_settings:{}'.format(name),
+                lambda: cls.query.filter_by(name=name).first())
             if admin_setting_object:
                 if dict_to_object:
                     return cls.Dict2Obj(admin_setting_object.settings)
@@ -1927,6 +1930,10 @@ class FacetSearchSetting(db.Model):
         return cls.query.filter_by(mapping=mapping).one_or_none()
 
 
+watch_settings_model(SearchManagement)
+watch_settings_model(AdminSettings)
+
+
 __all__ = ([
     'SearchManagement',
     'AdminLangSettings',
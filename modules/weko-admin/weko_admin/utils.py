@@ -55,7 +55,7 @@ from weko_authors.models import Authors
 from weko_schema_ui.models import PublishStatus
 
 from weko_records.api import ItemsMetadata
-from weko_redis.redis import RedisConnection
+from weko_redis.redis import RedisConnection, get_many
 from elasticsearch import Elasticsearch
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 import weko_schema_ui
@@ -530,7 +530,8 @@ def is_exists_key_or_empty_in_redis(key):
     try:
         redis_connection = RedisConnection()
         datastore = redis_connection.connection(db=current_app.config['CACHE_REDIS_DB'], kv = True)
-        return datastore.redis.exists(key) and datastore.redis.get(key) != b''
+        value = datastore.redis.get(key)
+        return value is not None and value != b''
     except Exception as e:
         current_app.logger.error('Could get value for ' + key + ": {}".format(e))
     return False
@@ -541,13 +542,26 @@ def get_redis_cache(cache_key):
     try:
         redis_connection = RedisConnection()
         datastore = redis_connection.connection(db=current_app.config['CACHE_REDIS_DB'], kv = True)
-        if datastore.redis.exists(cache_key):
-            return datastore.get(cache_key).decode('utf-8')
+        value = datastore.redis.get(cache_key)
+        if value is not None:
+            return value.decode('utf-8')
     except Exception as e:
         current_app.logger.error('Could get value for ' + cache_key + ": {}".format(e))
     return None
 
 
+def get_redis_caches(*cache_keys):
+    """Retrieve the values of several Redis cache keys in one round trip."""
+    try:
+        redis_connection = RedisConnection()
+        datastore = redis_connection.connection(db=current_app.config['CACHE_REDIS_DB'], kv = True)
+        return [value.decode('utf-8') if value is not None else None
+                for value in get_many(datastore, cache_keys)]
+    except Exception as e:
+        current_app.logger.error('Could get values for ' + ', '.join(cache_keys) + ": {}".format(e))
+    return [None] * len(cache_keys)
+
+
 def get_system_default_language():
     """Get system default language.
 
@@ -1,6 +1,6 @@
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_admin.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
 
-from flask import url_for,make_response,json
+from flask import current_app,url_for,make_response,json
 from mock import patch
 import pytest
 
@@ -555,7 +555,7 @@ class TestImportView():
         res =  client.post(url)
         assert_role(res,is_permission)
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_admin.py::TestImportView::test_import_authors -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
-    def test_import_authors(self,client,users,mocker):
+    def test_import_authors(self,client,users,mocker,monkeypatch):
         login_user_via_session(client=client, email=users[0]['email'])
         url = url_for('authors/import.import_authors')
         
@@ -573,24 +573,28 @@ class TestImportView():
                 pass
             @property
             def children(self):
-                return [self.MockTask(id) for id in range(4)]
+                return [self.MockTask(id) for id in range(2)]
             
             class MockTask:
                 def __init__(self,id):
                     self.task_id = id
         data = {"records":[
-            {"pk_id":"test_id0"},{"pk_id":"test_id1"},{"pk_id":"test_id2"},{"pk_id":"test_id3"}
+            {"pk_id":"test_id0"},{"pk_id":"test_id1"},{"pk_id":"test_id2"}
         ]}
         
+        monkeypatch.setitem(current_app.config,"WEKO_AUTHORS_IMPORT_BATCH_SIZE",2)
+        mock_import = mocker.patch("weko_authors.admin.import_authors.s")
         mocker.patch("weko_authors.admin.group.apply_async",return_value=MockTaskGroup())
         res = client.post(url,json=data)
         test = {
             "status":"success",
             "data":{
                 "group_task_id":1,
-                "tasks":[{"task_id":0,"record_id":"test_id0","status":"PENDING"},{"task_id":1,"record_id":"test_id1","status":"PENDING"},{"task_id":2,"record_id":"test_id2","status":"PENDING"},{"task_id":3,"record_id":"test_id3","status":"PENDING"}]
+                "tasks":[{"task_id":"0_0","record_id":"test_id0","status":"PENDING"},{"task_id":"0_1","record_id":"test_id1","status":"PENDING"},{"task_id":"1_0","record_id":"test_id2","status":"PENDING"}]
             }
         }
+        assert mock_import.call_args_list[0][0][0] == [{"pk_id":"test_id0"},{"pk_id":"test_id1"}]
+        assert mock_import.call_args_list[1][0][0] == [{"pk_id":"test_id2"}]
         assert json.loads(res.data) == test
 
     # def check_import_status(self):
@@ -652,4 +656,26 @@ class TestImportView():
         ]
         res = client.post(url,json=data)
         assert res.status_code == 200
-        assert json.loads(res.data) == test
\ No newline at end of file
+        assert json.loads(res.data) == test
+
+        # rows of import_authors
+        class MockChunkResult:
+            def __init__(self,result):
+                self.result = result
+        chunks = {
+            "chunk1":MockChunkResult([
+                {"start_date":"2022-10-01 01:02:03","end_date":"2022-10-01 02:03:04","status":"SUCCESS"},
+                {"start_date":"2022-10-01 01:02:03","end_date":"2022-10-01 02:03:04","status":"FAILURE","error_id":"delete_author_link"}]),
+            "chunk2":MockChunkResult(None)
+        }
+        mock_chunk = mocker.patch("weko_authors.admin.import_authors.AsyncResult",side_effect=lambda x:chunks[x])
+        data = {"tasks":["chunk1_0","chunk1_1","chunk2_0"]}
+        test = [
+            {"task_id":"chunk1_0","start_date":"2022-10-01 01:02:03","end_date":"2022-10-01 02:03:04","status":"SUCCESS","error_id":None},
+            {"task_id":"chunk1_1","start_date":"2022-10-01 01:02:03","end_date":"2022-10-01 02:03:04","status":"FAILURE","error_id":"delete_author_link"},
+            {"task_id":"chunk2_0","start_date":"","end_date":"","status":"PENDING","error_id":None}
+        ]
+        res = client.post(url,json=data)
+        assert res.status_code == 200
+        assert json.loads(res.data) == test
+        assert mock_chunk.call_count == 2
\ No newline at end of file
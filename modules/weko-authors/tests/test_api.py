@@ -3,6 +3,8 @@ import json
 import pytest
 from invenio_indexer.api import RecordIndexer
 
+from invenio_db import db
+
 from weko_authors.api import WekoAuthors
 from weko_authors.models import Authors, AuthorsPrefixSettings
 from weko_authors.config import WEKO_AUTHORS_FILE_MAPPING
@@ -104,6 +106,73 @@ class TestWekoAuthors:
             with pytest.raises(Exception):
                 WekoAuthors.update(author_id,data)
             
+#     def bulk_import(cls, authors):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_api.py::TestWekoAuthors::test_bulk_import -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+    def test_bulk_import(self,app,authors,mocker):
+        mock_indexer = mocker.patch("weko_authors.api.RecordIndexer")
+        mock_indexer.return_value.client.search.return_value = \
+            {"hits":{"total":1,"hits":[{"_id":"es1","_source":{"pk_id":"1"}}]}}
+        mocker.patch("weko_authors.api.Authors.get_sequence",return_value=100)
+        mock_streaming_bulk = mocker.patch("weko_authors.api.streaming_bulk",return_value=[
+            (True,{"update":{"_id":"es1"}}),
+            (True,{"index":{"_id":"es100"}}),
+        ])
+        data = [
+            {"pk_id":"1","is_deleted":True,"authorIdInfo":[]},
+            {"pk_id":"1000","is_deleted":False,"authorIdInfo":[]},
+            {"is_deleted":False,"authorIdInfo":[]},
+        ]
+        result = WekoAuthors.bulk_import(data)
+        assert result == [None,"Author 1000 does not exist.",None]
+        actions = mock_streaming_bulk.call_args[0][1]
+        assert [action["_op_type"] for action in actions] == ["update","index"]
+        assert actions[0]["_id"] == "es1"
+        author = Authors.query.filter_by(id=1).one()
+        assert author.is_deleted == True
+        assert json.loads(author.json)["id"] == "es1"
+        author = Authors.query.filter_by(id=100).one()
+        assert json.loads(author.json) == {
+            "is_deleted":False,"pk_id":"100","gather_flg":0,"id":"es100",
+            "authorIdInfo":[{"idType":"1","authorId":"100","authorIdShowFlg":"true"}]}
+
+        # failed to index
+        mocker.patch("weko_authors.api.Authors.get_sequence",return_value=101)
+        mocker.patch("weko_authors.api.streaming_bulk",return_value=[
+            (False,{"index":{"error":"test_error"}}),
+        ])
+        result = WekoAuthors.bulk_import([{"is_deleted":False,"authorIdInfo":[]}])
+        assert result == ["test_error"]
+        assert Authors.query.filter_by(id=101).one_or_none() is None
+
+        # failed to save, remove created documents
+        mocker.patch("weko_authors.api.Authors.get_sequence",return_value=102)
+        mocker.patch("weko_authors.api.streaming_bulk",return_value=[
+            (True,{"index":{"_id":"es102"}}),
+        ])
+        mock_bulk = mocker.patch("weko_authors.api.bulk")
+        with patch("weko_authors.api.db.session.add",side_effect=Exception("test_error")):
+            with pytest.raises(Exception):
+                WekoAuthors.bulk_import([{"is_deleted":False,"authorIdInfo":[]}])
+        assert mock_bulk.call_args[0][1][0]["_id"] == "es102"
+        assert mock_bulk.call_args[0][1][0]["_op_type"] == "delete"
+
+        # failed to save, restore updated documents
+        mocker.patch("weko_authors.api.streaming_bulk",return_value=[
+            (True,{"update":{"_id":"es1"}}),
+        ])
+        mock_bulk = mocker.patch("weko_authors.api.bulk")
+        with patch("weko_authors.api.db.session.commit",side_effect=Exception("test_error")):
+            with pytest.raises(Exception):
+                WekoAuthors.bulk_import([{"pk_id":"1","is_deleted":False,"authorIdInfo":[]}])
+        assert mock_bulk.call_args[0][1] == [{
+            "_op_type":"index",
+            "_index":app.config["WEKO_AUTHORS_ES_INDEX_NAME"],
+            "_type":app.config["WEKO_AUTHORS_ES_DOC_TYPE"],
+            "_id":"es1",
+            "_source":{"pk_id":"1"},
+        }]
+        assert "_source" not in mock_indexer.return_value.client.search.call_args[1]["body"]
+
 #     def get_all(cls, with_deleted=True, with_gather=True):
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_api.py::TestWekoAuthors::test_get_all -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
     def test_get_all(self,app,authors):
@@ -180,5 +249,35 @@ class TestWekoAuthors:
         assert label_jp == ["#WEKO ID","姓[0]","名[0]","言語[0]","フォーマット[0]","姓名・言語 表示／非表示[0]","外部著者ID 識別子[0]","外部著者ID[0]","外部著者ID 表示／非表示[0]","メールアドレス[0]","削除フラグ"]
         
         assert data == [[None,None,None,None,None,None,None,None,None,None,None]]
-        
-        
+
+#     def iter_all(cls, with_deleted=True, with_gather=True, batch_size=None):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_api.py::TestWekoAuthors::test_iter_all -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+    def test_iter_all(self,app,authors):
+        result = list(WekoAuthors.iter_all(batch_size=1))
+        assert [author.id for author in result] == [author.id for author in authors]
+        assert result[0].json == authors[0].json
+
+        authors[0].is_deleted = True
+        db.session.commit()
+        result = list(WekoAuthors.iter_all(with_deleted=False, batch_size=1))
+        assert [author.id for author in result] == [authors[1].id]
+
+#     def get_max_count_of_mappings(cls, mappings, with_deleted=True, with_gather=True):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_api.py::TestWekoAuthors::test_get_max_count_of_mappings -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+    def test_get_max_count_of_mappings(self,app,authors):
+        count, max_counts = WekoAuthors.get_max_count_of_mappings(WEKO_AUTHORS_FILE_MAPPING)
+        assert count == 2
+        assert max_counts == {"authorNameInfo":1,"authorIdInfo":2,"emailInfo":1}
+
+        count, max_counts = WekoAuthors.get_max_count_of_mappings(
+            WEKO_AUTHORS_FILE_MAPPING, with_gather=False)
+        assert count == 2
+
+#     def iter_export_data(cls, mappings=None, schemes=None):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_api.py::TestWekoAuthors::test_iter_export_data -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+    def test_iter_export_data(self,app,authors,mocker):
+        scheme_info={"1":{"scheme":"WEKO","url":None},"2":{"scheme":"ORCID","url":"https://orcid.org/##"}}
+        mocker.patch("weko_authors.api.WekoAuthors.get_identifier_scheme_info",return_value=scheme_info)
+        result = list(WekoAuthors.iter_export_data())
+        assert result == list(WekoAuthors.prepare_export_data(None,authors,scheme_info)[:3]) \
+            + WekoAuthors.prepare_export_data(None,authors,scheme_info)[3]
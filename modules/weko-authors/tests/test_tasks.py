@@ -3,7 +3,7 @@ from mock import patch
 
 from invenio_cache import current_cache
 
-from weko_authors.tasks import export_all,import_author,check_is_import_available
+from weko_authors.tasks import export_all,import_author,import_authors,check_is_import_available
 
 
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_tasks.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
@@ -41,6 +41,19 @@ def test_import_author(app):
         result = import_author("test author")
         assert result["status"] == "FAILURE"
 
+# def import_authors(authors):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_tasks.py::test_import_authors -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+def test_import_authors(app):
+    with patch("weko_authors.tasks.import_authors_to_system",return_value=[{"status":"SUCCESS"},{"status":"FAILURE","error_id":"1"}]):
+        result = import_authors(["author1","author2"])
+        assert [r["status"] for r in result] == ["SUCCESS","FAILURE"]
+        assert result[1]["error_id"] == "1"
+        assert result[0]["start_date"] and result[0]["end_date"]
+
+    with patch("weko_authors.tasks.import_authors_to_system",side_effect=Exception("test_error")):
+        result = import_authors(["author1","author2"])
+        assert [r["status"] for r in result] == ["FAILURE","FAILURE"]
+
 # def check_is_import_available(group_task_id=None):
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_tasks.py::test_check_is_import_available -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
 def test_check_is_import_available(app,mocker):
@@ -1,4 +1,6 @@
 
+import csv
+import io
 from os.path import dirname, join
 import pytest
 from mock import patch
@@ -17,6 +19,7 @@ from weko_authors.utils import (
     delete_export_status,
     get_export_url,
     save_export_url,
+    ExportStream,
     export_authors,
     check_import_data,
     getEncode,
@@ -29,7 +32,9 @@ from weko_authors.utils import (
     set_record_status,
     flatten_authors_mapping,
     import_author_to_system,
-    get_count_item_link
+    import_authors_to_system,
+    get_count_item_link,
+    get_count_item_links
 )
 
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py -vv -s --cov-branch --cov-report=term --cov-report=html --basetemp=/code/modules/weko-authors/.tox/c1/tmp
@@ -131,7 +136,6 @@ def test_save_export_url(app):
 # def export_authors():
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py::test_export_authors -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
 def test_export_authors(app,authors,location,file_instance,mocker):
-    mocker.patch("weko_authors.utils.WekoAuthors.get_all",return_value=authors)
     scheme_info={"1":{"scheme":"WEKO","url":None},"2":{"scheme":"ORCID","url":"https://orcid.org/##"}}
     mocker.patch("weko_authors.utils.WekoAuthors.get_identifier_scheme_info",return_value=scheme_info)
     header = ["#pk_id","authorNameInfo[0].familyName","authorNameInfo[0].firstName","authorNameInfo[0].language","authorNameInfo[0].nameFormat","authorNameInfo[0].nameShowFlg","authorIdInfo[0].idType","authorIdInfo[0].authorId","authorIdInfo[0].authorIdShowFlg","emailInfo[0].email","is_deleted"]
@@ -139,7 +143,7 @@ def test_export_authors(app,authors,location,file_instance,mocker):
     label_jp=["#WEKO ID","姓[0]","名[0]","言語[0]","フォーマット[0]","姓名・言語 表示／非表示[0]","外部著者ID 識別子[0]","外部著者ID[0]","外部著者ID 表示／非表示[0]","メールアドレス[0]","削除フラグ"]
     row_data = [["1","テスト","太郎","ja","familyNmAndNm","Y","ORCID","1234","Y","test.taro@test.org",""],
             ["2","test","smith","en","familyNmAndNm","Y","ORCID","5678","Y","test.smith@test.org",""]]
-    mocker.patch("weko_authors.utils.WekoAuthors.prepare_export_data",return_value=(header,label_en,label_jp,row_data))
+    mocker.patch("weko_authors.utils.WekoAuthors.iter_export_data",side_effect=lambda *args:iter([header,label_en,label_jp,*row_data]))
     with patch("weko_authors.utils.get_export_url",return_value={}):
         result = export_authors()
         assert result
@@ -151,10 +155,28 @@ def test_export_authors(app,authors,location,file_instance,mocker):
         assert result == "/var/tmp/test_dir"
     
     # raise Exception
-    with patch("weko_authors.utils.WekoAuthors.get_all", side_effect=Exception("test_error")):
+    with patch("weko_authors.utils.WekoAuthors.iter_export_data", side_effect=Exception("test_error")):
         result = export_authors()
         assert result == None
 
+# class ExportStream(io.RawIOBase):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py::test_export_stream -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+def test_export_stream():
+    rows = [["#pk_id","name"],["1","テスト"],["2","a,b"],["3",None]] * 100
+    reader = io.BufferedReader(ExportStream(
+        iter(rows), delimiter=',', quotechar='"',
+        quoting=csv.QUOTE_MINIMAL, lineterminator='\n'), buffer_size=16)
+    data = b""
+    while True:
+        chunk = reader.read(10)
+        if not chunk:
+            break
+        data += chunk
+    file_io = io.StringIO()
+    csv.writer(file_io, delimiter=',', quotechar='"',
+               quoting=csv.QUOTE_MINIMAL, lineterminator='\n').writerows(rows)
+    assert data == file_io.getvalue().encode("utf-8-sig")
+
 # def check_import_data(file_name: str, file_content: str):
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py::test_check_import_data -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
 def test_check_import_data(app,mocker):
@@ -647,6 +669,30 @@ def test_import_author_to_system(app,mocker):
     }
     with pytest.raises(Exception):
         import_author_to_system(author)
+# def import_authors_to_system(authors):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py::test_import_authors_to_system -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+def test_import_authors_to_system(app,mocker):
+    mock_links = mocker.patch("weko_authors.utils.get_count_item_links",return_value={"2":1})
+    mock_bulk_import = mocker.patch("weko_authors.utils.WekoAuthors.bulk_import",return_value=[None,"test_error"])
+    authors = [
+        {"status":"new","pk_id":"","is_deleted":""},
+        {"status":"deleted","pk_id":"2","is_deleted":"D"},
+        {"status":"update","pk_id":"3","is_deleted":"","emailInfo":[{"email":"test.taro@test.org"}]},
+    ]
+    result = import_authors_to_system(authors)
+    assert result == [{"status":"SUCCESS"},{"status":"FAILURE","error_id":"delete_author_link"},{"status":"FAILURE"}]
+    mock_links.assert_called_with(["2"])
+    mock_bulk_import.assert_called_with([
+        {"is_deleted":False,"authorIdInfo":[],"emailInfo":[]},
+        {"pk_id":"3","is_deleted":False,"emailInfo":[{"email":"test.taro@test.org"}],
+         "authorIdInfo":[{"idType":"1","authorId":"3","authorIdShowFlg":"true"}]},
+    ])
+
+    # bulk import failed
+    mocker.patch("weko_authors.utils.WekoAuthors.bulk_import",side_effect=Exception("test_error"))
+    result = import_authors_to_system([{"status":"new"}])
+    assert result == [{"status":"FAILURE"}]
+
 # def get_count_item_link(pk_id):
 # .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py::test_get_count_item_link -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
 def test_get_count_item_link(app,mocker):
@@ -666,4 +712,18 @@ def test_get_count_item_link(app,mocker):
     
     record_indexer.client.return_data={"hits":{"total":10}}
     result = get_count_item_link(1)
-    assert result == 10
\ No newline at end of file
+    assert result == 10
+
+# def get_count_item_links(pk_ids):
+# .tox/c1/bin/pytest --cov=weko_authors tests/test_utils.py::test_get_count_item_links -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-authors/.tox/c1/tmp
+def test_get_count_item_links(app,mocker):
+    mock_indexer = mocker.patch("weko_authors.utils.RecordIndexer")
+    mock_indexer.return_value.client.search.return_value = None
+    assert get_count_item_links(["1","2"]) == {}
+
+    mock_indexer.return_value.client.search.return_value = {
+        "aggregations":{"author_link":{"buckets":[{"key":"1","doc_count":3}]}}}
+    assert get_count_item_links(["1","2"]) == {"1":3}
+    body = mock_indexer.return_value.client.search.call_args[1]["body"]
+    assert body["query"] == {"terms":{"author_link.raw":["1","2"]}}
+    assert body["aggs"]["author_link"]["terms"]["include"] == ["1","2"]
@@ -36,7 +36,8 @@ from weko_workflow.utils import update_cache_data
 from .config import WEKO_AUTHORS_EXPORT_FILE_NAME, \
     WEKO_AUTHORS_IMPORT_CACHE_KEY
 from .permissions import author_permission
-from .tasks import check_is_import_available, export_all, import_author
+from .tasks import check_is_import_available, export_all, import_author, \
+    import_authors
 from .utils import check_import_data, delete_export_status, \
     get_export_status, get_export_url, set_export_status
 
@@ -234,18 +235,21 @@ class ImportView(BaseView):
             'records', []) if not item.get('errors')]
         
         group_tasks = []
-        for author in records:
-            group_tasks.append(import_author.s(author))
+        batch_size = current_app.config['WEKO_AUTHORS_IMPORT_BATCH_SIZE']
+        for idx in range(0, len(records), batch_size):
+            group_tasks.append(import_authors.s(records[idx:idx + batch_size]))
 
         # handle import tasks
         import_task = group(group_tasks).apply_async()
         import_task.save()
         for idx, task in enumerate(import_task.children):
-            tasks.append({
-                'task_id': task.task_id,
-                'record_id': records[idx].get('pk_id'),
-                'status': 'PENDING'
-            })
+            chunk = records[idx * batch_size:(idx + 1) * batch_size]
+            for row, author in enumerate(chunk):
+                tasks.append({
+                    'task_id': '{}_{}'.format(task.task_id, row),
+                    'record_id': author.get('pk_id'),
+                    'status': 'PENDING'
+                })
 
         response_data = {
             'group_task_id': import_task.id,
@@ -270,15 +274,26 @@ class ImportView(BaseView):
         result = []
         data = request.get_json() or {}
         if data and data.get('tasks'):
+            chunk_results = {}
             for task_id in data.get('tasks'):
-                task = import_author.AsyncResult(task_id)
-                start_date = task.result['start_date'] if task.result else ''
-                end_date = task.result['end_date'] if task.result else ''
+                # '<chunk task id>_<row>' refers to a row of import_authors
+                chunk_id, _, row = str(task_id).rpartition('_')
+                if chunk_id:
+                    if chunk_id not in chunk_results:
+                        chunk_results[chunk_id] = \
+                            import_authors.AsyncResult(chunk_id).result
+                    task_result = chunk_results[chunk_id]
+                    task_result = task_result[int(row)] \
+                        if isinstance(task_result, list) else None
+                else:
+                    task_result = import_author.AsyncResult(task_id).result
+                start_date = task_result['start_date'] if task_result else ''
+                end_date = task_result['end_date'] if task_result else ''
                 status = states.PENDING
                 error_id = None
-                if task.result and task.result.get('status'):
-                    status = task.result.get('status')
-                    error_id = task.result.get('error_id')
+                if task_result and task_result.get('status'):
+                    status = task_result.get('status')
+                    error_id = task_result.get('error_id')
                 result.append({
                     "task_id": task_id,
                     "start_date": start_date,
@@ -22,9 +22,11 @@
 import json
 from copy import deepcopy
 
+from elasticsearch.helpers import bulk, streaming_bulk
 from flask import current_app, json
 from invenio_db import db
 from invenio_indexer.api import RecordIndexer
+from sqlalchemy import case, literal_column
 from sqlalchemy.sql.functions import func
 
 from weko_authors.config import WEKO_AUTHORS_FILE_MAPPING
@@ -136,6 +138,131 @@ class WekoAuthors(object):
                 )
             raise ex
 
+    @classmethod
+    def bulk_import(cls, authors):
+        """Create or update authors in bulk.
+
+        Authors with ``pk_id`` are updated, the others are created. The
+        author documents are indexed with one bulk request and the rows
+        are saved in one transaction. If the transaction fails, created
+        documents are deleted and updated ones are restored.
+
+        :param authors: List of author metadata.
+        :return: List of error messages, None for the imported authors.
+        """
+        session = db.session
+        client = RecordIndexer().client
+        config_index = current_app.config['WEKO_AUTHORS_ES_INDEX_NAME']
+        config_doc_type = current_app.config['WEKO_AUTHORS_ES_DOC_TYPE']
+        errors = [None] * len(authors)
+
+        update_ids = [data['pk_id'] for data in authors if data.get('pk_id')]
+        existed_authors = {}
+        es_ids = {}
+        es_sources = {}
+        if update_ids:
+            for author in Authors.query.filter(
+                    Authors.id.in_([int(pk_id) for pk_id in update_ids])).all():
+                existed_authors[str(author.id)] = author
+            es_authors = client.search(
+                index=config_index,
+                doc_type=config_doc_type,
+                body={
+                    "query": {"terms": {"pk_id": update_ids}},
+                    "size": len(update_ids)
+                }
+            )
+            for hit in es_authors['hits']['hits']:
+                es_ids.setdefault(hit['_source']['pk_id'], hit['_id'])
+                es_sources[hit['_id']] = hit['_source']
+
+        targets = []
+        actions = []
+        for idx, data in enumerate(authors):
+            es_id = None
+            if data.get('pk_id'):
+                author = existed_authors.get(data['pk_id'])
+                if not author:
+                    errors[idx] = 'Author {} does not exist.'.format(
+                        data['pk_id'])
+                    continue
+                if not data.get('is_deleted'):
+                    data['is_deleted'] = author.is_deleted
+                es_id = es_ids.get(data['pk_id'])
+            else:
+                new_id = Authors.get_sequence(session)
+                data["pk_id"] = str(new_id)
+                data["gather_flg"] = 0
+                data["authorIdInfo"].insert(
+                    0,
+                    {
+                        "idType": "1",
+                        "authorId": str(new_id),
+                        "authorIdShowFlg": "true"
+                    }
+                )
+
+            action = {
+                '_index': config_index,
+                '_type': config_doc_type
+            }
+            if es_id:
+                action.update({'_op_type': 'update', '_id': es_id, 'doc': data})
+            else:
+                action.update({'_op_type': 'index', '_source': data})
+            targets.append(idx)
+            actions.append(action)
+
+        created_ids = []
+        updated_ids = []
+        indexed = []
+        for idx, (ok, item) in zip(targets, list(streaming_bulk(
+                client, actions, raise_on_error=False,
+                raise_on_exception=False))):
+            op_type, info = item.popitem()
+            if not ok:
+                errors[idx] = str(info.get('error', info))
+                continue
+            if op_type == 'index':
+                created_ids.append(info['_id'])
+            else:
+                updated_ids.append(info['_id'])
+            authors[idx]['id'] = info['_id']
+            indexed.append(idx)
+
+        try:
+            with session.begin_nested():
+                for idx in indexed:
+                    data = authors[idx]
+                    author = existed_authors.get(data['pk_id'])
+                    if author:
+                        if data.get('is_deleted'):
+                            author.is_deleted = True
+                        author.json = json.dumps(data)
+                    else:
+                        session.add(Authors(id=int(data['pk_id']),
+                                            json=json.dumps(data)))
+            session.commit()
+        except Exception as ex:
+            session.rollback()
+            revert = [{
+                '_op_type': 'delete',
+                '_index': config_index,
+                '_type': config_doc_type,
+                '_id': es_id
+            } for es_id in created_ids]
+            revert += [{
+                '_op_type': 'index',
+                '_index': config_index,
+                '_type': config_doc_type,
+                '_id': es_id,
+                '_source': es_sources[es_id]
+            } for es_id in updated_ids]
+            if revert:
+                bulk(client, revert, raise_on_error=False)
+            raise ex
+        return errors
+
     @classmethod
     def get_all(cls, with_deleted=True, with_gather=True):
         """Get all authors."""
@@ -185,33 +312,84 @@ class WekoAuthors(object):
         return result
 
     @classmethod
-    def prepare_export_data(cls, mappings, authors, schemes):
-        """Prepare export data of all authors."""
+    def iter_all(cls, with_deleted=True, with_gather=True, batch_size=None):
+        """Iterate all authors in pages of ``batch_size`` authors.
+
+        The authors are paged by id so that only one page is loaded at a
+        time. Each author has ``id`` and ``json``.
+        """
+        if not batch_size:
+            batch_size = current_app.config['WEKO_AUTHORS_EXPORT_BATCH_SIZE']
+        filters = []
+        if not with_deleted:
+            filters.append(Authors.is_deleted.is_(False))
+        if not with_gather:
+            filters.append(Authors.gather_flg == 0)
+        query = db.session.query(Authors.id, Authors.json).filter(*filters)
+
+        last_id = None
+        while True:
+            page_query = query
+            if last_id is not None:
+                page_query = page_query.filter(Authors.id > last_id)
+            authors = page_query.order_by(Authors.id).limit(batch_size).all()
+            if not authors:
+                break
+            for author in authors:
+                yield author
+            last_id = authors[-1].id
+
+    @classmethod
+    def get_max_count_of_mappings(cls, mappings, with_deleted=True,
+                                  with_gather=True):
+        """Get max count of items of the multiple mappings.
+
+        The counts are aggregated by the database with one query.
+
+        :return: Number of authors and dict of json_id and max count.
+        """
+        # author json is saved as a json string
+        author_json = literal_column(
+            "CASE jsonb_typeof(authors.json) "
+            "WHEN 'string' THEN (authors.json #>> '{}')::jsonb "
+            "ELSE authors.json END")
+        json_ids = [mapping['json_id'] for mapping in mappings
+                    if mapping.get('child')]
+        columns = [func.count(Authors.id)]
+        for json_id in json_ids:
+            value = author_json.op('->')(json_id)
+            columns.append(func.max(case(
+                [(func.jsonb_typeof(value) == 'array',
+                  func.jsonb_array_length(value))],
+                else_=0)))
+
+        filters = []
+        if not with_deleted:
+            filters.append(Authors.is_deleted.is_(False))
+        if not with_gather:
+            filters.append(Authors.gather_flg == 0)
+        result = db.session.query(*columns).filter(*filters).one()
+        return result[0], {json_id: count or 0
+                           for json_id, count in zip(json_ids, result[1:])}
+
+    @classmethod
+    def prepare_export_header(cls, mappings, max_counts, has_authors=True):
+        """Prepare header and label rows of export data.
+
+        Set ``max`` of the multiple mappings from ``max_counts``.
+        """
         row_header = []
         row_label_en = []
         row_label_jp = []
-        row_data = []
-
-        if not mappings:
-            mappings = deepcopy(WEKO_AUTHORS_FILE_MAPPING)
-        if not authors:
-            authors = cls.get_all(with_deleted=False, with_gather=False)
-        if not schemes:
-            schemes = cls.get_identifier_scheme_info()
-
-        # calc max item of multiple case and prepare header, label
         for mapping in mappings:
             if mapping.get('child'):
-                if not authors:
+                if not has_authors:
                     mapping['max'] = 1
                 else:
-                    mapping['max'] = max(
-                        list(map(lambda x: len(json.loads(x.json).get(
-                            mapping['json_id'], [])), authors))
-                    )
+                    mapping['max'] = max_counts.get(mapping['json_id'], 0)
                     if mapping['max'] == 0:
                         mapping['max'] = 1
-                if authors and mapping['json_id'] == 'authorIdInfo':
+                if has_authors and mapping['json_id'] == 'authorIdInfo':
                     if mapping['max'] > 1:
                         mapping['max'] -= 1
 
@@ -230,53 +408,94 @@ class WekoAuthors(object):
         row_header[0] = '#' + row_header[0]
         row_label_en[0] = '#' + row_label_en[0]
         row_label_jp[0] = '#' + row_label_jp[0]
+        return row_header, row_label_en, row_label_jp
 
-        # handle data rows
-        for author in authors:
-            json_data = json.loads(author.json)
-            row = []
-            for mapping in mappings:
-                if mapping.get('child'):
-                    data = json_data.get(mapping['json_id'])
-                    idx_start = 0
-                    idx_size = mapping['max']
-                    # ignore WEKO id
-                    if mapping['json_id'] == 'authorIdInfo':
-                        idx_start = 1
-                        idx_size += 1
-
-                    for i in range(idx_start, idx_size):
-                        for child in mapping.get('child'):
-                            if i >= len(data):
-                                row.append(None)
-                            elif 'mask' in child:
-                                row.append(
-                                    child['mask'].get(
-                                        str(data[i].get(
-                                            child['json_id'])).lower(),
-                                        None
-                                    )
+    @classmethod
+    def prepare_export_row(cls, mappings, json_data, schemes):
+        """Prepare export data row of an author."""
+        row = []
+        for mapping in mappings:
+            if mapping.get('child'):
+                data = json_data.get(mapping['json_id'])
+                idx_start = 0
+                idx_size = mapping['max']
+                # ignore WEKO id
+                if mapping['json_id'] == 'authorIdInfo':
+                    idx_start = 1
+                    idx_size += 1
+
+                for i in range(idx_start, idx_size):
+                    for child in mapping.get('child'):
+                        if i >= len(data):
+                            row.append(None)
+                        elif 'mask' in child:
+                            row.append(
+                                child['mask'].get(
+                                    str(data[i].get(
+                                        child['json_id'])).lower(),
+                                    None
                                 )
-                            else:
-                                val = data[i].get(child['json_id'])
-                                if child['json_id'] == 'idType':
-                                    scheme = schemes.get(val)
-                                    row.append(
-                                        scheme['scheme'] if scheme else val)
-                                else:
-                                    row.append(val)
-                else:
-                    if 'mask' in mapping:
-                        row.append(
-                            mapping['mask'].get(
-                                str(json_data.get(
-                                    mapping['json_id'])).lower(),
-                                None
                             )
+                        else:
+                            val = data[i].get(child['json_id'])
+                            if child['json_id'] == 'idType':
+                                scheme = schemes.get(val)
+                                row.append(
+                                    scheme['scheme'] if scheme else val)
+                            else:
+                                row.append(val)
+            else:
+                if 'mask' in mapping:
+                    row.append(
+                        mapping['mask'].get(
+                            str(json_data.get(
+                                mapping['json_id'])).lower(),
+                            None
                         )
-                    else:
-                        row.append(json_data.get(mapping['json_id']))
+                    )
+                else:
+                    row.append(json_data.get(mapping['json_id']))
+        return row
 
-            row_data.append(row)
+    @classmethod
+    def prepare_export_data(cls, mappings, authors, schemes):
+        """Prepare export data of all authors."""
+        if not mappings:
+            mappings = deepcopy(WEKO_AUTHORS_FILE_MAPPING)
+        if not authors:
+            authors = cls.get_all(with_deleted=False, with_gather=False)
+        if not schemes:
+            schemes = cls.get_identifier_scheme_info()
+
+        json_datas = [json.loads(author.json) for author in authors]
+        max_counts = {}
+        for mapping in mappings:
+            if mapping.get('child') and json_datas:
+                max_counts[mapping['json_id']] = max(
+                    len(json_data.get(mapping['json_id'], []))
+                    for json_data in json_datas)
+        row_header, row_label_en, row_label_jp = cls.prepare_export_header(
+            mappings, max_counts, bool(json_datas))
+        row_data = [cls.prepare_export_row(mappings, json_data, schemes)
+                    for json_data in json_datas]
 
         return row_header, row_label_en, row_label_jp, row_data
+
+    @classmethod
+    def iter_export_data(cls, mappings=None, schemes=None):
+        """Iterate export rows of all authors.
+
+        The header and label rows are made from the max counts aggregated
+        by the database, then the authors are read page by page.
+        """
+        if not mappings:
+            mappings = deepcopy(WEKO_AUTHORS_FILE_MAPPING)
+        if not schemes:
+            schemes = cls.get_identifier_scheme_info()
+
+        count, max_counts = cls.get_max_count_of_mappings(
+            mappings, with_deleted=False, with_gather=False)
+        yield from cls.prepare_export_header(mappings, max_counts, count > 0)
+        for author in cls.iter_all(with_deleted=False, with_gather=False):
+            yield cls.prepare_export_row(
+                mappings, json.loads(author.json), schemes)
@@ -65,6 +65,9 @@ WEKO_AUTHORS_EXPORT_FILE_NAME = 'Creator_export_all'
 WEKO_AUTHORS_EXPORT_CACHE_STATUS_KEY = 'weko_authors_export_status'
 WEKO_AUTHORS_EXPORT_CACHE_URL_KEY = 'weko_authors_exported_url'
 
+WEKO_AUTHORS_EXPORT_BATCH_SIZE = 1000
+"""Number of authors read from the database at a time on export."""
+
 WEKO_AUTHORS_FILE_MAPPING = [
     {
         'label_en': 'WEKO ID',
@@ -201,6 +204,9 @@ WEKO_AUTHORS_IMPORT_ENTRYPOINTS = {
 
 WEKO_AUTHORS_IMPORT_CACHE_KEY = 'author_import_cache'
 
+WEKO_AUTHORS_IMPORT_BATCH_SIZE = 100
+"""Number of authors imported by one import task."""
+
 WEKO_AUTHORS_NUM_OF_PAGE = 25
 """Default number of author search results that display in one page."""
 
@@ -29,8 +29,8 @@ from weko_workflow.utils import delete_cache_data, get_cache_data
 
 from weko_authors.config import WEKO_AUTHORS_IMPORT_CACHE_KEY
 
-from .utils import export_authors, import_author_to_system, save_export_url, \
-    set_export_status
+from .utils import export_authors, import_author_to_system, \
+    import_authors_to_system, save_export_url, set_export_status
 
 
 @shared_task
@@ -68,6 +68,27 @@ def import_author(author):
     return result
 
 
+@shared_task
+def import_authors(authors):
+    """Import a chunk of authors.
+
+    The result is a list with the import result of each author, in the
+    same order as ``authors``.
+    """
+    start_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        results = import_authors_to_system(authors)
+    except Exception as ex:
+        current_app.logger.error(ex)
+        results = [{'status': states.FAILURE} for _ in authors]
+
+    end_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for result in results:
+        result['start_date'] = start_date
+        result['end_date'] = end_date
+    return results
+
+
 def check_is_import_available(group_task_id=None):
     """Is import available."""
     result = {
@@ -21,6 +21,7 @@
 """Utils for weko-authors."""
 
 import base64
+import codecs
 import csv
 import io
 import sys
@@ -31,6 +32,7 @@ from functools import reduce
 from operator import getitem
 from sys import stdout
 
+from celery import states
 from flask import current_app
 from flask_babelex import gettext as _
 from invenio_cache import current_cache
@@ -141,28 +143,66 @@ def save_export_url(start_time, end_time, file_uri):
     return data
 
 
+class ExportStream(io.RawIOBase):
+    """Readable stream of export rows written as utf-8-sig csv/tsv.
+
+    Rows are written to the stream only when it is read, so the whole
+    file is never held in memory.
+    """
+
+    def __init__(self, rows, **writer_options):
+        """Initialize the stream.
+
+        :param rows: Iterable of export rows.
+        :param writer_options: Options of :func:`csv.writer`.
+        """
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, **writer_options)
+        self._encoder = codecs.getincrementalencoder('utf-8-sig')()
+        self._pending = bytearray()
+        self._finished = False
+
+    def readable(self):
+        """Return True."""
+        return True
+
+    def readinto(self, b):
+        """Write rows until ``b`` can be filled and copy them into it."""
+        while len(self._pending) < len(b) and not self._finished:
+            row = next(self._rows, None)
+            if row is None:
+                self._pending += self._encoder.encode('', final=True)
+                self._finished = True
+                break
+            self._writer.writerow(row)
+            self._pending += self._encoder.encode(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+        size = min(len(b), len(self._pending))
+        b[:size] = self._pending[:size]
+        del self._pending[:size]
+        return size
+
+
 def export_authors():
     """Export all authors."""
     file_uri = None
     try:
         mappings = deepcopy(WEKO_AUTHORS_FILE_MAPPING)
-        authors = WekoAuthors.get_all(with_deleted=False, with_gather=False)
         schemes = WekoAuthors.get_identifier_scheme_info()
-        row_header, row_label_en, row_label_jp, row_data = \
-            WekoAuthors.prepare_export_data(mappings, authors, schemes)
+        rows = WekoAuthors.iter_export_data(mappings, schemes)
 
         # write file data to a stream
-        file_io = io.StringIO()
         if current_app.config.get('WEKO_ADMIN_OUTPUT_FORMAT', 'tsv').lower() == 'csv':
-            writer = csv.writer(file_io, delimiter=',',
-                                quotechar='"', quoting=csv.QUOTE_MINIMAL,
-                                lineterminator='\n')
+            reader = io.BufferedReader(ExportStream(
+                rows, delimiter=',', quotechar='"',
+                quoting=csv.QUOTE_MINIMAL, lineterminator='\n'))
         else:
-            writer = csv.writer(file_io, delimiter='\t',
-                                quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        writer.writerows([row_header, row_label_en, row_label_jp, *row_data])
-        reader = io.BufferedReader(io.BytesIO(
-            file_io.getvalue().encode("utf-8-sig")))
+            reader = io.BufferedReader(ExportStream(
+                rows, delimiter='\t', quotechar='"',
+                quoting=csv.QUOTE_MINIMAL))
 
         # save data into location
         cache_url = get_export_url()
@@ -593,6 +633,65 @@ def import_author_to_system(author):
             raise ex
 
 
+def import_authors_to_system(authors):
+    """Import a chunk of authors to DB and ES.
+
+    Args:
+        authors (list): Author metadata from tsv/csv.
+
+    Returns:
+        list: Import result of each author.
+    """
+    results = [{'status': states.SUCCESS} for _ in authors]
+    deleted_ids = [author['pk_id'] for author in authors
+                   if author.get('status') == 'deleted']
+    item_links = get_count_item_links(deleted_ids) if deleted_ids else {}
+
+    targets = []
+    for idx, author in enumerate(authors):
+        status = author.pop('status', 'new')
+        author["is_deleted"] = True if author.get("is_deleted") else False
+        if not author.get('authorIdInfo'):
+            author["authorIdInfo"] = []
+
+        if not author.get('emailInfo'):
+            author['emailInfo'] = []
+
+        if status == 'new':
+            author.pop('pk_id', None)
+        else:
+            if status == 'deleted' \
+                    and item_links.get(author['pk_id'], 0) > 0:
+                results[idx] = {'status': states.FAILURE,
+                                'error_id': 'delete_author_link'}
+                continue
+
+            author["authorIdInfo"].insert(
+                0,
+                {
+                    "idType": "1",
+                    "authorId": author['pk_id'],
+                    "authorIdShowFlg": "true"
+                }
+            )
+        targets.append(idx)
+
+    if targets:
+        try:
+            errors = WekoAuthors.bulk_import(
+                [authors[idx] for idx in targets])
+        except Exception as ex:
+            traceback.print_exc(file=sys.stdout)
+            errors = [str(ex)] * len(targets)
+        for idx, error in zip(targets, errors):
+            if error:
+                current_app.logger.error(
+                    'Author id: %s import error. %s'
+                    % (authors[idx].get('pk_id'), error))
+                results[idx] = {'status': states.FAILURE}
+    return results
+
+
 def get_count_item_link(pk_id):
     """Get count of item link of author."""
     count = 0
@@ -611,3 +710,35 @@ def get_count_item_link(pk_id):
             and result_itemCnt['hits']['total'] > 0:
         count = result_itemCnt['hits']['total']
     return count
+
+
+def get_count_item_links(pk_ids):
+    """Get count of item links of authors.
+
+    Args:
+        pk_ids (list): Author ids.
+
+    Returns:
+        dict: Count of items linked to each author.
+    """
+    query_q = {
+        "size": 0,
+        "query": {"terms": {"author_link.raw": pk_ids}},
+        "aggs": {
+            "author_link": {
+                "terms": {
+                    "field": "author_link.raw",
+                    "include": pk_ids,
+                    "size": len(pk_ids)
+                }
+            }
+        }
+    }
+    result = RecordIndexer().client.search(
+        index=current_app.config['SEARCH_UI_SEARCH_INDEX'],
+        body=query_q
+    )
+
+    buckets = (result or {}).get(
+        'aggregations', {}).get('author_link', {}).get('buckets', [])
+    return {bucket['key']: bucket['doc_count'] for bucket in buckets}
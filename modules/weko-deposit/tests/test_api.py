@@ -48,12 +48,14 @@ from six import BytesIO
 from weko_records.utils import get_options_and_order_list
 from elasticsearch import Elasticsearch
 from sqlalchemy.orm.exc import NoResultFound
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from invenio_records.models import RecordMetadata
 from weko_admin.models import AdminSettings
 from weko_records.api import FeedbackMailList, ItemLink, ItemsMetadata, ItemTypes, Mapping,WekoRecord
 from invenio_pidrelations.serializers.utils import serialize_relations
 from weko_deposit.api import WekoDeposit, WekoFileObject, WekoIndexer, \
-    WekoRecord, _FormatSysBibliographicInformation, _FormatSysCreator
+    WekoRecord, _FormatSysBibliographicInformation, _FormatSysCreator, \
+    has_file_content
 from weko_deposit.config import WEKO_DEPOSIT_BIBLIOGRAPHIC_TRANSLATIONS
 from invenio_accounts.testutils import login_user_via_view,login_user_via_session
 from invenio_accounts.models import User
@@ -147,6 +149,16 @@ class TestWekoFileObject:
 # class WekoIndexer(RecordIndexer):
 
 # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoIndexer -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
+# def has_file_content(jrc):
+def test_has_file_content():
+    assert has_file_content({}) is False
+    assert has_file_content({"content": [{"file": ""}]}) is False
+    assert has_file_content(
+        {"content": [{"attachment": {"content": "text"}}]}) is False
+    assert has_file_content(
+        {"content": [{"attachment": {"content": "text"}}, {"file": "dGVzdA=="}]}) is True
+
+
 class TestWekoIndexer:
 
     # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoIndexer::test_get_es_index -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
@@ -314,6 +326,42 @@ class TestWekoIndexer:
         with patch("weko_deposit.api.bulk",return_value=(0,["test_error1","test_error2"])):
             indexer.bulk_update(res)
 
+    #     def get_pid_by_index_ids(self, index_ids):
+    # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoIndexer::test_get_pid_by_index_ids -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
+    def test_get_pid_by_index_ids(self,es_records):
+        indexer, records = es_records
+        with patch("weko_deposit.api.scan", return_value=iter([{"_id": "a"}, {"_id": "b"}])) as mock_scan:
+            assert list(indexer.get_pid_by_index_ids(["1"]))==["a", "b"]
+            assert mock_scan.call_args[1]["query"]=={"query": {"terms": {"path": ["1"]}}, "_source": False}
+
+    #     def bulk_update_path(self, paths):
+    # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoIndexer::test_bulk_update_path -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
+    def test_bulk_update_path(self,es_records):
+        indexer, records = es_records
+        assert indexer.bulk_update_path([])==(0, [])
+        with patch("weko_deposit.api.bulk",return_value=(1,[])) as mock_bulk:
+            assert indexer.bulk_update_path([(records[0]['record'].id, ["1"])])==(1,[])
+            action = mock_bulk.call_args[0][1][0]
+            assert action["_id"]==str(records[0]['record'].id)
+            assert action["doc"]["path"]==["1"]
+            assert action["doc"]["_item_metadata"]=={"path": ["1"]}
+
+    #     def bulk_delete_metadata_keys(self, ids, keys, mapping_keys, chunk_size=500):
+    # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoIndexer::test_bulk_delete_metadata_keys -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
+    def test_bulk_delete_metadata_keys(self,es_records):
+        indexer, records = es_records
+        ids = [records[0]['record'].id, records[1]['record'].id]
+        with patch("weko_deposit.api.bulk",return_value=(2,[])) as mock_bulk:
+            assert indexer.bulk_delete_metadata_keys(ids, ["item_1617186331708"], ["title"], chunk_size=1)==(2,[])
+            actions = list(mock_bulk.call_args[0][1])
+            assert [action["_id"] for action in actions]==[str(i) for i in ids]
+            assert actions[0]["_op_type"]=="update"
+            assert actions[0]["script"]["params"]=={"keys": ["item_1617186331708"], "mapping_keys": ["title"]}
+            assert mock_bulk.call_args[1]["chunk_size"]==1
+
+        with patch("weko_deposit.api.bulk",return_value=(0,["test_error1"])):
+            assert indexer.bulk_delete_metadata_keys(ids, ["item_1617186331708"], [])==(0,["test_error1"])
+
 # class WekoDeposit(Deposit):
 # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoDeposit -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
 class TestWekoDeposit:
@@ -708,6 +756,40 @@ class TestWekoDeposit:
         deposit = record['deposit']
         deposit.delete_by_index_tree_id('1',[])
 
+    # def delete_by_index_tree_ids(cls, index_ids):
+    # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoDeposit::test_delete_by_index_tree_ids -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
+    def test_delete_by_index_tree_ids(sel,app,db,location,es_records):
+        indexer, records = es_records
+        app.config['WEKO_DEPOSIT_DELETE_INDEX_BATCH_SIZE'] = 1
+        # records[0] is in index 2, records[1] in index 1
+        ids = [str(records[0]['record'].id), str(records[1]['record'].id)]
+        rec = RecordMetadata.query.filter_by(id=records[1]['record'].id).one()
+        rec.json = dict(rec.json, path=["1", "3"])
+        db.session.commit()
+        version_id = rec.version_id
+
+        assert WekoDeposit.delete_by_index_tree_ids([]) == 0
+
+        with patch("weko_deposit.api.WekoIndexer.get_pid_by_index_ids", return_value=iter(ids)):
+            with patch("weko_deposit.api.WekoIndexer.bulk_update_path") as mock_es:
+                with patch("weko_records_ui.utils.soft_delete") as mock_delete:
+                    assert WekoDeposit.delete_by_index_tree_ids([2, 3]) == 2
+                    mock_delete.assert_called_once_with(records[0]['record'].id)
+                    mock_es.assert_any_call([(records[1]['record'].id, ["1"])])
+        assert RecordMetadata.query.filter_by(id=records[0]['record'].id).one().json["path"] == []
+        assert RecordMetadata.query.filter_by(id=records[1]['record'].id).one().json["path"] == ["1"]
+        assert RecordMetadata.query.filter_by(id=records[1]['record'].id).one().version_id == version_id + 1
+
+        # items not in the indexes any more
+        with patch("weko_deposit.api.WekoIndexer.get_pid_by_index_ids", return_value=iter(ids)):
+            with patch("weko_deposit.api.WekoIndexer.bulk_update_path") as mock_es:
+                assert WekoDeposit.delete_by_index_tree_ids([2]) == 0
+
+        with patch("weko_deposit.api.WekoIndexer.get_pid_by_index_ids", return_value=iter(ids)):
+            with patch("weko_deposit.api.db.session.execute", side_effect=SQLAlchemyError("error")):
+                with pytest.raises(SQLAlchemyError):
+                    WekoDeposit.delete_by_index_tree_ids([1])
+
 
     # def update_pid_by_index_tree_id(self, path):
     # .tox/c1/bin/pytest --cov=weko_deposit tests/test_api.py::TestWekoDeposit::test_update_pid_by_index_tree_id -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
@@ -78,8 +78,9 @@ class MockRecordIndexer:
 
 # .tox/c1/bin/pytest --cov=weko_deposit tests/test_tasks.py::test_update_authorInfo -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
 def test_update_authorInfo(app, db, records,mocker):
-    app.config.update(WEKO_SEARCH_MAX_RESULT=1)
+    app.config.update(WEKO_DEPOSIT_AUTHOR_UPDATE_ES_WAIT=0)
     mocker.patch("weko_deposit.tasks.WekoDeposit.update_author_link")
+    mocker.patch("weko_deposit.api.WekoIndexer.bulk_update_author_link")
     mock_recordssearch = MagicMock(side_effect=MockRecordsSearch)
     with patch("weko_deposit.tasks.RecordsSearch", mock_recordssearch):
         with patch("weko_deposit.tasks.RecordIndexer", MockRecordIndexer):
@@ -223,3 +224,41 @@ def test_update_authorInfo(app, db, records,mocker):
         with patch("weko_deposit.tasks.RecordIndexer", MockRecordIndexer):
             update_items_by_authorInfo(["1","xxx"], _target)
 
+
+
+# def update_items_by_authorInfo(self, origin_list, target, resume_after=None):
+# .tox/c1/bin/pytest --cov=weko_deposit tests/test_tasks.py::test_update_authorInfo_batch -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-deposit/.tox/c1/tmp
+def test_update_authorInfo_batch(app, db, records, mocker):
+    app.config.update(WEKO_DEPOSIT_AUTHOR_UPDATE_BATCH_SIZE=2,
+                      WEKO_DEPOSIT_AUTHOR_UPDATE_ES_WAIT=0)
+    mock_bulk = mocker.patch(
+        "weko_deposit.api.WekoIndexer.bulk_update_author_link")
+    queries = []
+    pages = [
+        [{"_source": {"control_number": "1"}},
+         {"_source": {"control_number": "2"}}],
+        [{"_source": {"control_number": "3"}}],
+    ]
+
+    def _search(index=None):
+        search = MagicMock()
+
+        def _update_from_dict(query):
+            queries.append(query)
+            hits = pages[len(queries) - 1]
+            search.execute.return_value.to_dict.return_value = {
+                "hits": {"hits": hits, "total": 3}}
+            return search
+        search.update_from_dict.side_effect = _update_from_dict
+        return search
+
+    with patch("weko_deposit.tasks.RecordsSearch", side_effect=_search):
+        with patch("weko_deposit.tasks.RecordIndexer", MockRecordIndexer):
+            update_items_by_authorInfo(["1"], {}, resume_after="0")
+    assert len(queries) == 2
+    assert queries[0]["search_after"] == ["0"]
+    assert queries[0]["sort"] == [{"control_number": {"order": "asc"}}]
+    assert queries[1]["search_after"] == ["2"]
+    assert "from" not in queries[1]
+    # one ES bulk request per batch
+    assert mock_bulk.call_count == 2
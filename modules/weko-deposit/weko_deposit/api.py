@@ -32,7 +32,7 @@ from redis import sentinel
 from dictdiffer import dot_lookup
 from dictdiffer.merge import Merger, UnresolvedConflictsException
 from elasticsearch.exceptions import TransportError
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import bulk, scan
 from flask import abort, current_app, json, request, session
 from flask_security import current_user
 from invenio_db import db
@@ -55,6 +55,8 @@ from invenio_records_files.models import RecordsBuckets
 from invenio_records_rest.errors import PIDResolveRESTError
 from invenio_files_rest.errors import StorageError
 from simplekv.memory.redisstore import RedisStore
+from sqlalchemy import Text, and_, cast, func
+from sqlalchemy.dialects.postgresql import ARRAY, array
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.attributes import flag_modified
 from weko_admin.models import AdminSettings
@@ -128,6 +130,18 @@ class WekoFileObject(FileObject):
         return True
 
 
+def has_file_content(jrc):
+    """Check if the ES document needs the ingest attachment pipeline.
+
+    Args:
+        jrc (dict): ES document of an item.
+
+    Returns:
+        bool: True if a content entry holds encoded file data.
+    """
+    return any(content.get('file') for content in jrc.get('content') or [])
+
+
 class WekoIndexer(RecordIndexer):
     """Provide an interface for indexing records in Elasticsearch."""
 
@@ -161,7 +175,7 @@ class WekoIndexer(RecordIndexer):
                     body=jrc)
 
         # Only pass through pipeline if file exists
-        if 'content' in jrc and not skip_files:
+        if has_file_content(jrc) and not skip_files:
             body['pipeline'] = 'item-file-pipeline'
         if self.client.exists(**es_info):
             del body['version']
@@ -359,6 +373,20 @@ class WekoIndexer(RecordIndexer):
 
             self.client.clear_scroll(scroll_id=scroll_id)
 
+    def get_pid_by_index_ids(self, index_ids):
+        """Get the ids of all the records in indexes.
+
+        :param index_ids: Index ids.
+        :return: Generator of record ids.
+        """
+        self.get_es_index()
+        for hit in scan(self.client,
+                        query={"query": {"terms": {"path": index_ids}},
+                               "_source": False},
+                        scroll='1m', size=3000,
+                        index=self.es_index, doc_type=self.es_doc_type):
+            yield hit['_id']
+
     def get_metadata_by_item_id(self, item_id):
         """Get metadata of item by id from ES.
 
@@ -405,6 +433,89 @@ class WekoIndexer(RecordIndexer):
             body=body
         )
 
+    def bulk_update_author_link(self, author_links):
+        """Update author_link info of many documents in one bulk request.
+
+        :param author_links: List of dict with ``id`` and ``author_link``.
+        """
+        self.get_es_index()
+        es_data = [
+            dict(
+                _op_type='update',
+                _id=str(author_link.get('id')),
+                _index=self.es_index,
+                _type=self.es_doc_type,
+                doc={'author_link': author_link.get('author_link')},
+            ) for author_link in author_links if author_link.get('id')
+        ]
+        if es_data:
+            success, failed = bulk(self.client, es_data, raise_on_error=False)
+            for error in failed:
+                current_app.logger.error(error)
+            return success, failed
+        return 0, []
+
+    def bulk_update_path(self, paths):
+        """Update the path of many documents in one bulk request.
+
+        :param paths: List of tuple of record id and path.
+        """
+        self.get_es_index()
+        updated = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+        es_data = [
+            dict(
+                _op_type='update',
+                _id=str(id_),
+                _index=self.es_index,
+                _type=self.es_doc_type,
+                doc={
+                    '_item_metadata': {'path': path},
+                    'path': path,
+                    '_updated': updated
+                },
+            ) for id_, path in paths
+        ]
+        if es_data:
+            success, failed = bulk(self.client, es_data, raise_on_error=False)
+            for error in failed:
+                current_app.logger.error(error)
+            return success, failed
+        return 0, []
+
+    def bulk_delete_metadata_keys(self, ids, keys, mapping_keys, chunk_size=500):
+        """Remove properties from many documents with partial updates.
+
+        :param ids: Record identifiers.
+        :param keys: Keys removed from ``_item_metadata``.
+        :param mapping_keys: Keys removed from the document.
+        :param chunk_size: Number of documents per bulk request.
+        """
+        self.get_es_index()
+        script = dict(
+            lang='painless',
+            source="boolean changed = false;"
+                   "def m = ctx._source._item_metadata;"
+                   "for (k in params.keys) {"
+                   " if (m != null && m.remove(k) != null) { changed = true; } }"
+                   "for (k in params.mapping_keys) {"
+                   " if (ctx._source.remove(k) != null) { changed = true; } }"
+                   "if (!changed) { ctx.op = 'none'; }",
+            params=dict(keys=list(keys), mapping_keys=list(mapping_keys)))
+        es_data = (
+            dict(
+                _op_type='update',
+                _id=str(id_),
+                _index=self.es_index,
+                _type=self.es_doc_type,
+                script=script,
+            ) for id_ in ids
+        )
+        success, failed = bulk(self.client, es_data, chunk_size=chunk_size,
+                               raise_on_error=False)
+        for error in failed:
+            current_app.logger.error(error)
+        return success, failed
+
     def update_jpcoar_identifier(self, dc, item_id):
         """Update JPCOAR meta data item."""
         # current_app.logger.error("dc:{}".format(dc));
@@ -1147,18 +1258,25 @@ class WekoDeposit(Deposit):
                                 mimetypes = current_app.config[
                                     'WEKO_MIMETYPE_WHITELIST_FOR_ES']
                                 content = lst.copy()
-                                file_content = ""
-                                if file.obj.file.size <= file_size_max and \
-                                        file.obj.mimetype in mimetypes:
+                                if file.obj.mimetype in mimetypes:
                                     ## invenio_files_rest.errors.StorageError
-                                    file_content = ""
                                     try:
-                                        file_content = file.obj.file.read_file(lst)
+                                        # index extracted text directly, the
+                                        # ingest pipeline only gets files
+                                        # that could not be read as text.
+                                        text = file.obj.file.read_text(
+                                            lst, file_size_max)
+                                        if text is not None:
+                                            content.update({"attachment": {
+                                                "content": text}})
+                                        elif file.obj.file.size <= \
+                                                file_size_max:
+                                            content.update({
+                                                "file": file.obj.file.read_file(lst)})
                                     except StorageError as se:
                                         import traceback
                                         current_app.logger.critical("StorageError: {}".format(se))
                                         current_app.logger.critical(traceback.format_exc())
-                                content.update({"file": file_content})
                                 contents.append(content)
                             except Exception as e2:
                                 import traceback
@@ -1523,6 +1641,77 @@ class WekoDeposit(Deposit):
             db.session.rollback()
             raise ex
 
+    @classmethod
+    def delete_by_index_tree_ids(cls, index_ids):
+        """Remove indexes from the path of all their items.
+
+        Items are found over all the scroll pages. Their paths are updated
+        by one statement per batch, sent to ES in one bulk request per
+        batch, and the items left without any index are soft-deleted.
+
+        Args:
+            index_ids (list): index ids
+
+        Returns:
+            int: number of updated items
+
+        Raises:
+            SQLAlchemyError: database error
+        """
+        from weko_records_ui.utils import soft_delete
+
+        index_ids = [str(index_id) for index_id in index_ids]
+        if not index_ids:
+            return 0
+        batch_size = current_app.config[
+            'WEKO_DEPOSIT_DELETE_INDEX_BATCH_SIZE']
+        table = RecordMetadata.__table__
+        path = table.c.json.op('->')('path')
+        removed = cast(array(index_ids), ARRAY(Text))
+
+        def _update(obj_ids):
+            try:
+                rows = db.session.execute(
+                    table.update().where(and_(
+                        table.c.id.in_(obj_ids),
+                        path.op('?|', is_comparison=True)(removed)
+                    )).values(
+                        json=func.jsonb_set(
+                            table.c.json,
+                            cast(array(['path']), ARRAY(Text)),
+                            path.op('-')(removed)),
+                        version_id=table.c.version_id + 1,
+                        updated=datetime.utcnow()
+                    ).returning(table.c.id, path)
+                ).fetchall()
+                db.session.commit()
+            except SQLAlchemyError as ex:
+                current_app.logger.error(ex)
+                db.session.rollback()
+                raise ex
+
+            cls.indexer.bulk_update_path(
+                [(obj_uuid, paths) for obj_uuid, paths in rows if paths])
+            for obj_uuid in [obj_uuid for obj_uuid, paths in rows if not paths]:
+                try:
+                    soft_delete(obj_uuid)
+                    db.session.commit()
+                except Exception as ex:
+                    current_app.logger.error(ex)
+                    db.session.rollback()
+            return len(rows)
+
+        count = 0
+        obj_ids = []
+        for obj_uuid in cls.indexer.get_pid_by_index_ids(index_ids):
+            obj_ids.append(obj_uuid)
+            if len(obj_ids) >= batch_size:
+                count += _update(obj_ids)
+                obj_ids = []
+        if obj_ids:
+            count += _update(obj_ids)
+        return count
+
     def update_pid_by_index_tree_id(self, path):
         """ 
 
@@ -29,7 +29,12 @@ WEKO_BUCKET_QUOTA_SIZE = 50 * 1024 * 1024 * 1024  # 50 GB
 
 WEKO_MAX_FILE_SIZE = WEKO_BUCKET_QUOTA_SIZE
 WEKO_MAX_FILE_SIZE_FOR_ES = 1 * 1024 * 1024  # 1MB
-"""Maximum file size accepted."""
+"""Maximum size of the file text indexed in Elasticsearch.
+
+Text files and files handled by ``FILES_REST_TEXT_EXTRACTION_URL`` are
+truncated to this size of text. Other files are only sent to the ingest
+pipeline if the file itself is smaller.
+"""
 
 WEKO_MIMETYPE_WHITELIST_FOR_ES = [
     'text/plain',
@@ -203,3 +208,12 @@ WEKO_DEPOSIT_ES_PARSING_ERROR_PROCESS_ENABLE = True
 
 WEKO_DEPOSIT_ES_PARSING_ERROR_KEYWORD = 'ElasticsearchParseException'
 """Parsing error's Keyword in Elasticsearch exception info."""
+
+WEKO_DEPOSIT_AUTHOR_UPDATE_BATCH_SIZE = 500
+"""Number of items patched and committed per batch on author update."""
+
+WEKO_DEPOSIT_AUTHOR_UPDATE_ES_WAIT = 20
+"""Seconds to wait for reindexing before updating author_link in ES."""
+
+WEKO_DEPOSIT_DELETE_INDEX_BATCH_SIZE = 500
+"""Number of items updated per batch when indexes are deleted."""
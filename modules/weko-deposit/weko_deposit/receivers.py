@@ -14,7 +14,7 @@ from invenio_records.models import RecordMetadata
 from weko_records.api import FeedbackMailList
 from weko_records.utils import json_loader
 
-from .api import WekoDeposit
+from .api import WekoDeposit, has_file_content
 from .pidstore import get_record_without_version
 
 
@@ -58,7 +58,7 @@ def append_file_content(sender, json=None, record=None, index=None, **kwargs):
 
         ps = dict(publish_status=dep.get('publish_status'))
         dep.jrc.update(ps)
-        if dep.jrc.get('content', None):
+        if has_file_content(dep.jrc):
             kwargs['arguments']['pipeline'] = 'item-file-pipeline'
         json.update(dep.jrc)
 
@@ -26,7 +26,6 @@ from celery.utils.log import get_task_logger
 from flask import current_app
 from invenio_db import db
 from invenio_indexer.api import RecordIndexer
-from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
 from invenio_search import RecordsSearch
@@ -40,9 +39,14 @@ from .api import WekoDeposit
 logger = get_task_logger(__name__)
 
 
-@shared_task(ignore_result=True)
-def update_items_by_authorInfo(origin_list, target):
-    """Update item by authorInfo."""
+@shared_task(bind=True, ignore_result=True)
+def update_items_by_authorInfo(self, origin_list, target, resume_after=None):
+    """Update item by authorInfo.
+
+    Affected items are paged by control number, patched in a worker pool
+    and committed/indexed per batch. Progress is reported through the task
+    state, and a retry resumes after the last committed batch.
+    """
     current_app.logger.debug('item update task is running.')
 
     def _get_author_prefix():
@@ -180,67 +184,91 @@ def update_items_by_authorInfo(origin_list, target):
                 })
         return target_id, meta
 
-    def _update_author_data(item_id, record_ids):
-        try:
-            pid = PersistentIdentifier.get('recid', item_id)
-            dep = WekoDeposit.get_record(pid.object_uuid)
-            author_link = set()
-            author_data = {}
-            for k, v in dep.items():
-                if isinstance(v, dict) \
-                    and v.get('attribute_value_mlt') \
-                        and isinstance(v['attribute_value_mlt'], list):
-                    data_list = v['attribute_value_mlt']
-                    prop_type = None
-                    for index, data in enumerate(data_list):
-                        if isinstance(data, dict) \
-                                and 'nameIdentifiers' in data:
-                            if 'creatorNames' in data:
-                                prop_type = 'creator'
-                            elif 'contributorNames' in data:
-                                prop_type = 'contributor'
-                            elif 'names' in data:
-                                prop_type = 'full_name'
+    def _patch_author_data(dep):
+        author_link = set()
+        author_data = {}
+        changed = False
+        for k, v in dep.items():
+            if isinstance(v, dict) \
+                and v.get('attribute_value_mlt') \
+                    and isinstance(v['attribute_value_mlt'], list):
+                data_list = v['attribute_value_mlt']
+                prop_type = None
+                for index, data in enumerate(data_list):
+                    if isinstance(data, dict) \
+                            and 'nameIdentifiers' in data:
+                        if 'creatorNames' in data:
+                            prop_type = 'creator'
+                        elif 'contributorNames' in data:
+                            prop_type = 'contributor'
+                        elif 'names' in data:
+                            prop_type = 'full_name'
+                        else:
+                            continue
+                        origin_id = -1
+                        change_flag = False
+                        for id in data['nameIdentifiers']:
+                            if id['nameIdentifierScheme'] == 'WEKO':
+                                author_link.add(id['nameIdentifier'])
+                                if id['nameIdentifier'] in origin_list:
+                                    origin_id = id['nameIdentifier']
+                                    change_flag = True
+                                    changed = True
+                                    break
                             else:
                                 continue
-                            origin_id = -1
-                            change_flag = False
-                            for id in data['nameIdentifiers']:
-                                if id['nameIdentifierScheme'] == 'WEKO':
-                                    author_link.add(id['nameIdentifier'])
-                                    if id['nameIdentifier'] in origin_list:
-                                        origin_id = id['nameIdentifier']
-                                        change_flag = True
-                                        record_ids.append(pid.object_uuid)
-                                        break
-                                else:
-                                    continue
-                            if change_flag:
-                                target_id, new_meta = _change_to_meta(
-                                    target, author_prefix, affiliation_id, key_map[prop_type])
-                                dep[k]['attribute_value_mlt'][index].update(
-                                    new_meta)
-                                author_data.update(
-                                    {k: dep[k]['attribute_value_mlt']})
-                                if origin_id != target_id:
-                                    author_link.remove(origin_id)
-                                    author_link.add(target_id)
+                        if change_flag:
+                            target_id, new_meta = _change_to_meta(
+                                target, author_prefix, affiliation_id, key_map[prop_type])
+                            dep[k]['attribute_value_mlt'][index].update(
+                                new_meta)
+                            author_data.update(
+                                {k: dep[k]['attribute_value_mlt']})
+                            if origin_id != target_id:
+                                author_link.discard(origin_id)
+                                author_link.add(target_id)
+        dep['author_link'] = list(author_link)
+        return author_data, author_link, changed
 
-            dep['author_link'] = list(author_link)
-            dep.update_item_by_task()
-            obj = ItemsMetadata.get_record(pid.object_uuid)
-            obj.update(author_data)
-            obj.commit()
-            return pid.object_uuid, author_link
-        except PIDDoesNotExistError as pid_error:
-            current_app.logger.error("PID {} does not exist.".format(item_id))
-            return None, set()
-        except Exception as ex:
-            current_app.logger.error(ex)
-            return None, set()
+    def _load_records(item_ids):
+        pids = PersistentIdentifier.query.filter(
+            PersistentIdentifier.pid_type == 'recid',
+            PersistentIdentifier.pid_value.in_(item_ids)
+        ).all()
+        uuids = {pid.pid_value: pid.object_uuid for pid in pids}
+        for item_id in item_ids:
+            if item_id not in uuids:
+                current_app.logger.error(
+                    "PID {} does not exist.".format(item_id))
+        object_uuids = list(uuids.values())
+        if not object_uuids:
+            return [], {}
+        deps = WekoDeposit.get_records(object_uuids)
+        items = {obj.id: obj for obj in ItemsMetadata.get_records(object_uuids)}
+        return deps, items
+
+    def _update_author_data(deps, items, record_ids):
+        update_es_authorinfo = []
+        for dep in deps:
+            try:
+                author_data, author_link, changed = _patch_author_data(dep)
+                with db.session.begin_nested():
+                    dep.update_item_by_task()
+                    obj = items.get(dep.id)
+                    if obj is not None and author_data:
+                        obj.update(author_data)
+                        obj.commit()
+                if changed:
+                    record_ids.append(dep.id)
+                update_es_authorinfo.append({
+                    'id': dep.id, 'author_link': list(author_link)})
+            except SQLAlchemyError:
+                raise
+            except Exception as ex:
+                current_app.logger.error(ex)
+        return update_es_authorinfo
 
-    def _process(data_size, data_from):
-        res = False
+    def _process(data_size, search_after):
         query_q = {
             "query": {
                 "bool": {
@@ -260,43 +288,36 @@ def update_items_by_authorInfo(origin_list, target):
             "_source": [
                 "control_number"
             ],
-            "size": data_size,
-            "from": data_from
+            "sort": [
+                {"control_number": {"order": "asc"}}
+            ],
+            "size": data_size
         }
+        if search_after:
+            query_q["search_after"] = [search_after]
         search = RecordsSearch(
             index=current_app.config['INDEXER_DEFAULT_INDEX'],). \
             update_from_dict(query_q).execute().to_dict()
 
+        hits = search['hits']['hits']
+        item_ids = [item['_source']['control_number'] for item in hits]
+        deps, items = _load_records(item_ids)
+
         record_ids = []
-        update_es_authorinfo = []
-        for item in search['hits']['hits']:
-            item_id = item['_source']['control_number']
-            object_uuid, author_link = _update_author_data(item_id, record_ids)
-            update_es_authorinfo.append({
-                'id': object_uuid, 'author_link': list(author_link)})
+        update_es_authorinfo = _update_author_data(deps, items, record_ids)
         db.session.commit()
         # update record to ES
         if record_ids:
-            sleep(20)
-            query = (x[0] for x in PersistentIdentifier.query.filter(
-                PersistentIdentifier.object_uuid.in_(record_ids)
-            ).values(
-                PersistentIdentifier.object_uuid
-            ))
-            RecordIndexer().bulk_index(query)
+            RecordIndexer().bulk_index(iter(record_ids))
             RecordIndexer().process_bulk_queue(
                 es_bulk_kwargs={'raise_on_error': True})
         if update_es_authorinfo:
-            sleep(20)
-            for d in update_es_authorinfo:
-                dep = WekoDeposit.get_record(d['id'])
-                dep.update_author_link(d['author_link'])
+            sleep(current_app.config['WEKO_DEPOSIT_AUTHOR_UPDATE_ES_WAIT'])
+            WekoDeposit.indexer.bulk_update_author_link(update_es_authorinfo)
 
-        data_total = search['hits']['total']
-        if data_total > data_size + data_from:
-            return len(update_es_authorinfo), True
-        else:
-            return len(update_es_authorinfo), False
+        last = item_ids[-1] if item_ids else search_after
+        return len(update_es_authorinfo), search['hits']['total'], \
+            last, len(hits) == data_size
 
     key_map = {
         "creator": {
@@ -378,15 +399,30 @@ def update_items_by_authorInfo(origin_list, target):
     author_prefix = _get_author_prefix()
     affiliation_id = _get_affiliation_id()
 
+    def _report_progress(counter, total, last):
+        if not self.request.id:
+            return
+        try:
+            self.update_state(state='PROGRESS', meta={
+                'updated': counter, 'total': total, 'last': last})
+        except Exception as ex:
+            current_app.logger.debug(ex)
+
+    search_after = resume_after
+    counter = 0
+    total = None
     try:
-        data_from = 0
-        data_size = current_app.config['WEKO_SEARCH_MAX_RESULT']
-        counter = 0
+        data_size = current_app.config[
+            'WEKO_DEPOSIT_AUTHOR_UPDATE_BATCH_SIZE']
         while True:
-            current_app.logger.debug("process data from {}.".format(data_from))
-            c, next = _process(data_size, data_from)
+            current_app.logger.debug(
+                "process data after {}.".format(search_after))
+            c, hits_total, search_after, next = _process(
+                data_size, search_after)
             counter += c
-            data_from += data_size
+            if total is None:
+                total = hits_total
+            _report_progress(counter, total, search_after)
             if not next:
                 break
         current_app.logger.debug(
@@ -396,4 +432,8 @@ def update_items_by_authorInfo(origin_list, target):
         current_app.logger. \
             exception('Failed to update items by author data. err:{0}'.
                       format(e))
-        update_items_by_authorInfo.retry(countdown=3, exc=e, max_retries=1)
+        # Batches up to search_after are committed, resume after them.
+        self.retry(
+            args=(origin_list, target),
+            kwargs={'resume_after': search_after},
+            countdown=3, exc=e, max_retries=1)
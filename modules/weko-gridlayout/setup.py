@@ -90,6 +90,9 @@ setup(
         ],
         'invenio_db.models': [
             'weko_gridlayout = weko_gridlayout.models',
+        ],
+        'invenio_celery.tasks': [
+            'weko_gridlayout = weko_gridlayout.tasks',
         ],
                 'invenio_db.alembic': [
             'weko_gridlayout = weko_gridlayout:alembic',
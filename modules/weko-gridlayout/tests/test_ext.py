@@ -13,4 +13,19 @@ test = WekoGridLayout()
 def test_init_config(i18n_app):
     i18n_app.config['BASE_TEMPLATE'] = "test.html"
     
-    test.init_config(i18n_app)
\ No newline at end of file
+    test.init_config(i18n_app)
+
+
+# def register_signals(self):
+def test_register_signals(i18n_app, db):
+    from invenio_records.signals import before_record_update
+    item = {"item_type_id": "1", "recid": "1", "publish_status": "0",
+            "_deposit": {"id": "1", "status": "published"}}
+    with patch("weko_gridlayout.tasks.outdate_new_arrivals_snapshots_task.apply_async") as mock_task:
+        test.register_signals()
+        before_record_update.send(i18n_app, record={})
+        db.session.commit()
+        mock_task.assert_not_called()
+        before_record_update.send(i18n_app, record=item)
+        db.session.commit()
+        mock_task.assert_called_once()
@@ -646,15 +646,42 @@ def test_get_new_arrivals_data(i18n_app, widget_item):
     data4 = copy.deepcopy(data1)
     data4["settings"]["display_result"] = 999
     
-    with patch("weko_gridlayout.services.WidgetItemServices.get_widget_data_by_widget_id", return_value=data4):
-        with patch("weko_gridlayout.services.QueryRankingHelper", res):
-            assert "Cannot search data" in w.get_new_arrivals_data(1)["error"]
-
-    res.get_new_items = get_new_items_2
-
-    with patch("weko_gridlayout.services.WidgetItemServices.get_widget_data_by_widget_id", return_value=data4):
-        with patch("weko_gridlayout.services.QueryRankingHelper", res):
-            assert "Cannot search data" in w.get_new_arrivals_data(1)["error"]
+    with patch("weko_gridlayout.services.get_new_arrivals_role_key", return_value="guest"), \
+            patch("weko_gridlayout.services.get_new_arrivals_snapshot", return_value=(None, "v1")):
+        with patch("weko_gridlayout.services.WidgetItemServices.get_widget_data_by_widget_id", return_value=data4):
+            with patch("weko_gridlayout.services.QueryRankingHelper", res):
+                assert "Cannot search data" in w.get_new_arrivals_data(1)["error"]
+
+        res.get_new_items = get_new_items_2
+
+        with patch("weko_gridlayout.services.WidgetItemServices.get_widget_data_by_widget_id", return_value=data4):
+            with patch("weko_gridlayout.services.QueryRankingHelper", res):
+                assert "Cannot search data" in w.get_new_arrivals_data(1)["error"]
+
+        # make a snapshot
+        res.get_new_items = MagicMock(return_value=[{"key": "1"}])
+        with patch("weko_gridlayout.services.WidgetItemServices.get_widget_data_by_widget_id", return_value=data4):
+            with patch("weko_gridlayout.services.QueryRankingHelper", res):
+                with patch("weko_gridlayout.services.Indexes.get_browsing_tree_ignore_more", return_value=[]):
+                    with patch("weko_items_ui.utils.get_permission_record", return_value=[{"title": "title"}]) as mock_permission:
+                        with patch("weko_gridlayout.services.save_new_arrivals_snapshot") as mock_save:
+                            result = w.get_new_arrivals_data(1)
+                            assert result["data"] == [{"title": "title", "name": "title"}]
+                            assert mock_permission.call_args[1] == {"check_owner": False}
+                            name, window, version, data = mock_save.call_args[0]
+                            assert name == "widget_1_guest"
+                            assert window[2] == 999
+                            assert version == "v1"
+                            assert data == [{"title": "title", "name": "title"}]
+
+    # from the snapshot
+    res.get_new_items = MagicMock()
+    with patch("weko_gridlayout.services.get_new_arrivals_role_key", return_value="guest"), \
+            patch("weko_gridlayout.services.get_new_arrivals_snapshot", return_value=([{"name": "cached"}], "v1")):
+        with patch("weko_gridlayout.services.WidgetItemServices.get_widget_data_by_widget_id", return_value=data4):
+            with patch("weko_gridlayout.services.QueryRankingHelper", res):
+                assert w.get_new_arrivals_data(1)["data"] == [{"name": "cached"}]
+                res.get_new_items.assert_not_called()
 
 
 #     def get_arrivals_rss(cls, data, term, count):
@@ -684,6 +711,45 @@ def test_get_arrivals_rss(i18n_app):
         # assert WidgetDataLoaderServices.get_arrivals_rss(data, term, count) != None
 
 
+#     def get_new_arrivals_rss(cls, term, count):
+def test_get_new_arrivals_rss(i18n_app):
+    snapshot = {
+        "body": b"<rss/>",
+        "etag": "etag",
+        "last_modified": datetime(2022, 10, 1, 1, 2, 3)
+    }
+    with patch("weko_gridlayout.services.get_new_arrivals_role_key", return_value="guest"):
+        # make a snapshot
+        with i18n_app.test_request_context():
+            with patch("weko_gridlayout.services.get_new_arrivals_snapshot", return_value=(None, "v1")):
+                with patch("weko_gridlayout.services.get_elasticsearch_result_by_date", return_value=None) as mock_es:
+                    with patch("weko_gridlayout.services.save_new_arrivals_snapshot") as mock_save:
+                        res = WidgetDataLoaderServices.get_new_arrivals_rss(1, 10)
+                        assert res.status_code == 200
+                        assert mock_es.call_count == 1
+                        name, window, version, data = mock_save.call_args[0]
+                        assert name.startswith("rss_1_10_")
+                        assert version == "v1"
+                        assert res.get_data() == data["body"]
+                        assert res.headers["ETag"] == '"{}"'.format(data["etag"])
+
+        # from the snapshot
+        with i18n_app.test_request_context():
+            with patch("weko_gridlayout.services.get_new_arrivals_snapshot", return_value=(snapshot, "v1")):
+                with patch("weko_gridlayout.services.get_elasticsearch_result_by_date") as mock_es:
+                    res = WidgetDataLoaderServices.get_new_arrivals_rss(1, 10)
+                    assert res.status_code == 200
+                    assert res.get_data() == b"<rss/>"
+                    assert res.headers["Last-Modified"] == "Sat, 01 Oct 2022 01:02:03 GMT"
+                    mock_es.assert_not_called()
+
+        # not modified
+        with i18n_app.test_request_context(headers={"If-None-Match": '"etag"'}):
+            with patch("weko_gridlayout.services.get_new_arrivals_snapshot", return_value=(snapshot, "v1")):
+                res = WidgetDataLoaderServices.get_new_arrivals_rss(1, 10)
+                assert res.status_code == 304
+
+
 #     def get_widget_page_endpoints(cls, widget_id, language):
 def test_get_widget_page_endpoints(i18n_app, widget_item):
     from sqlalchemy.orm.exc import NoResultFound
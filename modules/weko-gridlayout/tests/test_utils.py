@@ -51,6 +51,11 @@ from weko_gridlayout.utils import (
     get_widget_design_setting,
     compress_widget_response,
     delete_widget_cache,
+    get_new_arrivals_role_key,
+    get_new_arrivals_snapshot,
+    save_new_arrivals_snapshot,
+    clear_new_arrivals_snapshots,
+    outdate_new_arrivals_snapshots,
     validate_upload_file,
     WidgetBucket,
 )
@@ -777,6 +782,94 @@ def test_compress_widget_response(i18n_app):
     assert compress_widget_response(response=response) != None
 
 
+# def get_new_arrivals_role_key():
+def test_get_new_arrivals_role_key(i18n_app):
+    with patch("weko_index_tree.utils.get_user_roles", return_value=(True, [1])):
+        assert get_new_arrivals_role_key() == "admin"
+    with patch("weko_index_tree.utils.get_user_roles", return_value=(False, None)):
+        assert get_new_arrivals_role_key() == "guest"
+    with patch("weko_index_tree.utils.get_user_roles", return_value=(False, [3, 2])):
+        with patch("weko_index_tree.utils.get_user_groups", return_value=[5]):
+            assert get_new_arrivals_role_key() == "r2-3_g5"
+
+
+# def get_new_arrivals_snapshot(name, window):
+# def save_new_arrivals_snapshot(name, window, version, data):
+# def outdate_new_arrivals_snapshots():
+# .tox/c1/bin/pytest --cov=weko_gridlayout tests/test_utils.py::test_new_arrivals_snapshot -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-gridlayout/.tox/c1/tmp
+def test_new_arrivals_snapshot(i18n_app):
+    cache = {}
+    current_cache = MagicMock()
+    current_cache.get_many = lambda *keys: [cache.get(key) for key in keys]
+    current_cache.set = lambda key, value, timeout=None: cache.update({key: value})
+    window = ("2022-10-01", "2022-10-08", 10)
+    with patch("weko_gridlayout.utils.current_cache", current_cache):
+        assert get_new_arrivals_snapshot("widget_1_guest", window) == (None, None)
+
+        save_new_arrivals_snapshot("widget_1_guest", window, None, ["data"])
+        assert get_new_arrivals_snapshot("widget_1_guest", window) == (["data"], None)
+
+        # the date window moved on
+        assert get_new_arrivals_snapshot(
+            "widget_1_guest", ("2022-10-02", "2022-10-09", 10)) == (None, None)
+
+        # items were published or deleted
+        outdate_new_arrivals_snapshots()
+        data, version = get_new_arrivals_snapshot("widget_1_guest", window)
+        assert data is None
+        assert version
+
+        save_new_arrivals_snapshot("widget_1_guest", window, version, ["new"])
+        assert get_new_arrivals_snapshot("widget_1_guest", window) == (["new"], version)
+
+
+# def clear_new_arrivals_snapshots(sender=None, record=None, *args, **kwargs):
+# .tox/c1/bin/pytest --cov=weko_gridlayout tests/test_utils.py::test_clear_new_arrivals_snapshots -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-gridlayout/.tox/c1/tmp
+def test_clear_new_arrivals_snapshots(i18n_app, db):
+    key = "weko_gridlayout_new_arrivals_outdated"
+    item = {"item_type_id": "1", "recid": "1", "publish_status": "0",
+            "_deposit": {"id": "1", "status": "published"}}
+
+    # records which are not public items
+    for record in ({"title": "not an item"},
+                   dict(item, recid="1.0"),
+                   dict(item, publish_status="1")):
+        clear_new_arrivals_snapshots(None, record=record)
+        assert key not in db.session.info
+
+    # an item made private
+    class MockRecord(dict):
+        pass
+    record = MockRecord(item, publish_status="1")
+    record.model = MagicMock(json=item)
+    clear_new_arrivals_snapshots(None, record=record)
+    assert db.session.info[key]
+
+    # outdated after the commit
+    with patch("weko_gridlayout.tasks.outdate_new_arrivals_snapshots_task.apply_async") as mock_task:
+        db.session.commit()
+        mock_task.assert_called_once_with(
+            countdown=i18n_app.config["WEKO_GRIDLAYOUT_NEW_ARRIVALS_REFRESH_DELAY"])
+        assert key not in db.session.info
+        db.session.commit()
+        mock_task.assert_called_once()
+
+    # outdated at once when the task cannot be queued
+    clear_new_arrivals_snapshots(None, record=item)
+    with patch("weko_gridlayout.tasks.outdate_new_arrivals_snapshots_task.apply_async",
+               side_effect=Exception("error")):
+        with patch("weko_gridlayout.utils.outdate_new_arrivals_snapshots") as mock_outdate:
+            db.session.commit()
+            mock_outdate.assert_called_once()
+
+    # not outdated on rollback
+    clear_new_arrivals_snapshots(None, record=item)
+    with patch("weko_gridlayout.tasks.outdate_new_arrivals_snapshots_task.apply_async") as mock_task:
+        db.session.rollback()
+        db.session.commit()
+        mock_task.assert_not_called()
+
+
 # def delete_widget_cache(repository_id, page_id=None):
 def test_delete_widget_cache(i18n_app):
     repository_id = 1
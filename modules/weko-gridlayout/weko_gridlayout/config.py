@@ -101,6 +101,20 @@ WEKO_GRIDLAYOUT_WIDGET_CACHE_KEY = "widget_cache"
 WEKO_GRIDLAYOUT_WIDGET_PAGE_CACHE_KEY = "widget_page_cache"
 """The Page cache key"""
 
+WEKO_GRIDLAYOUT_NEW_ARRIVALS_CACHE_KEY = "new_arrivals_snapshot_{}"
+"""The new arrivals snapshot cache key"""
+
+WEKO_GRIDLAYOUT_NEW_ARRIVALS_VERSION_KEY = "new_arrivals_version"
+"""The cache key of the version of new arrivals, changed when items are
+published or deleted"""
+
+WEKO_GRIDLAYOUT_NEW_ARRIVALS_CACHE_TIMEOUT = 3600
+"""The new arrivals snapshot cache timeout (seconds)"""
+
+WEKO_GRIDLAYOUT_NEW_ARRIVALS_REFRESH_DELAY = 2
+"""Seconds between the commit of a change and the outdating of the new
+arrivals snapshots, so that the search index shows the change"""
+
 WEKO_GRIDLAYOUT_BUCKET_UUID = "517f7d98-ab2c-4736-91ea-54ba34e7905d"
 """The Gridlayout bucket UUID"""
 
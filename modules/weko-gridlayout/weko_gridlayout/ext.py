@@ -34,12 +34,28 @@ class WekoGridLayout(object):
             current_handler = None
 
         app.extensions['weko-gridlayout'] = self
+        self.register_signals()
 
         # For widget pages
         app.register_error_handler(404, lambda error:
                                    handle_not_found(
                                        error, current_handler=current_handler))
 
+    def register_signals(self):
+        """Outdate new arrivals snapshots when public items are changed.
+
+        The signals sent before the change are used, so that the stored
+        record still tells whether an item was public. The snapshots are
+        outdated after the change is committed.
+        """
+        from invenio_records.signals import before_record_delete, \
+            before_record_insert, before_record_update
+
+        from .utils import clear_new_arrivals_snapshots
+        before_record_insert.connect(clear_new_arrivals_snapshots)
+        before_record_update.connect(clear_new_arrivals_snapshots)
+        before_record_delete.connect(clear_new_arrivals_snapshots)
+
     def init_config(self, app):
         """Initialize configuration."""
         # Use theme's base template if theme is installed
@@ -28,6 +28,7 @@ from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm.collections import attribute_mapped_collection
 from sqlalchemy_utils.models import Timestamp
 from sqlalchemy_utils.types import JSONType
+from weko_admin.cache import get_cached_setting, watch_settings_model
 
 
 class WidgetType(db.Model):
@@ -406,14 +407,17 @@ class WidgetDesignSetting(db.Model):
         Returns:
             dict: {'repository_id':'','':'settings'}
         """
-        query_result = cls.query.filter_by(
-            repository_id=str(repository_id)).one_or_none()
-        data = {}
-        if query_result is not None:
-            data['repository_id'] = query_result.repository_id
-            data['settings'] = query_result.settings
+        def load():
+            query_result = cls.query.filter_by(
+                repository_id=str(repository_id)).one_or_none()
+            data = {}
+            if query_result is not None:
+                data['repository_id'] = query_result.repository_id
+                data['settings'] = query_result.settings
+            return data
 
-        return data
+        return get_cached_setting(
+            'widget_design_setting:{}'.format(repository_id), load)
 
     @classmethod
     def update(cls, repository_id, settings):
@@ -462,6 +466,9 @@ class WidgetDesignSetting(db.Model):
             return False
 
 
+watch_settings_model(WidgetDesignSetting)
+
+
 class WidgetDesignPage(db.Model):
     """Database for menu pages."""
 
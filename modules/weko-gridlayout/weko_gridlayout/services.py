@@ -20,12 +20,13 @@
 
 """Service for widget modules."""
 import copy
+import hashlib
 import pickle
 import json
 from datetime import date, datetime, timedelta
 from operator import itemgetter
 
-from flask import Markup, current_app, session
+from flask import Markup, Response, current_app, request, session
 from flask_babelex import gettext as _
 from flask_login import current_user
 from invenio_db import db
@@ -44,8 +45,9 @@ from .models import WidgetDesignPage, WidgetDesignPageMultiLangData, \
 from .utils import build_data, build_multi_lang_data, build_rss_xml, \
     convert_data_to_design_pack, convert_data_to_edit_pack, \
     convert_widget_data_to_dict, delete_widget_cache, \
-    get_elasticsearch_result_by_date, update_general_item, \
-    validate_main_widget_insertion
+    get_elasticsearch_result_by_date, get_new_arrivals_role_key, \
+    get_new_arrivals_snapshot, save_new_arrivals_snapshot, \
+    update_general_item, validate_main_widget_insertion
 
 
 class WidgetItemServices:
@@ -1067,6 +1069,9 @@ class WidgetDataLoaderServices:
     def get_new_arrivals_data(cls, widget_id):
         """Get new arrivals data from DB.
 
+        The data is kept as a snapshot per widget and role until items are
+        published or deleted or the date window moves on.
+
         Returns:
             dictionary -- new arrivals data
 
@@ -1103,6 +1108,15 @@ class WidgetDataLoaderServices:
             end_date = current_date.strftime("%Y-%m-%d")
             start_date = (current_date - timedelta(days=term)).strftime(
                 "%Y-%m-%d")
+            snapshot_name = 'widget_{}_{}'.format(
+                widget_id, get_new_arrivals_role_key())
+            window = (start_date, end_date, number_result)
+            snapshot, version = get_new_arrivals_snapshot(
+                snapshot_name, window)
+            if snapshot is not None:
+                result['data'] = snapshot
+                return result
+
             res = QueryRankingHelper.get_new_items(
                 start_date=start_date,
                 end_date=end_date,
@@ -1117,11 +1131,14 @@ class WidgetDataLoaderServices:
             index_info = {}
             cls._get_index_info(index_json, index_info)
             has_permission_indexes = list(index_info.keys())
-            data = get_permission_record('new_items', res, int(number_result), has_permission_indexes)
+            data = get_permission_record(
+                'new_items', res, int(number_result), has_permission_indexes,
+                check_owner=False)
 
             for d in data:
                 d['name'] = d['title']
             result['data'] = data
+            save_new_arrivals_snapshot(snapshot_name, window, version, data)
         except Exception as e:
             result['error'] = str(e)
         return result
@@ -1150,6 +1167,40 @@ class WidgetDataLoaderServices:
             rss_data.append(es_item)
         return build_rss_xml(data=rss_data, term=term, count=count, lang=lang)
 
+    @classmethod
+    def get_new_arrivals_rss(cls, term, count):
+        """Get New Arrivals RSS response.
+
+        The RSS body is kept as a snapshot per term, count, language and
+        role until items are published or deleted or the date window moves
+        on, and is answered with ETag and Last-Modified.
+
+        :term: number of days of new arrivals
+        :count: number of items
+
+        """
+        current_date = date.today()
+        end_date = current_date.strftime("%Y-%m-%d")
+        start_date = (current_date - timedelta(days=term)).strftime("%Y-%m-%d")
+        snapshot_name = 'rss_{}_{}_{}_{}'.format(
+            term, count, current_i18n.language, get_new_arrivals_role_key())
+        window = (start_date, end_date)
+        snapshot, version = get_new_arrivals_snapshot(snapshot_name, window)
+        if snapshot is None:
+            rd = get_elasticsearch_result_by_date(start_date, end_date)
+            body = cls.get_arrivals_rss(rd, term, count).get_data()
+            snapshot = dict(
+                body=body,
+                etag=hashlib.md5(body).hexdigest(),
+                last_modified=datetime.utcnow().replace(microsecond=0))
+            save_new_arrivals_snapshot(
+                snapshot_name, window, version, snapshot)
+
+        response = Response(snapshot['body'], mimetype='text/xml')
+        response.set_etag(snapshot['etag'])
+        response.last_modified = snapshot['last_modified']
+        return response.make_conditional(request)
+
     @classmethod
     def get_widget_page_endpoints(cls, widget_id, language):
         """Get endpoints for a particular menu widget."""
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019 National Institute of Informatics.
+#
+# weko-gridlayout is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Celery tasks of weko-gridlayout."""
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def outdate_new_arrivals_snapshots_task():
+    """Outdate all new arrivals snapshots."""
+    from .utils import outdate_new_arrivals_snapshots
+    outdate_new_arrivals_snapshots()
@@ -26,13 +26,14 @@ import json
 import xml.etree.ElementTree as Et
 from datetime import datetime
 from io import SEEK_END, SEEK_SET, BytesIO
-from uuid import UUID
+from uuid import UUID, uuid4
 from xml.etree.ElementTree import tostring
 
 import redis
 from redis import sentinel
 from elasticsearch.exceptions import NotFoundError
-from flask import Markup, Response, abort, current_app, jsonify, request
+from flask import Markup, Response, abort, current_app, has_app_context, \
+    jsonify, request
 from flask_babelex import gettext as _
 from invenio_cache import current_cache
 from invenio_db import db
@@ -41,14 +42,17 @@ from invenio_files_rest.errors import FileInstanceAlreadySetError, \
 from invenio_files_rest.models import Bucket, Location, ObjectVersion
 from invenio_search import RecordsSearch
 from simplekv.memory.redisstore import RedisStore
-from sqlalchemy import asc
+from sqlalchemy import asc, event
+from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import MultipleResultsFound
 from weko_admin.models import AdminLangSettings
 from weko_index_tree.api import Indexes
 from weko_records.api import Mapping
 from weko_records.serializers.utils import get_mapping
+from weko_records.utils import is_published_item
 from weko_records_ui.utils import get_pair_value
 from weko_redis.redis import RedisConnection
+from weko_schema_ui.models import PublishStatus
 from weko_search_ui.query import item_search_factory
 from weko_theme import config as theme_config
 
@@ -956,6 +960,107 @@ def delete_widget_cache(repository_id, page_id=None):
         cache_store.redis.delete(key)
 
 
+def get_new_arrivals_role_key():
+    """Get the key of the roles and groups of the current user.
+
+    Users with the same roles and groups can see the same new arrivals,
+    so they share the new arrivals snapshots.
+
+    @return: The role key
+    """
+    from weko_index_tree.utils import get_user_groups, get_user_roles
+    is_admin, roles = get_user_roles()
+    if is_admin:
+        return 'admin'
+    if roles is None:
+        return 'guest'
+    return 'r{}_g{}'.format('-'.join(map(str, sorted(roles))),
+                            '-'.join(map(str, sorted(get_user_groups()))))
+
+
+def get_new_arrivals_snapshot(name, window):
+    """Get a new arrivals snapshot.
+
+    @param name: The snapshot name
+    @param window: The date window and settings of the snapshot
+    @return: The snapshot data, None if it is missing or outdated,
+        and the current version of new arrivals
+    """
+    snapshot, version = current_cache.get_many(
+        current_app.config['WEKO_GRIDLAYOUT_NEW_ARRIVALS_CACHE_KEY'].format(
+            name),
+        current_app.config['WEKO_GRIDLAYOUT_NEW_ARRIVALS_VERSION_KEY'])
+    if snapshot and snapshot.get('version') == version \
+            and snapshot.get('window') == window:
+        return snapshot['data'], version
+    return None, version
+
+
+def save_new_arrivals_snapshot(name, window, version, data):
+    """Save a new arrivals snapshot.
+
+    @param name: The snapshot name
+    @param window: The date window and settings of the snapshot
+    @param version: The version of new arrivals the snapshot was made from
+    @param data: The snapshot data
+    """
+    current_cache.set(
+        current_app.config['WEKO_GRIDLAYOUT_NEW_ARRIVALS_CACHE_KEY'].format(
+            name),
+        dict(window=window, version=version, data=data),
+        timeout=current_app.config[
+            'WEKO_GRIDLAYOUT_NEW_ARRIVALS_CACHE_TIMEOUT'])
+
+
+def _is_public_item(record):
+    return is_published_item(record) and \
+        record.get('publish_status') == PublishStatus.PUBLIC.value
+
+
+def outdate_new_arrivals_snapshots():
+    """Outdate all new arrivals snapshots."""
+    current_cache.set(
+        current_app.config['WEKO_GRIDLAYOUT_NEW_ARRIVALS_VERSION_KEY'],
+        uuid4().hex, timeout=0)
+
+
+def clear_new_arrivals_snapshots(sender=None, record=None, *args, **kwargs):
+    """Outdate all new arrivals snapshots once a change is indexed.
+
+    Connected to the record signals sent before a change, so that the
+    stored record still tells whether an item was public. Only public
+    items, or items which were public before the change, outdate the
+    snapshots, WEKO_GRIDLAYOUT_NEW_ARRIVALS_REFRESH_DELAY seconds after the
+    transaction is committed.
+    """
+    if record is not None and not _is_public_item(record):
+        model = getattr(record, 'model', None)
+        if model is None or not _is_public_item(model.json):
+            return
+    db.session.info['weko_gridlayout_new_arrivals_outdated'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _outdate_new_arrivals_snapshots_after_commit(session):
+    if not session.info.pop('weko_gridlayout_new_arrivals_outdated', None) \
+            or not has_app_context():
+        return
+    from .tasks import outdate_new_arrivals_snapshots_task
+    try:
+        outdate_new_arrivals_snapshots_task.apply_async(
+            countdown=current_app.config[
+                'WEKO_GRIDLAYOUT_NEW_ARRIVALS_REFRESH_DELAY'])
+    except Exception as e:
+        current_app.logger.error(
+            'Could not queue outdating new arrivals snapshots: {}'.format(e))
+        outdate_new_arrivals_snapshots()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _clear_outdated_new_arrivals_snapshots(session):
+    session.info.pop('weko_gridlayout_new_arrivals_outdated', None)
+
+
 class WidgetBucket:
     """The widget file bucket."""
 
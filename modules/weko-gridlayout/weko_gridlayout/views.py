@@ -9,7 +9,7 @@
 from __future__ import absolute_import, print_function
 
 import json
-from datetime import date, timedelta
+from datetime import date
 
 import six
 from flask import Blueprint, abort, current_app, jsonify, render_template, \
@@ -28,8 +28,7 @@ from .config import WEKO_GRIDLAYOUT_ACCESS_COUNTER_TYPE
 from .models import WidgetDesignPage
 from .services import WidgetDataLoaderServices, WidgetDesignPageServices, \
     WidgetDesignServices, WidgetItemServices
-from .utils import WidgetBucket, get_default_language, \
-    get_elasticsearch_result_by_date, get_system_language, \
+from .utils import WidgetBucket, get_default_language, get_system_language, \
     get_widget_design_setting, get_widget_type_list, validate_upload_file
 
 blueprint = Blueprint(
@@ -358,11 +357,7 @@ def get_rss_data():
         term = -1
     if term < 0 or count < 0:
         return WidgetDataLoaderServices.get_arrivals_rss(None, 0, 0)
-    current_date = date.today()
-    end_date = current_date.strftime("%Y-%m-%d")
-    start_date = (current_date - timedelta(days=term)).strftime("%Y-%m-%d")
-    rd = get_elasticsearch_result_by_date(start_date, end_date)
-    return WidgetDataLoaderServices.get_arrivals_rss(rd, term, count)
+    return WidgetDataLoaderServices.get_new_arrivals_rss(term, count)
 
 
 @blueprint_api.route('/get_page_endpoints/<int:widget_id>', methods=['GET'])
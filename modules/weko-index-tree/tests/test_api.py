@@ -264,6 +264,12 @@ def test_indexes_delete_by_action(app, db, user):
     res = Indexes.delete_by_action('delete', 1)
     assert res==0
 
+    with patch("weko_index_tree.api.Indexes.delete", return_value=[1, 2]):
+        with patch("weko_index_tree.tasks.delete_index_items.delay") as mock_task:
+            res = Indexes.delete_by_action('delete', 1)
+            assert res==[1, 2]
+            mock_task.assert_called_once_with(['1', '2'])
+
 
 # class Indexes(object):
 #     def move(cls, index_id, **data):
@@ -556,11 +562,7 @@ def test_indexes_get_index_tree(i18n_app, db, redis_connect, users, db_records,
         res = Indexes.get_browsing_tree(0)
         assert len(res)==3
 
-        with patch("weko_index_tree.api.RedisConnection", side_effect=RedisError):
-            res = Indexes.get_browsing_tree(0)
-            assert len(res)==3
-
-        with patch("weko_index_tree.api.RedisConnection", side_effect=KeyError):
+        with patch("weko_index_tree.utils.RedisConnection", side_effect=RedisError):
             res = Indexes.get_browsing_tree(0)
             assert len(res)==3
 
@@ -575,11 +577,7 @@ def test_indexes_get_index_tree(i18n_app, db, redis_connect, users, db_records,
         res = Indexes.get_browsing_tree_ignore_more(0)
         assert len(res)==3
 
-        with patch("weko_index_tree.api.RedisConnection", side_effect=RedisError):
-            res = Indexes.get_browsing_tree_ignore_more(0)
-            assert len(res)==3
-
-        with patch("weko_index_tree.api.RedisConnection", side_effect=KeyError):
+        with patch("weko_index_tree.utils.RedisConnection", side_effect=RedisError):
             res = Indexes.get_browsing_tree_ignore_more(0)
             assert len(res)==3
 
@@ -199,7 +199,7 @@ def test_index_action_put_login(app, client_rest, users, id, status_code):
                 else:
                     assert res.status_code == status_code
 
-        with patch('weko_index_tree.rest.save_index_trees_to_redis', return_value=True):
+        with patch('weko_index_tree.rest.update_index_tree_cache', return_value=True):
             with patch('weko_index_tree.rest.Indexes.update', return_value=True):
                 res = client_rest.put('/tree/index/1',
                                     data=json.dumps(
@@ -247,10 +247,13 @@ def test_index_action_post3_login(client_rest, users, id, status_code):
     login_user_via_session(client=client_rest, email=users[id]['email'])
     with patch('weko_index_tree.rest.is_index_locked', return_value=False):
         with patch('weko_index_tree.api.Indexes.create', return_value=True):
-            res = client_rest.post('/tree/index/3',
-                                data=json.dumps({'test':'test'}),
-                                content_type='application/json')
-            assert res.status_code == status_code
+            with patch('weko_index_tree.rest.update_index_tree_cache') as mock_cache:
+                res = client_rest.post('/tree/index/3',
+                                    data=json.dumps({'id':31,'value':'test'}),
+                                    content_type='application/json')
+                assert res.status_code == status_code
+                if status_code == 201:
+                    mock_cache.assert_called_once_with(31)
 
 
 # .tox/c1/bin/pytest --cov=weko_index_tree tests/test_rest.py::test_index_action_post1_guest -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
@@ -268,7 +271,7 @@ def test_index_action_post1_guest(client_rest, users):
 def test_index_action_delete_login(client_rest, users, id, status_code):
     login_user_via_session(client=client_rest, email=users[id]['email'])
     with patch('weko_index_tree.rest.perform_delete_index', return_value=('test_msg','test_err')):
-        with patch('weko_index_tree.rest.save_index_trees_to_redis', return_value=None):
+        with patch('weko_index_tree.rest.update_index_tree_cache', return_value=None):
             res = client_rest.delete('/tree/index/1',
                                      data=json.dumps({'test':'test'}),
                                      content_type='application/json')
@@ -2,6 +2,8 @@
 
 import json
 import pytest
+from mock import patch
+from sqlalchemy.exc import SQLAlchemyError
 
 from celery import shared_task
 from flask import current_app
@@ -9,7 +11,8 @@ from invenio_db import db
 from invenio_oaiserver.models import OAISet
 from invenio_accounts.testutils import login_user_via_session
 
-from weko_index_tree.tasks import update_oaiset_setting, delete_oaiset_setting
+from weko_index_tree.tasks import update_oaiset_setting, delete_oaiset_setting, \
+    reconcile_index_item_counts, recount_index_item_counts, delete_index_items
 from weko_index_tree.api import Indexes
 from weko_index_tree.models import Index
 
@@ -142,3 +145,49 @@ def test_delete_oaiset_setting(i18n_app, indices, db_oaischema, without_oaiset_s
     delete_oaiset_setting({})
     res = OAISet.query.all()
     assert len(res)==1
+
+
+# def reconcile_index_item_counts():
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_tasks.py::test_reconcile_index_item_counts -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_reconcile_index_item_counts(i18n_app):
+    with patch("weko_index_tree.utils.refresh_index_item_counts") as mock_refresh:
+        reconcile_index_item_counts()
+        mock_refresh.assert_called_once()
+
+    i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE"] = False
+    with patch("weko_index_tree.utils.refresh_index_item_counts") as mock_refresh:
+        reconcile_index_item_counts()
+        mock_refresh.assert_not_called()
+    i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE"] = True
+
+
+# def recount_index_item_counts():
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_tasks.py::test_recount_index_item_counts -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_recount_index_item_counts(i18n_app, redis_connect):
+    recount_key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_KEY"]
+    redis_connect.redis.set(recount_key, 1)
+    with patch("weko_index_tree.utils.recount_dirty_index_item_counts") as mock_recount:
+        recount_index_item_counts()
+        mock_recount.assert_called_once_with()
+    assert not redis_connect.redis.exists(recount_key)
+
+
+# def delete_index_items(index_ids):
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_tasks.py::test_delete_index_items -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_delete_index_items(i18n_app):
+    with patch("weko_deposit.api.WekoDeposit.delete_by_index_tree_ids", return_value=2) as mock_delete:
+        delete_index_items(["1", "2"])
+        mock_delete.assert_called_once_with(["1", "2"])
+
+    # database errors are retried
+    with patch("weko_deposit.api.WekoDeposit.delete_by_index_tree_ids", side_effect=SQLAlchemyError("error")):
+        with patch("weko_index_tree.tasks.delete_index_items.retry", side_effect=Exception("retry")) as mock_retry:
+            with pytest.raises(Exception) as e:
+                delete_index_items(["1"])
+            assert str(e.value) == "retry"
+            mock_retry.assert_called_once()
+
+    # other errors fail the task
+    with patch("weko_deposit.api.WekoDeposit.delete_by_index_tree_ids", side_effect=ValueError("error")):
+        with pytest.raises(ValueError):
+            delete_index_items(["1"])
@@ -30,6 +30,11 @@ from weko_index_tree.utils import (
     reduce_index_by_more,
     reduce_index_by_role,
     recorrect_private_items_count,
+    refresh_index_item_counts,
+    recount_dirty_index_item_counts,
+    mark_index_item_counts_dirty,
+    get_index_item_counts,
+    update_index_item_counts,
     sanitize,
     check_doi_in_index,
     get_record_in_es_of_index,
@@ -39,6 +44,10 @@ from weko_index_tree.utils import (
     check_index_permissions,
     generate_path,
     save_index_trees_to_redis,
+    get_browsing_tree_cache,
+    update_index_tree_cache,
+    _patch_index_tree,
+    _browsing_trees,
     str_to_datetime
 )
 
@@ -46,13 +55,14 @@ from invenio_accounts.testutils import login_user_via_session, client_authentica
 ######
 import json
 import pytest
-from mock import patch
+from mock import patch, MagicMock
 from datetime import date, datetime, timedelta
 from functools import wraps
 from operator import itemgetter
 
 import redis
 from redis import sentinel
+from redis.exceptions import RedisError
 from elasticsearch.exceptions import NotFoundError
 from elasticsearch_dsl.query import Bool, Exists, Q, QueryString
 from flask import Markup, current_app, session
@@ -421,6 +431,121 @@ def test_recorrect_private_items_count(i18n_app, records):
     assert not recorrect_private_items_count(agp)
 
 
+# def refresh_index_item_counts():
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_refresh_index_item_counts -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_refresh_index_item_counts(i18n_app, redis_connect):
+    key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_KEY"]
+    dirty_key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY"]
+    store = redis_connect.redis
+    store.delete(key, dirty_key)
+    store.hset(key, "9", json.dumps({"doc_count": 1, "no_available": 0}))
+    counts = {"1": {"doc_count": 3, "no_available": 1}}
+    mark_index_item_counts_dirty(["1"])
+    with patch("weko_index_tree.utils._aggregate_index_item_counts", return_value=counts), \
+            patch("weko_index_tree.utils.time.time", return_value=9999999999):
+        assert refresh_index_item_counts() == counts
+    assert get_index_item_counts() == counts
+    assert not store.exists(dirty_key)
+
+
+# def mark_index_item_counts_dirty(index_ids):
+# def recount_dirty_index_item_counts():
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_recount_dirty_index_item_counts -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_recount_dirty_index_item_counts(i18n_app, redis_connect):
+    key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_KEY"]
+    dirty_key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY"]
+    store = redis_connect.redis
+    store.delete(key, dirty_key)
+
+    # not cached
+    counts = {"1": {"doc_count": 3, "no_available": 1},
+              "2": {"doc_count": 2, "no_available": 0}}
+    with patch("weko_index_tree.utils._aggregate_index_item_counts", return_value=counts) as mock_agg:
+        recount_dirty_index_item_counts()
+        mock_agg.assert_called_once_with()
+
+    # marks are kept per index
+    with patch("weko_index_tree.utils.time.time", return_value=100):
+        mark_index_item_counts_dirty(["2"])
+    with patch("weko_index_tree.utils.time.time", return_value=200):
+        mark_index_item_counts_dirty(["3"])
+    assert set(store.hkeys(dirty_key)) == {b"2", b"3"}
+
+    # recount only the indexes marked before the refresh delay
+    with patch("weko_index_tree.utils._aggregate_index_item_counts", return_value={}) as mock_agg, \
+            patch("weko_index_tree.utils.time.time", return_value=101):
+        recount_dirty_index_item_counts()
+        mock_agg.assert_not_called()
+    with patch("weko_index_tree.utils._aggregate_index_item_counts", return_value={}) as mock_agg, \
+            patch("weko_index_tree.utils.time.time", return_value=150):
+        recount_dirty_index_item_counts()
+        mock_agg.assert_called_once_with(["2"])
+    assert store.hkeys(dirty_key) == [b"3"]
+    with patch("weko_index_tree.tasks.recount_index_item_counts.apply_async"):
+        assert get_index_item_counts() == {"1": {"doc_count": 3, "no_available": 1}}
+
+
+# def get_index_item_counts():
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_get_index_item_counts -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_get_index_item_counts(i18n_app, redis_connect):
+    key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_KEY"]
+    dirty_key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY"]
+    recount_key = i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_KEY"]
+    store = redis_connect.redis
+    store.delete(key, dirty_key, recount_key)
+
+    # not cached, counted by the task
+    with patch("weko_index_tree.tasks.recount_index_item_counts.apply_async") as mock_task, \
+            patch("weko_index_tree.utils._aggregate_index_item_counts") as mock_agg:
+        assert get_index_item_counts() is None
+        assert get_index_item_counts() is None
+        mock_task.assert_called_once_with(
+            countdown=i18n_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_REFRESH_DELAY"])
+        mock_agg.assert_not_called()
+
+    # cached
+    store.delete(recount_key)
+    store.hset(key, "1", json.dumps({"doc_count": 3, "no_available": 1}))
+    store.hset(key, "_updated", 1)
+    with patch("weko_index_tree.tasks.recount_index_item_counts.apply_async") as mock_task:
+        assert get_index_item_counts() == {"1": {"doc_count": 3, "no_available": 1}}
+        mock_task.assert_not_called()
+
+    # dirty, the cached counts are returned until the task recounts them
+    mark_index_item_counts_dirty(["1"])
+    with patch("weko_index_tree.tasks.recount_index_item_counts.apply_async") as mock_task, \
+            patch("weko_index_tree.utils._aggregate_index_item_counts") as mock_agg:
+        assert get_index_item_counts() == {"1": {"doc_count": 3, "no_available": 1}}
+        mock_task.assert_called_once()
+        mock_agg.assert_not_called()
+    store.delete(key, dirty_key, recount_key)
+
+    # redis not available
+    with patch("weko_index_tree.utils.RedisConnection", side_effect=RedisError):
+        assert get_index_item_counts() is None
+
+
+# def update_index_item_counts(sender, record=None, **kwargs):
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_update_index_item_counts -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_update_index_item_counts(i18n_app):
+    class MockRecord(dict):
+        pass
+
+    record = MockRecord(path=["2"])
+    record.model = MagicMock()
+    record.model.json = {"path": ["1"]}
+    with patch("weko_index_tree.utils.mark_index_item_counts_dirty") as mock_mark:
+        update_index_item_counts(i18n_app, record=record)
+        mock_mark.assert_called_once_with({"1", "2"})
+
+    with patch("weko_index_tree.utils.mark_index_item_counts_dirty") as mock_mark:
+        update_index_item_counts(i18n_app, record={"item_type_id": 1})
+        mock_mark.assert_not_called()
+
+    with patch("weko_index_tree.utils.mark_index_item_counts_dirty", side_effect=Exception("error")):
+        update_index_item_counts(i18n_app, record={"path": ["1"]})
+
+
 #+++ def check_doi_in_index(index_id):
 def test_check_doi_in_index(i18n_app, indices, db_records):
     assert check_doi_in_index(33)
@@ -626,6 +751,103 @@ def test_save_index_trees_to_redis(app, redis_connect):
         assert not save_index_trees_to_redis(tree)
 
 
+# def _patch_index_tree(tree, index_id):
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_patch_index_tree -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_patch_index_tree(app):
+    tree = [
+        {"id": "1", "name": "a", "children": [
+            {"id": "11", "parent": "1", "name": "b", "children": [
+                {"id": "111", "parent": "1/11", "name": "c", "children": []}]}]},
+        {"id": "2", "name": "d", "children": []}
+    ]
+    subtree = [
+        {"id": "11", "name": "b2", "children": [
+            {"id": "111", "parent": "11", "name": "c2", "children": [
+                {"id": "1111", "parent": "11/111", "name": "e", "children": []}]}]}
+    ]
+    with patch("weko_index_tree.api.Indexes.get_recursive_tree", return_value=[]):
+        with patch("weko_index_tree.utils.get_tree_json", return_value=subtree):
+            assert _patch_index_tree(tree, 11) == True
+            assert tree[0]["children"][0] == {
+                "id": "11", "parent": "1", "name": "b2", "children": [
+                    {"id": "111", "parent": "1/11", "name": "c2", "children": [
+                        {"id": "1111", "parent": "1/11/111", "name": "e", "children": []}]}]}
+            assert tree[1] == {"id": "2", "name": "d", "children": []}
+
+            # not in the tree
+            with patch("weko_index_tree.api.Indexes.get_index", return_value=None):
+                assert _patch_index_tree(tree, 3) == False
+
+            # created index, its parent is patched
+            with patch("weko_index_tree.api.Indexes.get_index",
+                       return_value=MagicMock(parent=11)) as mock_index:
+                assert _patch_index_tree(tree, 1112) == True
+                mock_index.assert_called_once_with(1112)
+                assert tree[0]["children"][0]["children"][0]["children"][0]["id"] == "1111"
+
+            # created index at the top level
+            with patch("weko_index_tree.api.Indexes.get_index",
+                       return_value=MagicMock(parent=0)):
+                assert _patch_index_tree(tree, 3) == False
+
+        # deleted index
+        with patch("weko_index_tree.utils.get_tree_json", side_effect=KeyError):
+            assert _patch_index_tree(tree, 2) == False
+
+
+# def get_browsing_tree_cache():
+# .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_get_browsing_tree_cache -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
+def test_get_browsing_tree_cache(app, redis_connect):
+    os.environ['INVENIO_WEB_HOST_NAME'] = "test"
+    store = redis_connect.redis
+    store.delete("index_tree_version_test", "index_tree_changes_test",
+                 "index_tree_view_test_en", "index_tree_view_test_en_version")
+    _browsing_trees.clear()
+    tree = [{"id": "1", "name": "a", "children": []}]
+    with app.test_request_context(headers=[("Accept-Language", "en")]):
+        # not stored yet
+        with patch("weko_index_tree.api.Indexes.get_index_tree", return_value=tree) as mock_tree:
+            assert get_browsing_tree_cache() == tree
+            mock_tree.assert_called_once()
+        assert json.loads(store.get("index_tree_view_test_en")) == tree
+        assert store.get("index_tree_view_test_en_version") == b"0"
+
+        # same version, in process
+        with patch("weko_index_tree.api.Indexes.get_index_tree") as mock_tree:
+            res = get_browsing_tree_cache()
+            assert res == tree
+            res.clear()
+            assert get_browsing_tree_cache() == tree
+            mock_tree.assert_not_called()
+
+        # a subtree changed
+        def _patch(tree, index_id):
+            tree[0]["name"] = "b"
+            return True
+        with patch("weko_index_tree.api.Indexes.get_index_tree") as mock_tree:
+            with patch("weko_index_tree.utils._patch_index_tree", side_effect=_patch) as mock_patch:
+                update_index_tree_cache(1)
+                mock_patch.assert_called_once()
+                assert mock_patch.call_args[0][1] == 1
+                mock_tree.assert_not_called()
+        assert get_browsing_tree_cache() == [{"id": "1", "name": "b", "children": []}]
+        assert store.get("index_tree_view_test_en_version") == b"1"
+        assert store.hget("index_tree_changes_test", 1) == b"1"
+
+        # whole tree changed
+        with patch("weko_index_tree.api.Indexes.get_index_tree", return_value=tree) as mock_tree:
+            update_index_tree_cache()
+            mock_tree.assert_called_once()
+        assert get_browsing_tree_cache() == tree
+        assert store.get("index_tree_view_test_en_version") == b"2"
+
+    with patch("weko_index_tree.utils.RedisConnection", side_effect=RedisError):
+        with app.test_request_context(headers=[("Accept-Language", "en")]):
+            with patch("weko_index_tree.api.Indexes.get_index_tree", return_value=tree):
+                assert get_browsing_tree_cache() == tree
+                assert not update_index_tree_cache(1)
+
+
 # def str_to_datetime(str_dt, format):
 # .tox/c1/bin/pytest --cov=weko_index_tree tests/test_utils.py::test_str_to_datetime -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-index-tree/.tox/c1/tmp
 def test_str_to_datetime():
@@ -21,13 +21,11 @@
 """API for weko-index-tree."""
 
 import pickle
-import os
 from copy import deepcopy
 from datetime import date, datetime
 from functools import partial
 from socketserver import DatagramRequestHandler
 
-from redis.exceptions import RedisError
 from flask import current_app, json
 from flask_babelex import gettext as _
 from flask_login import current_user
@@ -40,13 +38,12 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.sql.expression import case, func, literal_column
 from weko_groups.api import Group
-from weko_redis.redis import RedisConnection
 
 from .models import Index
 from .utils import cached_index_tree_json, check_doi_in_index, \
     check_restrict_doi_with_indexes, filter_index_list_by_role, \
     get_index_id_list, get_publish_index_id_list, get_tree_json, \
-    get_user_roles, is_index_locked, reset_tree, sanitize, save_index_trees_to_redis
+    get_browsing_tree_cache, get_user_roles, is_index_locked, reset_tree, sanitize
 
 
 class Indexes(object):
@@ -322,15 +319,15 @@ class Indexes(object):
         :param path: path of the index.
         :return: bool True: Delete success None: Delete failed
         """
-        from weko_deposit.api import WekoDeposit
+        from .tasks import delete_index_items
         if "move" == action:
             result = cls.delete(index_id, True)
         else:
             result = cls.delete(index_id)
             if result:
-                # delete indexes all
-                for i in result:
-                    WekoDeposit.delete_by_index_tree_id(i)
+                # remove the indexes from their items in background
+                delete_index_items.delay(
+                    [str(index_id) for index_id in result])
         return result
 
     @classmethod
@@ -566,17 +563,7 @@ class Indexes(object):
     def get_browsing_tree(cls, pid=0):
         """Get browsing tree."""
         if pid == 0:
-            try:
-                redis_connection = RedisConnection()
-                datastore = redis_connection.connection(db=current_app.config['CACHE_REDIS_DB'], kv = True)
-                v = datastore.get("index_tree_view_" + os.environ.get('INVENIO_WEB_HOST_NAME') + "_" + current_i18n.language).decode("UTF-8")
-                tree = json.loads(str(v))
-            except RedisError:
-                tree = cls.get_index_tree(pid)
-                save_index_trees_to_redis(tree)
-            except KeyError:
-                tree = cls.get_index_tree(pid)
-                save_index_trees_to_redis(tree)
+            tree = get_browsing_tree_cache()
         else:
             tree = cls.get_index_tree(pid)
         reset_tree(tree=tree)
@@ -593,17 +580,7 @@ class Indexes(object):
     def get_browsing_tree_ignore_more(cls, pid=0):
         """Get browsing tree ignore more."""
         if pid == 0:
-            try:
-                redis_connection = RedisConnection()
-                datastore = redis_connection.connection(db=current_app.config['CACHE_REDIS_DB'], kv = True)
-                v = datastore.get("index_tree_view_" + os.environ.get('INVENIO_WEB_HOST_NAME') + "_" + current_i18n.language).decode("UTF-8")
-                tree = json.loads(str(v))
-            except RedisError:
-                tree = cls.get_index_tree(pid)
-                save_index_trees_to_redis(tree)
-            except KeyError:
-                tree = cls.get_index_tree(pid)
-                save_index_trees_to_redis(tree)
+            tree = get_browsing_tree_cache()
         else:
             tree = cls.get_index_tree(pid)
         reset_tree(tree=tree, ignore_more=True)
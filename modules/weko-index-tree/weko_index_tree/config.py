@@ -92,3 +92,33 @@ WEKO_INDEX_TREE_STATE_TIME_LIFE_SECONDS = 60
 
 WEKO_INDEX_TREE_INDEX_LOCK_KEY_PREFIX = "lock_index_"
 """Index lock key prefix."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE = True
+"""Use the cached item counts of indexes for the index tree."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_KEY = "index_item_counts"
+"""Redis hash of the item counts of indexes."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY = "index_item_counts_dirty"
+"""Redis hash of the indexes whose item counts must be recomputed."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_TIMEOUT = 60 * 60 * 24
+"""Cache timeout (seconds) of the item counts of indexes."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_REFRESH_DELAY = 2
+"""Seconds to wait for ES refresh before recounting a changed index."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_KEY = "index_item_counts_recount"
+"""Redis key set while a recount of the changed indexes is queued."""
+
+WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_TIMEOUT = 60 * 5
+"""Seconds after which a queued recount that did not run is queued again."""
+
+WEKO_INDEX_TREE_VERSION_KEY = "index_tree_version_{}"
+"""Redis key of the version of the index tree. Formatted with the host name."""
+
+WEKO_INDEX_TREE_CHANGES_KEY = "index_tree_changes_{}"
+"""Redis key of the indexes changed by each version of the index tree."""
+
+WEKO_INDEX_TREE_CHANGES_MAX = 100
+"""Number of versions of the index tree whose changes are kept."""
@@ -44,6 +44,8 @@ class WekoIndexTree(object):
         self.init_config(app)
         app.register_blueprint(blueprint)
         app.extensions['weko-index-tree'] = self
+        if app.config['WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE']:
+            self.register_signals(app)
 
     def init_config(self, app):
         """Initialize configuration.
@@ -60,6 +62,19 @@ class WekoIndexTree(object):
             if k.startswith('WEKO_INDEX_TREE_'):
                 app.config.setdefault(k, getattr(config, k))
 
+    def register_signals(self, app):
+        """Register signals to keep the item counts of indexes up to date.
+
+        :param app: The Flask application.
+        """
+        from invenio_records.signals import before_record_delete, \
+            before_record_insert, before_record_update
+
+        from .utils import update_index_item_counts
+        before_record_insert.connect(update_index_item_counts, weak=False)
+        before_record_update.connect(update_index_item_counts, weak=False)
+        before_record_delete.connect(update_index_item_counts, weak=False)
+
 
 class WekoIndexTreeREST(object):
     """Weko-index-tree Rest Obj."""
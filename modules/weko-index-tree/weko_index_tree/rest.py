@@ -37,7 +37,7 @@ from .errors import IndexAddedRESTError, IndexNotFoundRESTError, \
     IndexUpdatedRESTError, InvalidDataRESTError
 from .models import Index
 from .utils import check_doi_in_index, check_index_permissions, \
-    is_index_locked, perform_delete_index, save_index_trees_to_redis
+    is_index_locked, perform_delete_index, update_index_tree_cache
 
 
 def need_record_permission(factory_name):
@@ -243,8 +243,7 @@ class IndexActionResource(ContentNegotiatedMethodView):
             status = 201
             msg = 'Index created successfully.'
 
-            tree = self.record_class.get_index_tree()
-            save_index_trees_to_redis(tree)
+            update_index_tree_cache(int(data['id']))
         return make_response(
             jsonify({'status': status, 'message': msg, 'errors': errors}),
             status)
@@ -289,10 +288,7 @@ class IndexActionResource(ContentNegotiatedMethodView):
                 raise IndexUpdatedRESTError()
             msg = 'Index updated successfully.'
 
-            #roles = get_account_role()
-            #for role in roles:
-            tree = self.record_class.get_index_tree()
-            save_index_trees_to_redis(tree)
+            update_index_tree_cache(index_id)
 
         return make_response(jsonify(
             {'status': status, 'message': msg, 'errors': errors,
@@ -307,8 +303,7 @@ class IndexActionResource(ContentNegotiatedMethodView):
         action = request.values.get('action', 'all')
         msg, errors = perform_delete_index(index_id, self.record_class, action)
 
-        tree = self.record_class.get_index_tree()
-        save_index_trees_to_redis(tree)
+        update_index_tree_cache()
 
         return make_response(jsonify(
             {'status': 200, 'message': msg, 'errors': errors}), 200)
@@ -426,7 +421,6 @@ class IndexTreeActionResource(ContentNegotiatedMethodView):
             status = 201
             msg = _('Index moved successfully.')
 
-            tree = self.record_class.get_index_tree()
-            save_index_trees_to_redis(tree)
+            update_index_tree_cache()
         return make_response(
             jsonify({'status': status, 'message': msg}), status)
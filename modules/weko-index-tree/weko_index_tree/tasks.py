@@ -20,9 +20,11 @@
 """Weko Index celery tasks."""
 
 from celery import shared_task
+from elasticsearch.exceptions import ElasticsearchException
 from flask import current_app
 from invenio_db import db
 from invenio_oaiserver.models import OAISet
+from sqlalchemy.exc import SQLAlchemyError
 
 
 @shared_task(ignore_result=True)
@@ -80,3 +82,35 @@ def delete_oaiset_setting(id_list):
     except Exception as ex:
         current_app.logger.debug(ex)
         db.session.rollback()
+
+
+@shared_task(ignore_result=True)
+def reconcile_index_item_counts():
+    """Recompute the cached item counts of all indexes."""
+    from .utils import refresh_index_item_counts
+    if current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE']:
+        refresh_index_item_counts()
+
+
+@shared_task(ignore_result=True)
+def recount_index_item_counts():
+    """Recompute the cached item counts of the changed indexes."""
+    from .utils import __get_redis_store, recount_dirty_index_item_counts
+    __get_redis_store().redis.delete(
+        current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_KEY'])
+    recount_dirty_index_item_counts()
+
+
+@shared_task(ignore_result=True,
+             autoretry_for=(SQLAlchemyError, ElasticsearchException),
+             retry_backoff=60, max_retries=5)
+def delete_index_items(index_ids):
+    """Remove deleted indexes from the path of their items.
+
+    Database and ES errors are retried, items already updated are not
+    found again by the retry.
+    """
+    from weko_deposit.api import WekoDeposit
+    count = WekoDeposit.delete_by_index_tree_ids(index_ids)
+    current_app.logger.info(
+        "Updated {} items of deleted indexes.".format(count))
@@ -20,6 +20,8 @@
 
 """Module of weko-index-tree utils."""
 import os
+import pickle
+import time
 from datetime import date, datetime
 from functools import wraps
 from operator import itemgetter
@@ -35,10 +37,11 @@ from invenio_cache import current_cache
 from invenio_i18n.ext import current_i18n
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_search import RecordsSearch
+from redis.exceptions import RedisError
 from simplekv.memory.redisstore import RedisStore
 from weko_admin.utils import is_exists_key_in_redis
 from weko_groups.models import Group
-from weko_redis.redis import RedisConnection
+from weko_redis.redis import RedisConnection, get_many
 from weko_schema_ui.models import PublishStatus
 
 from .config import WEKO_INDEX_TREE_STATE_PREFIX
@@ -568,6 +571,211 @@ def recorrect_private_items_count(agp):
                 agg["no_available"]["doc_count"] += bk.get("doc_count")
 
 
+def _aggregate_index_item_counts(index_ids=None):
+    """Aggregate item counts per index from ES.
+
+    :param index_ids: Index ids to aggregate. All indexes if None.
+    :return: Dict of index id to ``doc_count`` and ``no_available``.
+    """
+    from .api import Indexes
+    terms = {"field": "path", "size": max(Indexes.get_index_count(), 1)}
+    if index_ids:
+        terms["include"] = [str(index_id) for index_id in index_ids]
+        terms["size"] = len(index_ids)
+    search = RecordsSearch(
+        index=current_app.config['SEARCH_UI_SEARCH_INDEX'])
+    search = search.update_from_dict({
+        "size": 0,
+        "query": {
+            "bool": {
+                "must": [
+                    {"match": {"relation_version_is_last": "true"}},
+                    {"terms": {"publish_status": [
+                        PublishStatus.PUBLIC.value,
+                        PublishStatus.PRIVATE.value]}}
+                ]
+            }
+        },
+        "aggs": {
+            "path": {
+                "terms": terms,
+                "aggs": {
+                    "date_range": {
+                        "filter": {"match": {
+                            "publish_status": PublishStatus.PUBLIC.value}},
+                        "aggs": {
+                            "available": {
+                                "range": {
+                                    "field": "publish_date",
+                                    "ranges": [
+                                        {"from": "now+1d/d"},
+                                        {"to": "now+1d/d"},
+                                    ],
+                                },
+                            }
+                        },
+                    },
+                    "no_available": {
+                        "filter": {"bool": {"must_not": [{"match": {
+                            "publish_status": PublishStatus.PUBLIC.value}}]}}
+                    },
+                },
+            }
+        }
+    })
+    agp = search.execute().to_dict()["aggregations"]["path"]["buckets"]
+    recorrect_private_items_count(agp)
+    return {
+        agg["key"]: {
+            "doc_count": agg["doc_count"],
+            "no_available": agg["no_available"]["doc_count"]
+        } for agg in agp
+    }
+
+
+_CLEAR_DIRTY_SCRIPT = """
+local fields = ARGV
+local first = 2
+if #ARGV == 1 then
+    fields = redis.call('HKEYS', KEYS[1])
+    first = 1
+end
+local removed = 0
+for i = first, #fields do
+    local v = redis.call('HGET', KEYS[1], fields[i])
+    if v and tonumber(v) <= tonumber(ARGV[1]) then
+        removed = removed + redis.call('HDEL', KEYS[1], fields[i])
+    end
+end
+return removed
+"""
+
+
+def refresh_index_item_counts():
+    """Recompute the item counts of all indexes and cache them.
+
+    :return: Dict of index id to ``doc_count`` and ``no_available``.
+    """
+    started = time.time()
+    counts = _aggregate_index_item_counts()
+    key = current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_KEY']
+    values = {k: json.dumps(v) for k, v in counts.items()}
+    values['_updated'] = started
+    pipe = __get_redis_store().redis.pipeline()
+    pipe.delete(key)
+    pipe.hmset(key, values)
+    pipe.expire(key, current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_TIMEOUT'])
+    pipe.execute()
+    _clear_index_item_counts_dirty(
+        started - current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_REFRESH_DELAY'])
+    return counts
+
+
+def recount_dirty_index_item_counts():
+    """Recompute the item counts of the indexes marked dirty.
+
+    Only indexes marked at least WEKO_INDEX_TREE_ITEM_COUNTS_REFRESH_DELAY
+    seconds ago are recounted, so that ES has refreshed the changed items.
+    All indexes are counted if no counts are cached yet.
+    """
+    redis = __get_redis_store().redis
+    key = current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_KEY']
+    if not redis.exists(key):
+        refresh_index_item_counts()
+        return
+
+    started = time.time()
+    delay = current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_REFRESH_DELAY']
+    dirty = redis.hgetall(
+        current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY'])
+    index_ids = [k.decode() for k, v in dirty.items()
+                 if started - float(v) >= delay]
+    if not index_ids:
+        return
+    fresh = _aggregate_index_item_counts(index_ids)
+    pipe = redis.pipeline()
+    removed = [index_id for index_id in index_ids if index_id not in fresh]
+    if removed:
+        pipe.hdel(key, *removed)
+    if fresh:
+        pipe.hmset(key, {k: json.dumps(v) for k, v in fresh.items()})
+    pipe.execute()
+    _clear_index_item_counts_dirty(started - delay, index_ids=index_ids)
+
+
+def mark_index_item_counts_dirty(index_ids):
+    """Mark indexes whose item counts must be recomputed.
+
+    :param index_ids: Index ids.
+    """
+    key = current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY']
+    now = time.time()
+    pipe = __get_redis_store().redis.pipeline()
+    pipe.hmset(key, {str(index_id): now for index_id in index_ids})
+    pipe.expire(key, current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_TIMEOUT'])
+    pipe.execute()
+
+
+def _clear_index_item_counts_dirty(before, index_ids=None):
+    """Unmark indexes which were not marked again after ``before``."""
+    __get_redis_store().redis.eval(
+        _CLEAR_DIRTY_SCRIPT, 1,
+        current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY'],
+        before, *(index_ids or []))
+
+
+def get_index_item_counts():
+    """Get the cached item counts of all indexes.
+
+    Indexes marked by :func:`mark_index_item_counts_dirty` are recounted
+    by a queued task, the counts cached so far are returned meanwhile.
+
+    :return: Dict of index id to ``doc_count`` and ``no_available``,
+        or None if no counts are cached yet or Redis is not available.
+    """
+    from .tasks import recount_index_item_counts as recount_task
+    try:
+        redis = __get_redis_store().redis
+        pipe = redis.pipeline(transaction=False)
+        pipe.hgetall(current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_KEY'])
+        pipe.exists(
+            current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_DIRTY_KEY'])
+        counts, dirty = pipe.execute()
+
+        if (not counts or dirty) and redis.set(
+                current_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_KEY'],
+                1, nx=True,
+                ex=current_app.config[
+                    'WEKO_INDEX_TREE_ITEM_COUNTS_RECOUNT_TIMEOUT']):
+            recount_task.apply_async(
+                countdown=current_app.config[
+                    'WEKO_INDEX_TREE_ITEM_COUNTS_REFRESH_DELAY'])
+    except RedisError as ex:
+        current_app.logger.warning(ex)
+        return None
+    if not counts:
+        return None
+    counts.pop(b'_updated', None)
+    return {k.decode(): json.loads(v) for k, v in counts.items()}
+
+
+def update_index_item_counts(sender, record=None, **kwargs):
+    """Mark the indexes of a record being changed for recount.
+
+    Connected to the record signals, the path stored before the change
+    is marked as well so that moved items are recounted in both indexes.
+    """
+    try:
+        paths = set(record.get('path') or []) if record else set()
+        model = getattr(record, 'model', None)
+        if model is not None and isinstance(model.json, dict):
+            paths.update(model.json.get('path') or [])
+        if paths:
+            mark_index_item_counts_dirty(paths)
+    except Exception as ex:
+        current_app.logger.error(ex)
+
+
 def check_doi_in_index(index_id):
     """Check doi in index.
 
@@ -1002,22 +1210,179 @@ def get_editing_items_in_index(index_id, recursively=False):
 
     return result
 
-def save_index_trees_to_redis(tree):
-    """save inde_tree to redis for roles
-    
-    """
+_browsing_trees = {}
+"""In-process browsing trees: ``{language: (version, pickled tree)}``."""
+
+
+def _dump_index_tree(tree):
+    """Serialize an index tree to JSON bytes."""
     def default(o):
         if hasattr(o, "isoformat"):
             return o.isoformat()
         else:
             return str(o)
+    return bytes(json.dumps(tree, default=default), encoding='utf-8')
+
+
+def _get_index_tree_key(lang=None):
+    """Get the redis key of the browsing tree of a language."""
+    return "index_tree_view_" + os.environ.get('INVENIO_WEB_HOST_NAME') \
+        + "_" + (lang or current_i18n.language)
+
+
+def save_index_trees_to_redis(tree, version=None):
+    """save inde_tree to redis for roles
+
+    :param tree: Index tree of the current language.
+    :param version: Version of the index tree the tree is built from.
+        Current version if None.
+    """
     redis = __get_redis_store()
     try:
-        v = bytes(json.dumps(tree, default=default), encoding='utf-8')
-        redis.put("index_tree_view_" + os.environ.get('INVENIO_WEB_HOST_NAME') + "_" + current_i18n.language,v)
-    except ConnectionError:
+        version_key = current_app.config['WEKO_INDEX_TREE_VERSION_KEY'].format(
+            os.environ.get('INVENIO_WEB_HOST_NAME'))
+        if version is None:
+            version = int(redis.redis.get(version_key) or 0)
+        v = _dump_index_tree(tree)
+        key = _get_index_tree_key()
+        pipe = redis.redis.pipeline()
+        pipe.set(key, v)
+        pipe.set(key + "_version", version)
+        pipe.execute()
+        _browsing_trees[current_i18n.language] = (
+            version, pickle.dumps(json.loads(v), -1))
+    except (ConnectionError, RedisError):
         current_app.logger.error("Fail save index_tree to redis")
 
+
+def _patch_index_tree(tree, index_id):
+    """Replace the subtree of an index by the one in the database.
+
+    An index which is not in the tree yet, such as a created one, is added
+    by replacing the subtree of its parent.
+
+    :param tree: Index tree to patch.
+    :param index_id: Index identifier.
+    :return: False if the index can not be patched.
+    """
+    from .api import Indexes
+
+    def _find(nodes):
+        for i, node in enumerate(nodes):
+            if node['id'] == str(index_id):
+                return nodes, i
+            found = _find(node.get('children', []))
+            if found:
+                return found
+        return None
+
+    found = _find(tree)
+    if not found:
+        index = Indexes.get_index(index_id)
+        if index is None or not index.parent:
+            return False
+        return _patch_index_tree(tree, index.parent)
+    nodes, i = found
+    try:
+        subtree = get_tree_json(Indexes.get_recursive_tree(index_id), index_id)
+    except KeyError:
+        return False
+    if not subtree:
+        return False
+
+    # parents of the subtree are relative to the index, make them absolute
+    node = json.loads(_dump_index_tree(subtree[0]))
+    prefix = ''
+    if 'parent' in nodes[i]:
+        node['parent'] = nodes[i]['parent']
+        prefix = nodes[i]['parent'] + '/'
+
+    def _set_parent(children):
+        for child in children:
+            child['parent'] = prefix + child['parent']
+            _set_parent(child.get('children', []))
+
+    _set_parent(node.get('children', []))
+    nodes[i] = node
+    return True
+
+
+def get_browsing_tree_cache():
+    """Get the browsing tree of the current language.
+
+    The tree is kept in process as long as the version of the index tree
+    is unchanged. When it has moved on, the subtrees of the indexes
+    changed since the stored tree was built are patched, other languages
+    catch up on their next request in the same way.
+
+    :return: Index tree which the caller may modify.
+    """
+    from .api import Indexes
+    lang = current_i18n.language
+    host = os.environ.get('INVENIO_WEB_HOST_NAME')
+    try:
+        redis = __get_redis_store().redis
+        version = int(redis.get(
+            current_app.config['WEKO_INDEX_TREE_VERSION_KEY'].format(host)) or 0)
+        cached = _browsing_trees.get(lang)
+        if cached and cached[0] == version:
+            return pickle.loads(cached[1])
+
+        key = _get_index_tree_key(lang)
+        v, tree_version = get_many(redis, [key, key + "_version"])
+        tree = None
+        changed = True
+        if v is not None and tree_version is not None \
+                and int(tree_version) <= version:
+            tree = json.loads(v)
+            tree_version = int(tree_version)
+            changed = tree_version < version
+            if changed:
+                changes = redis.hmget(
+                    current_app.config['WEKO_INDEX_TREE_CHANGES_KEY'].format(host),
+                    list(range(tree_version + 1, version + 1)))
+                if any(index_id is None or int(index_id) == 0
+                       for index_id in changes):
+                    tree = None
+                else:
+                    for index_id in dict.fromkeys(map(int, changes)):
+                        if not _patch_index_tree(tree, index_id):
+                            tree = None
+                            break
+        if tree is None:
+            tree = json.loads(_dump_index_tree(Indexes.get_index_tree()))
+        if changed:
+            save_index_trees_to_redis(tree, version)
+        else:
+            _browsing_trees[lang] = (version, pickle.dumps(tree, -1))
+        return tree
+    except RedisError:
+        return Indexes.get_index_tree()
+
+
+def update_index_tree_cache(index_id=0):
+    """Record a change of the index tree and update the browsing tree.
+
+    :param index_id: Index whose subtree changed. 0 if the whole tree
+        must be rebuilt.
+    """
+    host = os.environ.get('INVENIO_WEB_HOST_NAME')
+    try:
+        redis = __get_redis_store().redis
+        version = redis.incr(
+            current_app.config['WEKO_INDEX_TREE_VERSION_KEY'].format(host))
+        changes_key = current_app.config['WEKO_INDEX_TREE_CHANGES_KEY'].format(host)
+        pipe = redis.pipeline()
+        pipe.hset(changes_key, version, int(index_id))
+        pipe.hdel(changes_key,
+                  version - current_app.config['WEKO_INDEX_TREE_CHANGES_MAX'])
+        pipe.execute()
+    except RedisError:
+        current_app.logger.error("Fail save index_tree to redis")
+        return
+    get_browsing_tree_cache()
+
+
 def str_to_datetime(str_dt, format):
     try:
         return datetime.strptime(str_dt, format)
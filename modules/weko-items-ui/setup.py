@@ -57,6 +57,7 @@ setup_requires = [
 install_requires = [
     'Flask-BabelEx>=0.9.2',
     'invenio-assets>=1.0.0b7',
+    'invenio-cache>=1.0.0',
 ]
 
 packages = find_packages()
@@ -111,6 +112,9 @@ setup(
         'invenio_access.actions': [
             'item_access = weko_items_ui.permissions:action_item_access',
         ],
+        'invenio_celery.tasks': [
+            'weko_items_ui = weko_items_ui.tasks',
+        ],
     },
     extras_require=extras_require,
     install_requires=install_requires,
@@ -247,7 +247,7 @@ def base_app(instance_path):
     # InvenioTheme(app_)
     # InvenioREST(app_)
 
-    # InvenioCache(app_)
+    InvenioCache(app_)
 
     # InvenioDeposit(app_)
     # InvenioPIDStore(app_)
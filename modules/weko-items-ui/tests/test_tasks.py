@@ -0,0 +1,28 @@
+# .tox/c1/bin/pytest --cov=weko_items_ui tests/test_tasks.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-items-ui/.tox/c1/tmp
+
+
+from mock import patch, MagicMock
+
+from weko_items_ui.tasks import build_ranking_snapshots
+
+
+# def build_ranking_snapshots():
+# .tox/c1/bin/pytest --cov=weko_items_ui tests/test_tasks.py::test_build_ranking_snapshots -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-items-ui/.tox/c1/tmp
+def test_build_ranking_snapshots(app):
+    app.config.update(BABEL_DEFAULT_LOCALE='en',
+                      I18N_LANGUAGES=[('ja', 'Japanese')])
+    with patch("weko_items_ui.tasks.RankingSettings.get", return_value=None):
+        with patch("weko_items_ui.tasks.get_ranking_snapshot") as mock_snapshot:
+            build_ranking_snapshots()
+            mock_snapshot.assert_not_called()
+
+    settings = MagicMock()
+    with patch("weko_items_ui.tasks.RankingSettings.get", return_value=settings):
+        with patch("weko_items_ui.tasks.get_ranking_snapshot") as mock_snapshot:
+            build_ranking_snapshots()
+            assert mock_snapshot.call_count == 2
+            mock_snapshot.assert_called_with(settings, refresh=True)
+
+        with patch("weko_items_ui.tasks.get_ranking_snapshot", side_effect=Exception("error")) as mock_snapshot:
+            build_ranking_snapshots()
+            assert mock_snapshot.call_count == 2
@@ -18,6 +18,7 @@ from invenio_accounts.testutils import login_user_via_session
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from jsonschema import SchemaError, ValidationError
 from mock import patch
+from invenio_cache import current_cache
 from weko_deposit.api import WekoDeposit, WekoRecord
 from weko_records.api import FeedbackMailList, ItemTypes, Mapping
 from weko_workflow.api import WorkActivity
@@ -68,6 +69,9 @@ from weko_items_ui.utils import (
     get_options_and_order_list,
     get_options_list,
     get_ranking,
+    get_ranking_permission_class,
+    get_ranking_snapshot,
+    get_ranking_snapshot_key,
     get_title_in_request,
     get_user_info_by_email,
     get_user_info_by_username,
@@ -338,6 +342,19 @@ def test_get_permission_record(app, users, db_itemtype, db_records):
             res = get_permission_record('new_items', es_data, 1, [1])
             assert res == [{'date': '2022-09-02', 'title': 'title', 'url': '../records/6'}]
 
+    # unpublished item of the owner
+    record = MagicMock()
+    record.pid.status = PIDStatus.REGISTERED
+    record.navi = [MagicMock(cid=1)]
+    with patch("weko_items_ui.utils.WekoRecord.get_record_by_pid", return_value=record), \
+            patch("weko_items_ui.utils.get_user_roles", return_value=(False, [3])), \
+            patch("weko_items_ui.utils.check_created_id", return_value=True), \
+            patch("weko_items_ui.utils.check_publish_status", return_value=False), \
+            patch("weko_items_ui.utils.parse_ranking_results", return_value={'title': 'title'}):
+        with app.test_request_context():
+            assert get_permission_record('new_items', es_data, 1, ['1']) == [{'title': 'title'}]
+            assert get_permission_record('new_items', es_data, 1, ['1'], check_owner=False) == []
+
 
 
 # def parse_ranking_results(index_info,
@@ -7758,6 +7775,42 @@ def test_get_ranking(app, db_records, db_ranking):
     with app.test_request_context():
         assert get_ranking(settings)=={'most_reviewed_items': [], 'most_downloaded_items': [], 'created_most_items_user': [], 'most_searched_keywords': [], 'new_items': []}
 
+
+# def get_ranking_permission_class():
+# .tox/c1/bin/pytest --cov=weko_items_ui tests/test_utils.py::test_get_ranking_permission_class -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-items-ui/.tox/c1/tmp
+def test_get_ranking_permission_class(app, users):
+    with app.test_request_context():
+        assert get_ranking_permission_class() == 'guest'
+    with app.test_request_context():
+        with patch("flask_login.utils._get_user", return_value=users[1]["obj"]):
+            with patch("weko_items_ui.utils.get_user_roles", return_value=(True, [2])):
+                assert get_ranking_permission_class() == 'admin'
+            with patch("weko_items_ui.utils.get_user_roles", return_value=(False, [4, 3])):
+                with patch("weko_items_ui.utils.get_user_groups", return_value=[2, 1]):
+                    assert get_ranking_permission_class() == \
+                        'user-{}-3.4-1.2'.format(users[1]["obj"].id)
+
+
+# def get_ranking_snapshot(settings, refresh=False):
+# .tox/c1/bin/pytest --cov=weko_items_ui tests/test_utils.py::test_get_ranking_snapshot -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-items-ui/.tox/c1/tmp
+def test_get_ranking_snapshot(app, db_ranking):
+    settings = db_ranking['settings']
+    rankings = {'most_reviewed_items': [{'key': '1', 'count': 3}]}
+    with app.test_request_context():
+        key = get_ranking_snapshot_key(settings)
+        assert key.endswith('_guest')
+        assert get_ranking_snapshot_key(settings, 'admin') != key
+        current_cache.delete(key)
+        with patch("weko_items_ui.utils.get_ranking", return_value=rankings) as mock_ranking:
+            assert get_ranking_snapshot(settings) == rankings
+            assert get_ranking_snapshot(settings) == rankings
+            assert mock_ranking.call_count == 1
+            get_ranking_snapshot(settings, refresh=True)
+            assert mock_ranking.call_count == 2
+        settings.display_rank = 20
+        assert get_ranking_snapshot_key(settings) != key
+        current_cache.delete(key)
+
 # def __sanitize_string(s: str):
 # .tox/c1/bin/pytest --cov=weko_items_ui tests/test_utils.py::test___sanitize_string -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-items-ui/.tox/c1/tmp
 def test___sanitize_string():
@@ -204,4 +204,10 @@ WEKO_ITEMS_UI_RANKING_DEFAULT_SETTINGS = {
 
 WEKO_ITEMS_UI_RANKING_BUFFER = 100
 
+WEKO_ITEMS_UI_RANKING_SNAPSHOT_KEY = 'weko_items_ui_ranking_{0}_{1}_{2}_{3}'
+"""Cache key of a ranking snapshot (date, language, settings, permission class)."""
+
+WEKO_ITEMS_UI_RANKING_SNAPSHOT_TIMEOUT = 60 * 60
+"""Lifetime in seconds of a ranking snapshot."""
+
 WEKO_ITEMS_UI_SEARCH_RANK_KEY_FILTER = ['']
\ No newline at end of file
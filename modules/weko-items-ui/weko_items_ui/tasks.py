@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+"""Weko Items UI celery tasks."""
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from flask import current_app
+from weko_admin.models import RankingSettings
+
+from .utils import get_ranking_snapshot
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def build_ranking_snapshots():
+    """Precompute the guest ranking snapshot of every language.
+
+    Guests are the bulk of the ranking page and top page visitors, so their
+    snapshots are rebuilt on a schedule. Other permission classes are built
+    on their first request.
+    """
+    settings = RankingSettings.get()
+    if not settings:
+        return
+    languages = [current_app.config['BABEL_DEFAULT_LOCALE']] + [
+        lang for lang, _ in current_app.config.get('I18N_LANGUAGES', [])]
+    for lang in languages:
+        with current_app.test_request_context('/?ln={0}'.format(lang)):
+            try:
+                get_ranking_snapshot(settings, refresh=True)
+            except Exception as ex:
+                logger.error(
+                    'Failed to build ranking snapshot ({0}): {1}'.format(
+                        lang, ex))
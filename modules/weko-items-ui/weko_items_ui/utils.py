@@ -22,6 +22,7 @@
 
 import copy
 import csv
+import hashlib
 import json
 import os
 import re
@@ -42,6 +43,7 @@ from flask import abort, current_app, flash, redirect, request, send_file, \
 from flask_babelex import gettext as _
 from flask_login import current_user
 from invenio_accounts.models import Role, userrole
+from invenio_cache import current_cache
 from invenio_db import db
 from invenio_i18n.ext import current_i18n
 from invenio_indexer.api import RecordIndexer
@@ -61,7 +63,7 @@ from weko_deposit.api import WekoDeposit, WekoRecord
 from weko_deposit.pidstore import get_record_without_version
 from weko_index_tree.api import Indexes
 from weko_index_tree.utils import check_index_permissions, get_index_id, \
-    get_user_roles
+    get_user_groups, get_user_roles
 from weko_records.api import FeedbackMailList, ItemTypes, Mapping
 from weko_records.serializers.utils import get_item_type_name
 from weko_records.utils import replace_fqdn_of_file_metadata
@@ -390,7 +392,7 @@ def find_hidden_items(item_id_list, idx_paths=None, check_creator_permission=Fal
     return hidden_list
 
 
-def get_permission_record(rank_type, es_data, display_rank, has_permission_indexes):
+def get_permission_record(rank_type, es_data, display_rank, has_permission_indexes, check_owner=True):
     """
     Find items that should be visible by the current user.
 
@@ -399,6 +401,7 @@ def get_permission_record(rank_type, es_data, display_rank, has_permission_index
         es_data: List of ranking data.
         display_rank: Number of ranking display.
         has_permission_indexes: List of can be view by the current user.
+        check_owner: If False, unpublished items are not visible to their owner either.
     return: List of ranking data that the user can access.
     """
 
@@ -424,7 +427,7 @@ def get_permission_record(rank_type, es_data, display_rank, has_permission_index
             if roles[0]:
                 add_flag = True
             else:
-                is_public = roles[0] or check_created_id(record) or check_publish_status(record)
+                is_public = roles[0] or (check_owner and check_created_id(record)) or check_publish_status(record)
                 has_index_permission = False
                 for idx in record.navi:
                     if str(idx.cid) in has_permission_indexes:
@@ -654,12 +657,10 @@ def update_json_schema_by_activity_id(json_data, activity_id):
 
     redis_connection = RedisConnection()
     sessionstore = redis_connection.connection(db=current_app.config['ACCOUNTS_SESSION_REDIS_DB_NO'], kv = True)
-    if not sessionstore.redis.exists(
-        'updated_json_schema_{}'.format(activity_id)) or not sessionstore.get(
-        'updated_json_schema_{}'.format(activity_id)):
-        return None
-    session_data = sessionstore.get(
+    session_data = sessionstore.redis.get(
         'updated_json_schema_{}'.format(activity_id))
+    if not session_data:
+        return None
     error_list = json.loads(session_data.decode('utf-8'))
     #current_app.logger.error("error_list:{}".format(error_list))
     if error_list:
@@ -684,13 +685,10 @@ def update_schema_form_by_activity_id(schema_form, activity_id):
 
     redis_connection = RedisConnection()
     sessionstore = redis_connection.connection(db=current_app.config['ACCOUNTS_SESSION_REDIS_DB_NO'], kv = True)
-    if not sessionstore.redis.exists(
-        'updated_json_schema_{}'.format(activity_id)) \
-        or not sessionstore.get(
-            'updated_json_schema_{}'.format(activity_id)):
-        return None
-    session_data = sessionstore.get(
+    session_data = sessionstore.redis.get(
         'updated_json_schema_{}'.format(activity_id))
+    if not session_data:
+        return None
     error_list = json.loads(session_data.decode('utf-8'))
 
     if error_list and error_list['either']:
@@ -2593,6 +2591,65 @@ def get_ranking(settings):
     return rankings
 
 
+def get_ranking_permission_class():
+    """Get the permission class the current user sees the ranking with.
+
+    Administrators see every item and guests only the public ones. Other
+    users may also see the items they created, so each gets its own class.
+
+    :return: Permission class name.
+    """
+    roles = get_user_roles()
+    if roles[0]:
+        return 'admin'
+    if not current_user or not current_user.is_authenticated:
+        return 'guest'
+    return 'user-{0}-{1}-{2}'.format(
+        current_user.get_id(),
+        '.'.join(str(x) for x in sorted(roles[1] or [])),
+        '.'.join(str(x) for x in sorted(get_user_groups())))
+
+
+def get_ranking_snapshot_key(settings, permission_class=None):
+    """Get the cache key of a ranking snapshot.
+
+    :param settings: ranking setting.
+    :param permission_class: Permission class, the current user's if None.
+    :return: Cache key.
+    """
+    fingerprint = hashlib.md5(json.dumps(dict(
+        new_item_period=settings.new_item_period,
+        statistical_period=settings.statistical_period,
+        display_rank=settings.display_rank,
+        rankings=settings.rankings
+    ), sort_keys=True).encode('utf-8')).hexdigest()
+    return current_app.config['WEKO_ITEMS_UI_RANKING_SNAPSHOT_KEY'].format(
+        date.today().strftime('%Y%m%d'),
+        current_i18n.language,
+        fingerprint,
+        permission_class or get_ranking_permission_class())
+
+
+def get_ranking_snapshot(settings, refresh=False):
+    """Get the ranking of the current user from its snapshot.
+
+    The snapshot is computed by get_ranking on a miss and kept until
+    WEKO_ITEMS_UI_RANKING_SNAPSHOT_TIMEOUT or the settings change.
+
+    :param settings: ranking setting.
+    :param refresh: Recompute the snapshot even if it is cached.
+    :return: Rankings.
+    """
+    key = get_ranking_snapshot_key(settings)
+    rankings = None if refresh else current_cache.get(key)
+    if rankings is None:
+        rankings = get_ranking(settings)
+        current_cache.set(
+            key, rankings,
+            timeout=current_app.config['WEKO_ITEMS_UI_RANKING_SNAPSHOT_TIMEOUT'])
+    return rankings
+
+
 def __sanitize_string(s: str):
     """Sanitize control characters without '\x09', '\x0a', '\x0d' and '0x7f'.
 
@@ -64,7 +64,8 @@ from .permissions import item_permission
 from .utils import _get_max_export_items, check_item_is_being_edit, \
     export_items, get_current_user, get_data_authors_prefix_settings, \
     get_data_authors_affiliation_settings, \
-    get_list_email, get_list_username, get_ranking, get_user_info_by_email, \
+    get_list_email, get_list_username, get_ranking_snapshot, \
+    get_user_info_by_email, \
     get_user_info_by_username, get_user_information, get_user_permission, \
     get_workflow_by_item_type_id, hide_form_items, is_schema_include_key, \
     remove_excluded_items_in_json_schema, sanitize_input_data, save_title, \
@@ -1006,8 +1007,7 @@ def ranking():
     page, render_widgets = get_design_layout(
         current_app.config['WEKO_THEME_DEFAULT_COMMUNITY'])
 
-    
-    rankings = get_ranking(settings)
+    rankings = get_ranking_snapshot(settings)
 
     x = rankings.get('most_searched_keywords')
     if x:
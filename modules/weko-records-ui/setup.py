@@ -104,6 +104,9 @@ setup(
         'invenio_config.module': [
             'weko_records_ui = weko_records_ui.config',
         ],
+        'invenio_celery.tasks': [
+            'weko_records_ui = weko_records_ui.tasks',
+        ],
         'invenio_assets.bundles': [
             'weko_records_ui_css = weko_records_ui.bundles:style',
             'weko_records_ui_dependencies_js = weko_records_ui.bundles:js_dependecies',
@@ -1,7 +1,7 @@
 import pytest
 from mock import patch, MagicMock
 
-from weko_records_ui.preview import preview, decode_name, zip_preview, children_to_list
+from weko_records_ui.preview import preview, decode_name, zip_preview, children_to_list, zip_tree
 
 # .tox/c1/bin/pytest --cov=weko_records_ui tests/test_preview.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-records-ui/.tox/c1/tmp
 # def preview(pid, record, template=None, **kwargs):
@@ -102,16 +102,33 @@ def test_children_to_list(app):
 # def zip_preview(file):
 def test_zip_preview(app):
     obj1 = MagicMock()
-    obj2 = MagicMock()
-    obj3 = MagicMock()
-
-    with patch("weko_records_ui.preview.make_tree", return_value=(obj1, obj2, obj3)):
-        with patch("weko_records_ui.preview.children_to_list", return_value={"children": [1,2,3]}):
-            # Error
-            try:
-                zip_preview(obj1)
-            except:
-                pass
+
+    tree = [{"name": "a", "path": "a", "type": "folder", "size": 0}]
+    with patch("weko_records_ui.preview.get_tree_level", return_value=(tree, False, None)):
+        with patch("weko_records_ui.preview.render_template", return_value="") as render:
+            zip_preview(obj1)
+            assert render.call_args[1]["tree"] == tree
+            assert render.call_args[1]["tree_url"] == obj1.tree_uri
+
+
+# def zip_tree(pid, record, template=None, **kwargs):
+def test_zip_tree(app):
+    pid = MagicMock()
+    record = MagicMock()
+    children = [{"name": "b.txt", "path": "a/b.txt", "type": "item", "size": 5}]
+    with app.test_request_context('/record/1/preview_zip_tree/test.zip?path=a'):
+        with patch("weko_records_ui.preview.current_previewer") as previewer:
+            previewer.record_file_factory.return_value = None
+            with pytest.raises(Exception):
+                zip_tree(pid, record)
+
+            fileobj = MagicMock()
+            fileobj.key = "test.zip"
+            previewer.record_file_factory.return_value = fileobj
+            with patch("weko_records_ui.preview.get_tree_level", return_value=(children, False, None)) as get_level:
+                res = zip_tree(pid, record)
+                assert get_level.call_args[0][1] == "a"
+                assert res.json["children"][0]["path"] == "a/b.txt"
 
 # def decode_name(k):
 def test_decode_name(app):
@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+from mock import patch
+
+from weko_records_ui.tasks import build_landing_page_meta_task
+
+# .tox/c1/bin/pytest --cov=weko_records_ui tests/test_tasks.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-records-ui/.tox/c1/tmp
+
+# def build_landing_page_meta_task(self, record_id, revision_id=None):
+# .tox/c1/bin/pytest --cov=weko_records_ui tests/test_tasks.py::test_build_landing_page_meta_task -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-records-ui/.tox/c1/tmp
+def test_build_landing_page_meta_task(app, records):
+    indexer, results = records
+    record = results[0]["record"]
+    app.config["THEME_SITEURL"] = "https://weko3.example.org"
+
+    def get_landing_page_meta(record):
+        from flask import request
+        assert request.host == "weko3.example.org"
+
+    with patch("weko_records_ui.tasks.get_draft_record_ids", return_value=set()), \
+            patch("weko_records_ui.tasks.get_landing_page_meta", side_effect=get_landing_page_meta) as mock_meta:
+        build_landing_page_meta_task(str(record.id))
+        assert mock_meta.call_args[0][0].id == record.id
+
+    # draft
+    with patch("weko_records_ui.tasks.get_draft_record_ids", return_value={record.id}), \
+            patch("weko_records_ui.tasks.get_landing_page_meta") as mock_meta:
+        build_landing_page_meta_task(str(record.id))
+        mock_meta.assert_not_called()
+
+    # replaced by a later revision
+    with patch("weko_records_ui.tasks.get_draft_record_ids", return_value=set()), \
+            patch("weko_records_ui.tasks.get_landing_page_meta") as mock_meta:
+        build_landing_page_meta_task(str(record.id), record.revision_id - 1)
+        mock_meta.assert_not_called()
+        build_landing_page_meta_task(str(record.id), record.revision_id)
+        mock_meta.assert_called_once()
+
+    # deleted record
+    with patch("weko_records_ui.tasks.get_landing_page_meta") as mock_meta:
+        build_landing_page_meta_task(str(uuid.uuid4()))
+        mock_meta.assert_not_called()
+
+    # error, retried
+    with patch("weko_records_ui.tasks.get_draft_record_ids", side_effect=Exception("error")), \
+            patch("weko_records_ui.tasks.get_landing_page_meta") as mock_meta, \
+            patch("weko_records_ui.tasks.build_landing_page_meta_task.retry", side_effect=Exception("retry")) as mock_retry:
+        with pytest.raises(Exception) as e:
+            build_landing_page_meta_task(str(record.id))
+        assert str(e.value) == "retry"
+        mock_meta.assert_not_called()
+        assert str(mock_retry.call_args[1]["exc"]) == "error"
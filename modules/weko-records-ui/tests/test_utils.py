@@ -1,5 +1,5 @@
 import pytest
-from weko_records_ui.utils import create_usage_report_for_user,get_data_usage_application_data,send_usage_report_mail_for_user,check_and_send_usage_report,check_and_create_usage_report,update_onetime_download,create_onetime_download_url,get_onetime_download,validate_onetime_download_token,get_license_pdf,hide_item_metadata,get_pair_value,get_min_price_billing_file_download,parse_one_time_download_token,generate_one_time_download_url,validate_download_record,is_private_index,get_file_info_list,replace_license_free,is_show_email_of_creator,hide_by_itemtype,hide_by_email,hide_by_file,hide_item_metadata_email_only,get_workflows,get_billing_file_download_permission,get_list_licence,restore,soft_delete,is_billing_item,get_groups_price,get_record_permalink,get_google_detaset_meta,get_google_scholar_meta,display_oaiset_path,get_terms,get_roles,check_items_settings
+from weko_records_ui.utils import create_usage_report_for_user,get_data_usage_application_data,send_usage_report_mail_for_user,check_and_send_usage_report,check_and_create_usage_report,update_onetime_download,create_onetime_download_url,get_onetime_download,validate_onetime_download_token,get_license_pdf,hide_item_metadata,get_pair_value,get_min_price_billing_file_download,parse_one_time_download_token,generate_one_time_download_url,validate_download_record,is_private_index,get_file_info_list,replace_license_free,is_show_email_of_creator,hide_by_itemtype,hide_by_email,hide_by_file,hide_item_metadata_email_only,get_workflows,get_billing_file_download_permission,get_list_licence,restore,soft_delete,is_billing_item,get_groups_price,get_record_permalink,get_google_detaset_meta,get_google_scholar_meta,display_oaiset_path,get_terms,get_roles,check_items_settings,get_landing_page_meta,get_draft_record_ids,queue_landing_page_meta
 import base64
 from unittest.mock import MagicMock
 import copy
@@ -14,7 +14,7 @@ from flask import Flask, json, jsonify, session, url_for,current_app
 from flask_security.utils import login_user
 from invenio_accounts.testutils import login_user_via_session
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
-from mock import patch
+from mock import patch, PropertyMock
 from weko_deposit.api import WekoRecord
 from weko_records_ui.models import FileOnetimeDownload
 from weko_records.api import ItemTypes,Mapping
@@ -1337,4 +1337,114 @@ def test_get_google_detaset_meta(app, records, itemtypes, oaischema, oaiidentify
         data1 = MagicMock()
 
         with patch("lxml.etree", return_value=data1):
-            assert get_google_detaset_meta(record) == None
\ No newline at end of file
+            assert get_google_detaset_meta(record) == None
+
+
+# def get_landing_page_meta(record):
+# def build_landing_page_meta(record):
+# .tox/c1/bin/pytest --cov=weko_records_ui tests/test_utils.py::test_get_landing_page_meta -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-records-ui/.tox/c1/tmp
+def test_get_landing_page_meta(app, records):
+    indexer, results = records
+    record = results[0]["record"]
+    cache = {}
+    current_cache = MagicMock()
+    current_cache.get = lambda key: cache.get(key)
+    current_cache.set = lambda key, value, timeout=None: cache.update({key: value})
+    with app.test_request_context():
+        with patch("weko_records_ui.utils.current_cache", current_cache), \
+                patch("weko_records_ui.utils.ItemLink.get_item_link_info", return_value=[]), \
+                patch("weko_records_ui.utils.getrecord", return_value=etree.fromstring("<OAI-PMH/>")) as mock_getrecord, \
+                patch("weko_records_ui.utils.get_google_scholar_meta", return_value=[{"name": "citation_title", "data": "title"}]), \
+                patch("weko_records_ui.utils.get_google_detaset_meta", return_value="{}"):
+            meta = get_landing_page_meta(record)
+            assert meta == {
+                "google_scholar_meta": [{"name": "citation_title", "data": "title"}],
+                "google_dataset_meta": "{}",
+                "relation": {}
+            }
+            assert list(cache) == ["landing_page_meta_{}_{}".format(record.id, record.revision_id)]
+
+            # from the cache
+            assert get_landing_page_meta(record) == meta
+            assert mock_getrecord.call_count == 1
+
+            # the publish date is in future
+            cache.clear()
+            with patch("weko_records_ui.utils.is_pubdate_in_future", return_value=True):
+                assert get_landing_page_meta(record) == meta
+            assert cache == {}
+
+
+# def get_draft_record_ids(record_ids):
+# .tox/c1/bin/pytest --cov=weko_records_ui tests/test_utils.py::test_get_draft_record_ids -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-records-ui/.tox/c1/tmp
+def test_get_draft_record_ids(app, records):
+    indexer, results = records
+    record = results[0]["record"]
+    cache = {}
+    current_cache = MagicMock()
+    current_cache.get_many = lambda *keys: [cache.get(key) for key in keys]
+    current_cache.set = lambda key, value, timeout=None: cache.update({key: value})
+    with patch("weko_records_ui.utils.current_cache", current_cache):
+        assert get_draft_record_ids([]) == set()
+
+        key = "record_deposit_status_{}_{}".format(record.id, record.revision_id)
+        cache[key] = "draft"
+        assert get_draft_record_ids([record.id]) == {record.id}
+
+        cache[key] = "published"
+        assert get_draft_record_ids([record.id]) == set()
+
+        cache.clear()
+        assert get_draft_record_ids([record.id]) == set()
+        assert cache[key] == "published"
+
+
+# def queue_landing_page_meta(sender, record=None, *args, **kwargs):
+# def _build_queued_landing_page_meta(session):
+# .tox/c1/bin/pytest --cov=weko_records_ui tests/test_utils.py::test_queue_landing_page_meta -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-records-ui/.tox/c1/tmp
+def test_queue_landing_page_meta(app, db, records):
+    indexer, results = records
+    record = results[0]["record"]
+    app.config["WEKO_RECORDS_UI_LANDING_PAGE_META_PREBUILD"] = True
+    with patch("weko_records_ui.tasks.build_landing_page_meta_task.apply_async") as mock_task:
+        queue_landing_page_meta(app, record=None)
+        queue_landing_page_meta(app, record=record)
+        queue_landing_page_meta(app, record=record)
+        db.session.commit()
+        mock_task.assert_called_once_with(args=(str(record.id), record.revision_id))
+
+        # only the last revision of the transaction
+        mock_task.reset_mock()
+        with patch.object(type(record), "revision_id", new_callable=PropertyMock, side_effect=[1, 3, 2]):
+            for _ in range(3):
+                queue_landing_page_meta(app, record=record)
+        db.session.commit()
+        mock_task.assert_called_once_with(args=(str(record.id), 3))
+
+        # already built
+        mock_task.reset_mock()
+        key = app.config["WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_KEY"].format(record.id, record.revision_id)
+        with patch("weko_records_ui.utils.current_cache.get_many", return_value=[{"relation": {}}]) as mock_get:
+            queue_landing_page_meta(app, record=record)
+            db.session.commit()
+            mock_get.assert_called_once_with(key)
+        mock_task.assert_not_called()
+
+        # not a published item
+        with patch("weko_records_ui.utils.is_published_item", return_value=False):
+            queue_landing_page_meta(app, record=record)
+        db.session.commit()
+        mock_task.assert_not_called()
+
+        # rolled back
+        mock_task.reset_mock()
+        queue_landing_page_meta(app, record=record)
+        db.session.rollback()
+        db.session.commit()
+        mock_task.assert_not_called()
+
+        # disabled
+        app.config["WEKO_RECORDS_UI_LANDING_PAGE_META_PREBUILD"] = False
+        queue_landing_page_meta(app, record=record)
+        db.session.commit()
+        mock_task.assert_not_called()
@@ -809,7 +809,8 @@ def test_default_view_method_fix35133(app, records, itemtypes, indexstyle,mocker
     mock_render_template = mocker.patch("weko_records_ui.views.render_template")
     with app.test_request_context():
         with patch('weko_records_ui.views.check_original_pdf_download_permission', return_value=True):
-            with patch("weko_records_ui.views.getrecord",return_value=et):
+            with patch("weko_records_ui.utils.getrecord",return_value=et), \
+                    patch("weko_records_ui.utils.current_cache.get",return_value=None):
                 default_view_method(recid, record)
                 args, kwargs = mock_render_template.call_args
                 assert kwargs["google_scholar_meta"] == [
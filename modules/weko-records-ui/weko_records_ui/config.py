@@ -153,6 +153,14 @@ RECORDS_UI_ENDPOINTS = dict(
         permission_factory_imp='weko_records_ui.permissions'
                                ':page_permission_factory',
     ),
+    recid_preview_zip_tree=dict(
+        pid_type='recid',
+        route='/record/<pid_value>/preview_zip_tree/<path:filename>',
+        view_imp='weko_records_ui.preview.zip_tree',
+        record_class='weko_deposit.api:WekoRecord',
+        permission_factory_imp='weko_records_ui.permissions'
+                               ':page_permission_factory',
+    ),
     recid_publish=dict(
         pid_type='recid',
         route='/record/<pid_value>/publish',
@@ -615,3 +623,16 @@ WEKO_RECORDS_UI_DISPLAY_RESOURCE_TYPE = False
 
 WEKO_RECORDS_UI_DISPLAY_ITEM_TYPE = True
 """ Display item type name on item detail. """
+
+WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_KEY = 'landing_page_meta_{}_{}'
+"""Cache key of the landing page metadata of a record revision."""
+
+WEKO_RECORDS_UI_RECORD_STATUS_CACHE_KEY = 'record_deposit_status_{}_{}'
+"""Cache key of the deposit status of a record revision."""
+
+WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_TIMEOUT = 3600
+"""Cache timeout (seconds) of the landing page metadata. It bounds how long
+changes of index or OAI-PMH settings take to appear."""
+
+WEKO_RECORDS_UI_LANDING_PAGE_META_PREBUILD = True
+"""Build the landing page metadata of a record when it is committed."""
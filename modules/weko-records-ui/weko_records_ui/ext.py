@@ -44,6 +44,16 @@ class WekoRecordsUI(object):
         self.init_config(app)
         app.register_blueprint(blueprint)
         app.extensions['weko-records-ui'] = self
+        self.register_signals()
+
+    def register_signals(self):
+        """Build landing page metadata when records are changed."""
+        from invenio_records.signals import after_record_insert, \
+            after_record_update
+
+        from .utils import queue_landing_page_meta
+        after_record_insert.connect(queue_landing_page_meta)
+        after_record_update.connect(queue_landing_page_meta)
 
     def init_config(self, app):
         """Initialize configuration.
@@ -56,6 +66,11 @@ class WekoRecordsUI(object):
                 'WEKO_RECORDS_UI_BASE_TEMPLATE',
                 app.config['BASE_PAGE_TEMPLATE'],
             )
+        # Tasks run eagerly in tests, where no SQL can be emitted after commit.
+        app.config.setdefault(
+            'WEKO_RECORDS_UI_LANDING_PAGE_META_PREBUILD',
+            config.WEKO_RECORDS_UI_LANDING_PAGE_META_PREBUILD
+            and not app.testing)
         for k in dir(config):
             if k.startswith('WEKO_RECORDS_UI_'):
                 app.config.setdefault(k, getattr(config, k))
@@ -29,6 +29,7 @@ from sqlalchemy import desc, or_
 from sqlalchemy.dialects import postgresql
 from sqlalchemy_utils.models import Timestamp
 from sqlalchemy_utils.types import JSONType
+from weko_admin.cache import get_cached_row, watch_settings_model
 
 """ PDF cover page model"""
 
@@ -83,8 +84,9 @@ class PDFCoverPageSettings(db.Model):
     @classmethod
     def find(cls, id):
         """Find record by ID."""
-        record = db.session.query(cls).filter_by(id=id).first()
-        return record
+        return get_cached_row(
+            'pdfcoverpage_set:{}'.format(id),
+            lambda: db.session.query(cls).filter_by(id=id).first())
 
     @classmethod
     def update(
@@ -115,6 +117,9 @@ class PDFCoverPageSettings(db.Model):
         return record
 
 
+watch_settings_model(PDFCoverPageSettings)
+
+
 """ Record UI models """
 
 
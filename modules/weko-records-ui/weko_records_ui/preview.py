@@ -21,10 +21,10 @@
 """Preview for weko-records-ui."""
 
 import cchardet as chardet
-from flask import abort, current_app, render_template, request
+from flask import abort, current_app, jsonify, render_template, request
 from invenio_previewer.api import PreviewFile
 from invenio_previewer.extensions import default
-from invenio_previewer.extensions.zip import make_tree
+from invenio_previewer.extensions.zip import get_tree_level
 from invenio_previewer.proxies import current_previewer
 
 
@@ -117,19 +117,52 @@ def children_to_list(node):
 
 def zip_preview(file):
     """Return appropriate template and pass the file and an embed flag."""
-    tree, limit_reached, error = make_tree(file)
-    lst = children_to_list(tree)['children']
+    tree, limit_reached, error = get_tree_level(file)
+    for node in tree:
+        node['name'] = decode_name(node['name'])
     return render_template(
         "invenio_previewer/zip.html",
         file=file,
-        tree=lst,
+        tree=tree,
+        tree_url=file.tree_uri,
         limit_reached=limit_reached,
         error=error,
-        js_bundles=current_previewer.js_bundles + ['previewer_fullscreen_js'],
+        js_bundles=current_previewer.js_bundles + [
+            'previewer_fullscreen_js', 'previewer_zip_tree_js'],
         css_bundles=current_previewer.css_bundles,
     )
 
 
+def zip_tree(pid, record, template=None, **kwargs):
+    """Return one directory level of a previewed ZIP file as JSON.
+
+    Args:
+        pid (invenio_pidstore.models.PersistentIdentifier): PID of the record.
+        record (weko_deposit.api.WekoRecord): The record.
+        template (str, optional): Unused. Defaults to None.
+
+    Returns:
+        flask.Response: ``children``, ``limit_reached`` and ``error`` of the
+            directory given by the ``path`` query argument.
+    """
+    fileobj = current_previewer.record_file_factory(
+        pid, record, request.view_args.get(
+            'filename', request.args.get('filename', type=str))
+    )
+    if not fileobj:
+        abort(404)
+    fileobj = PreviewFile(pid, record, fileobj)
+    if not fileobj.has_extensions('.zip'):
+        abort(404)
+
+    children, limit_reached, error = get_tree_level(
+        fileobj, request.args.get('path', '', type=str))
+    for node in children:
+        node['name'] = decode_name(node['name'])
+    return jsonify(children=children, limit_reached=limit_reached,
+                   error=error)
+
+
 def decode_name(k):
     """Decode name."""
     try:
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+"""Celery tasks for weko-records-ui."""
+
+from celery import shared_task
+from flask import current_app
+from sqlalchemy.orm.exc import NoResultFound
+from weko_deposit.api import WekoRecord
+
+from .utils import get_draft_record_ids, get_landing_page_meta
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=3,
+             default_retry_delay=60)
+def build_landing_page_meta_task(self, record_id, revision_id=None):
+    """Build the landing page metadata of a committed record revision.
+
+    Deleted records and revisions replaced by a later commit are skipped,
+    other failures are retried.
+
+    :param record_id: Record id.
+    :param revision_id: Record revision, the current one if None.
+    """
+    try:
+        record = WekoRecord.get_record(record_id)
+    except NoResultFound:
+        return
+    if revision_id is not None and record.revision_id != revision_id:
+        return
+    try:
+        # The deposit status of the revision is cached as well.
+        if get_draft_record_ids([record.id]):
+            return
+        with current_app.test_request_context(
+                base_url=current_app.config['THEME_SITEURL']):
+            get_landing_page_meta(record)
+    except Exception as e:
+        current_app.logger.warning(
+            'Could not build landing page metadata of {}: {}'.format(
+                record_id, e))
+        raise self.retry(exc=e)
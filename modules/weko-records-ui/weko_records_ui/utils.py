@@ -28,7 +28,8 @@ from decimal import Decimal
 from typing import NoReturn, Tuple
 from urllib.parse import urlparse,quote
 
-from flask import abort, current_app, json, request, url_for
+from flask import abort, current_app, has_app_context, json, request, \
+    url_for
 from flask_babelex import get_locale
 from flask_babelex import gettext as _
 from flask_babelex import to_user_timezone, to_utc
@@ -37,18 +38,21 @@ from invenio_accounts.models import Role
 from invenio_cache import current_cache
 from invenio_db import db
 from invenio_i18n.ext import current_i18n
-from invenio_oaiserver.response import getrecord
+from invenio_oaiserver.response import getrecord, is_pubdate_in_future
 from invenio_pidrelations.contrib.versioning import PIDVersioning
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_records.models import RecordMetadata
 from lxml import etree
 from passlib.handlers.oracle import oracle10
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from weko_admin.models import AdminSettings
 from weko_admin.utils import UsageReport, get_restricted_access
 from weko_deposit.api import WekoDeposit
-from weko_records.api import FeedbackMailList, ItemTypes, Mapping
+from weko_records.api import FeedbackMailList, ItemLink, ItemTypes, \
+    Mapping
 from weko_records.serializers.utils import get_mapping
-from weko_records.utils import replace_fqdn
+from weko_records.utils import is_published_item, replace_fqdn
 from weko_schema_ui.models import PublishStatus
 from weko_workflow.api import WorkActivity, WorkFlow
 
@@ -1508,3 +1512,135 @@ def get_google_detaset_meta(record,record_tree=None):
     current_app.logger.debug("res_data: {}".format(json.dumps(res_data, ensure_ascii=False)))
 
     return json.dumps(res_data, ensure_ascii=False)
+
+
+def get_landing_page_meta(record):
+    """Get the metadata of the landing page of a record.
+
+    The metadata is kept in the cache per record revision, so the OAI-PMH
+    record is built only once for each revision.
+
+    :param record: WekoRecord.
+    :return: Dictionary with the google scholar and google dataset metadata
+        and the item links.
+    """
+    key = current_app.config['WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_KEY']\
+        .format(record.id, record.revision_id)
+    meta = current_cache.get(key)
+    if meta is None:
+        meta = build_landing_page_meta(record)
+        # The OAI-PMH record of an item is hidden until its publish date.
+        if not (record.get('publish_date') and is_pubdate_in_future(record)):
+            current_cache.set(
+                key, meta, timeout=current_app.config[
+                    'WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_TIMEOUT'])
+    return meta
+
+
+def build_landing_page_meta(record):
+    """Build the metadata of the landing page of a record.
+
+    :param record: WekoRecord.
+    :return: Dictionary with the google scholar and google dataset metadata
+        and the item links.
+    """
+    meta = {
+        'google_scholar_meta': None,
+        'google_dataset_meta': None,
+        'relation': ItemLink.get_item_link_info(record.get('recid')) or {}
+    }
+    if not record.get('_oai', {}).get('id'):
+        return meta
+    recstr = etree.tostring(
+        getrecord(
+            identifier=record['_oai'].get('id'),
+            metadataPrefix='jpcoar',
+            verb='getrecord'))
+    et = etree.fromstring(recstr)
+    meta['google_scholar_meta'] = get_google_scholar_meta(
+        record, record_tree=et)
+    meta['google_dataset_meta'] = get_google_detaset_meta(
+        record, record_tree=et)
+    return meta
+
+
+def get_draft_record_ids(record_ids):
+    """Get the ids of the records which are drafts.
+
+    The deposit status of each record revision is kept in the cache, so
+    only the revision numbers are read from the database.
+
+    :param record_ids: List of record ids.
+    :return: Set of the ids of the draft records.
+    """
+    if not record_ids:
+        return set()
+    key = current_app.config['WEKO_RECORDS_UI_RECORD_STATUS_CACHE_KEY']
+    revisions = db.session.query(
+        RecordMetadata.id, RecordMetadata.version_id).filter(
+        RecordMetadata.id.in_(set(record_ids))).all()
+    # The revision id of a record is its version id minus one.
+    keys = [key.format(id_, version_id - 1) for id_, version_id in revisions]
+    statuses = dict(zip(keys, current_cache.get_many(*keys))) if keys else {}
+    missing = [id_ for (id_, version_id), key_ in zip(revisions, keys)
+               if statuses[key_] is None]
+    if missing:
+        for rec in RecordMetadata.query.filter(
+                RecordMetadata.id.in_(missing)).all():
+            key_ = key.format(rec.id, rec.version_id - 1)
+            statuses[key_] = (rec.json or {}).get(
+                '_deposit', {}).get('status') or ''
+            current_cache.set(
+                key_, statuses[key_], timeout=current_app.config[
+                    'WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_TIMEOUT'])
+    return {id_ for (id_, version_id), key_ in zip(revisions, keys)
+            if statuses.get(key_) == 'draft'}
+
+
+def queue_landing_page_meta(sender, record=None, *args, **kwargs):
+    """Queue building the landing page metadata of a changed item.
+
+    Only published items are queued, once per record revision. The
+    metadata is built after the transaction is committed.
+    """
+    if record is None or record.id is None or not is_published_item(record):
+        return
+    db.session.info.setdefault(
+        'weko_records_ui_landing_page_meta', set()).add(
+        (str(record.id), record.revision_id))
+
+
+@event.listens_for(Session, 'after_commit')
+def _build_queued_landing_page_meta(session):
+    queued = session.info.pop('weko_records_ui_landing_page_meta', None)
+    if not queued or not has_app_context() or not \
+            current_app.config.get('WEKO_RECORDS_UI_LANDING_PAGE_META_PREBUILD'):
+        return
+    from .tasks import build_landing_page_meta_task
+
+    # Only the last revision committed in the transaction is built.
+    revisions = {}
+    for record_id, revision_id in queued:
+        revisions[record_id] = max(
+            revision_id, revisions.get(record_id, revision_id))
+    key = current_app.config['WEKO_RECORDS_UI_LANDING_PAGE_META_CACHE_KEY']
+    revisions = list(revisions.items())
+    built = current_cache.get_many(
+        *[key.format(record_id, revision_id)
+          for record_id, revision_id in revisions])
+    for (record_id, revision_id), meta in zip(revisions, built):
+        if meta is not None:
+            continue
+        try:
+            build_landing_page_meta_task.apply_async(
+                args=(record_id, revision_id))
+        except Exception as e:
+            # The metadata is still built on the first view.
+            current_app.logger.error(
+                'Could not queue landing page metadata of {}: {}'.format(
+                    record_id, e))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _clear_queued_landing_page_meta(session):
+    session.info.pop('weko_records_ui_landing_page_meta', None)
@@ -36,14 +36,12 @@ from invenio_db import db
 from invenio_files_rest.models import ObjectVersion, FileInstance
 from invenio_files_rest.permissions import has_update_version_role
 from invenio_i18n.ext import current_i18n
-from invenio_oaiserver.response import getrecord
 from invenio_pidrelations.contrib.versioning import PIDVersioning
 from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_records_ui.signals import record_viewed
 from invenio_files_rest.signals import file_downloaded
 from invenio_records_ui.utils import obj_or_import_string
-from lxml import etree
 from weko_accounts.views import _redirect_method
 from weko_admin.models import AdminSettings
 from weko_admin.utils import get_search_setting
@@ -52,7 +50,7 @@ from weko_deposit.pidstore import get_record_without_version
 from weko_index_tree.api import Indexes
 from weko_index_tree.models import IndexStyle
 from weko_index_tree.utils import get_index_link_list
-from weko_records.api import ItemLink, Mapping
+from weko_records.api import Mapping
 from weko_records.serializers import citeproc_v1
 from weko_records.serializers.utils import get_mapping
 from weko_records.utils import custom_record_medata_for_export, \
@@ -70,7 +68,7 @@ from .permissions import check_content_clickable, check_created_id, \
     check_file_download_permission, check_original_pdf_download_permission, \
     check_permission_period, file_permission_factory, get_permission
 from .utils import get_billing_file_download_permission, \
-    get_google_detaset_meta, get_google_scholar_meta, get_groups_price, \
+    get_draft_record_ids, get_groups_price, get_landing_page_meta, \
     get_min_price_billing_file_download, get_record_permalink, hide_by_email, \
     is_show_email_of_creator
 from .utils import restore as restore_imp
@@ -428,15 +426,13 @@ def default_view_method(pid, record, filename=None, template=None, **kwargs):
     active_versions = list(pid_ver.children or [])
     all_versions = list(pid_ver.get_children(ordered=True, pid_status=None)
                         or [])
-    try:
-        if WekoRecord.get_record(id_=active_versions[-1].object_uuid)[
-                '_deposit']['status'] == 'draft':
-            active_versions.pop()
-        if WekoRecord.get_record(id_=all_versions[-1].object_uuid)[
-                '_deposit']['status'] == 'draft':
-            all_versions.pop()
-    except Exception:
-        pass
+    draft_ids = get_draft_record_ids(
+        [versions[-1].object_uuid
+         for versions in (active_versions, all_versions) if versions])
+    if active_versions and active_versions[-1].object_uuid in draft_ids:
+        active_versions.pop()
+    if all_versions and all_versions[-1].object_uuid in draft_ids:
+        all_versions.pop()
     if active_versions:
         # active_versions.remove(pid_ver.last_child)
         active_versions.pop()
@@ -474,22 +470,10 @@ def default_view_method(pid, record, filename=None, template=None, **kwargs):
     detail_condition = get_search_detail_keyword('')
 
     # Add Item Reference data to Record Metadata
-    res = ItemLink.get_item_link_info(record.get("recid"))
-    if res:
-        record["relation"] = res
-    else:
-        record["relation"] = {}
-    
-    recstr = etree.tostring(
-        getrecord(
-            identifier=record['_oai'].get('id'),
-            metadataPrefix='jpcoar',
-            verb='getrecord'
-        )
-    )
-    et=etree.fromstring(recstr)
-    google_scholar_meta = get_google_scholar_meta(record,record_tree=et)
-    google_dataset_meta = get_google_detaset_meta(record,record_tree=et)
+    landing_page_meta = get_landing_page_meta(record)
+    record["relation"] = landing_page_meta['relation']
+    google_scholar_meta = landing_page_meta['google_scholar_meta']
+    google_dataset_meta = landing_page_meta['google_dataset_meta']
     
     current_lang = current_i18n.language \
         if hasattr(current_i18n, 'language') else None
@@ -612,22 +596,24 @@ def default_view_method(pid, record, filename=None, template=None, **kwargs):
         # record = hide_by_itemtype(record, list_hidden)
         record = hide_by_email(record)
 
+    display_control = get_search_setting().get("display_control", {})
+
     # Get Facet search setting.
-    display_facet_search = get_search_setting().get("display_control", {}).get(
+    display_facet_search = display_control.get(
         'display_facet_search', {}).get('status', False)
     ctx.update({
         "display_facet_search": display_facet_search
     })
 
     # Get index tree setting.
-    display_index_tree = get_search_setting().get("display_control", {}).get(
+    display_index_tree = display_control.get(
         'display_index_tree', {}).get('status', False)
     ctx.update({
         "display_index_tree": display_index_tree
     })
 
     # Get display_community setting.
-    display_community = get_search_setting().get("display_control", {}).get(
+    display_community = display_control.get(
         'display_community', {}).get('status', False)
     ctx.update({
         "display_community": display_community
@@ -101,6 +101,9 @@ setup(
         'invenio_config.module': [
             'weko_records = weko_records.config',
         ],
+        'invenio_celery.tasks': [
+            'weko_records = weko_records.tasks',
+        ],
     },
     extras_require=extras_require,
     install_requires=install_requires,
@@ -340,47 +340,6 @@ def test_itemtypes_update_item_type(app, db, location):
     )
     item_type = ItemTypes.get_by_id(1)
 
-    def to_dict():
-        return {
-            "hits": {
-                "hits": [{
-                    "_id": "1",
-                    "_source": {
-                        "_item_metadata": {
-                            "item_type_id": "1"
-                        }
-                    },
-                }]
-            },
-        }
-
-    def myfilter(item):
-        def all():
-            return []
-
-        filter_magicmock = MagicMock()
-        filter_magicmock.all = all
-
-        return filter_magicmock
-    
-    def myfilter_2(item):
-        def all_2():
-            all2_magicmock = MagicMock()
-            all2_magicmock.json = {"1": "1"}
-            return [all2_magicmock]
-
-        filter_magicmock_2 = MagicMock()
-        filter_magicmock_2.all = all_2
-
-        return filter_magicmock_2
-
-    data1 = MagicMock()
-    data1.to_dict = to_dict
-    data1.filter = myfilter
-
-    data2 = MagicMock()
-    data2.filter = myfilter_2
-
     data3 = MagicMock()
 
     test = ItemTypes(
@@ -389,28 +348,18 @@ def test_itemtypes_update_item_type(app, db, location):
 
     app.config['WEKO_ITEMTYPES_UI_UPGRADE_VERSION_ENABLED'] = False
 
-    with patch("weko_records.api.RecordsSearch.execute", return_value=data1):
-        with patch("weko_records.api.Mapping", return_value=data3):
-            with patch("weko_records.api.db.session.merge", return_value=""):
-                with patch("weko_records.api.db.session.query", return_value=data2):
-                    assert test.update_item_type(
-                        form=_form,
-                        id_=1,
-                        name='test',
-                        render=_render_2,
-                        result=item_type,
-                        schema=_schema
-                    ) != None
-                
-            with patch("weko_records.api.db.session.query", return_value=data1):
-                assert test.update_item_type(
-                    form=_form,
-                    id_=1,
-                    name='test',
-                    render=_render_2,
-                    result=item_type,
-                    schema=_schema
-                ) != None
+    data3.get_record.return_value = {"1": {"jpcoar_mapping": {"title": {}}}}
+    with patch("weko_records.api.Mapping", data3):
+        with patch("weko_records.tasks.migrate_item_type_metadata.delay") as mock_task:
+            assert test.update_item_type(
+                form=_form,
+                id_=1,
+                name='test',
+                render=_render_2,
+                result=item_type,
+                schema=_schema
+            ) != None
+            mock_task.assert_called_once_with(1, ['1'], ['title'])
 
     with pytest.raises(Exception) as e:
         record = ItemTypes.update_item_type(
@@ -474,7 +423,6 @@ def test_itemtypes_update_item_type(app, db, location):
 # class ItemTypes(RecordBase):
 #     def __update_item_type(cls, id_, schema, form, render):
 #     def __update_metadata(cls, item_type_id, item_type_name, old_render, new_render):
-#     def __get_records_by_item_type_name(cls, item_type_name):
 
 # class ItemTypes(RecordBase):
 #     def get_record(cls, id_, with_deleted=False):
@@ -14,6 +14,7 @@ from weko_records.serializers.utils import (
     get_attribute_schema,
     get_item_type_name_id,
     get_item_type_name,
+    get_compiled_mapping,
     OpenSearchDetailData)
 
 # def get_mapping(item_type_mapping, mapping_type):
@@ -116,6 +117,31 @@ def test_get_item_type_name(db, item_type):
     result = get_item_type_name(2)
     assert result == None
 
+# def get_compiled_mapping(item_type_id, mapping_type='jpcoar_mapping'):
+# .tox/c1/bin/pytest --cov=weko_records tests/test_serializers_utils.py::test_get_compiled_mapping -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-records/.tox/c1/tmp
+def test_get_compiled_mapping(app, db, item_type):
+    mapping = json_data("data/item_type_mapping.json")
+    Mapping.create(item_type_id=1, mapping=mapping)
+    db.session.commit()
+    with app.test_request_context():
+        assert get_compiled_mapping(1) == get_mapping(mapping, 'jpcoar_mapping')
+        assert get_compiled_mapping(2) == {}
+        # cached in the request
+        with patch("weko_records.serializers.utils.db.session.query") as mock_query:
+            get_compiled_mapping(1)
+            mock_query.assert_not_called()
+
+    # cached in the process while the mapping is not updated
+    with app.test_request_context():
+        with patch("weko_records.serializers.utils.Mapping.get_record") as mock_get_record:
+            assert get_compiled_mapping(1) == get_mapping(mapping, 'jpcoar_mapping')
+            mock_get_record.assert_not_called()
+
+    Mapping.create(item_type_id=1, mapping={})
+    db.session.commit()
+    with app.test_request_context():
+        assert get_compiled_mapping(1) == {}
+
 # class OpenSearchDetailData:
 #     def output_open_search_detail_data(self):
 # .tox/c1/bin/pytest --cov=weko_records tests/test_serializers_utils.py::test_open_search_detail_data -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-records/.tox/c1/tmp
@@ -368,3 +394,33 @@ def test__set_description(app):
         assert sample_copy._set_description(fe=fe, item_map=item_map, item_metadata=item_metadata, request_lang=request_lang) == None
 
 
+#     def _prefetch_index_names(self, index_meta):
+# .tox/c1/bin/pytest --cov=weko_records tests/test_serializers_utils.py::test__prefetch_index_names -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-records/.tox/c1/tmp
+def test__prefetch_index_names(app, db, db_index):
+    search_result = {'hits': {'total': 3, 'hits': [
+        {'_source': {'_item_metadata': {'path': ['1']}}},
+        {'_source': {'_item_metadata': {'path': ['2']}}},
+        {'_source': {'_item_metadata': {'path': []}}},
+    ]}}
+    data = OpenSearchDetailData(MagicMock(), search_result, 'rss')
+    index_meta = {}
+    data._prefetch_index_names(index_meta)
+    assert index_meta == {'1': 'IndexA'}
+
+
+#     def _get_metadata(self, item_metadata, item_id):
+# .tox/c1/bin/pytest --cov=weko_records tests/test_serializers_utils.py::test__get_metadata -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-records/.tox/c1/tmp
+def test__get_metadata():
+    data = OpenSearchDetailData(MagicMock(), MagicMock(), 'rss')
+    item_metadata = {'item_1': {'attribute_value': 'value'}}
+    with patch("weko_records.serializers.utils.get_metadata_from_map",
+               return_value={'item_1': 'value'}) as mock_get:
+        assert data._get_metadata(item_metadata, 'item_1') == {'item_1': 'value'}
+        assert data._get_metadata(item_metadata, 'item_1') == {'item_1': 'value'}
+        assert mock_get.call_count == 2
+
+        # made once per item id while serializing the hits
+        data._item_values = {}
+        data._get_metadata(item_metadata, 'item_1')
+        data._get_metadata(item_metadata, 'item_1')
+        assert mock_get.call_count == 3
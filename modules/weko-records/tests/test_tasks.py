@@ -0,0 +1,74 @@
+import uuid
+
+import pytest
+from elasticsearch import ElasticsearchException
+from mock import patch
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from invenio_records.models import RecordMetadata
+from sqlalchemy.exc import SQLAlchemyError
+
+from weko_records.models import ItemMetadata
+from weko_records.tasks import migrate_item_type_metadata
+
+
+# def migrate_item_type_metadata(self, item_type_id, delete_list, mapping_keys, resume_after=None):
+# .tox/c1/bin/pytest --cov=weko_records tests/test_tasks.py::test_migrate_item_type_metadata -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-records/.tox/c1/tmp
+def test_migrate_item_type_metadata(app, db):
+    app.config['WEKO_RECORDS_ITEM_TYPE_MIGRATION_BATCH_SIZE'] = 2
+    # the last item is a draft
+    ids = sorted(uuid.uuid4() for _ in range(4))
+    deleted = uuid.uuid4()
+    with db.session.begin_nested():
+        for i, id_ in enumerate(ids + [deleted]):
+            db.session.add(RecordMetadata(
+                id=id_, json={"item_type_id": "1", "item_1": "a", "item_2": "b"}))
+            db.session.add(ItemMetadata(
+                id=id_, item_type_id=1, json={"item_1": "a", "item_2": "b"}))
+            PersistentIdentifier.create(
+                "recid", "1.0" if id_ == ids[3] else str(i + 1),
+                object_type="rec", object_uuid=id_,
+                status=PIDStatus.DELETED if id_ == deleted else PIDStatus.REGISTERED)
+        other = uuid.uuid4()
+        db.session.add(ItemMetadata(
+            id=other, item_type_id=2, json={"item_1": "a"}))
+    db.session.commit()
+    versions = {id_: ItemMetadata.query.get(id_).version_id for id_ in ids}
+
+    with patch("weko_deposit.api.WekoIndexer.bulk_delete_metadata_keys") as mock_es:
+        migrate_item_type_metadata.apply(args=(1, ["item_1"], ["title"]))
+        assert mock_es.call_count == 2
+        assert mock_es.call_args_list[0][0] == (ids[:2], ["item_1"], ["title"])
+        assert mock_es.call_args_list[1][0] == (ids[2:], ["item_1"], ["title"])
+
+    db.session.expire_all()
+    for id_ in ids:
+        assert RecordMetadata.query.get(id_).json == {"item_type_id": "1", "item_2": "b"}
+        assert ItemMetadata.query.get(id_).json == {"item_2": "b"}
+        assert ItemMetadata.query.get(id_).version_id == versions[id_] + 1
+    assert ItemMetadata.query.get(other).json == {"item_1": "a"}
+    # deleted items are not migrated
+    assert ItemMetadata.query.get(deleted).json == {"item_1": "a", "item_2": "b"}
+
+    # resume after the first item
+    with patch("weko_deposit.api.WekoIndexer.bulk_delete_metadata_keys") as mock_es:
+        migrate_item_type_metadata.apply(
+            args=(1, ["item_2"], []), kwargs={"resume_after": str(ids[0])})
+        assert mock_es.call_count == 2
+        assert mock_es.call_args_list[0][0][0] == ids[1:3]
+    assert ItemMetadata.query.get(ids[0]).json == {"item_2": "b"}
+    assert ItemMetadata.query.get(ids[1]).json == {}
+
+    # elasticsearch error, resumed after the last updated documents
+    with patch("weko_deposit.api.WekoIndexer.bulk_delete_metadata_keys",
+               side_effect=[None, ElasticsearchException("error")]):
+        with patch("weko_records.tasks.migrate_item_type_metadata.retry", side_effect=Exception("retry")) as mock_retry:
+            with pytest.raises(Exception):
+                migrate_item_type_metadata.apply(args=(1, ["item_1"], []), throw=True)
+            assert mock_retry.call_args[1]["kwargs"] == {"resume_after": str(ids[1])}
+
+    # database error
+    with patch("weko_records.tasks._delete_json_keys", side_effect=SQLAlchemyError("error")):
+        with patch("weko_records.tasks.migrate_item_type_metadata.retry", side_effect=Exception("retry")) as mock_retry:
+            with pytest.raises(Exception):
+                migrate_item_type_metadata.apply(args=(1, ["item_1"], []), throw=True)
+            assert mock_retry.call_args[1]["kwargs"] == {"resume_after": None}
@@ -59,7 +59,8 @@ from weko_records.utils import (
     add_biographic,
     custom_record_medata_for_export,
     replace_fqdn,
-    replace_fqdn_of_file_metadata)
+    replace_fqdn_of_file_metadata,
+    is_published_item)
 from weko_records.api import ItemTypes, Mapping
 from weko_records.models import ItemTypeName
 
@@ -1668,4 +1669,17 @@ def test_replace_fqdn_of_file_metadata(app):
     assert _file_url==['http://test/a', 'http://test/b']
     replace_fqdn_of_file_metadata(_file_metadata_list2)
     assert _file_metadata_list2==[{'url': {'url': 'https://localhost/a'}, 'version_id': '1'}, {'url': {'url': 'https://localhost/b'}, 'version_id': '1'}]
-    
\ No newline at end of file
+    
+
+
+# def is_published_item(record):
+# .tox/c1/bin/pytest --cov=weko_records tests/test_utils.py::test_is_published_item -v -s -vv --cov-branch --cov-report=term --cov-config=tox.ini --basetemp=/code/modules/weko-records/.tox/c1/tmp
+def test_is_published_item():
+    item = {"item_type_id": "1", "recid": "1", "_deposit": {"id": "1", "status": "published"}}
+    assert is_published_item(item) == True
+    assert is_published_item(dict(item, recid="1.1")) == True
+    assert is_published_item(dict(item, recid="1.10")) == True
+    assert is_published_item(dict(item, recid="1.0")) == False
+    assert is_published_item(dict(item, _deposit={"id": "1", "status": "draft"})) == False
+    assert is_published_item({"title": "not an item"}) == False
+    assert is_published_item(None) == False
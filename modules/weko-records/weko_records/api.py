@@ -20,23 +20,18 @@
 
 """Record API."""
 
-import urllib.parse
 import pickle
 from typing import Union
 
-from elasticsearch.exceptions import NotFoundError
-from elasticsearch_dsl.query import QueryString
 from flask import current_app, request
 from flask_babelex import gettext as _
 from invenio_db import db
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_records.api import Record
 from invenio_records.errors import MissingModelError
-from invenio_records.models import RecordMetadata
 from invenio_records.signals import after_record_delete, after_record_insert, \
     after_record_revert, after_record_update, before_record_delete, \
     before_record_insert, before_record_revert, before_record_update
-from invenio_search import RecordsSearch
 from jsonpatch import apply_patch
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm.attributes import flag_modified
@@ -427,10 +422,15 @@ class ItemTypes(RecordBase):
     ):
         """Update metadata.
 
+        Deleted properties are removed from the items of the item type by
+        a background task.
+
         :param item_type_id: Item type identifiers.
         :param item_type_name: Item type name.
         :param old_render: Old render.
         :param new_render: New render.
+        :return: Identifier of the migration task, or None if no property
+            was deleted.
         """
         def __diff(list1, list2):
             """Compare list.
@@ -441,20 +441,6 @@ class ItemTypes(RecordBase):
             """
             return list(list(set(list1) - set(list2)))
 
-        def __del_data(_json, diff_keys):
-            """Delete metadata.
-
-            :param _json: Metadata.
-            :param diff_keys: Diff key list.
-            :return:
-            """
-            is_del = False
-            for k in diff_keys:
-                if k in _json:
-                    del _json[k]
-                    is_del = True
-            return is_del
-
         def __get_delete_mapping_key(item_type_mapping, _delete_list):
             """Get mapping key of deleted key.
 
@@ -469,77 +455,6 @@ class ItemTypes(RecordBase):
                     result.extend(list(prop_mapping.keys()))
             return result
 
-        def __update_es_data(_es_data, _delete_list):
-            """Update metadata on ElasticSearch.
-
-            :param _es_data: Elasticsearch data.
-            :param _delete_list: delete list
-            """
-            item_type_mapping = Mapping.get_record(item_type_id=item_type_id)
-            delete_mapping_key_list = __get_delete_mapping_key(item_type_mapping, _delete_list)
-            es_updated_data = []
-            for _data in _es_data:
-                source = _data.get('_source', {})
-                item_metadata = _data.get('_source', {}).get('_item_metadata',
-                                                             {})
-                is_update = False
-                if __del_data(item_metadata, _delete_list):
-                    is_update = True
-                if __del_data(source, delete_mapping_key_list):
-                    is_update = True
-                if is_update:
-                    es_updated_data.append(_data)
-
-            from weko_deposit.api import WekoIndexer
-            WekoIndexer().bulk_update(es_updated_data)
-
-        def __update_db(db_records, _delete_list):
-            """Update metadata in Database.
-
-            :param db_records:Db data
-            :param _delete_list: delete list
-            """
-            try:
-                with db.session.begin_nested():
-                    for db_record in db_records:
-                        record_json = pickle.loads(pickle.dumps(db_record.json, -1))
-                        if __del_data(record_json, _delete_list):
-                            db_record.json = record_json
-                            db.session.merge(db_record)
-                db.session.commit()
-            except SQLAlchemyError as e:
-                db.session.rollback()
-                current_app.logger.error(e)
-                raise e
-
-        def __update_record_metadata(_record_ids, _delete_list):
-            """Update Record Metadata table.
-
-            :param _record_ids: Record identifiers.
-            :param _delete_list: Delete list
-            :return:
-            """
-            query = db.session.query(RecordMetadata).filter(
-                RecordMetadata.id.in_(_record_ids))
-            db_records = query.all()
-            if len(db_records) == 0:
-                return
-            __update_db(db_records, _delete_list)
-
-        def __update_item_metadata(_record_ids, _delete_list):
-            """Update Item Metadata table.
-
-            :param _record_ids: Record identifiers.
-            :param _delete_list: Delete list.
-            :return:
-            """
-            query = db.session.query(ItemMetadata).filter(
-                ItemMetadata.id.in_(_record_ids))
-            db_records = query.all()
-            if len(db_records) == 0:
-                return
-            __update_db(db_records, _delete_list)
-
         # Get deleted properties
         old_meta_list = old_render.get('table_row')
         new_meta_list = new_render.get('table_row')
@@ -547,52 +462,17 @@ class ItemTypes(RecordBase):
         if len(delete_list) == 0:
             return
 
-        # Get records on ElasticSearch based on Item Type Name
-        records = cls.__get_records_by_item_type_name(item_type_name)
-        record_ids = []
-        es_data = []
-        for record in records:
-            rec_id = record.get("_id")
-            _source = record.get("_source", {})
-            _item_type_id = _source.get("_item_metadata", {}).get(
-                "item_type_id")
-            if rec_id and _source and str(item_type_id) == str(_item_type_id):
-                record_ids.append(rec_id)
-                es_data.append(dict(
-                    _id=rec_id,
-                    _source=_source
-                ))
-        if len(record_ids) == 0:
-            return
-
-        # Update record metadata in DB based on data from ES.
-        __update_record_metadata(record_ids, delete_list)
-        # Update item metadata in DB based on data from ES.
-        __update_item_metadata(record_ids, delete_list)
-        # Update Elasticsearch data
-        __update_es_data(es_data, delete_list)
-
-    @classmethod
-    def __get_records_by_item_type_name(cls, item_type_name):
-        """Get records on Elasticsearch by Item Type Name.
-
-        :param item_type_name: Item Type Name.
-        :return: Record list.
-        """
-        name = urllib.parse.quote_plus(item_type_name)
-        query_string = "itemtype:{}".format(
-            name)
-        result = []
-        try:
-            search = RecordsSearch(
-                index=current_app.config['SEARCH_UI_SEARCH_INDEX'])
-            search = search.query(QueryString(query=query_string))
-            search = search.sort('-publish_date', '-_updated')
-            search_result = search.execute().to_dict()
-            result = search_result.get('hits', {}).get('hits', [])
-        except NotFoundError as e:
-            current_app.logger.debug("Indexes do not exist yet: ", str(e))
-        return result
+        item_type_mapping = Mapping.get_record(item_type_id=item_type_id)
+        delete_mapping_key_list = __get_delete_mapping_key(
+            item_type_mapping or {}, delete_list)
+
+        from .tasks import migrate_item_type_metadata
+        task = migrate_item_type_metadata.delay(
+            item_type_id, delete_list, delete_mapping_key_list)
+        current_app.logger.info(
+            'Queued task {} removing {} from the items of item type {}.'.format(
+                task.id, delete_list, item_type_id))
+        return task.id
 
     @classmethod
     def get_record(cls, id_, with_deleted=False):
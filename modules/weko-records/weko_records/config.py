@@ -252,3 +252,6 @@ COPY_NEW_FIELD = True
 
 WEKO_RECORDS_SYSTEM_COMMA = "-,-"
 """The system comma used to break metadata subitems."""
+
+WEKO_RECORDS_ITEM_TYPE_MIGRATION_BATCH_SIZE = 500
+"""Number of items migrated per batch when properties are deleted from an item type."""
@@ -24,12 +24,14 @@ import pickle
 from datetime import datetime
 
 import pytz
-from flask import request
+from flask import g, request
 from invenio_db import db
+from sqlalchemy import desc
 from weko_index_tree.api import Index
 
 from weko_records.api import Mapping
-from weko_records.models import ItemType, ItemTypeName, ItemTypeProperty
+from weko_records.models import ItemType, ItemTypeMapping, ItemTypeName, \
+    ItemTypeProperty
 
 from .dc import DcWekoBaseExtension, DcWekoEntryExtension
 from .feed import WekoFeedGenerator
@@ -37,6 +39,10 @@ from .opensearch import OpensearchEntryExtension, OpensearchExtension
 from .prism import PrismEntryExtension, PrismExtension
 
 
+_compiled_mappings = {}
+"""Mappings flattened by get_mapping, by item type id and mapping type."""
+
+
 def get_mapping(item_type_mapping, mapping_type):
     """Format itemtype mapping data.
 
@@ -189,6 +195,45 @@ def get_metadata_from_map(item_data, item_id):
     return item_value
 
 
+def get_compiled_mapping(item_type_id, mapping_type='jpcoar_mapping'):
+    """Get item type mapping flattened by get_mapping.
+
+    The flattened mapping is kept in the process together with the
+    revision of the item type mapping and is rebuilt only when the
+    mapping is updated. The revision is checked once per request.
+
+    :param item_type_id: Item type id.
+    :param mapping_type: Mapping type.
+    :return: Flattened mapping, empty if the item type has no mapping.
+    """
+    request_mappings = g.setdefault('weko_records_compiled_mappings', {})
+    key = (item_type_id, mapping_type)
+    if key in request_mappings:
+        return request_mappings[key]
+
+    with db.session.no_autoflush:
+        revision = db.session.query(
+            ItemTypeMapping.id, ItemTypeMapping.version_id,
+            ItemTypeMapping.updated
+        ).filter(
+            ItemTypeMapping.item_type_id == item_type_id,
+            ItemTypeMapping.mapping != None  # noqa
+        ).order_by(desc(ItemTypeMapping.created)).first()
+
+    item_map = {}
+    if revision:
+        revision = tuple(revision)
+        compiled = _compiled_mappings.get(key)
+        if compiled and compiled[0] == revision:
+            item_map = compiled[1]
+        else:
+            item_map = get_mapping(Mapping.get_record(item_type_id),
+                                   mapping_type)
+            _compiled_mappings[key] = (revision, item_map)
+    request_mappings[key] = item_map
+    return item_map
+
+
 def get_attribute_schema(schema_id):
     """Get schema of item type property.
 
@@ -255,6 +300,7 @@ class OpenSearchDetailData:
         self.links = links
         self.item_links_factory = item_links_factory
         self.kwargs = kwargs
+        self._item_values = None
 
     def output_open_search_detail_data(self):
         """Output open search detail data.
@@ -336,18 +382,14 @@ class OpenSearchDetailData:
             fg.language('en')
 
         rss_items = []
-        jpcoar_map = {}
+        if not _index_id:
+            self._prefetch_index_names(index_meta)
         for hit in self.search_result['hits']['hits']:
             item_metadata = hit['_source']['_item_metadata']
 
             item_type_id = item_metadata['item_type_id']
-            type_mapping = Mapping.get_record(item_type_id)
-
-            if item_type_id in jpcoar_map:
-                item_map = jpcoar_map[item_type_id]
-            else:
-                item_map = get_mapping(type_mapping, 'jpcoar_mapping')
-                jpcoar_map[item_type_id] = item_map
+            item_map = get_compiled_mapping(item_type_id, 'jpcoar_mapping')
+            self._item_values = {}
 
             fe = fg.add_entry()
 
@@ -391,8 +433,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    type_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    type_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     aggregation_types = None
                     if isinstance(type_metadata, dict):
                         aggregation_types = type_metadata.get(
@@ -415,8 +457,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    file_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    file_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     mime_types = None
                     if isinstance(file_metadata, dict):
                         mime_types = file_metadata.get(mime_type_key)
@@ -435,8 +477,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    uri_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    uri_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     uri_list = None
                     if isinstance(uri_metadata, dict):
                         uri_list = uri_metadata.get(uri_key)
@@ -476,8 +518,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    source_title_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    source_title_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     source_titles = None
                     if isinstance(source_title_metadata, dict):
                         source_titles = source_title_metadata.get(
@@ -501,8 +543,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    volume_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    volume_metadata = self._get_metadata(
+                        item_metadata, item_id)
 
                     volumes = None
                     if isinstance(volume_metadata, dict):
@@ -522,8 +564,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    issue_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    issue_metadata = self._get_metadata(
+                        item_metadata, item_id)
 
                     issues = None
                     if isinstance(issue_metadata):
@@ -544,8 +586,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    page_start_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    page_start_metadata = self._get_metadata(
+                        item_metadata, item_id)
 
                     page_starts = None
                     if isinstance(page_start_metadata, dict):
@@ -566,8 +608,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    page_end_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    page_end_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     page_ends = None
                     if isinstance(page_end_metadata, dict):
                         page_ends = page_end_metadata.get(page_end_key)
@@ -608,6 +650,8 @@ class OpenSearchDetailData:
             if _modification_date:
                 fe.prism.modificationDate(_modification_date)
 
+        self._item_values = None
+
         if self.output_type == self.OUTPUT_ATOM:
             return fg.atom_str(pretty=True)
         else:
@@ -616,6 +660,40 @@ class OpenSearchDetailData:
 
             return fg.rss_str(pretty=True)
 
+    def _prefetch_index_names(self, index_meta):
+        """Get names of the indexes of the hits with one query.
+
+        :param index_meta: Dict of index id and index name to update.
+        """
+        index_ids = set()
+        for hit in self.search_result['hits']['hits']:
+            path = hit['_source']['_item_metadata'].get('path')
+            if path and str(path[0]).isnumeric():
+                index_ids.add(path[0])
+        if not index_ids:
+            return
+
+        index_names = {
+            str(index.id): index.index_name for index in Index.query.filter(
+                Index.id.in_([int(index_id) for index_id in index_ids])).all()
+        }
+        for index_id in index_ids:
+            if str(index_id) in index_names:
+                index_meta[index_id] = index_names[str(index_id)]
+
+    def _get_metadata(self, item_metadata, item_id):
+        """Get item metadata of an item id by get_metadata_from_map.
+
+        While serializing the hits, the metadata is made once per item id
+        of each hit.
+        """
+        if self._item_values is None:
+            return get_metadata_from_map(item_metadata[item_id], item_id)
+        if item_id not in self._item_values:
+            self._item_values[item_id] = get_metadata_from_map(
+                item_metadata[item_id], item_id)
+        return self._item_values[item_id]
+
     def _set_description(self, fe, item_map, item_metadata, request_lang):
         _description_attr_lang = 'description.@attributes.xml:lang'
         _description_value = 'description.@value'
@@ -648,8 +726,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    date_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    date_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     if not isinstance(date_metadata, dict):
                         return
                     dates = date_metadata.get(date_key)
@@ -669,8 +747,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    date_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    date_metadata = self._get_metadata(
+                        item_metadata, item_id)
                     if not isinstance(date_metadata, dict)\
                             or date_metadata.get(date_key) is None:
                         return
@@ -720,8 +798,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    source_identifier_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    source_identifier_metadata = self._get_metadata(
+                        item_metadata, item_id)
 
                     if not isinstance(source_identifier_metadata, dict) \
                             or source_identifier_metadata.get(
@@ -745,8 +823,8 @@ class OpenSearchDetailData:
 
                 # Get item data
                 if item_id in item_metadata:
-                    source_identifier_metadata = get_metadata_from_map(
-                        item_metadata[item_id], item_id)
+                    source_identifier_metadata = self._get_metadata(
+                        item_metadata, item_id)
 
                     source_identifiers = source_identifier_metadata[
                         item_map[_source_identifier_attr_type]]
@@ -774,8 +852,8 @@ class OpenSearchDetailData:
 
             # Get item data
             if item_id in item_metadata:
-                creator_metadata = get_metadata_from_map(
-                    item_metadata[item_id], item_id)
+                creator_metadata = self._get_metadata(
+                    item_metadata, item_id)
 
                 create_name_key = item_map[_creator_name_value]
                 if not isinstance(creator_metadata, dict) \
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+
+"""Celery tasks for weko-records."""
+
+from datetime import datetime
+
+from celery import shared_task
+from elasticsearch import ElasticsearchException
+from flask import current_app
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+from invenio_records.models import RecordMetadata
+from sqlalchemy import Text, cast
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import ItemMetadata
+
+
+def _delete_json_keys(model, ids, keys):
+    """Remove keys from the JSON of rows in the database.
+
+    The version of the rows is incremented like an update through the ORM.
+
+    :param model: RecordMetadata or ItemMetadata.
+    :param ids: Identifiers of the rows.
+    :param keys: Keys to remove.
+    """
+    keys = cast(array(list(keys)), ARRAY(Text))
+    db.session.query(model).filter(
+        model.id.in_(ids),
+        model.json.op('?|', is_comparison=True)(keys)
+    ).update({
+        model.json: model.json.op('-')(keys),
+        model.version_id: model.version_id + 1,
+        model.updated: datetime.utcnow()
+    }, synchronize_session=False)
+
+
+@shared_task(bind=True, ignore_result=True)
+def migrate_item_type_metadata(self, item_type_id, delete_list, mapping_keys,
+                               resume_after=None):
+    """Remove the deleted properties of an item type from its items.
+
+    Items with a registered record identifier, drafts included, are
+    selected by item type in keyset batches. The properties are
+    removed from the JSON by the database and from the documents by bulk
+    partial updates. Progress is reported through the task state, and a
+    retry resumes after the last batch whose documents were updated; rows
+    of a batch already committed are skipped by the key filter.
+
+    :param item_type_id: Item type identifier.
+    :param delete_list: Deleted property keys.
+    :param mapping_keys: Mapping keys of the deleted properties.
+    :param resume_after: Identifier of the last migrated item.
+    """
+    from weko_deposit.api import WekoIndexer
+
+    batch_size = current_app.config[
+        'WEKO_RECORDS_ITEM_TYPE_MIGRATION_BATCH_SIZE']
+    indexer = WekoIndexer()
+    last_id = resume_after
+    migrated = 0
+    try:
+        while True:
+            query = db.session.query(ItemMetadata.id).join(
+                PersistentIdentifier,
+                PersistentIdentifier.object_uuid == ItemMetadata.id
+            ).filter(
+                ItemMetadata.item_type_id == item_type_id,
+                PersistentIdentifier.pid_type == 'recid',
+                PersistentIdentifier.status == PIDStatus.REGISTERED)
+            if last_id:
+                query = query.filter(ItemMetadata.id > last_id)
+            ids = [row.id for row in
+                   query.order_by(ItemMetadata.id).limit(batch_size).all()]
+            if not ids:
+                break
+
+            with db.session.begin_nested():
+                _delete_json_keys(RecordMetadata, ids, delete_list)
+                _delete_json_keys(ItemMetadata, ids, delete_list)
+            db.session.commit()
+            indexer.bulk_delete_metadata_keys(
+                ids, delete_list, mapping_keys, chunk_size=batch_size)
+
+            migrated += len(ids)
+            last_id = str(ids[-1])
+            if self.request.id:
+                self.update_state(state='PROGRESS', meta={
+                    'item_type_id': item_type_id, 'migrated': migrated,
+                    'last': last_id})
+        current_app.logger.info(
+            'Migrated {} items of item type {}.'.format(migrated, item_type_id))
+    except (SQLAlchemyError, ElasticsearchException) as ex:
+        db.session.rollback()
+        current_app.logger.error(ex)
+        self.retry(
+            args=(item_type_id, delete_list, mapping_keys),
+            kwargs={'resume_after': last_id},
+            countdown=60, exc=ex, max_retries=5)
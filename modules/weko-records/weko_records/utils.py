@@ -2328,3 +2328,25 @@ def replace_fqdn_of_file_metadata(file_metadata_lst: list, file_url: list = None
                 file["url"]["url"] = replace_fqdn(file["url"]["url"])
             elif isinstance(file_url, list):
                 file_url.append(file["url"]["url"])
+
+
+def is_published_item(record):
+    """Check whether a record is a published item.
+
+    Records of other kinds, unpublished deposits and drafts (``X.0``) are
+    not published items.
+
+    Args:
+        record (dict): Record or its JSON.
+
+    Returns:
+        bool: True if the record is a published item.
+
+    """
+    if not isinstance(record, dict) or not record.get("item_type_id"):
+        return False
+    deposit = record.get("_deposit") or {}
+    if deposit.get("status") != "published":
+        return False
+    pid_value = str(record.get("recid") or deposit.get("id") or "")
+    return not pid_value.endswith(".0")
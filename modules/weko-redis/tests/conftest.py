@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+"""Pytest configuration."""
+
+import pytest
+from flask import Flask
+
+from weko_redis.redis import clear_clients
+
+
+@pytest.yield_fixture()
+def app():
+    """Flask application configured for a plain redis server."""
+    app = Flask('testapp')
+    app.config.update(
+        CACHE_TYPE='redis',
+        CACHE_REDIS_HOST='localhost',
+        REDIS_PORT='6379',
+        WEKO_REDIS_HEALTH_CHECK_INTERVAL=0,
+    )
+    with app.app_context():
+        yield app
+    clear_clients()
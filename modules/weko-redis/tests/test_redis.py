@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+"""Tests for the pooled redis clients."""
+
+import redis
+from mock import MagicMock, patch
+
+from weko_redis.redis import RedisConnection, _clients
+
+
+# def connection(self, db, kv = False):
+# .tox/c1/bin/pytest --cov=weko_redis tests/test_redis.py::test_connection_reuse -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-redis/.tox/c1/tmp
+def test_connection_reuse(app):
+    with patch('weko_redis.redis.redis.StrictRedis.from_url',
+               side_effect=lambda *args, **kwargs: MagicMock()) as mock_url:
+        first = RedisConnection().connection(db=0)
+        assert RedisConnection().connection(db=0) is first
+        assert mock_url.call_count == 1
+
+        kv = RedisConnection().connection(db=0, kv=True)
+        assert kv is not first
+        assert kv.redis is not first
+        other = RedisConnection().connection(db=1)
+        assert other is not first
+        assert mock_url.call_count == 3
+        assert len(_clients) == 3
+
+
+# def _is_healthy(self, key, datastore):
+# .tox/c1/bin/pytest --cov=weko_redis tests/test_redis.py::test_connection_health_check_failure -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-redis/.tox/c1/tmp
+def test_connection_health_check_failure(app):
+    broken = MagicMock()
+    broken.ping.side_effect = redis.exceptions.ConnectionError('down')
+    healthy = MagicMock()
+    with patch('weko_redis.redis.redis.StrictRedis.from_url',
+               side_effect=[broken, healthy]) as mock_url:
+        assert RedisConnection().connection(db=0) is broken
+        assert RedisConnection().connection(db=0) is healthy
+        assert mock_url.call_count == 2
+        broken.connection_pool.disconnect.assert_called_once_with()
+
+        assert RedisConnection().connection(db=0) is healthy
+        healthy.ping.assert_called_once_with()
+        assert mock_url.call_count == 2
+
+
+# def clear_clients():
+# .tox/c1/bin/pytest --cov=weko_redis tests/test_redis.py::test_clear_clients -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-redis/.tox/c1/tmp
+def test_clear_clients(app):
+    from weko_redis.redis import clear_clients
+
+    with patch('weko_redis.redis.redis.StrictRedis.from_url',
+               side_effect=lambda *args, **kwargs: MagicMock()):
+        store = RedisConnection().connection(db=0)
+        clear_clients()
+        store.connection_pool.disconnect.assert_called_once_with()
+        assert _clients == {}
+        assert RedisConnection().connection(db=0) is not store
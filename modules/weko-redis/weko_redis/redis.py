@@ -18,11 +18,48 @@
 # Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
 # MA 02111-1307, USA.
 
+import threading
+import time
+
 import redis
 from redis import sentinel
 from flask import current_app
 from simplekv.memory.redisstore import RedisStore
 
+HEALTH_CHECK_INTERVAL = 30
+"""Default seconds between health checks of a pooled client."""
+
+_clients = {}
+_sentinels = {}
+_checked = {}
+_clients_lock = threading.Lock()
+
+
+def get_many(store, keys):
+    """Get the values of several keys in one pipelined round trip.
+
+    :param store: Client or RedisStore returned by RedisConnection.connection.
+    :param keys: Keys to read.
+    :return: List of values, None for missing keys.
+    """
+    client = getattr(store, 'redis', store)
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.get(key)
+    return pipe.execute()
+
+
+def clear_clients():
+    """Disconnect and forget every pooled client of this process."""
+    with _clients_lock:
+        for store in _clients.values():
+            client = getattr(store, 'redis', store)
+            client.connection_pool.disconnect()
+        _clients.clear()
+        _sentinels.clear()
+        _checked.clear()
+
+
 class RedisConnection:
     "Redis Connection for app"
     def __init__(self):
@@ -30,27 +67,71 @@ class RedisConnection:
 
 
     def connection(self, db, kv = False):
-        datastore = None
-        try:
-            if self.redis_type == 'redis':
-                store = self.redis_connection(db)
-            elif self.redis_type == 'redissentinel':
-                store = self.sentinel_connection(db)
-        except Exception as ex:
-            raise ex
+        """Get the pooled client of db, created on first use.
 
-        if kv == True:
-            datastore = RedisStore(store)
-        else:
-            datastore = store
+        Clients are shared per process and keyed by type, location, db and
+        kv. A client failing its periodic ping is dropped and rebuilt, which
+        also rediscovers the sentinel master after a failover.
+        """
+        key = (self.redis_type, self._location(), str(db), kv)
+        datastore = _clients.get(key)
+        if datastore is not None and self._is_healthy(key, datastore):
+            return datastore
+
+        with _clients_lock:
+            datastore = _clients.get(key)
+            if datastore is None:
+                try:
+                    if self.redis_type == 'redis':
+                        store = self.redis_connection(db)
+                    elif self.redis_type == 'redissentinel':
+                        store = self.sentinel_connection(db)
+                except Exception as ex:
+                    raise ex
+
+                if kv == True:
+                    datastore = RedisStore(store)
+                else:
+                    datastore = store
+                _clients[key] = datastore
+                _checked[key] = time.monotonic()
 
         return datastore
 
+    def _location(self):
+        if self.redis_type == 'redissentinel':
+            return (str(current_app.config['CACHE_REDIS_SENTINELS']),
+                    current_app.config['CACHE_REDIS_SENTINEL_MASTER'])
+        return (current_app.config['CACHE_REDIS_HOST'],
+                str(current_app.config['REDIS_PORT']))
+
+    def _is_healthy(self, key, datastore):
+        interval = current_app.config.get(
+            'WEKO_REDIS_HEALTH_CHECK_INTERVAL', HEALTH_CHECK_INTERVAL)
+        if time.monotonic() - _checked.get(key, 0) < interval:
+            return True
+        client = getattr(datastore, 'redis', datastore)
+        try:
+            client.ping()
+        except (redis.exceptions.ConnectionError,
+                redis.exceptions.TimeoutError) as ex:
+            current_app.logger.warning(
+                'Redis client {0} failed health check: {1}'.format(key, ex))
+            with _clients_lock:
+                if _clients.get(key) is datastore:
+                    client.connection_pool.disconnect()
+                    del _clients[key]
+                    _sentinels.pop(key[1], None)
+            return False
+        _checked[key] = time.monotonic()
+        return True
+
     def redis_connection(self, db):
         store = None
         try:
             redis_url = 'redis://' + current_app.config['CACHE_REDIS_HOST'] + ':' + current_app.config['REDIS_PORT'] + '/' + str(db)
-            store = redis.StrictRedis.from_url(redis_url)
+            store = redis.StrictRedis.from_url(
+                redis_url, socket_keepalive=True, retry_on_timeout=True)
         except Exception as ex:
             raise ex
 
@@ -59,9 +140,14 @@ class RedisConnection:
     def sentinel_connection(self, db):
         store = None
         try:
-            sentinels = sentinel.Sentinel(current_app.config['CACHE_REDIS_SENTINELS'], decode_responses=False)
+            location = self._location()
+            sentinels = _sentinels.get(location)
+            if sentinels is None:
+                sentinels = sentinel.Sentinel(current_app.config['CACHE_REDIS_SENTINELS'], decode_responses=False)
+                _sentinels[location] = sentinels
             store = sentinels.master_for(
-                current_app.config['CACHE_REDIS_SENTINEL_MASTER'], db= db)
+                current_app.config['CACHE_REDIS_SENTINEL_MASTER'], db= db,
+                socket_keepalive=True, retry_on_timeout=True)
         except Exception as ex:
             raise ex
             
@@ -5,7 +5,11 @@ from weko_schema_ui.schema import (
     schema_list_render,
     delete_schema,
     delete_schema_cache,
-    get_oai_metadata_formats)
+    get_oai_metadata_formats,
+    get_element_list,
+    get_schema_plan,
+    get_schema_plan_revision,
+    clear_schema_plans)
 import pytest
 import os
 from flask import current_app
@@ -343,3 +347,95 @@ def test_delete_schema(app, db_oaischema):
 def test_get_oai_metadata_formats(app, db_oaischema):
     res = get_oai_metadata_formats(app)
     assert res=={'oai_dc': {'serializer': ('invenio_oaiserver.utils:dumps_etree', {'xslt_filename': '/code/modules/invenio-oaiserver/invenio_oaiserver/static/xsl/MARC21slim2OAIDC.xsl'}), 'schema': 'http://www.openarchives.org/OAI/2.0/oai_dc/ http://www.openarchives.org/OAI/2.0/oai_dc.xsd', 'namespace': 'http://www.w3.org/2001/XMLSchema'}, 'marc21': {'serializer': ('invenio_oaiserver.utils:dumps_etree', {'prefix': 'marc'}), 'schema': 'http://www.loc.gov/standards/marcxml/schema/MARC21slim.xsd', 'namespace': 'http://www.loc.gov/MARC21/slim'}, 'ddi': {'namespace': 'ddi:codebook:2_5', 'schema': 'https://ddialliance.org/Specification/DDI-Codebook/2.5/XMLSchema/codebook.xsd', 'serializer': ('invenio_oaiserver.utils:dumps_etree', {'schema_type': 'ddi'})}, 'jpcoar_v1': {'namespace': 'https://github.com/JPCOAR/schema/blob/master/1.0/', 'schema': 'https://github.com/JPCOAR/schema/blob/master/1.0/jpcoar_scm.xsd', 'serializer': ('invenio_oaiserver.utils:dumps_etree', {'schema_type': 'jpcoar_v1'})}, 'jpcoar': {'namespace': 'https://github.com/JPCOAR/schema/blob/master/2.0/', 'schema': 'https://github.com/JPCOAR/schema/blob/master/2.0/jpcoar_scm.xsd', 'serializer': ('invenio_oaiserver.utils:dumps_etree', {'schema_type': 'jpcoar'})}}
+
+
+# def get_element_list(schema_obj):
+# .tox/c1/bin/pytest --cov=weko_schema_ui tests/test_schema.py::test_get_element_list -v --cov-branch --cov-report=term --basetemp=/code/modules/weko-schema-ui/.tox/c1/tmp
+def test_get_element_list():
+    schema_obj = OrderedDict([
+        ("dc:title", {"type": {}}),
+        ("jpcoar:creator", OrderedDict([
+            ("type", {}),
+            ("jpcoar:creatorName", {"type": {}}),
+            ("jpcoar:affiliation", OrderedDict([
+                ("type", {}),
+                ("jpcoar:affiliationName", {"type": {}})]))]))])
+    assert get_element_list(schema_obj) == [
+        "title", "creator.creatorName",
+        "creator.affiliation.affiliationName"]
+
+
+# def get_schema_plan_revision(schema_name, item_type_id=None):
+# .tox/c1/bin/pytest --cov=weko_schema_ui tests/test_schema.py::test_get_schema_plan_revision -v --cov-branch --cov-report=term --basetemp=/code/modules/weko-schema-ui/.tox/c1/tmp
+def test_get_schema_plan_revision(app, db_oaischema):
+    revision = get_schema_plan_revision("jpcoar_mapping")
+    assert len(revision) == 1
+    assert revision[0] is not None
+
+    assert get_schema_plan_revision("none_mapping") == (None,)
+    assert get_schema_plan_revision("jpcoar_mapping", 9999) == \
+        (revision[0], None)
+
+
+# def get_schema_plan(schema_name, item_type_id=None):
+# .tox/c1/bin/pytest --cov=weko_schema_ui tests/test_schema.py::test_get_schema_plan -v --cov-branch --cov-report=term --basetemp=/code/modules/weko-schema-ui/.tox/c1/tmp
+def test_get_schema_plan(app, db_oaischema):
+    clear_schema_plans()
+    plan = get_schema_plan("jpcoar_mapping")
+    assert plan["root_name"] == "jpcoar"
+    assert plan["location"] == "https://github.com/JPCOAR/schema/blob/master/2.0/jpcoar_scm.xsd"
+    assert plan["mapping"] is None
+    assert plan["element_list"] == get_element_list(plan["schema"])
+    assert "title" in plan["path_lists"]
+
+    # compiled once per revision
+    with patch("weko_schema_ui.schema.compile_schema_plan") as mock_compile:
+        assert get_schema_plan("jpcoar_mapping") is plan
+        mock_compile.assert_not_called()
+
+    # a new schema, item type or mapping revision compiles a new plan
+    with patch("weko_schema_ui.schema.get_schema_plan_revision",
+               return_value=("changed",)):
+        new_plan = get_schema_plan("jpcoar_mapping")
+        assert new_plan is not plan
+        assert get_schema_plan("jpcoar_mapping") is new_plan
+
+    # the process local plans are dropped with the schema cache
+    delete_schema_cache("jpcoar_mapping")
+    assert get_schema_plan("jpcoar_mapping") is not new_plan
+
+    app.config.update(WEKO_SCHEMA_PLAN_CACHE_SIZE=1)
+    get_schema_plan("oai_dc_mapping")
+    with patch("weko_schema_ui.schema.compile_schema_plan",
+               return_value={}) as mock_compile:
+        get_schema_plan("jpcoar_mapping")
+        mock_compile.assert_called_once_with("jpcoar_mapping", None)
+
+    assert get_schema_plan("none_mapping") is None
+    clear_schema_plans()
+
+
+# def SchemaTree.to_list(self):
+# .tox/c1/bin/pytest --cov=weko_schema_ui tests/test_schema.py::test_SchemaTree_shares_plan -v --cov-branch --cov-report=term --basetemp=/code/modules/weko-schema-ui/.tox/c1/tmp
+def test_SchemaTree_shares_plan(app, db_oaischema):
+    clear_schema_plans()
+    record = {"metadata": {"_oai": {"id": "oai:weko3.example.org:00000001"},
+                           "item_type_id": "1"}}
+    with patch("weko_schema_ui.schema.get_schema_plan",
+               wraps=get_schema_plan) as mock_plan, \
+            patch("weko_schema_ui.schema.get_ignore_item_from_option",
+                  return_value=({}, [])) as mock_ignore:
+        first = SchemaTree(record=copy.deepcopy(record),
+                           schema_name="jpcoar_mapping")
+        second = SchemaTree(record=copy.deepcopy(record),
+                            schema_name="jpcoar_mapping")
+        assert mock_plan.call_count == 2
+        mock_ignore.assert_called_once_with("1")
+    assert first._plan is second._plan
+    assert first._schema_obj is second._schema_obj
+    assert first._ns is not second._ns
+    assert first._item_type_id == "1"
+    assert first._ignore_list == []
+    assert first._location == "https://github.com/JPCOAR/schema/blob/master/2.0/jpcoar_scm.xsd"
+    assert first.to_list() == get_element_list(first._schema_obj)
+    clear_schema_plans()
@@ -69,6 +69,9 @@ WEKO_SCHEMA_UI_RESPONSE_MESSAGES = {}
 WEKO_SCHEMA_CACHE_PREFIX = 'cache_{schema_name}'
 """ cache items prifix info"""
 
+WEKO_SCHEMA_PLAN_CACHE_SIZE = 128
+"""Number of compiled (schema, item type) serialization plans per process."""
+
 # WEKO_SCHEMA_UI_FORMAT_EDIT = 'weko_schema_ui/edit.html'
 # WEKO_SCHEMA_UI_FORMAT_EDIT_API = '/api/schemas/'
 # """URL of search endpoint for schemas."""
@@ -22,6 +22,7 @@
 
 import copy
 import json
+import threading
 from collections import Iterable, OrderedDict
 from functools import partial
 
@@ -31,14 +32,23 @@ import xmlschema
 from flask import abort, current_app, request, url_for
 from lxml import etree
 from lxml.builder import ElementMaker
+from invenio_db import db
 from simplekv.memory.redisstore import RedisStore
+from sqlalchemy import and_, desc
 from weko_records.api import ItemLink, Mapping
+from weko_records.models import ItemType, ItemTypeMapping
 from weko_redis import RedisConnection
 from xmlschema.validators import XsdAnyAttribute, XsdAnyElement, \
     XsdAtomicBuiltin, XsdAtomicRestriction, XsdEnumerationFacet, XsdGroup, \
     XsdPatternsFacet, XsdSingleFacet, XsdUnion
 
 from .api import WekoSchema
+from .models import OAIServerSchema
+
+_schema_plans = OrderedDict()
+"""Compiled serialization plans by (schema name, item type id)."""
+
+_schema_plans_lock = threading.Lock()
 
 
 class SchemaConverter:
@@ -233,6 +243,7 @@ class SchemaTree:
         self._record = record["metadata"] \
             if record and record.get("metadata") else None
         self._schema_name = schema_name if schema_name else None
+        self._plan = None
         if self._record:
             self._root_name, self._ns, self._schema_obj, self._item_type_id = \
                 self.get_mapping_data()
@@ -246,32 +257,22 @@ class SchemaTree:
         self._separate_nodes = None
         self._location = ''
         self._target_namespace = ''
-        schemas = WekoSchema.get_all()
-        if self._record and self._item_type_id:
-            self._ignore_list_all, self._ignore_list = \
-                self.get_ignore_item_from_option()
-        for schema in schemas:
-            if self._schema_name == schema.schema_name:
-                self._location = schema.schema_location
-                self._target_namespace = schema.target_namespace
+        if self._plan:
+            # schema location and hidden items come from the compiled plan
+            self._location = self._plan['location']
+            self._target_namespace = self._plan['target_namespace']
+            if self._item_type_id:
+                self._ignore_list_all = self._plan['ignore_list_all']
+                self._ignore_list = self._plan['ignore_list']
+        else:
+            for schema in WekoSchema.get_all():
+                if self._schema_name == schema.schema_name:
+                    self._location = schema.schema_location
+                    self._target_namespace = schema.target_namespace
 
     def get_ignore_item_from_option(self):
         """Get all keys of properties that is enable Hide option in metadata."""
-        ignore_list_parents = []
-        ignore_list_all = []
-        ignore_dict_all = {}
-        from weko_records.utils import get_options_and_order_list
-        ignore_list_all, meta_options = \
-            get_options_and_order_list(self._item_type_id)
-        for key, val in meta_options.items():
-            hidden = val.get('option').get('hidden')
-            if hidden:
-                ignore_list_parents.append(key)
-        for element_info in ignore_list_all:
-            element_info[0] = element_info[0].replace("[]", "")
-            # only get hide option
-            ignore_dict_all[element_info[0]] = element_info[3].get("hide")
-        return ignore_dict_all, ignore_list_parents
+        return get_ignore_item_from_option(self._item_type_id)
 
     def get_mapping_data(self):
         """
@@ -280,11 +281,14 @@ class SchemaTree:
         :return: root name, namespace and schema
 
         """
-        # Get Schema info
-        rec = cache_schema(self._schema_name)
+        # Get Schema info and item type mapping compiled for this pair
+        item_type_id = self._record.get("item_type_id") \
+            if isinstance(self._record, dict) else None
+        plan = get_schema_plan(self._schema_name, item_type_id)
 
-        if not rec:
+        if not plan:
             return None, None, None, None
+        self._plan = plan
 
         def get_mapping():
 
@@ -292,20 +296,21 @@ class SchemaTree:
                 _id = self._record.pop("item_type_id")
                 self._record.pop("_buckets", {})
                 self._record.pop("_deposit", {})
-                mjson = Mapping.get_record(_id)
-                self.item_type_mapping = mjson
-                mp = mjson.dumps()
-                if mjson:
+                mp = plan['mapping']
+                self.item_type_mapping = mp
+                if mp:
                     for k, v in self._record.items():
                         if isinstance(v, dict) and mp.get(k) and k != "_oai":
-                            v.update({self._schema_name: mp.get(
-                                k).get(self._schema_name)})
+                            # the plan is shared, give the record its own copy
+                            v.update({self._schema_name: copy.deepcopy(
+                                mp.get(k).get(self._schema_name))})
                 return _id
 
         # inject mappings info to record
         item_type_id = get_mapping()
-        return rec.get('root_name'), rec.get('namespaces'), rec.get(
-            'schema'), item_type_id
+        # create_xml() adds the xml/xsi prefixes to the namespaces
+        return plan['root_name'], copy.copy(plan['namespaces']), \
+            plan['schema'], item_type_id
 
     def __converter(self, node):
         description_type = "descriptionType"
@@ -1679,34 +1684,9 @@ class SchemaTree:
 
     def to_list(self):
         """Get a elementName List."""
-        elst = []
-        klst = []
-
-        def get_element(str):
-            return str.split(":")[-1] if ":" in str else str
-
-        def get_key_list(nodes):
-            # if no child
-            if len(nodes.keys()) == 1:
-                _str = ""
-                for lst in klst:
-                    _str = _str + "." + get_element(lst)
-                elst.append(_str[1:])
-
-                klst.pop(-1)
-                return
-
-            for k, v in nodes.items():
-                if k != "type" and isinstance(v, dict):
-                    klst.append(k)
-                    get_key_list(v)
-
-            if len(klst) > 0:
-                klst.pop(-1)
-
-        get_key_list(self._schema_obj)
-
-        return elst
+        if self._plan:
+            return self._plan['element_list']
+        return get_element_list(self._schema_obj)
 
     # def get_node(self, dc, key=None):
     #     """
@@ -1754,18 +1734,15 @@ class SchemaTree:
                         yield value
 
         def get_path_list(key):
-            klst = []
-            plst = self.to_list()
-            for i in range(len(plst)):
-                if key in plst[i].split('.')[0]:
-                    klst.append(plst[i])
-            return klst
+            if self._plan:
+                return self._plan['path_lists'].get(key, [])
+            return get_path_list_by_element(self.to_list(), key)
 
-        ndic = copy.deepcopy(self._schema_obj)
         # start
         # ---------------------------------------------------------------------------------------------------
         nlst = []
-        for k, v in ndic.items():
+        # the schema is only read here, every mapped node is deep copied
+        for k, v in self._schema_obj.items():
             key = cut_pre(k)
             # get nested path list
             klst = get_path_list(key)
@@ -1817,6 +1794,191 @@ class SchemaTree:
         # end
 
 
+def get_element_list(schema_obj):
+    """Get a elementName List of the schema.
+
+    :param schema_obj: schema json
+    :return: list of dotted element paths
+
+    """
+    elst = []
+    klst = []
+
+    def get_element(str):
+        return str.split(":")[-1] if ":" in str else str
+
+    def get_key_list(nodes):
+        # if no child
+        if len(nodes.keys()) == 1:
+            _str = ""
+            for lst in klst:
+                _str = _str + "." + get_element(lst)
+            elst.append(_str[1:])
+
+            klst.pop(-1)
+            return
+
+        for k, v in nodes.items():
+            if k != "type" and isinstance(v, dict):
+                klst.append(k)
+                get_key_list(v)
+
+        if len(klst) > 0:
+            klst.pop(-1)
+
+    get_key_list(schema_obj)
+
+    return elst
+
+
+def get_path_list_by_element(element_list, key):
+    """Get the nested element paths belonging to a top element.
+
+    :param element_list: list of dotted element paths
+    :param key: top element name without prefix
+    :return: list of dotted element paths
+
+    """
+    return [path for path in element_list if key in path.split('.')[0]]
+
+
+def get_ignore_item_from_option(item_type_id):
+    """Get all keys of properties that is enable Hide option in metadata.
+
+    :param item_type_id: item type id
+    :return: hide option of each item and hidden parent items
+
+    """
+    ignore_list_parents = []
+    ignore_list_all = []
+    ignore_dict_all = {}
+    from weko_records.utils import get_options_and_order_list
+    ignore_list_all, meta_options = \
+        get_options_and_order_list(item_type_id)
+    for key, val in meta_options.items():
+        hidden = val.get('option').get('hidden')
+        if hidden:
+            ignore_list_parents.append(key)
+    for element_info in ignore_list_all:
+        element_info[0] = element_info[0].replace("[]", "")
+        # only get hide option
+        ignore_dict_all[element_info[0]] = element_info[3].get("hide")
+    return ignore_dict_all, ignore_list_parents
+
+
+def get_schema_plan_revision(schema_name, item_type_id=None):
+    """Get the revision of a schema and an item type mapping.
+
+    Only the version columns are read, so every worker notices a schema,
+    item type or mapping change without loading the rows themselves.
+
+    :param schema_name: schema name
+    :param item_type_id: item type id
+    :return: tuple of version ids
+
+    """
+    schema_version = db.session.query(OAIServerSchema.version_id).filter(
+        OAIServerSchema.schema_name == schema_name,
+        OAIServerSchema.isvalid.is_(True)).first()
+    revision = (schema_version[0] if schema_version else None,)
+    if item_type_id:
+        mapping_version = db.session.query(
+            ItemType.version_id, ItemTypeMapping.id,
+            ItemTypeMapping.version_id
+        ).outerjoin(
+            ItemTypeMapping,
+            and_(ItemTypeMapping.item_type_id == ItemType.id,
+                 ItemTypeMapping.mapping != None)  # noqa
+        ).filter(ItemType.id == item_type_id).order_by(
+            desc(ItemTypeMapping.created)).first()
+        revision += tuple(mapping_version) if mapping_version else (None,)
+    return revision
+
+
+def compile_schema_plan(schema_name, item_type_id=None):
+    """Compile everything SchemaTree needs for a schema and an item type.
+
+    :param schema_name: schema name
+    :param item_type_id: item type id
+    :return: serialization plan or None if the schema does not exist
+
+    """
+    rec = cache_schema(schema_name)
+    if not rec:
+        return None
+
+    schema_obj = rec.get('schema')
+    element_list = get_element_list(schema_obj)
+    path_lists = dict()
+    for k in schema_obj:
+        key = k.split(':')[-1] if ':' in k else k
+        path_lists[key] = get_path_list_by_element(element_list, key)
+    plan = {
+        'root_name': rec.get('root_name'),
+        'namespaces': rec.get('namespaces'),
+        'schema': schema_obj,
+        'element_list': element_list,
+        'path_lists': path_lists,
+        'location': '',
+        'target_namespace': '',
+        'mapping': None,
+        'ignore_list_all': {},
+        'ignore_list': []
+    }
+    for schema in WekoSchema.get_all():
+        if schema_name == schema.schema_name:
+            plan['location'] = schema.schema_location
+            plan['target_namespace'] = schema.target_namespace
+    if item_type_id:
+        mjson = Mapping.get_record(item_type_id)
+        plan['mapping'] = mjson.dumps() if mjson else None
+        plan['ignore_list_all'], plan['ignore_list'] = \
+            get_ignore_item_from_option(item_type_id)
+    return plan
+
+
+def get_schema_plan(schema_name, item_type_id=None):
+    """Get the compiled serialization plan of a schema and an item type.
+
+    Plans are kept in a process local LRU and recompiled as soon as
+    the revision of the schema, the item type or its mapping changes.
+
+    :param schema_name: schema name
+    :param item_type_id: item type id
+    :return: serialization plan or None if the schema does not exist
+
+    """
+    key = (schema_name, str(item_type_id) if item_type_id else None)
+    revision = get_schema_plan_revision(schema_name, item_type_id)
+    with _schema_plans_lock:
+        cached = _schema_plans.get(key)
+        if cached and cached[0] == revision:
+            _schema_plans.move_to_end(key)
+            return cached[1]
+
+    plan = compile_schema_plan(schema_name, item_type_id)
+    if plan:
+        with _schema_plans_lock:
+            _schema_plans[key] = (revision, plan)
+            _schema_plans.move_to_end(key)
+            while len(_schema_plans) > \
+                    current_app.config['WEKO_SCHEMA_PLAN_CACHE_SIZE']:
+                _schema_plans.popitem(last=False)
+    return plan
+
+
+def clear_schema_plans(schema_name=None):
+    """Drop the compiled serialization plans of this process.
+
+    :param schema_name: schema name, all plans are dropped if None
+
+    """
+    with _schema_plans_lock:
+        for key in list(_schema_plans):
+            if schema_name is None or key[0] == schema_name:
+                _schema_plans.pop(key, None)
+
+
 def cache_schema(schema_name, delete=False):
     """
     Cache the schema to Redis.
@@ -1886,6 +2048,7 @@ def delete_schema_cache(schema_name):
         datastore.delete(cache_key)
     except BaseException:
         pass
+    clear_schema_plans(schema_name)
 
 
 def schema_list_render(pid=None, **kwargs):
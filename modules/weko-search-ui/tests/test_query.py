@@ -130,6 +130,19 @@ def test_item_path_search_factory(i18n_app, users, indices):
                     res = item_path_search_factory(self=None, search=search, index_id=None)
                     assert res
 
+                # the aggregation is narrowed only when the counts are cached
+                i18n_app.config['WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE'] = True
+                counts = {"33": {"doc_count": 1, "no_available": 0}}
+                with patch("weko_search_ui.query.get_index_item_counts", return_value=counts):
+                    _search, urlkwargs = item_path_search_factory(self=None, search=search, index_id=33)
+                    assert urlkwargs["index_counts"] == counts
+                    assert _search.to_dict()["aggs"]["path"]["terms"]["include"] == "33"
+                with patch("weko_search_ui.query.get_index_item_counts", return_value=None):
+                    with patch("weko_search_ui.query.Indexes.get_child_list_recursive", return_value=["33", "34"]):
+                        _search, urlkwargs = item_path_search_factory(self=None, search=search, index_id=33)
+                    assert urlkwargs["index_counts"] is None
+                    assert _search.to_dict()["aggs"]["path"]["terms"]["include"] == "33|34"
+
 
 # def check_permission_user():
 # .tox/c1/bin/pytest --cov=weko_search_ui tests/test_query.py::test_check_permission_user -vv -s --cov-branch --cov-report=xml --basetemp=/code/modules/weko-search-ui/.tox/c1/tmp
@@ -95,6 +95,7 @@ def test_IndexSearchResource_get(client_rest, users, item_type, record, facet_se
     facet = json_data("tests/data/search/"+facet_file)
     for l in links:
         links[l]="http://"+sname+"/index/"+links[l]
+    current_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE"] = False
     with patch("weko_admin.utils.get_facet_search_query", return_value=facet):
         with patch("weko_search_ui.rest.Indexes.get_self_list",side_effect=paths):
             with patch("invenio_search.api.RecordsSearch.execute", return_value=mock_es_execute("tests/data/search/"+execute)):
@@ -103,6 +104,22 @@ def test_IndexSearchResource_get(client_rest, users, item_type, record, facet_se
                 rd = json_data("tests/data/search/"+rd_file)
                 rd["links"] = links
                 assert result == rd
+    current_app.config["WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE"] = True
+
+    # use the cached item counts of indexes
+    with patch("weko_admin.utils.get_facet_search_query", return_value=facet):
+        with patch("weko_search_ui.rest.Indexes.get_self_list",side_effect=paths):
+            with patch("invenio_search.api.RecordsSearch.execute", return_value=mock_es_execute("tests/data/search/"+execute)):
+                with patch("weko_search_ui.query.get_index_item_counts", return_value={}) as mock_counts:
+                    res = client_rest.get(url("/index/",params))
+                    assert res.status_code == 200
+                    mock_counts.assert_called_once()
+
+                # no counts cached yet
+                with patch("weko_search_ui.query.get_index_item_counts", return_value=None) as mock_counts:
+                    res = client_rest.get(url("/index/",params))
+                    assert res.status_code == 200
+                    mock_counts.assert_called_once()
 
 # .tox/c1/bin/pytest --cov=weko_search_ui tests/test_rest.py::test_IndexSearchResource_get_Exception -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-search-ui/.tox/c1/tmp
 def test_IndexSearchResource_get_Exception(client_rest, db, users, item_type, db_records, facet_search_setting):
@@ -115,6 +115,8 @@ from weko_search_ui.utils import (
     set_nested_item,
     unpackage_import_file,
     up_load_file,
+    stage_item_files,
+    discard_staged_files,
     update_publish_status,
     validation_date_property,
     validation_file_open_date,
@@ -649,6 +651,101 @@ def test_up_load_file(i18n_app, deposit, db_activity):
     )
 
 
+# .tox/c1/bin/pytest --cov=weko_search_ui tests/test_utils.py::test_up_load_file_staged -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-search-ui/.tox/c1/tmp
+def test_up_load_file_staged(i18n_app, tmpdir):
+    from invenio_files_rest.errors import FileSizeError
+
+    root_path = str(tmpdir)
+    tmpdir.mkdir("data").join("a.txt").write("test")
+    record = {"file_path": ["data/a.txt"], "filenames": [{"filename": "a.txt"}]}
+    deposit = MagicMock()
+    deposit.files.bucket.size = 0
+    deposit.files.bucket.size_limit = 10
+    deposit.files.bucket.objects = []
+    staged_files = {"data/a.txt": {
+        "id": uuid.uuid4(), "uri": "uri", "size": 4,
+        "checksum": "md5:1234", "linked": False}}
+    obj = MagicMock()
+    with patch("weko_search_ui.utils.ObjectVersion.create", return_value=obj), \
+            patch("weko_search_ui.utils.db.session.add"), \
+            patch("weko_search_ui.utils.clean_thumbnail_file"):
+        up_load_file(record, root_path, deposit, True, [], staged_files)
+        # the bucket size is updated by set_file only
+        obj.set_file.assert_called_once()
+        obj.set_contents.assert_not_called()
+        assert deposit.files.bucket.size == 0
+        assert staged_files["data/a.txt"]["linked"] is True
+
+        # over the quota of the bucket
+        staged_files["data/a.txt"]["linked"] = False
+        deposit.files.bucket.size_limit = 3
+        obj.reset_mock()
+        with pytest.raises(FileSizeError):
+            up_load_file(record, root_path, deposit, True, [], staged_files)
+        obj.set_file.assert_not_called()
+        assert staged_files["data/a.txt"]["linked"] is False
+
+
+# def stage_item_files(item, root_path):
+def test_stage_item_files(i18n_app, tmpdir):
+    root_path = str(tmpdir)
+    tmpdir.mkdir("data").join("a.txt").write("test")
+    item = {"file_path": ["data/a.txt", "data/missing.txt"], "thumbnail_path": ""}
+
+    assert stage_item_files({"file_path": []}, root_path) == {}
+
+    location = MagicMock()
+    location.uri = root_path
+    storage = MagicMock()
+    storage.save.return_value = ("uri", 4, "md5:1234")
+    with patch("weko_search_ui.utils.Location.get_default", return_value=location):
+        with patch("weko_search_ui.utils.current_files_rest") as files_rest:
+            files_rest.storage_factory.return_value = storage
+            staged_files = stage_item_files(item, root_path)
+    assert list(staged_files) == ["data/a.txt"]
+    assert staged_files["data/a.txt"]["uri"] == "uri"
+    assert staged_files["data/a.txt"]["checksum"] == "md5:1234"
+    assert staged_files["data/a.txt"]["linked"] is False
+
+    # existing items are staged to the location of their deposit bucket
+    bucket = MagicMock()
+    bucket.location.uri = "/bucket/location"
+    record = MagicMock()
+    record.json = {"_buckets": {"deposit": "bucket-id"}}
+    with patch("weko_search_ui.utils.PersistentIdentifier.query") as pid_query:
+        with patch("weko_search_ui.utils.RecordMetadata.query") as record_query:
+            with patch("weko_search_ui.utils.Bucket.query") as bucket_query:
+                with patch("weko_search_ui.utils.current_files_rest") as files_rest:
+                    record_query.get.return_value = record
+                    bucket_query.get.return_value = bucket
+                    files_rest.storage_factory.return_value = storage
+                    stage_item_files(dict(item, status="keep", id="1"), root_path)
+                    bucket_query.get.assert_called_with("bucket-id")
+                    assert files_rest.storage_factory.call_args[1][
+                        "default_location"] == "/bucket/location"
+
+    storage.save.side_effect = IOError("error")
+    with patch("weko_search_ui.utils.Location.get_default", return_value=location):
+        with patch("weko_search_ui.utils.current_files_rest") as files_rest:
+            files_rest.storage_factory.return_value = storage
+            with pytest.raises(IOError):
+                stage_item_files(item, root_path)
+
+
+# def discard_staged_files(staged_files, only_unlinked=False):
+def test_discard_staged_files(i18n_app):
+    staged_files = {
+        "a": {"uri": "a", "size": 1, "linked": True},
+        "b": {"uri": "b", "size": 0, "linked": False},
+    }
+    with patch("weko_search_ui.utils.current_files_rest") as files_rest:
+        discard_staged_files(staged_files, only_unlinked=True)
+        files_rest.storage_factory.assert_called_once_with(fileurl="b", size=1)
+        files_rest.storage_factory.reset_mock()
+        discard_staged_files(staged_files)
+        assert files_rest.storage_factory.call_count == 2
+
+
 # def get_file_name(file_path):
 def test_get_file_name(i18n_app):
     assert get_file_name("test/test/test")
@@ -34,7 +34,7 @@ from flask_babelex import get_timezone
 from invenio_communities.models import Community
 from invenio_records_rest.errors import InvalidQueryRESTError
 from weko_index_tree.api import Indexes
-from weko_index_tree.utils import get_user_roles
+from weko_index_tree.utils import get_index_item_counts, get_user_roles
 from weko_schema_ui.models import PublishStatus
 from werkzeug.datastructures import MultiDict
 
@@ -905,7 +905,11 @@ def item_path_search_factory(self, search, index_id=None):
             if q:
                 try:
                     child_idx = Indexes.get_child_list_recursive(q)
-                    child_idx_str = "|".join(child_idx)
+                    if index_counts is not None:
+                        # counts of the child indexes are read from the cache
+                        child_idx_str = str(q)
+                    else:
+                        child_idx_str = "|".join(child_idx)
                     max_clause_count = current_app.config.get(
                         "OAISERVER_ES_MAX_CLAUSE_COUNT", 1024
                     )
@@ -1050,6 +1054,10 @@ def item_path_search_factory(self, search, index_id=None):
 
             return query_not_q, is_perm_paths
 
+    index_counts = None
+    if current_app.config.get("WEKO_INDEX_TREE_ITEM_COUNTS_ENABLE"):
+        index_counts = get_index_item_counts()
+
     # create a index search query
     query_q, is_perm_paths = _get_index_earch_query()
     urlkwargs = MultiDict()
@@ -1119,6 +1127,7 @@ def item_path_search_factory(self, search, index_id=None):
 
     urlkwargs.add("q", query_q)
     urlkwargs.add("is_perm_paths", is_perm_paths)
+    urlkwargs.add("index_counts", index_counts)
     # debug elastic search query
     current_app.logger.debug(json.dumps((search.query()).to_dict()))
     return search, urlkwargs
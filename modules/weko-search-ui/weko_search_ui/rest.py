@@ -261,12 +261,22 @@ class IndexSearchResource(ContentNegotiatedMethodView):
         items_count = dict()
         public_indexes = Indexes.get_public_indexes_list()
         recorrect_private_items_count(agp)
-        for i in agp:
-            items_count[i["key"]] = {
-                "key": i["key"],
-                "doc_count": i["doc_count"],
-                "no_available": i["no_available"]["doc_count"],
-                "public_state": True if i["key"] in public_indexes else False,
+        # cached counts read by the search factory before narrowing the
+        # aggregation, the aggregated counts otherwise.
+        index_counts = qs_kwargs.get("index_counts")
+        if index_counts is None:
+            index_counts = {
+                i["key"]: {
+                    "doc_count": i["doc_count"],
+                    "no_available": i["no_available"]["doc_count"],
+                } for i in agp
+            }
+        for key, cnt in index_counts.items():
+            items_count[key] = {
+                "key": key,
+                "doc_count": cnt["doc_count"],
+                "no_available": cnt["no_available"],
+                "public_state": True if key in public_indexes else False,
             }
 
         is_perm_paths = qs_kwargs.get("is_perm_paths", [])
@@ -32,6 +32,7 @@ import traceback
 import uuid
 import zipfile
 from collections import Callable, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import partial, reduce, wraps
 from io import StringIO
@@ -50,8 +51,9 @@ from flask import abort, current_app, has_request_context, request
 from flask_babelex import gettext as _
 from flask_login import current_user
 from invenio_db import db
-from invenio_files_rest.models import FileInstance, Location, ObjectVersion
+from invenio_files_rest.models import Bucket, FileInstance, Location, ObjectVersion
 from invenio_files_rest.proxies import current_files_rest
+from invenio_files_rest.storage.base import check_sizelimit
 from invenio_files_rest.utils import find_and_update_location_size
 from invenio_i18n.ext import current_i18n
 from invenio_indexer.api import RecordIndexer
@@ -74,7 +76,8 @@ from jsonschema import Draft4Validator
 from sqlalchemy import func as _func
 from sqlalchemy.exc import SQLAlchemyError
 from weko_admin.models import SessionLifetime
-from weko_admin.utils import get_redis_cache, reset_redis_cache
+from weko_admin.utils import get_redis_cache, get_redis_caches, \
+    reset_redis_cache
 from weko_authors.utils import check_email_existed
 from weko_deposit.api import WekoDeposit, WekoIndexer, WekoRecord
 from weko_deposit.pidstore import get_latest_version_id
@@ -1114,7 +1117,104 @@ def clean_thumbnail_file(deposit, root_path, thumbnail_path):
             file.obj.remove()
 
 
-def up_load_file(record, root_path, deposit, allow_upload_file_content, old_files):
+def stage_item_files(item, root_path):
+    """Write file contents of an import item to the storage.
+
+    The contents are copied concurrently and their checksum is computed while
+    streaming, before any database transaction is opened. ``up_load_file``
+    then only links the staged contents to the item bucket, so existing items
+    are staged to the location of their deposit bucket.
+
+    :argument
+        item           -- {dict} item import.
+        root_path      -- {str} location of temp folder.
+    :return
+        return         -- {dict} staged file information by file path.
+
+    """
+    paths = item.get("thumbnail_path") or []
+    if isinstance(paths, str):
+        paths = [paths]
+    paths = [
+        path
+        for path in list(paths) + list(item.get("file_path") or [])
+        if path and os.path.isfile(root_path + "/" + path)
+    ]
+    if not paths:
+        return {}
+
+    app = current_app._get_current_object()
+    location = None
+    if item.get("status") != "new" and item.get("id"):
+        # write to the storage of the bucket the files will be linked to.
+        pid = PersistentIdentifier.query.filter_by(
+            pid_type="recid", pid_value=str(item.get("id"))
+        ).first()
+        record = RecordMetadata.query.get(pid.object_uuid) if pid else None
+        bucket_id = ((record.json or {}).get("_buckets") or {}).get(
+            "deposit") if record else None
+        bucket = Bucket.query.get(bucket_id) if bucket_id else None
+        location = bucket.location if bucket else None
+    location = location or Location.get_default()
+    default_location = location.uri
+    default_storage_class = location.default_storage_class
+
+    def stage(path):
+        with app.app_context():
+            file_id = uuid.uuid4()
+            storage = current_files_rest.storage_factory(
+                fileinstance=FileInstance(id=file_id, size=0),
+                default_location=default_location,
+                default_storage_class=default_storage_class,
+            )
+            with open(root_path + "/" + path, "rb") as file:
+                uri, size, checksum = storage.save(file)
+            return path, dict(
+                id=file_id, uri=uri, size=size, checksum=checksum, linked=False
+            )
+
+    staged_files = {}
+    errors = []
+    with ThreadPoolExecutor(
+        max_workers=current_app.config.get(
+            "WEKO_SEARCH_UI_IMPORT_FILE_STAGE_WORKERS", 4
+        )
+    ) as executor:
+        for future in [executor.submit(stage, path) for path in set(paths)]:
+            try:
+                path, staged = future.result()
+                staged_files[path] = staged
+            except Exception as ex:
+                errors.append(ex)
+    if errors:
+        discard_staged_files(staged_files)
+        raise errors[0]
+    return staged_files
+
+
+def discard_staged_files(staged_files, only_unlinked=False):
+    """Remove staged file contents from the storage.
+
+    :argument
+        staged_files   -- {dict} staged file information by file path.
+        only_unlinked  -- {bool} keep contents linked to an ObjectVersion.
+
+    """
+    for staged in (staged_files or {}).values():
+        if only_unlinked and staged["linked"]:
+            continue
+        try:
+            current_files_rest.storage_factory(
+                fileurl=staged["uri"], size=staged["size"] or 1
+            ).delete()
+        except Exception as ex:
+            current_app.logger.warning(
+                "Could not remove staged file {}: {}".format(staged["uri"], ex)
+            )
+
+
+def up_load_file(record, root_path, deposit, allow_upload_file_content, old_files,
+                 staged_files=None):
     """Upload thumbnail or file content.
 
     :argument
@@ -1123,6 +1223,7 @@ def up_load_file(record, root_path, deposit, allow_upload_file_content, old_file
         deposit        -- {object} item deposit.
         allow_upload_file_content   -- {bool} allow file content upload?
         old_files      -- {list} List of ObjectVersion in current bucket.
+        staged_files   -- {dict} contents written by ``stage_item_files``.
 
     """
 
@@ -1143,14 +1244,32 @@ def up_load_file(record, root_path, deposit, allow_upload_file_content, old_file
                     old_file.remove()
                 continue
 
-            with open(root_path + "/" + path, "rb") as file:
-                root_file_id = None
-                if old_file:
-                    root_file_id = old_file.root_file_id
-                    old_file.remove()
+            root_file_id = None
+            if old_file:
+                root_file_id = old_file.root_file_id
+                old_file.remove()
+
+            obj = ObjectVersion.create(deposit.files.bucket, get_file_name(path))
+            obj.is_thumbnail = is_thumbnail
+            staged = (staged_files or {}).get(path)
+            if staged and not staged["linked"]:
+                # Same quota and file size limits as ``set_contents``.
+                check_sizelimit(
+                    deposit.files.bucket.size_limit, staged["size"],
+                    staged["size"]
+                )
+                file_instance = FileInstance(id=staged["id"])
+                file_instance.set_uri(
+                    staged["uri"], staged["size"], staged["checksum"]
+                )
+                db.session.add(file_instance)
+                # set_file also adds the file size to the bucket size.
+                obj.set_file(file_instance)
+                obj.root_file_id = root_file_id or file_instance.id
+                staged["linked"] = True
+                continue
 
-                obj = ObjectVersion.create(deposit.files.bucket, get_file_name(path))
-                obj.is_thumbnail = is_thumbnail
+            with open(root_path + "/" + path, "rb") as file:
                 obj.set_contents(
                     file, root_file_id=root_file_id, is_set_size_location=False
                 )
@@ -1186,13 +1305,15 @@ def get_file_name(file_path):
     return file_path.split("/")[-1] if file_path.split("/")[-1] else ""
 
 
-def register_item_metadata(item, root_path, owner, is_gakuninrdm=False):
+def register_item_metadata(item, root_path, owner, is_gakuninrdm=False,
+                           staged_files=None):
     """Upload file content.
 
     :argument
         item        -- {dict} Information of item need to import.
         root_path   -- {str} path of the folder include files.
         is_gakuninrdm -- {bool} Is call by gakuninrdm api.
+        staged_files -- {dict} contents written by ``stage_item_files``.
     """
 
     def clean_file_metadata(item_type_id, data):
@@ -1302,7 +1423,9 @@ def register_item_metadata(item, root_path, owner, is_gakuninrdm=False):
     # set delete flag for file metadata if is empty.
     new_data, is_cleaned = clean_file_metadata(item["item_type_id"], new_data)
     # progress upload file, replace file contents.
-    up_load_file(item, root_path, deposit, not is_cleaned, old_file_list)
+    up_load_file(
+        item, root_path, deposit, not is_cleaned, old_file_list, staged_files
+    )
     new_data = autofill_thumbnail_metadata(item["item_type_id"], new_data)
 
     # check location file
@@ -1528,10 +1651,14 @@ def import_items_to_system(item: dict, request_info=None, is_gakuninrdm=False):
     else:
         bef_metadata = None
         bef_last_ver_metadata = None
+        staged_files = {}
+        committed = False
         try:
             # current_app.logger.debug("item: {0}".format(item))
             status = item.get("status")
             root_path = item.get("root_path", "")
+            # write file contents before the item transaction starts.
+            staged_files = stage_item_files(item, root_path)
             if status == "new":
                 item_id = create_deposit(item.get("id"))
                 item["id"] = item_id
@@ -1546,7 +1673,9 @@ def import_items_to_system(item: dict, request_info=None, is_gakuninrdm=False):
                     PIDVersioning(child=pid).last_child.object_uuid
                 )
 
-            register_item_metadata(item, root_path, owner, is_gakuninrdm)
+            register_item_metadata(
+                item, root_path, owner, is_gakuninrdm, staged_files
+            )
             if not is_gakuninrdm:
                 if current_app.config.get("WEKO_HANDLE_ALLOW_REGISTER_CNRI"):
                     register_item_handle(item)
@@ -1560,6 +1689,7 @@ def import_items_to_system(item: dict, request_info=None, is_gakuninrdm=False):
                     # Send item_created event to ES.
                     send_item_created_event_to_es(item, request_info)
             db.session.commit()
+            committed = True
 
             # clean unuse file content in keep mode if import success
             cache_key = current_app.config[
@@ -1670,6 +1800,8 @@ def import_items_to_system(item: dict, request_info=None, is_gakuninrdm=False):
                 error_id = ex.args[0].get("error_id")
 
             return {"success": False, "error_id": error_id}
+        finally:
+            discard_staged_files(staged_files, only_unlinked=committed)
     return {"success": True, "recid": item["id"]}
 
 
@@ -3611,10 +3743,8 @@ def get_export_status():
     status = ""
     
     try:
-        task_id = get_redis_cache(cache_key)
-        download_uri = get_redis_cache(cache_uri)
-        message = get_redis_cache(cache_msg)
-        run_message = get_redis_cache(run_msg)
+        task_id, download_uri, message, run_message = get_redis_caches(
+            cache_key, cache_uri, cache_msg, run_msg)
         if task_id:
             task = AsyncResult(task_id)
             status_cond = task.successful() or task.failed() or task.state == "REVOKED"
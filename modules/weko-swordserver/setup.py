@@ -44,6 +44,7 @@ setup_requires = [
 install_requires = [
     'Flask-BabelEx>=0.9.3',
     'sword3common>=0.1.1',
+    'invenio-cache>=1.0.0',
 ]
 
 packages = find_packages()
@@ -79,6 +80,9 @@ setup(
         'invenio_i18n.translations': [
             'messages = weko_swordserver',
         ],
+        'invenio_celery.tasks': [
+            'weko_swordserver = weko_swordserver.tasks',
+        ],
         # TODO: Edit these entry points to fit your needs.
         # 'invenio_access.actions': [],
         # 'invenio_admin.actions': [],
@@ -0,0 +1,44 @@
+
+from mock import patch
+
+from weko_swordserver.errors import ErrorType, WekoSwordserverException
+from weko_swordserver.tasks import import_deposit
+from weko_swordserver.utils import get_deposit_status
+
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_tasks.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+
+# def import_deposit(deposit_id, package_path, host_url, request_info):
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_tasks.py::test_import_deposit -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_import_deposit(app, db, tmpdir):
+    app.config.update(WEKO_SWORDSERVER_DEPOSIT_TMP_DIR=str(tmpdir))
+
+    def _package():
+        path = tmpdir.mkdir("package_{}".format(len(tmpdir.listdir()))).join("payload.zip")
+        path.write("zip")
+        return str(path)
+
+    # ingested
+    package_path = _package()
+    with patch("weko_swordserver.views._import_package", return_value="1") as mock_import:
+        import_deposit("deposit1", package_path, "https://localhost/", {"hostname": "localhost"})
+        mock_import.assert_called_with(package_path, {"hostname": "localhost"})
+    status = get_deposit_status("deposit1")
+    assert status["state"] == "http://purl.org/net/sword/3.0/state/ingested"
+    assert status["recid"] == "1"
+
+    # rejected
+    package_path = _package()
+    with patch("weko_swordserver.views._import_package",
+               side_effect=WekoSwordserverException("item_missing", ErrorType.ContentMalformed)):
+        import_deposit("deposit2", package_path, "https://localhost/", {})
+    status = get_deposit_status("deposit2")
+    assert status["state"] == "http://purl.org/net/sword/3.0/state/rejected"
+    assert status["error"] == "item_missing"
+
+    # unexpected error
+    package_path = _package()
+    with patch("weko_swordserver.views._import_package", side_effect=Exception("test_error")):
+        import_deposit("deposit3", package_path, "https://localhost/", {})
+    status = get_deposit_status("deposit3")
+    assert status["state"] == "http://purl.org/net/sword/3.0/state/rejected"
+    assert status["error"] == "Internal Server Error"
@@ -0,0 +1,112 @@
+
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from mock import patch
+
+from weko_swordserver.errors import ErrorType, WekoSwordserverException
+from weko_swordserver.utils import assemble_segments, get_segmented_upload, \
+    init_segmented_upload, store_segment, touch_deposit_tmp_dir
+
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_utils.py -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+
+# def init_segmented_upload(size, segment_count, segment_size):
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_utils.py::test_init_segmented_upload -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_init_segmented_upload(app, tmpdir):
+    app.config.update(WEKO_SWORDSERVER_DEPOSIT_TMP_DIR=str(tmpdir),
+                      WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_SEGMENTS=10,
+                      WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_ASSEMBLED_SIZE=100)
+    with app.test_request_context():
+        upload_id = init_segmented_upload(25, 3, 10)
+        assert get_segmented_upload(upload_id) == dict(
+            size=25, segment_count=3, segment_size=10, received=[])
+
+        for args, error_type in (((25, 11, 10), ErrorType.SegmentLimitExceeded),
+                                 ((101, 3, 10), ErrorType.MaxAssembledSizeExceeded),
+                                 ((25, 3, 5), ErrorType.InvalidSegmentSize),
+                                 ((25, 4, 10), ErrorType.InvalidSegmentSize)):
+            with pytest.raises(WekoSwordserverException) as e:
+                init_segmented_upload(*args)
+            assert e.value.errorType == error_type
+
+
+# def store_segment(upload_id, segment_number, stream):
+# def assemble_segments(upload_id, filename):
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_utils.py::test_store_segment -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_store_segment(app, tmpdir):
+    app.config.update(WEKO_SWORDSERVER_DEPOSIT_TMP_DIR=str(tmpdir),
+                      WEKO_SWORDSERVER_DEPOSIT_CHUNK_SIZE=4)
+    with app.test_request_context():
+        upload_id = init_segmented_upload(25, 3, 10)
+        store_segment(upload_id, 3, io.BytesIO(b"c" * 5))
+        store_segment(upload_id, 1, io.BytesIO(b"a" * 10))
+
+        # wrong size
+        with pytest.raises(WekoSwordserverException) as e:
+            store_segment(upload_id, 2, io.BytesIO(b"b" * 11))
+        assert e.value.errorType == ErrorType.InvalidSegmentSize
+        # duplicated
+        with pytest.raises(WekoSwordserverException) as e:
+            store_segment(upload_id, 1, io.BytesIO(b"a" * 10))
+        assert e.value.errorType == ErrorType.UnexpectedSegment
+        # not complete
+        with pytest.raises(WekoSwordserverException) as e:
+            assemble_segments(upload_id, "payload.zip")
+        assert e.value.errorType == ErrorType.BadRequest
+
+        store_segment(upload_id, 2, io.BytesIO(b"b" * 10))
+        path = assemble_segments(upload_id, "payload.zip")
+        assert os.path.basename(path) == "payload.zip"
+        assert open(path, "rb").read() == b"a" * 10 + b"b" * 10 + b"c" * 5
+
+        with pytest.raises(WekoSwordserverException) as e:
+            get_segmented_upload(upload_id)
+        assert e.value.errorType == ErrorType.NotFound
+
+
+# def get_segmented_upload(upload_id):
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_utils.py::test_get_segmented_upload -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_get_segmented_upload(app, tmpdir):
+    app.config.update(WEKO_SWORDSERVER_DEPOSIT_TMP_DIR=str(tmpdir))
+    with app.test_request_context():
+        with patch("weko_swordserver.utils._get_upload_owner",
+                   return_value=dict(client_id="client1", user_id="1")):
+            upload_id = init_segmented_upload(25, 3, 10)
+            segment_dir = str(tmpdir.join(
+                app.config["WEKO_SWORDSERVER_DEPOSIT_TMP_PREFIX"] + "segment_" + upload_id))
+            # a segment being written is not received yet
+            open(os.path.join(segment_dir, "segment_1.part"), "wb").close()
+            open(os.path.join(segment_dir, "segment_2"), "wb").close()
+            assert get_segmented_upload(upload_id)["received"] == [2]
+
+        # segments of another client
+        with patch("weko_swordserver.utils._get_upload_owner",
+                   return_value=dict(client_id="client2", user_id="1")):
+            for func, args in ((get_segmented_upload, ()),
+                               (store_segment, (1, io.BytesIO(b"a" * 10))),
+                               (assemble_segments, ("payload.zip",))):
+                with pytest.raises(WekoSwordserverException) as e:
+                    func(upload_id, *args)
+                assert e.value.errorType == ErrorType.NotFound
+
+
+# def touch_deposit_tmp_dir(path, max_idle=None):
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_utils.py::test_touch_deposit_tmp_dir -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_touch_deposit_tmp_dir(app, tmpdir):
+    app.config.update(WEKO_SWORDSERVER_DEPOSIT_TMP_DIR=str(tmpdir),
+                      WEKO_SWORDSERVER_SERVICEDOCUMENT_STAGING_MAX_IDLE=60)
+    with app.test_request_context():
+        upload_id = init_segmented_upload(25, 3, 10)
+        with patch("weko_swordserver.utils.TempDirInfo") as mock_info:
+            store_segment(upload_id, 1, io.BytesIO(b"a" * 10))
+            path, value = mock_info.return_value.set.call_args[0]
+            assert path.endswith("segment_" + upload_id)
+            expire = datetime.strptime(value["expire"], "%Y-%m-%d %H:%M:%S")
+            assert datetime.now() < expire <= datetime.now() + timedelta(seconds=60)
+
+            touch_deposit_tmp_dir(path, 3600)
+            expire = datetime.strptime(
+                mock_info.return_value.set.call_args[0][1]["expire"], "%Y-%m-%d %H:%M:%S")
+            assert expire > datetime.now() + timedelta(seconds=60)
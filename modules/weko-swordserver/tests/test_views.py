@@ -2,6 +2,7 @@
 from flask import url_for,json,request,abort
 import pytest
 from mock import patch
+import os
 import datetime
 from sword3common.lib.seamless import SeamlessException
 from werkzeug.datastructures import FileStorage
@@ -106,6 +107,95 @@ def test_post_service_document(app,client,db,users,esindex,location,index,make_z
         
         
 
+# def post_service_document():
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_views.py::test_post_service_document_async -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_post_service_document_async(app,client,db,users,tokens,make_zip,mocker):
+    login_user_via_session(client=client,email=users[0]["email"])
+    token=tokens["token"].access_token
+    url = url_for("weko_swordserver.post_service_document")
+    headers = {
+        "Authorization":"Bearer {}".format(token),
+        "Content-Disposition":"attachment; filename=payload.zip",
+        "Packaging":"http://purl.org/net/sword/3.0/package/SimpleZip",
+        "Prefer":"respond-async",
+    }
+    mock_task = mocker.patch("weko_swordserver.views.import_deposit.apply_async")
+    mock_touch = mocker.patch("weko_swordserver.views.touch_deposit_tmp_dir")
+    storage = FileStorage(filename="payload.zip",stream=make_zip())
+    res = client.post(url, data=dict(file=storage),content_type="multipart/form-data",headers=headers)
+    assert res.status_code == 202
+    data = json.loads(res.data)
+    assert data["state"][0]["@id"] == "http://purl.org/net/sword/3.0/state/accepted"
+    deposit_id, package_path = mock_task.call_args[1]["args"][:2]
+    assert res.headers["Location"].endswith("/sword/deposit/{}".format(deposit_id))
+    assert open(package_path, "rb").read() == make_zip().read()
+    mock_touch.assert_called_once_with(
+        os.path.dirname(package_path),
+        app.config["WEKO_SWORDSERVER_DEPOSIT_QUEUED_MAX_IDLE"])
+
+    # status of the queued deposit
+    res = client.get(res.headers["Location"], headers={"Authorization":"Bearer {}".format(token)})
+    assert res.status_code == 200
+    assert json.loads(res.data)["state"][0]["@id"] == "http://purl.org/net/sword/3.0/state/accepted"
+
+
+# def post_staging():
+# def post_segment(upload_id):
+# def get_staging(upload_id):
+# .tox/c1/bin/pytest --cov=weko_swordserver tests/test_views.py::test_segmented_upload -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
+def test_segmented_upload(app,client,db,users,tokens,make_zip,mocker):
+    login_user_via_session(client=client,email=users[0]["email"])
+    token=tokens["token"].access_token
+    auth = {"Authorization":"Bearer {}".format(token)}
+    package = make_zip().read()
+    segment_size = len(package) // 2 + 1
+
+    # init
+    headers = dict(auth, **{"Content-Disposition":"segment-init; size={}; segment_count=2; segment_size={}".format(len(package), segment_size)})
+    res = client.post(url_for("weko_swordserver.post_staging"), headers=headers)
+    assert res.status_code == 201
+    temporary_url = res.headers["Location"]
+    assert json.loads(res.data)["segments"]["expecting"] == [1, 2]
+
+    # upload segments
+    for number, segment in ((2, package[segment_size:]), (1, package[:segment_size])):
+        headers = dict(auth, **{"Content-Disposition":"upload; segment_number={}".format(number)})
+        res = client.post(temporary_url, data=segment, content_type="application/octet-stream", headers=headers)
+        assert res.status_code == 204
+    res = client.get(temporary_url, headers=auth)
+    assert json.loads(res.data)["segments"]["received"] == [1, 2]
+
+    # unexpected segment
+    headers = dict(auth, **{"Content-Disposition":"upload; segment_number=3"})
+    res = client.post(temporary_url, data=b"x", content_type="application/octet-stream", headers=headers)
+    assert res.status_code == 400
+
+    # deposit the assembled package
+    packages = []
+    def _import_package(path, request_info=None):
+        packages.append(open(path, "rb").read())
+        return "1"
+    mocker.patch("weko_swordserver.views._import_package", side_effect=_import_package)
+    mocker.patch("weko_swordserver.views._get_status_document",side_effect=lambda x:{"recid":x})
+    body = {
+        "@type": "ByReference",
+        "byReferenceFiles": [{
+            "@id": temporary_url,
+            "contentDisposition": "attachment; filename=payload.zip",
+            "contentType": "application/zip",
+        }]
+    }
+    res = client.post(url_for("weko_swordserver.post_service_document"),
+                      data=json.dumps(body), content_type="application/ld+json", headers=auth)
+    assert res.status_code == 200
+    assert json.loads(res.data) == {"recid":"1"}
+    assert packages == [package]
+
+    # staged upload is consumed
+    res = client.get(temporary_url, headers=auth)
+    assert res.status_code == 404
+
+
 # def get_status_document(recid):
 # .tox/c1/bin/pytest --cov=weko_swordserver tests/test_views.py::test__get_status_document -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-swordserver/.tox/c1/tmp
 def test_get_status_document(client, users, tokens):
@@ -90,4 +90,28 @@ WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_ASSEMBLED_SIZE = 30000000000000
 """ Maximum size in bytes as an integer for files being uploaded. """
 
 WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_SEGMENTS = 1000
-""" Maximum number of segments that the server will accept for a single segmented upload, if segmented upload is supported. """
\ No newline at end of file
+""" Maximum number of segments that the server will accept for a single segmented upload, if segmented upload is supported. """
+WEKO_SWORDSERVER_DEPOSIT_ASYNC = False
+""" Queue every deposit for import and respond with 202 Accepted.
+
+    Clients can also request a queued deposit with the header
+    "Prefer: respond-async".
+"""
+
+WEKO_SWORDSERVER_DEPOSIT_TMP_DIR = None
+""" Directory where packages and segments are stored before import. The system temporary directory if None. It must be shared with the celery workers. """
+
+WEKO_SWORDSERVER_DEPOSIT_TMP_PREFIX = 'weko_sword_'
+""" Prefix of the temporary directories of packages and segments. """
+
+WEKO_SWORDSERVER_DEPOSIT_QUEUED_MAX_IDLE = 7 * 24 * 60 * 60
+""" Seconds a queued package is kept while it waits for the import task. """
+
+WEKO_SWORDSERVER_DEPOSIT_CHUNK_SIZE = 1024 * 1024
+""" Size in bytes of the chunks packages and segments are streamed to disk with. """
+
+WEKO_SWORDSERVER_DEPOSIT_STATUS_KEY = 'weko_swordserver_deposit_status_{0}'
+""" Cache key of the status of a queued deposit. """
+
+WEKO_SWORDSERVER_DEPOSIT_STATUS_TIMEOUT = 7 * 24 * 60 * 60
+""" Seconds the status of a queued deposit is kept. """
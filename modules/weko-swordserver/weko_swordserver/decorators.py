@@ -59,6 +59,10 @@ def check_package_contents():
     def wrapper(f):
         @wraps(f)
         def decorated(*args, **kwargs):
+            # Segments of a segmented upload are checked when uploaded
+            if request.mimetype == 'application/ld+json':
+                return f(*args, **kwargs)
+
             if 'file' not in request.files:
                 raise WekoSwordserverException("No file part.", ErrorType.ContentMalformed)
             file = request.files['file']
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 National Institute of Informatics.
+#
+# WEKO-SWORDServer is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Celery tasks of weko-swordserver."""
+
+import os
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from flask import current_app
+from invenio_db import db
+
+from .errors import WekoSwordserverException
+from .utils import remove_deposit_tmp_dir, set_deposit_status
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def import_deposit(deposit_id, package_path, host_url, request_info):
+    """Import a queued deposit and record its state.
+
+    :param deposit_id: Deposit identifier.
+    :param package_path: Path of the package saved by the request.
+    :param host_url: Host URL of the request.
+    :param request_info: Information of the request for the import.
+    """
+    from .views import SwordState, _import_package
+
+    set_deposit_status(deposit_id, SwordState.inProgress)
+    try:
+        with current_app.test_request_context(host_url):
+            recid = _import_package(package_path, request_info)
+        db.session.commit()
+        set_deposit_status(deposit_id, SwordState.ingested, recid=recid)
+    except WekoSwordserverException as ex:
+        db.session.rollback()
+        logger.error(ex.message)
+        set_deposit_status(deposit_id, SwordState.rejected, error=ex.message)
+    except Exception as ex:
+        db.session.rollback()
+        logger.error(ex)
+        set_deposit_status(deposit_id, SwordState.rejected,
+                           error="Internal Server Error")
+    finally:
+        remove_deposit_tmp_dir(os.path.dirname(package_path))
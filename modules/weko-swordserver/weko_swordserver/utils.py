@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 National Institute of Informatics.
+#
+# WEKO-SWORDServer is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Utilities for queued and segmented deposits."""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app, request
+from flask_login import current_user
+from invenio_cache import current_cache
+from weko_admin.api import TempDirInfo
+
+from .errors import ErrorType, WekoSwordserverException
+
+_SEGMENT_FILE = re.compile(r'^segment_(\d+)$')
+
+
+def get_deposit_tmp_dir(name):
+    """Create a temporary directory for a package or a segmented upload.
+
+    The directory is registered to TempDirInfo so that it is removed when
+    it is abandoned.
+
+    :param name: Directory name.
+    :returns: Path of the directory.
+    """
+    path = os.path.join(
+        current_app.config['WEKO_SWORDSERVER_DEPOSIT_TMP_DIR']
+        or tempfile.gettempdir(),
+        current_app.config['WEKO_SWORDSERVER_DEPOSIT_TMP_PREFIX'] + name)
+    os.makedirs(path, exist_ok=True)
+    touch_deposit_tmp_dir(path)
+    return path
+
+
+def touch_deposit_tmp_dir(path, max_idle=None):
+    """Extend the expiry of a directory created by get_deposit_tmp_dir.
+
+    :param path: Path of the directory.
+    :param max_idle: Seconds the directory is kept from now.
+        WEKO_SWORDSERVER_SERVICEDOCUMENT_STAGING_MAX_IDLE if None.
+    """
+    if max_idle is None:
+        max_idle = current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_STAGING_MAX_IDLE']
+    expire = datetime.now() + timedelta(seconds=max_idle)
+    TempDirInfo().set(path, {"expire": expire.strftime("%Y-%m-%d %H:%M:%S")})
+
+
+def remove_deposit_tmp_dir(path):
+    """Remove a directory created by get_deposit_tmp_dir.
+
+    :param path: Path of the directory.
+    """
+    shutil.rmtree(path, ignore_errors=True)
+    TempDirInfo().delete(path)
+
+
+def save_package(file, filename):
+    """Stream an uploaded package to disk.
+
+    :param file: :class:`werkzeug.datastructures.FileStorage` of the package.
+    :param filename: File name of the package.
+    :returns: Path of the saved package.
+    """
+    path = os.path.join(get_deposit_tmp_dir(uuid.uuid4().hex),
+                        os.path.basename(filename))
+    file.save(path, buffer_size=current_app.config['WEKO_SWORDSERVER_DEPOSIT_CHUNK_SIZE'])
+    return path
+
+
+def get_deposit_status(deposit_id):
+    """Get the status of a queued deposit.
+
+    :param deposit_id: Deposit identifier.
+    :returns: Dict with ``state`` and optionally ``recid`` or ``error``,
+        or None if the deposit is not known.
+    """
+    return current_cache.get(
+        current_app.config['WEKO_SWORDSERVER_DEPOSIT_STATUS_KEY'].format(deposit_id))
+
+
+def set_deposit_status(deposit_id, state, **kwargs):
+    """Set the status of a queued deposit.
+
+    :param deposit_id: Deposit identifier.
+    :param state: SWORD state URI.
+    :param kwargs: ``recid`` once ingested, ``error`` once rejected.
+    """
+    status = dict(state=state, updated=datetime.now().strftime("%Y-%m-%dT%H:%M:%SZ"))
+    status.update(kwargs)
+    current_cache.set(
+        current_app.config['WEKO_SWORDSERVER_DEPOSIT_STATUS_KEY'].format(deposit_id),
+        status,
+        timeout=current_app.config['WEKO_SWORDSERVER_DEPOSIT_STATUS_TIMEOUT'])
+    return status
+
+
+def _get_segment_dir(upload_id):
+    path = os.path.join(
+        current_app.config['WEKO_SWORDSERVER_DEPOSIT_TMP_DIR']
+        or tempfile.gettempdir(),
+        current_app.config['WEKO_SWORDSERVER_DEPOSIT_TMP_PREFIX'] + 'segment_' + upload_id)
+    if not upload_id.isalnum() or not os.path.isdir(path):
+        raise WekoSwordserverException(
+            "Segmented upload not found. (id={})".format(upload_id), ErrorType.NotFound)
+    return path
+
+
+def _get_upload_owner():
+    oauth = getattr(request, 'oauth', None)
+    client = getattr(oauth, 'client', None)
+    return dict(client_id=getattr(client, 'client_id', None),
+                user_id=current_user.get_id())
+
+
+def get_segmented_upload(upload_id):
+    """Get the state of a segmented upload of the requesting client.
+
+    :param upload_id: Segmented upload identifier.
+    :returns: Dict with ``size``, ``segment_count``, ``segment_size``
+        and ``received`` segment numbers.
+    """
+    segment_dir = _get_segment_dir(upload_id)
+    with open(os.path.join(segment_dir, 'segments.json')) as f:
+        info = json.load(f)
+    if info.pop('owner', None) != _get_upload_owner():
+        raise WekoSwordserverException(
+            "Segmented upload not found. (id={})".format(upload_id), ErrorType.NotFound)
+    info['received'] = sorted(
+        int(match.group(1))
+        for match in map(_SEGMENT_FILE.match, os.listdir(segment_dir))
+        if match)
+    return info
+
+
+def init_segmented_upload(size, segment_count, segment_size):
+    """Start a segmented upload.
+
+    :param size: Size in bytes of the assembled file.
+    :param segment_count: Number of segments.
+    :param segment_size: Size in bytes of every segment but the last.
+    :returns: Segmented upload identifier.
+    """
+    if segment_count > current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_SEGMENTS']:
+        raise WekoSwordserverException(
+            "Too many segments. (segment_count:{}, maxSegments:{})".format(
+                segment_count,
+                current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_SEGMENTS']),
+            ErrorType.SegmentLimitExceeded)
+    if size > current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_ASSEMBLED_SIZE']:
+        raise WekoSwordserverException(
+            "Assembled size is too large. (size:{}, maxAssembledSize:{})".format(
+                size,
+                current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_ASSEMBLED_SIZE']),
+            ErrorType.MaxAssembledSizeExceeded)
+    if segment_count < 1 or segment_size < 1 \
+            or (segment_count - 1) * segment_size >= size \
+            or segment_count * segment_size < size:
+        raise WekoSwordserverException(
+            "Segment size does not match the assembled size.",
+            ErrorType.InvalidSegmentSize)
+
+    upload_id = uuid.uuid4().hex
+    path = get_deposit_tmp_dir('segment_' + upload_id)
+    with open(os.path.join(path, 'segments.json'), 'w') as f:
+        json.dump(dict(size=size, segment_count=segment_count,
+                       segment_size=segment_size, owner=_get_upload_owner()), f)
+    return upload_id
+
+
+def store_segment(upload_id, segment_number, stream):
+    """Stream one segment of a segmented upload to disk.
+
+    :param upload_id: Segmented upload identifier.
+    :param segment_number: Segment number, starting from 1.
+    :param stream: Readable stream of the segment.
+    """
+    info = get_segmented_upload(upload_id)
+    if segment_number < 1 or segment_number > info['segment_count'] \
+            or segment_number in info['received']:
+        raise WekoSwordserverException(
+            "Unexpected segment. (segment_number:{})".format(segment_number),
+            ErrorType.UnexpectedSegment)
+    if segment_number < info['segment_count']:
+        expected = info['segment_size']
+    else:
+        expected = info['size'] - info['segment_size'] * (info['segment_count'] - 1)
+
+    segment_dir = _get_segment_dir(upload_id)
+    path = os.path.join(segment_dir, 'segment_{}'.format(segment_number))
+    chunk_size = current_app.config['WEKO_SWORDSERVER_DEPOSIT_CHUNK_SIZE']
+    written = 0
+    with open(path + '.part', 'wb') as f:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > expected:
+                break
+            f.write(chunk)
+    if written != expected:
+        os.remove(path + '.part')
+        raise WekoSwordserverException(
+            "Invalid segment size. (segment_number:{}, expected:{})".format(
+                segment_number, expected),
+            ErrorType.InvalidSegmentSize)
+    os.rename(path + '.part', path)
+    touch_deposit_tmp_dir(segment_dir)
+
+
+def assemble_segments(upload_id, filename):
+    """Assemble a completed segmented upload into a package.
+
+    :param upload_id: Segmented upload identifier.
+    :param filename: File name of the package.
+    :returns: Path of the assembled package.
+    """
+    info = get_segmented_upload(upload_id)
+    if len(info['received']) != info['segment_count']:
+        raise WekoSwordserverException(
+            "Segmented upload is not complete. (received:{}, segment_count:{})".format(
+                len(info['received']), info['segment_count']),
+            ErrorType.BadRequest)
+
+    segment_dir = _get_segment_dir(upload_id)
+    path = os.path.join(get_deposit_tmp_dir(uuid.uuid4().hex),
+                        os.path.basename(filename))
+    chunk_size = current_app.config['WEKO_SWORDSERVER_DEPOSIT_CHUNK_SIZE']
+    with open(path, 'wb') as package:
+        for number in range(1, info['segment_count'] + 1):
+            with open(os.path.join(segment_dir, 'segment_{}'.format(number)), 'rb') as f:
+                shutil.copyfileobj(f, package, chunk_size)
+    remove_deposit_tmp_dir(segment_dir)
+    return path
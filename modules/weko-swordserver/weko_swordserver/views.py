@@ -10,7 +10,9 @@
 from __future__ import absolute_import, print_function
 
 from datetime import datetime, timedelta
+import os
 import shutil
+import uuid
 
 import sword3common
 from flask import Blueprint, current_app, jsonify, request, url_for
@@ -26,6 +28,10 @@ from invenio_db import db
 
 from .decorators import *
 from .errors import *
+from .tasks import import_deposit
+from .utils import assemble_segments, get_deposit_status, \
+    get_segmented_upload, init_segmented_upload, remove_deposit_tmp_dir, \
+    save_package, set_deposit_status, store_segment, touch_deposit_tmp_dir
 
 
 class SwordState:
@@ -106,7 +112,8 @@ def get_service_document():
         "maxUploadSize": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_MAX_UPLOAD_SIZE'],
         "onBehalfOf": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_ON_BEHALF_OF'],
         "services": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_SERVICES'],
-        "staging": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_STAGING'],
+        "staging": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_STAGING']
+            or url_for('weko_swordserver.post_staging', _external=True),
         "stagingMaxIdle": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_STAGING_MAX_IDLE'],
         "treatment": current_app.config['WEKO_SWORDSERVER_SERVICEDOCUMENT_TREATMENT'],
     }
@@ -163,27 +170,99 @@ def post_service_document():
         * If the Packaging header does not match the format found in the body content, SHOULD return 415 (FormatHeaderMismatch). Note that the server may not be able to inspect the package during the request-response, so MAY NOT return this response.
     """
     
+    if request.mimetype == 'application/ld+json':
+        # Deposit of a completed segmented upload
+        package_path = _get_segmented_package()
+    else:
+        """
+        Check content-disposition
+            Request format:
+                Content-Disposition	attachment; filename=[filename]
+        """
+        content_disposition, content_disposition_options = parse_options_header(
+                request.headers.get("Content-Disposition") or ""
+            )
+        if content_disposition != "attachment" or not content_disposition_options.get('filename'):
+            raise WekoSwordserverException("Cannot get filename by Content-Disposition.", ErrorType.BadRequest)
+        filename = content_disposition_options.get('filename')
+
+        file = None
+        for key, value in request.files.items():
+            if value.filename == filename:
+                file = value
+        if file is None:
+            raise WekoSwordserverException("Not found {0} in request body.".format(filename), ErrorType.BadRequest)
+        package_path = save_package(file, filename)
+
+    if _is_async_deposit():
+        # Queue the import and let the client poll the status document
+        request_info = {
+            "remote_addr": request.remote_addr,
+            "referrer": request.referrer,
+            "hostname": request.host,
+        }
+        deposit_id = uuid.uuid4().hex
+        status = set_deposit_status(deposit_id, SwordState.accepted)
+        # Keep the package until the worker picks it up
+        touch_deposit_tmp_dir(
+            os.path.dirname(package_path),
+            current_app.config['WEKO_SWORDSERVER_DEPOSIT_QUEUED_MAX_IDLE'])
+        import_deposit.apply_async(
+            args=(deposit_id, package_path, request.host_url, request_info))
+
+        response = jsonify(_get_deposit_status_document(deposit_id, status))
+        response.status_code = 202
+        response.headers['Location'] = url_for(
+            'weko_swordserver.get_status_document', recid=deposit_id, _external=True)
+        return response
+
+    try:
+        recid = _import_package(package_path)
+    finally:
+        remove_deposit_tmp_dir(os.path.dirname(package_path))
+
+    return jsonify(_get_status_document(recid))
+
+
+def _is_async_deposit():
+    """Check whether the deposit is queued for import."""
+    prefer = [x.strip() for x in request.headers.get("Prefer", "").split(",")]
+    return current_app.config['WEKO_SWORDSERVER_DEPOSIT_ASYNC'] \
+        or "respond-async" in prefer
+
+
+def _get_segmented_package():
+    """Assemble the segmented upload referenced by a By-Reference deposit.
+
+    :returns: Path of the assembled package.
     """
-    Check content-disposition
-        Request format:
-            Content-Disposition	attachment; filename=[filename]
-    """
+    data = request.get_json(silent=True) or {}
+    files = data.get("byReferenceFiles") or []
+    if len(files) != 1:
+        raise WekoSwordserverException("Deposit exactly one file.", ErrorType.ContentMalformed)
+
+    staging_url = url_for('weko_swordserver.post_staging', _external=True) + "/"
+    file_url = files[0].get("@id") or ""
+    if not file_url.startswith(staging_url):
+        raise WekoSwordserverException("Not support By-Reference deposit.", ErrorType.ByReferenceNotAllowed)
+
     content_disposition, content_disposition_options = parse_options_header(
-            request.headers.get("Content-Disposition") or ""
+            files[0].get("contentDisposition") or ""
         )
     if content_disposition != "attachment" or not content_disposition_options.get('filename'):
-        raise WekoSwordserverException("Cannot get filename by Content-Disposition.", ErrorType.BadRequest)
-    filename = content_disposition_options.get('filename')
-
-    # Check import item
-    file = None
-    for key, value in request.files.items():
-        if value.filename == filename:
-            file = value
-    if file is None:
-        raise WekoSwordserverException("Not found {0} in request body.".format(filename), ErrorType.BadRequest)
-
-    check_result = check_import_items(file, False)
+        raise WekoSwordserverException("Cannot get filename by contentDisposition.", ErrorType.BadRequest)
+    return assemble_segments(file_url[len(staging_url):].strip("/"),
+                             content_disposition_options.get('filename'))
+
+
+def _import_package(package_path, request_info=None):
+    """Check the package and import its item.
+
+    :param package_path: Path of the package.
+    :param request_info: Information of the request for the import.
+    :returns: Record Identifier of the imported item.
+    """
+    check_result = check_import_items(package_path, False)
     item = check_result.get('list_record')[0] if check_result.get('list_record') else None
     if check_result.get('error') or not item or item.get('errors'):
         errorType = None
@@ -199,24 +278,107 @@ def post_service_document():
             check_result_msg = 'item_missing'
         raise WekoSwordserverException('Error in check_import_items: {0}'.format(check_result_msg), errorType)
     if item.get('status') != 'new':
-        raise WekoSwordserverException('This item is already registered: {0]'.format(item.get('item_title')), ErrorType.BadRequest)
+        raise WekoSwordserverException('This item is already registered: {0}'.format(item.get('item_title')), ErrorType.BadRequest)
 
     data_path = check_result.get("data_path","")
     expire = datetime.now() + timedelta(days=1)
     TempDirInfo().set(data_path, {"expire": expire.strftime("%Y-%m-%d %H:%M:%S")})
     item["root_path"] = data_path+"/data"
-    
+
     # import item
-    import_result = import_items_to_system(item, None)
+    import_result = import_items_to_system(item, request_info)
     if not import_result.get('success'):
         raise WekoSwordserverException('Error in import_items_to_system: {0}'.format(item.get('error_id')), ErrorType.ServerError)
-    
+
     shutil.rmtree(data_path)
     TempDirInfo().delete(data_path)
-    
-    recid = import_result.get('recid')
 
-    return jsonify(_get_status_document(recid))
+    return import_result.get('recid')
+
+
+@blueprint.route("/staging", methods=['POST'])
+@check_oauth(write_scope.id)
+@check_on_behalf_of()
+def post_staging():
+    """
+    Initialise a Segmented File Upload.
+
+    Request format:
+        Content-Disposition	segment-init; size=[size]; segment_count=[count]; segment_size=[size]
+    The response Location header is the Temporary-URL the segments are sent to.
+    """
+    content_disposition, content_disposition_options = parse_options_header(
+            request.headers.get("Content-Disposition") or ""
+        )
+    if content_disposition != "segment-init":
+        raise WekoSwordserverException("Content-Disposition must be segment-init.", ErrorType.BadRequest)
+    try:
+        size = int(content_disposition_options['size'])
+        segment_count = int(content_disposition_options['segment_count'])
+        segment_size = int(content_disposition_options['segment_size'])
+    except (KeyError, ValueError):
+        raise WekoSwordserverException("Cannot get segment size by Content-Disposition.", ErrorType.ContentMalformed)
+
+    upload_id = init_segmented_upload(size, segment_count, segment_size)
+
+    response = jsonify(_get_temporary_document(upload_id))
+    response.status_code = 201
+    response.headers['Location'] = url_for(
+        'weko_swordserver.get_staging', upload_id=upload_id, _external=True)
+    return response
+
+
+@blueprint.route("/staging/<upload_id>", methods=['GET'])
+@check_oauth()
+@check_on_behalf_of()
+def get_staging(upload_id):
+    """Get the state of a Segmented File Upload."""
+    return jsonify(_get_temporary_document(upload_id))
+
+
+@blueprint.route("/staging/<upload_id>", methods=['POST'])
+@check_oauth(write_scope.id)
+@check_on_behalf_of()
+def post_segment(upload_id):
+    """
+    Upload one segment of a Segmented File Upload.
+
+    Request format:
+        Content-Disposition	upload; segment_number=[number]
+    The segment is streamed from the request body to disk.
+    """
+    content_disposition, content_disposition_options = parse_options_header(
+            request.headers.get("Content-Disposition") or ""
+        )
+    if content_disposition != "upload":
+        raise WekoSwordserverException("Content-Disposition must be upload.", ErrorType.BadRequest)
+    try:
+        segment_number = int(content_disposition_options['segment_number'])
+    except (KeyError, ValueError):
+        raise WekoSwordserverException("Cannot get segment_number by Content-Disposition.", ErrorType.ContentMalformed)
+
+    store_segment(upload_id, segment_number, request.stream)
+    return ('', 204)
+
+
+def _get_temporary_document(upload_id):
+    """
+    :param upload_id: Segmented upload identifier.
+    :returns: The state of the Segmented File Upload.
+    """
+    info = get_segmented_upload(upload_id)
+    return {
+        "@context": constants.JSON_LD_CONTEXT,
+        "@id": url_for('weko_swordserver.get_staging', upload_id=upload_id, _external=True),
+        "@type": "Temporary",
+        "segments": {
+            "received": info['received'],
+            "expecting": [n for n in range(1, info['segment_count'] + 1)
+                          if n not in info['received']],
+            "size": info['size'],
+            "segment_size": info['segment_size'],
+        },
+    }
 
 
 @blueprint.route("/deposit/<recid>", methods=['GET'])
@@ -246,8 +408,14 @@ def get_status_document(recid):
         * If the server does not allow this method in this context at this time, MAY respond with a 405 (MethodNotAllowed)
         * If the server does not support On-Behalf-Of deposit and the On-Behalf-Of header has been provided, MAY respond with a 412 (OnBehalfOfNotAllowed)
     """
-    # Get status document
-    status_document = _get_status_document(recid)
+    # Get status document, or the state of a queued deposit
+    status = get_deposit_status(recid)
+    if status is None:
+        status_document = _get_status_document(recid)
+    elif status.get('recid'):
+        status_document = _get_status_document(status.get('recid'))
+    else:
+        status_document = _get_deposit_status_document(recid, status)
 
     return jsonify(status_document)
 
@@ -336,6 +504,44 @@ def _get_status_document(recid):
 
     return statusDocument.data
 
+def _get_deposit_status_document(deposit_id, status):
+    """
+    :param deposit_id: Deposit identifier of a queued deposit.
+    :param status: State of the queued deposit.
+    :returns: A :class:`sword3common.StatusDocument` instance.
+    """
+    raw_data = {
+        "@context": constants.JSON_LD_CONTEXT,
+        "@type": constants.DocumentType.Status[0],
+        "@id" : url_for('weko_swordserver.get_status_document', recid=deposit_id, _external=True),
+        "actions" : {
+            "getMetadata" : False,
+            "getFiles" : False,
+            "appendMetadata" : False,
+            "appendFiles" : False,
+            "replaceMetadata" : False,
+            "replaceFiles" : False,
+            "deleteMetadata" : False,
+            "deleteFiles" : False,
+            "deleteObject" : False,
+        },
+        "eTag" : status.get('updated', ''),
+        "fileSet" : {},
+        "metadata" : {},
+        "service" : url_for('weko_swordserver.get_service_document'),
+        "state" : [
+            {
+                "@id" : status.get('state'),
+                "description" : status.get('error', '')
+            }
+        ],
+        "links" : []
+    }
+
+    statusDocument = StatusDocument(raw=raw_data)
+
+    return statusDocument.data
+
 @blueprint.route("/deposit/<recid>", methods=['DELETE'])
 @check_oauth()
 @check_on_behalf_of()
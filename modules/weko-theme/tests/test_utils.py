@@ -72,7 +72,7 @@ def test_get_init_display_setting(i18n_app, users, client_request_args, communit
         ranking_settings.statistical_period = "9999"
         ranking_settings.is_show = True
         with patch('weko_theme.utils.RankingSettings.get', return_value=ranking_settings):
-            with patch('weko_items_ui.utils.get_ranking', return_value="get_ranking"):
+            with patch('weko_items_ui.utils.get_ranking_snapshot', return_value="get_ranking"):
                 search_setting.init_disp_setting["init_disp_screen_setting"] = "1"
                 assert isinstance(test.get_init_display_setting(), dict)
         
@@ -70,22 +70,24 @@ def get_weko_contents(getargs):
     detail_condition = get_search_detail_keyword('')
     check_site_license_permission()
 
+    display_control = get_search_setting().get("display_control", {})
+
     # Get Facet search setting.
-    display_facet_search = get_search_setting().get("display_control", {}).get(
+    display_facet_search = display_control.get(
         'display_facet_search', {}).get('status', False)
     ctx.update({
         "display_facet_search": display_facet_search
     })
 
     # Get display_index_tree setting.
-    display_index_tree = get_search_setting().get("display_control", {}).get(
+    display_index_tree = display_control.get(
         'display_index_tree', {}).get('status', False)
     ctx.update({
         "display_index_tree": display_index_tree
     })
 
     # Get display_community setting.
-    display_community = get_search_setting().get("display_control", {}).get(
+    display_community = display_control.get(
         'display_community', {}).get('status', False)
     ctx.update({
         "display_community": display_community
@@ -233,7 +235,7 @@ class MainScreenInitDisplaySetting:
 
     @classmethod
     def __ranking(cls, main_screen_display_setting):
-        from weko_items_ui.utils import get_ranking
+        from weko_items_ui.utils import get_ranking_snapshot
 
         ranking_settings = RankingSettings.get()
         # get statistical period
@@ -243,7 +245,7 @@ class MainScreenInitDisplaySetting:
         if ranking_settings:
             start_date = end_date - timedelta(
                 days=int(ranking_settings.statistical_period))
-            main_screen_display_setting['rankings'] = get_ranking(
+            main_screen_display_setting['rankings'] = get_ranking_snapshot(
                 ranking_settings)
             is_show = ranking_settings.is_show
         main_screen_display_setting['is_show'] = is_show
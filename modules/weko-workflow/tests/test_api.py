@@ -1,3 +1,4 @@
+import pytest
 from flask_login.utils import login_user
 
 from weko_workflow.api import Flow, WorkActivity
@@ -88,6 +89,139 @@ def test_WorkActivity_get_all_activity_list(app, client, users, db_register):
         assert len(activities) == 13
 
 
+# .tox/c1/bin/pytest --cov=weko_workflow tests/test_api.py::test_WorkActivity_get_new_activity_id -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-workflow/.tox/c1/tmp
+def test_WorkActivity_get_new_activity_id(app, db):
+    from datetime import datetime, timedelta
+    from weko_workflow.api import _activity_id_block
+    from weko_workflow.models import ActivityCount
+    _activity_id_block['date'] = None
+    today = datetime.utcnow()
+    db.session.add(ActivityCount(date=(today - timedelta(days=1)).date(),
+                                 activity_count=10))
+    db.session.commit()
+
+    activity = WorkActivity()
+    assert activity.get_new_activity_id() == \
+        'A-{}-00001'.format(today.strftime("%Y%m%d"))
+    assert activity.get_new_activity_id() == \
+        'A-{}-00002'.format(today.strftime("%Y%m%d"))
+    # the previous days are dropped
+    db.session.expire_all()
+    assert [c.date for c in ActivityCount.query.all()] == [today.date()]
+
+    # numbers are served from the reserved block
+    app.config.update(WEKO_WORKFLOW_ACTIVITY_ID_BLOCK_SIZE=10)
+    _activity_id_block['numbers'].clear()
+    assert activity.get_new_activity_id().endswith('-00003')
+    assert activity.get_new_activity_id().endswith('-00004')
+    db.session.expire_all()
+    assert ActivityCount.query.one().activity_count == 12
+
+    app.config.update(WEKO_WORKFLOW_ACTIVITY_ID_BLOCK_SIZE=1,
+                      WEKO_WORKFLOW_MAX_ACTIVITY_ID=12)
+    _activity_id_block['numbers'].clear()
+    with pytest.raises(IndexError):
+        activity.get_new_activity_id()
+    app.config.update(WEKO_WORKFLOW_MAX_ACTIVITY_ID=99999)
+    _activity_id_block['date'] = None
+
+
+# .tox/c1/bin/pytest --cov=weko_workflow tests/test_api.py::test_WorkActivity_get_new_activity_id_concurrency -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-workflow/.tox/c1/tmp
+def test_WorkActivity_get_new_activity_id_concurrency(app, db):
+    import threading
+    from weko_workflow.api import _activity_id_block
+    _activity_id_block['date'] = None
+    workers, per_worker = 8, 25
+    activity_ids = []
+    errors = []
+
+    # a registration keeps its transaction open after taking an id
+    activity = WorkActivity()
+    activity_ids.append(activity.get_new_activity_id())
+    db.session.execute('SELECT 1')
+
+    def register():
+        with app.app_context():
+            try:
+                for _ in range(per_worker):
+                    activity_ids.append(WorkActivity().get_new_activity_id())
+                    # each registration runs in its own open transaction
+                    db.session.execute('SELECT 1')
+                    db.session.rollback()
+            except Exception as ex:
+                errors.append(ex)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=register) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        # nothing waits for the open transaction of the main thread
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+    db.session.rollback()
+
+    assert not errors
+    assert len(activity_ids) == workers * per_worker + 1
+    assert len(set(activity_ids)) == len(activity_ids)
+    _activity_id_block['date'] = None
+
+
+# .tox/c1/bin/pytest --cov=weko_workflow tests/test_api.py::test_WorkActivity_get_activity_list_pages -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-workflow/.tox/c1/tmp
+def test_WorkActivity_get_activity_list_pages(app, client, users, db_register):
+    with app.test_request_context():
+        login_user(users[2]["obj"])
+        activity = WorkActivity()
+        conditions = {'tab': ['all'], 'sizeall': ['5']}
+        activities, max_page, size, page, name_param = \
+            activity.get_activity_list(conditions=conditions)
+        ids = [a.id for a in activities]
+        assert len(ids) == 5
+        assert ids == sorted(ids, reverse=True)
+        assert max_page > 1
+
+        conditions['pagesall'] = ['2']
+        offset_page, _, _, page, _ = \
+            activity.get_activity_list(conditions=conditions)
+        assert page == '2'
+
+        # the next page link seeks from the last activity shown
+        conditions['cursorall'] = ['2_{}'.format(ids[-1])]
+        cursor_page, _, _, page, _ = \
+            activity.get_activity_list(conditions=conditions)
+        assert [a.id for a in cursor_page] == [a.id for a in offset_page]
+        assert all(a.id < ids[-1] for a in cursor_page)
+        assert hasattr(cursor_page[0], 'flows_name')
+
+
+# .tox/c1/bin/pytest --cov=weko_workflow tests/test_api.py::test_WorkActivity_get_page_cursor -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-workflow/.tox/c1/tmp
+def test_WorkActivity_get_page_cursor():
+    assert WorkActivity.get_page_cursor(None, '2') is None
+    assert WorkActivity.get_page_cursor('2_15', '2') == 15
+    assert WorkActivity.get_page_cursor('2_15', 2) == 15
+    # a cursor of another page is ignored
+    assert WorkActivity.get_page_cursor('2_15', '3') is None
+    assert WorkActivity.get_page_cursor('2_x', '2') is None
+    assert WorkActivity.get_page_cursor('15', '2') is None
+
+
+# .tox/c1/bin/pytest --cov=weko_workflow tests/test_api.py::test_WorkActivity_get_community_user_ids -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-workflow/.tox/c1/tmp
+def test_WorkActivity_get_community_user_ids(app, users):
+    from invenio_cache import current_cache
+    cache_key = app.config['WEKO_WORKFLOW_COMMUNITY_USER_IDS_CACHE_KEY']
+    current_cache.delete(cache_key)
+    activity = WorkActivity()
+    assert activity._WorkActivity__get_community_user_ids() == \
+        [users[3]["id"]]
+    assert current_cache.get(cache_key) == [users[3]["id"]]
+
+    # served from the cache
+    current_cache.set(cache_key, [1, 2])
+    assert activity._WorkActivity__get_community_user_ids() == [1, 2]
+    current_cache.delete(cache_key)
+
+
 # .tox/c1/bin/pytest --cov=weko_workflow tests/test_api.py::test_WorkActivity_get_activity_index_search -vv -s --cov-branch --cov-report=term --basetemp=/code/modules/weko-workflow/.tox/c1/tmp
 def test_WorkActivity_get_activity_index_search(app, db_register):
     activity = WorkActivity()
@@ -21,16 +21,20 @@
 """WEKO3 module docstring."""
 
 import math
+import threading
 import urllib.parse
 import uuid
+from collections import deque
 from datetime import date,datetime, timedelta
 
 from flask import abort, current_app, request, session, url_for
 from flask_login import current_user
 from invenio_accounts.models import Role, User, userrole
+from invenio_cache import current_cache
 from invenio_db import db
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
-from sqlalchemy import and_, asc, desc, func, or_
+from sqlalchemy import and_, asc, desc, distinct, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.exc import NoResultFound
 from weko_deposit.api import WekoDeposit
@@ -52,6 +56,11 @@ from .models import WorkFlow as _WorkFlow
 from .models import WorkflowRole
 from .models import ActivityCount
 
+_activity_id_block = {'date': None, 'numbers': deque()}
+"""Activity numbers reserved by this process for the day."""
+
+_activity_id_lock = threading.Lock()
+
 
 class Flow(object):
     """Operated on the Flow."""
@@ -781,41 +790,25 @@ class WorkActivity(object):
     def get_new_activity_id(self):
         """Get new an activity ID.
 
+        Numbers are taken from a block reserved for this process, so the
+        activity count is not locked until the registration commits.
+
         :return: activity ID.
         """
-        number = 1
-        try:
-            # Table lock for calculate new activity id
-            if db.get_engine().driver!='pysqlite':
-                db.session.execute(
-                    'LOCK TABLE ' + ActivityCount.__tablename__ + ' IN EXCLUSIVE MODE')
-
-            # Calculate activity_id based on id
-            utc_now = datetime.utcnow()
-            current_date = utc_now.strftime("%Y-%m-%d")       
-            today_count = ActivityCount.query.filter_by(date=current_date).one_or_none()
-            # Cannot use '.with_for_update()'. FOR UPDATE is not allowed 
-            # with aggregate functions
-
-            if today_count:
-                # Calculate aid
-                number = today_count.activity_count + 1
-                if number > current_app.config['WEKO_WORKFLOW_MAX_ACTIVITY_ID']:
-                    raise IndexError('The number is out of range \
-                        (maximum is {}, current is {}'.format(current_app.config['WEKO_WORKFLOW_MAX_ACTIVITY_ID'],number))
-                today_count.activity_count = number          
-            else:
-                # The default activity Id of the current day
-                _activty_count = ActivityCount(date=current_date, activity_count=number)
-                db.session.add(_activty_count)
-                prev_counts = ActivityCount.query.filter(ActivityCount.date<current_date).all()
-                if prev_counts:
-                    for prev_count in prev_counts:
-                        db.session.delete(prev_count)
-        except SQLAlchemyError as ex:
-            raise ex
-        except IndexError as ex:
-            raise ex          
+        utc_now = datetime.utcnow()
+        current_date = utc_now.date()
+        with _activity_id_lock:
+            numbers = _activity_id_block['numbers']
+            if _activity_id_block['date'] != current_date or not numbers:
+                numbers.clear()
+                numbers.extend(self.reserve_activity_numbers(
+                    current_date, current_app.config[
+                        'WEKO_WORKFLOW_ACTIVITY_ID_BLOCK_SIZE']))
+                _activity_id_block['date'] = current_date
+            number = numbers.popleft()
+        if number > current_app.config['WEKO_WORKFLOW_MAX_ACTIVITY_ID']:
+            raise IndexError('The number is out of range \
+                (maximum is {}, current is {}'.format(current_app.config['WEKO_WORKFLOW_MAX_ACTIVITY_ID'],number))
 
         # Activity Id's format
         activity_id_format = current_app.\
@@ -829,6 +822,49 @@ class WorkActivity(object):
             date_str,
             '{inc:05d}'.format(inc=number))
 
+    @staticmethod
+    def reserve_activity_numbers(current_date, size=1):
+        """Reserve a block of activity numbers of the day.
+
+        The count is incremented in its own transaction which commits at
+        once, concurrent registrations only wait for this statement.
+
+        :param current_date: date of the activity IDs.
+        :param size: count of numbers to reserve.
+        :return: range of the reserved numbers.
+        """
+        table = ActivityCount.__table__
+        with db.engine.begin() as conn:
+            if conn.dialect.name == 'postgresql':
+                stmt = pg_insert(table).values(
+                    date=current_date, activity_count=size)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.date],
+                    set_=dict(
+                        activity_count=table.c.activity_count + size,
+                        updated=datetime.utcnow()
+                    )
+                ).returning(table.c.activity_count)
+                last_number = conn.execute(stmt).scalar()
+            else:
+                last_number = conn.execute(
+                    select([table.c.activity_count]).where(
+                        table.c.date == current_date)).scalar()
+                if last_number is None:
+                    last_number = size
+                    conn.execute(table.insert().values(
+                        date=current_date, activity_count=last_number))
+                else:
+                    last_number += size
+                    conn.execute(table.update().where(
+                        table.c.date == current_date).values(
+                        activity_count=last_number))
+            if last_number == size:
+                # The first block of the day, drop the previous counts
+                conn.execute(table.delete().where(
+                    table.c.date < current_date))
+        return range(last_number - size + 1, last_number + 1)
+
     def upt_activity_agreement_step(self, activity_id, is_agree):
         """Update agreement step of activity.
 
@@ -1645,19 +1681,24 @@ class WorkActivity(object):
         return query
 
     @staticmethod
-    def __common_query_activity_list():
+    def __common_query_activity_list(with_columns=True):
         """Common query.
 
+        @param with_columns: select the columns shown on the list, otherwise
+            only the activity id for filtering, counting and paging.
         @return:
         """
         # select columns
-        common_query = db.session.query(
-            _Activity,
-            User.email,
-            _WorkFlow.flows_name,
-            _Action.action_name,
-            Role.name
-        )
+        if with_columns:
+            common_query = db.session.query(
+                _Activity,
+                User.email,
+                _WorkFlow.flows_name,
+                _Action.action_name,
+                Role.name
+            )
+        else:
+            common_query = db.session.query(_Activity.id)
 
         # query all activities
         common_query = common_query \
@@ -1684,10 +1725,13 @@ class WorkActivity(object):
                     and_(
                         _Activity.activity_login_user == User.id,
                     )
-                ) \
-                .outerjoin(
-                    userrole, and_(User.id == userrole.c.user_id)
-                ).outerjoin(Role, and_(userrole.c.role_id == Role.id))
+                )
+            # user roles are only shown, never filtered on
+            if with_columns:
+                common_query = common_query \
+                    .outerjoin(
+                        userrole, and_(User.id == userrole.c.user_id)
+                    ).outerjoin(Role, and_(userrole.c.role_id == Role.id))
         else:
             common_query = common_query \
                 .outerjoin(
@@ -1734,18 +1778,22 @@ class WorkActivity(object):
 
         @return:
         """
-        community_roles = current_app.config[
-            'WEKO_PERMISSION_ROLE_COMMUNITY']
-        community_user_ids = []
-        for role_name in community_roles:
-            community_users = User.query.outerjoin(userrole).outerjoin(Role) \
-                .filter(role_name == Role.name) \
-                .filter(userrole.c.role_id == Role.id) \
-                .filter(User.id == userrole.c.user_id) \
-                .all()
-            _tmp = [community_user.id for community_user in
-                    community_users]
-            community_user_ids.extend(_tmp)
+        cache_key = current_app.config[
+            'WEKO_WORKFLOW_COMMUNITY_USER_IDS_CACHE_KEY']
+        community_user_ids = current_cache.get(cache_key)
+        if community_user_ids is None:
+            community_roles = current_app.config[
+                'WEKO_PERMISSION_ROLE_COMMUNITY']
+            community_users = db.session.query(userrole.c.user_id) \
+                .join(Role, userrole.c.role_id == Role.id) \
+                .filter(Role.name.in_(community_roles)) \
+                .distinct().all()
+            community_user_ids = [community_user.user_id for community_user
+                                  in community_users]
+            current_cache.set(
+                cache_key, community_user_ids,
+                timeout=current_app.config[
+                    'WEKO_WORKFLOW_COMMUNITY_USER_IDS_CACHE_TTL'])
 
         return community_user_ids
 
@@ -1773,8 +1821,9 @@ class WorkActivity(object):
 
             activities = []
 
-            # query activities
-            query_action_activities = self.__common_query_activity_list()
+            # query activity ids, the columns are loaded for one page only
+            query_action_activities = self.__common_query_activity_list(
+                with_columns=False)
 
             # query activities by tab is wait
             if tab == WEKO_WORKFLOW_WAIT_TAB:
@@ -1830,19 +1879,41 @@ class WorkActivity(object):
                 size = current_app.config.get("WEKO_WORKFLOW_ACTIVITYLOG_BULK_MAX")
 
             # Count all result
-            count = query_action_activities.distinct(_Activity.id).count()
+            count = query_action_activities.with_entities(
+                func.count(distinct(_Activity.id))).scalar()
             max_page = math.ceil(count / int(size))
             name_param = ''
             if count > 0:
+                cursor = conditions.get('cursor' + tab)
                 name_param, page = self.__get_activity_list_per_page(
                     activities, max_page, name_param, page,
-                    query_action_activities, size, tab, is_get_all
+                    query_action_activities, size, tab, is_get_all,
+                    cursor[0] if cursor else None
                 )
             return activities, max_page, size, page, name_param
 
+    @staticmethod
+    def get_page_cursor(cursor, page):
+        """Get the last activity id shown before the page.
+
+        The cursor is sent as "<page>_<activity id>" by the next page link
+        and is ignored for any other page.
+
+        @param cursor:
+        @param page:
+        @return: activity id or None
+        """
+        if not cursor:
+            return None
+        cursor_page, _, last_id = str(cursor).partition('_')
+        if cursor_page != str(page) or not last_id.isnumeric():
+            return None
+        return int(last_id)
+
     def __get_activity_list_per_page(
         self, activities, max_page, name_param,
-        page, query_action_activities, size, tab, is_get_all=False
+        page, query_action_activities, size, tab, is_get_all=False,
+        cursor=None
     ):
         """Get activity list per page.
 
@@ -1850,22 +1921,38 @@ class WorkActivity(object):
         @param max_page:
         @param name_param:
         @param page:
-        @param query_action_activities:
+        @param query_action_activities: query of the filtered activity ids
         @param size:
         @param tab:
+        @param cursor: last activity id of the previous page
         @return:
         """
         if int(page) > max_page:
             page = 1
             name_param = 'pages' + tab
         offset = int(size) * (int(page) - 1)
+        # Get activity ids of the page
+        if is_get_all:
+            activity_ids = query_action_activities.subquery()
+        else:
+            query_action_activities = query_action_activities \
+                .distinct().order_by(desc(_Activity.id))
+            last_id = self.get_page_cursor(cursor, page)
+            if last_id:
+                # seek from the previous page instead of skipping rows
+                query_action_activities = query_action_activities \
+                    .filter(_Activity.id < last_id).limit(size)
+            else:
+                query_action_activities = query_action_activities.limit(
+                    size).offset(offset)
+            activity_ids = [activity.id for activity
+                            in query_action_activities.all()]
+            if not activity_ids:
+                return name_param, page
         # Get activities
-        query_action_activities = query_action_activities \
-            .distinct(_Activity.id).order_by(desc(_Activity.id))
-        if not is_get_all:
-            query_action_activities = query_action_activities.limit(
-                size).offset(offset)
-        action_activities = query_action_activities.all()
+        action_activities = self.__common_query_activity_list() \
+            .filter(_Activity.id.in_(activity_ids)) \
+            .distinct(_Activity.id).order_by(desc(_Activity.id)).all()
         if action_activities:
             # Format activities
             self.__format_activity_data_to_show_on_workflow(
@@ -32,9 +32,21 @@ WEKO_WORKFLOW_OAPOLICY_SEARCH = 'oa_policy_{keyword}'
 WEKO_WORKFLOW_OAPOLICY_CACHE_TTL = 24 * 60 * 60
 """ cache default timeout 1 day"""
 
+WEKO_WORKFLOW_COMMUNITY_USER_IDS_CACHE_KEY = 'weko_workflow_community_user_ids'
+"""Cache key of the users having a community administrator role."""
+
+WEKO_WORKFLOW_COMMUNITY_USER_IDS_CACHE_TTL = 5 * 60
+"""Cache timeout of the community administrator users in seconds."""
+
 WEKO_WORKFLOW_MAX_ACTIVITY_ID = 99999
 """ max activity id per day"""
 
+WEKO_WORKFLOW_ACTIVITY_ID_BLOCK_SIZE = 1
+"""Count of activity ids reserved at once by each worker process.
+
+Larger blocks save round trips on bulk registration, the ids are then
+not in creation order across workers and unused ones are skipped."""
+
 WEKO_WORKFLOW_ACTIVITY_ID_FORMAT = 'A-{}-{}'
 """Activity Id's format (A-YYYYMMDD-NNNNN with NNNNN starts from 00001)."""
 
@@ -291,7 +303,8 @@ WEKO_WORKFLOW_SEND_MAIL_USER_GROUP = {}
 
 WEKO_WORKFLOW_FILTER_PARAMS = [
     'createdfrom', 'createdto', 'workflow', 'user', 'item', 'status', 'tab',
-    'sizewait', 'sizetodo', 'sizeall', 'pagesall', 'pagestodo', 'pageswait'
+    'sizewait', 'sizetodo', 'sizeall', 'pagesall', 'pagestodo', 'pageswait',
+    'cursorall', 'cursortodo', 'cursorwait'
 ]
 
 WEKO_WORKFLOW_ACTIVITY_TOKEN_PATTERN = "activity={} file_name={} date={} email={}"
@@ -74,11 +74,17 @@ require([
   }
 
   $("#page_count").change(function () {
-    window.location.href = creatURL(createParamArray($(this).val(), getSizeAndPagesName('size')));
+    window.location.href = creatURL(removeCursorParam(createParamArray($(this).val(), getSizeAndPagesName('size'))));
   });
 
   $(".get-pages").click(function () {
-    window.location.href = creatURL(createParamArray($(this).data('pages'), getSizeAndPagesName('pages')));
+    let params = removeCursorParam(createParamArray($(this).data('pages'), getSizeAndPagesName('pages')));
+    let cursorName = getSizeAndPagesName('cursor');
+    // The next page is sought from the last activity shown on this page
+    if ($(this).data('cursor')) {
+      params.push({'name': cursorName, 'value': $(this).data('cursor')});
+    }
+    window.location.href = creatURL(params);
   });
 
   $(".activity_tab").click(function () {
@@ -146,6 +152,13 @@ require([
     window.location.href = creatURL(paramsAfterFilter);
   }
 
+  function removeCursorParam(data) {
+    let cursorName = getSizeAndPagesName('cursor');
+    return data.filter(function (param) {
+      return param.name != cursorName;
+    });
+  }
+
   function creatURL(data) {
     let urlEncodedDataPairs = [];
     for (let key in data) {
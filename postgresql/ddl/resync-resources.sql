@@ -0,0 +1,14 @@
+CREATE TABLE public.resync_resources (
+    created timestamp NOT NULL DEFAULT now(),
+    updated timestamp NOT NULL DEFAULT now(),
+    id serial NOT NULL,
+    resync_indexes_id integer NOT NULL,
+    resource_key character varying(2048) NOT NULL,
+    resource jsonb,
+    status character varying(10) NOT NULL DEFAULT 'pending',
+    CONSTRAINT pk_resync_resources PRIMARY KEY (id),
+    CONSTRAINT fk_resync_resources_resync_indexes_id_resync_indexes FOREIGN KEY (resync_indexes_id)
+        REFERENCES public.resync_indexes (id) ON DELETE CASCADE,
+    CONSTRAINT uq_resync_resources_resync_indexes_id UNIQUE (resync_indexes_id, resource_key)
+);
+CREATE INDEX idx_resync_resources_status ON public.resync_resources (resync_indexes_id, status);
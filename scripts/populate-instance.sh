@@ -137,36 +137,7 @@ ${INVENIO_WEB_INSTANCE} index queue init
 # sphinxdoc-index-initialisation-end
 
 # sphinxdoc-pipeline-registration-begin
-curl -XPUT 'http://'${INVENIO_ELASTICSEARCH_HOST}':9200/_ingest/pipeline/item-file-pipeline' -H 'Content-Type: application/json' -d '{
- "description" : "Index contents of each file.",
- "processors" : [
-   {
-     "foreach": {
-       "field": "content",
-       "processor": {
-         "attachment": {
-           "indexed_chars" : -1,
-           "target_field": "_ingest._value.attachment",
-           "field": "_ingest._value.file",
-           "properties": [
-             "content"
-           ]
-         }
-       }
-     }
-   },
-   {
-     "foreach": {
-       "field": "content",
-       "processor": {
-         "remove": {
-           "field": "_ingest._value.file"
-         }
-       }
-     }
-   }
- ]
-}'
+bash "$(dirname "$0")/put-item-file-pipeline.sh"
 # sphinxdoc-pipeline-registration-end
 
 # elasticsearch-ilm-setting-begin
@@ -0,0 +1,61 @@
+#!/usr/bin/env bash
+#
+# This file is part of WEKO3.
+# Copyright (C) 2017 National Institute of Informatics.
+#
+# WEKO3 is free software; you can redistribute it
+# and/or modify it under the terms of the GNU General Public License as
+# published by the Free Software Foundation; either version 2 of the
+# License, or (at your option) any later version.
+#
+# WEKO3 is distributed in the hope that it will be
+# useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with WEKO3; if not, write to the
+# Free Software Foundation, Inc., 59 Temple Place, Suite 330, Boston,
+# MA 02111-1307, USA.
+
+# Register the ingest pipeline indexing the contents of item files.
+# Existing instances run this script again when the pipeline definition
+# changes, e.g. when entries without file data were made optional.
+if [ "${INVENIO_ELASTICSEARCH_HOST}" = "" ]; then
+    echo "[ERROR] Please set environment variable INVENIO_ELASTICSEARCH_HOST before runnning this script."
+    echo "[ERROR] Example: export INVENIO_ELASTICSEARCH_HOST=192.168.50.13"
+    exit 1
+fi
+
+curl -XPUT 'http://'${INVENIO_ELASTICSEARCH_HOST}':9200/_ingest/pipeline/item-file-pipeline' -H 'Content-Type: application/json' -d '{
+ "description" : "Index contents of each file.",
+ "processors" : [
+   {
+     "foreach": {
+       "field": "content",
+       "processor": {
+         "attachment": {
+           "indexed_chars" : -1,
+           "ignore_missing": true,
+           "target_field": "_ingest._value.attachment",
+           "field": "_ingest._value.file",
+           "properties": [
+             "content"
+           ]
+         }
+       }
+     }
+   },
+   {
+     "foreach": {
+       "field": "content",
+       "processor": {
+         "remove": {
+           "ignore_missing": true,
+           "field": "_ingest._value.file"
+         }
+       }
+     }
+   }
+ ]
+}'